@@ -0,0 +1,96 @@
+"""
+Benchmark de l'instrumentation HTTP (shared.instrumentation).
+
+Mesure le surcoût par requête du MetricsMiddleware en appelant
+directement une application ASGI minimale, avec et sans middleware.
+Si FastAPI est installé, mesure aussi une application FastAPI réelle
+(routeur, validation, sérialisation JSON).
+
+Usage:
+    python scripts/bench_asgi_metrics.py [--n 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src", "shared"))
+
+from shared.instrumentation import MetricsMiddleware  # noqa: E402
+from shared.telemetry import Telemetry  # noqa: E402
+
+PATHS = [f"/agents/agent{i}" for i in range(32)]
+
+
+async def raw_app(scope, receive, send):
+    """Application ASGI nue : réponse fixe"""
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b'{"status":"ok"}'})
+
+
+def fastapi_app():
+    try:
+        from fastapi import FastAPI
+    except ImportError:
+        return None
+    app = FastAPI()
+
+    @app.get("/agents/{agent_id}")
+    async def get_agent(agent_id: str):
+        return {"agent": agent_id, "status": "ok"}
+
+    return app
+
+
+async def run(app, n: int) -> float:
+    """Durée moyenne (µs) d'une requête GET traversant l'application"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scopes = [
+        {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+            "root_path": "", "query_string": b"", "headers": [],
+            "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 8000),
+        }
+        for path in PATHS
+    ]
+    for scope in scopes:  # Échauffement
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for i in range(n):
+        await app(dict(scopes[i % len(scopes)]), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000, help="Requêtes par mesure")
+    args = parser.parse_args()
+
+    apps = [("ASGI nue", raw_app, MetricsMiddleware(raw_app, Telemetry("bench")))]
+    app = fastapi_app()
+    if app is not None:
+        instrumented = fastapi_app()
+        instrumented.add_middleware(MetricsMiddleware, telemetry=Telemetry("bench"))
+        apps.append(("FastAPI", app, instrumented))
+    else:
+        print("(FastAPI non installé : mesure ASGI nue uniquement)\n")
+
+    print(f"{'application':>12}{'sans µs/req':>14}{'avec µs/req':>14}{'surcoût µs':>13}")
+    print("-" * 53)
+    for name, plain, wrapped in apps:
+        base = await run(plain, args.n)
+        timed = await run(wrapped, args.n)
+        print(f"{name:>12}{base:>14.2f}{timed:>14.2f}{timed - base:>13.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
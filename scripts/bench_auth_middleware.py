@@ -0,0 +1,88 @@
+"""
+Benchmark du middleware d'authentification interne (shared.auth_middleware).
+
+Mesure la latence moyenne d'un endpoint FastAPI « chaud » appelé
+directement en ASGI (sans réseau ni client HTTP), avec et sans
+InternalAuthMiddleware, pour un chemin protégé (jeton valide) et un
+chemin exclu (/health). Chaque mesure garde le meilleur de `--rounds`
+passes alternées, pour lisser le bruit (GC, ordre d'exécution).
+
+Usage:
+    python scripts/bench_auth_middleware.py [--n 20000] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src", "shared"))
+
+from fastapi import FastAPI  # noqa: E402
+
+from shared.auth_middleware import InternalAuthMiddleware  # noqa: E402
+from shared.internal_auth import InternalAuth  # noqa: E402
+
+
+def make_app(protected: bool) -> FastAPI:
+    app = FastAPI()
+    if protected:
+        app.add_middleware(InternalAuthMiddleware)
+
+    @app.get("/agents/{agent_id}")
+    async def get_agent(agent_id: str):
+        return {"agent": agent_id, "status": "ok"}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
+
+
+async def run(app, path: str, n: int) -> float:
+    """Durée moyenne (µs) d'une requête GET traversant l'application"""
+    token = InternalAuth.get_token("core").encode()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message["status"]
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"x-hive-internal-token", token)],
+        "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 8000),
+    }
+    for _ in range(200):  # Échauffement (cache de jetons compris)
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000, help="Requêtes par mesure")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes par mesure")
+    args = parser.parse_args()
+
+    plain, protected = make_app(False), make_app(True)
+    print(f"{'chemin':>16}{'sans µs/req':>14}{'avec µs/req':>14}{'surcoût µs':>13}")
+    print("-" * 57)
+    for path in ("/agents/banker", "/health"):
+        base = timed = float("inf")
+        for _ in range(args.rounds):
+            base = min(base, await run(plain, path, args.n))
+            timed = min(timed, await run(protected, path, args.n))
+        print(f"{path:>16}{base:>14.2f}{timed:>14.2f}{timed - base:>13.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
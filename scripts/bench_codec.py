@@ -0,0 +1,79 @@
+"""
+Benchmark des codecs inter-agents (shared.codec).
+
+Compare le débit encode/decode de json, orjson et msgpack sur les
+payloads réels de la ruche : AgentMessage, TradeOrder et ticks.
+
+Usage:
+    python scripts/bench_codec.py [--n 20000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src", "shared"))
+
+from shared.codec import _CODECS  # noqa: E402
+from shared.models import (  # noqa: E402
+    AgentMessage,
+    AgentMessageType,
+    TradeAction,
+    TradeOrder,
+)
+
+
+def build_payloads() -> dict:
+    """Construit les payloads représentatifs (déjà aplatis comme sur le fil)"""
+    message = AgentMessage(
+        type=AgentMessageType.REQUEST,
+        source_agent="core",
+        target_agent="banker",
+        action="TRADING_ORDER",
+        payload={"session_id": "4f1c", "message": "achète 0.1 lot d'or", "entities": {"symbol": "XAUUSD"}},
+    )
+    order = TradeOrder(
+        symbol="XAUUSD",
+        action=TradeAction.BUY,
+        volume=Decimal("0.10"),
+        stop_loss_price=Decimal("2030.50"),
+        take_profit_price=Decimal("2060.00"),
+    )
+    tick = {"symbol": "XAUUSD", "bid": 2034.51, "ask": 2034.78, "ts": 1739000000.123, "volume": 12}
+    return {
+        "AgentMessage": message.model_dump(),
+        "TradeOrder": order.model_dump(),
+        "tick": tick,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000, help="Itérations par mesure")
+    args = parser.parse_args()
+
+    payloads = build_payloads()
+    print(f"{'payload':<14}{'codec':<9}{'taille':>8}{'encode/s':>14}{'decode/s':>14}")
+    print("-" * 59)
+
+    # Référence : chemin historique json.dumps / json.loads
+    codecs = {"stdlib": (lambda p: json.dumps(p, default=str).encode(), json.loads)}
+    codecs.update({name: (c.encode, c.decode) for name, c in _CODECS.items()})
+
+    for label, payload in payloads.items():
+        for name, (encode, decode) in codecs.items():
+            encoded = encode(payload)
+            enc_t = timeit.timeit(lambda: encode(payload), number=args.n)
+            dec_t = timeit.timeit(lambda: decode(encoded), number=args.n)
+            print(
+                f"{label:<14}{name:<9}{len(encoded):>7}B"
+                f"{args.n / enc_t:>14,.0f}{args.n / dec_t:>14,.0f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark de l'authentification interne (shared.internal_auth).
+
+Compare, avec et sans cache :
+  - la création des en-têtes internes (signature HS256 à chaque appel
+    ou jeton réutilisé jusqu'à l'approche de l'expiration) ;
+  - la vérification du jeton (décodage JWT complet ou LRU des jetons
+    déjà vérifiés) ;
+  - si FastAPI est installé, le débit d'un endpoint interne protégé par
+    InternalAuthMiddleware, appelé en concurrence via httpx (transport
+    ASGI, sans réseau).
+
+Usage:
+    python scripts/bench_internal_auth.py [--n 20000] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src", "shared"))
+
+from shared.internal_auth import InternalAuth, VerifiedTokenCache  # noqa: E402
+
+
+def per_second(func, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return n / (time.perf_counter() - start)
+
+
+def uncached(enabled: bool) -> None:
+    """Cache serveur actif (LRU normal) ou désactivé (taille 0)"""
+    InternalAuth.verified_cache = VerifiedTokenCache(maxsize=4096 if enabled else 0)
+    InternalAuth._issued.clear()
+
+
+async def endpoint_rps(n: int, concurrency: int, cached: bool) -> float | None:
+    try:
+        import httpx
+        from fastapi import FastAPI
+    except ImportError:
+        return None
+    from shared.auth_middleware import InternalAuthMiddleware
+
+    app = FastAPI()
+    app.add_middleware(InternalAuthMiddleware)
+
+    @app.get("/internal/status")
+    async def status():
+        return {"status": "ok"}
+
+    mint = InternalAuth.get_token if cached else InternalAuth.generate_token
+    uncached(cached)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                response = await client.get(
+                    "/internal/status", headers={"X-Hive-Internal-Token": mint("core")}
+                )
+                assert response.status_code == 200, response.status_code
+
+        await worker(50)  # Échauffement
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(n // concurrency) for _ in range(concurrency)))
+        return (n // concurrency * concurrency) / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000, help="Opérations par mesure")
+    parser.add_argument("--concurrency", type=int, default=32, help="Clients simultanés (endpoint)")
+    args = parser.parse_args()
+
+    token = InternalAuth.generate_token("core")
+    uncached(False)
+    sign = per_second(lambda: InternalAuth.generate_token("core"), args.n)
+    verify = per_second(lambda: InternalAuth.verify_token(token), args.n)
+    uncached(True)
+    sign_cached = per_second(lambda: InternalAuth.get_token("core"), args.n)
+    verify_cached = per_second(lambda: InternalAuth.verify_token(token), args.n)
+
+    print(f"{'opération':>22}{'sans cache /s':>16}{'avec cache /s':>16}{'gain':>8}")
+    print("-" * 62)
+    rows = [("signature", sign, sign_cached), ("vérification", verify, verify_cached)]
+    without = await endpoint_rps(args.n // 4, args.concurrency, cached=False)
+    if without is not None:
+        with_cache = await endpoint_rps(args.n // 4, args.concurrency, cached=True)
+        rows.append(("endpoint interne (req)", without, with_cache))
+    else:
+        print("(FastAPI/httpx non installés : endpoint non mesuré)")
+    for name, base, fast in rows:
+        print(f"{name:>22}{base:>16,.0f}{fast:>16,.0f}{fast / base:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
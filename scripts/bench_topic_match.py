@@ -0,0 +1,96 @@
+"""
+Benchmark du routage MQTT (shared.topic_trie).
+
+Compare le coût de correspondance d'un topic entre le TopicTrie et un
+balayage linéaire des filtres (comparaison niveau par niveau), pour un
+nombre croissant d'abonnements avec wildcards.
+
+Usage:
+    python scripts/bench_topic_match.py [--n 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src", "shared"))
+
+from shared.topic_trie import TopicTrie  # noqa: E402
+
+AGENTS = ["core", "banker", "sentinel", "compliance", "muse", "lab", "builder", "accountant"]
+KINDS = ["status", "requests", "events", "ticks", "sensors", "alerts"]
+
+
+def linear_match(filters: list[list[str]], topic: str) -> list[int]:
+    """Référence naïve : teste chaque filtre"""
+    levels = topic.split("/")
+    matched = []
+    for index, parts in enumerate(filters):
+        for i, part in enumerate(parts):
+            if part == "#":
+                matched.append(index)
+                break
+            if i >= len(levels) or (part != "+" and part != levels[i]):
+                break
+        else:
+            if len(parts) == len(levels):
+                matched.append(index)
+    return matched
+
+
+def build_filters(count: int, rng: random.Random) -> list[str]:
+    """Filtres réalistes : exacts, `+` et `#` mélangés"""
+    filters = set()
+    while len(filters) < count:
+        agent = rng.choice(AGENTS + ["+"])
+        kind = rng.choice(KINDS + ["+", "#"])
+        leaf = f"dev{rng.randrange(count)}"
+        shape = rng.random()
+        if kind == "#":
+            filters.add(f"eva/{agent}/#")
+        elif shape < 0.6:
+            filters.add(f"eva/{agent}/{kind}/{leaf}")
+        else:
+            filters.add(f"eva/{agent}/{kind}/+")
+    return sorted(filters)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000, help="Correspondances par mesure")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    topics = [
+        f"eva/{rng.choice(AGENTS)}/{rng.choice(KINDS)}/dev{rng.randrange(500)}"
+        for _ in range(256)
+    ]
+
+    print(f"{'filtres':>8}{'trie µs/match':>16}{'linéaire µs/match':>20}{'gain':>8}")
+    print("-" * 52)
+    for count in (10, 100, 300, 500, 1000):
+        filters = build_filters(count, rng)
+        trie = TopicTrie()
+        for topic_filter in filters:
+            trie.add(topic_filter, topic_filter)
+        split_filters = [f.split("/") for f in filters]
+
+        # Les deux implémentations doivent être d'accord
+        for topic in topics:
+            expected = {filters[i] for i in linear_match(split_filters, topic)}
+            assert trie.match(topic) == expected, topic
+
+        cycle = iter(topics * (args.n // len(topics) + 1))
+        trie_t = timeit.timeit(lambda: trie.match(next(cycle)), number=args.n)
+        cycle = iter(topics * (args.n // len(topics) + 1))
+        linear_t = timeit.timeit(lambda: linear_match(split_filters, next(cycle)), number=args.n)
+        print(
+            f"{count:>8}{trie_t / args.n * 1e6:>16.2f}"
+            f"{linear_t / args.n * 1e6:>20.2f}{linear_t / trie_t:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
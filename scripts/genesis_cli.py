@@ -4,6 +4,7 @@ import json
 from rich.console import Console
 from rich.panel import Panel
 from shared.redis_client import get_redis_client, init_redis
+from shared.registry import get_drone_registry
 
 console = Console()
 
@@ -15,9 +16,8 @@ async def emergency_halt():
 
 async def swarm_status():
     """Affiche le statut rapide de la ruche."""
-    redis = get_redis_client()
-    keys = await redis._client.keys("swarm:drone:*")
-    console.print(f"🐝 [bold yellow]THE HIVE STATUS:[/bold yellow] {len(keys)} Drones actifs.")
+    count = await get_drone_registry().count()
+    console.print(f"🐝 [bold yellow]THE HIVE STATUS:[/bold yellow] {count} Drones actifs.")
 
 async def force_audit():
     """Demande à l'Expert Researcher de générer un rapport immédiat."""
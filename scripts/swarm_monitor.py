@@ -1,5 +1,4 @@
 import asyncio
-import json
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
@@ -7,17 +6,16 @@ from rich.live import Live
 from rich.panel import Panel
 from rich.layout import Layout
 from redis.asyncio import Redis
+from shared.redis_client import RedisClient
+from shared.registry import RedisRegistry, get_drone_registry
+
+REDIS_URL = "redis://127.0.0.1:6379"
 
 console = Console()
 
-async def get_drones(redis: Redis):
-    keys = await redis.keys("swarm:drone:*")
-    drones = []
-    for key in keys:
-        data = await redis.get(key)
-        if data:
-            drones.append(json.loads(data))
-    return drones
+async def get_drones(registry: RedisRegistry):
+    # Un seul aller-retour (HGETALL) au lieu de KEYS + un GET par drone
+    return await registry.list_all()
 
 def make_layout() -> Layout:
     layout = Layout()
@@ -34,7 +32,8 @@ def make_layout() -> Layout:
     return layout
 
 async def run_monitor():
-    redis = Redis.from_url("redis://127.0.0.1:6379", decode_responses=True)
+    redis = Redis.from_url(REDIS_URL, decode_responses=True)
+    registry = get_drone_registry(RedisClient(REDIS_URL))
     layout = make_layout()
     events = []
 
@@ -63,7 +62,7 @@ async def run_monitor():
             layout["experts"].update(Panel(expert_table))
 
             # Drones
-            drones = await get_drones(redis)
+            drones = await get_drones(registry)
             drone_table = Table(title="Swarm Drones actifs")
             drone_table.add_column("Nom")
             drone_table.add_column("Mission")
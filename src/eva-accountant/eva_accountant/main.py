@@ -22,8 +22,10 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from shared.redis_client import init_redis, get_redis_client
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
 from shared.auth_middleware import InternalAuthMiddleware
+from shared.instrumentation import instrument_app, uninstrument_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -73,6 +75,7 @@ async def lifespan(app: FastAPI):
         None: Rend la main une fois l'initialisation terminée.
     """
     logger.info("💰 Démarrage EVA Accountant (L'Auditeur)...")
+    instrument_app(app, "accountant")
 
     # Redis — tolérant aux pannes au démarrage
     try:
@@ -93,6 +96,7 @@ async def lifespan(app: FastAPI):
     # Sauvegarder à l'arrêt
     save_ledger()
     logger.info("🛑 Arrêt EVA Accountant")
+    await uninstrument_app(app)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -173,7 +177,7 @@ async def hard_heartbeat():
 
     Inclut le ROI net courant dans le payload pour le monitoring.
     """
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {
@@ -182,7 +186,7 @@ async def hard_heartbeat():
                 "expert": "accountant",
                 "net_roi": financial_state["net_roi"],
             }
-            await redis.cache_set("eva.accountant.status", payload, ttl_seconds=10)
+            await presence.beat("accountant", payload)
         except Exception as e:
             logger.error(f"Heartbeat error: {e}")
         await asyncio.sleep(2.0)
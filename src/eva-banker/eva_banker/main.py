@@ -14,6 +14,7 @@ Architecture :
 """
 
 import asyncio
+import functools
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -39,7 +40,10 @@ from shared import (
     calculate_cvar,
 )
 from shared.redis_client import get_redis_client, init_redis
+from shared.dispatcher import ChannelPolicy, ExpiryPolicy
+from shared.circuit_breaker import get_circuit_breaker_registry
 from shared.auth_middleware import InternalAuthMiddleware
+from shared.instrumentation import instrument_app, uninstrument_app
 
 from eva_banker.services.mt5 import MT5Service, get_mt5_service
 from eva_banker.services.risk import RiskValidator, get_risk_validator
@@ -47,9 +51,7 @@ from eva_banker.services.binance_service import BinanceService
 from eva_banker.services.news_filter import NewsFilterService
 from eva_banker.nemesis import NemesisSystem, get_nemesis_system
 from eva_banker.skill_library import SkillLibrary, SkilledBehavior
-from eva_banker.models.gnn_model import TFTGNNModel
 from eva_banker.swarm import BankerSwarm
-from eva_core.probes import check_cognitive_sincerity
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -66,8 +68,14 @@ class BankerManager:
     """
     def __init__(self, library: SkillLibrary):
         self.library = library
-        # Initialisation du modèle (dims fictives pour l'exemple)
-        self.brain = TFTGNNModel(asset_dim=5, temporal_dim=64, hidden_dim=128)
+
+    @functools.cached_property
+    def brain(self):
+        """Modèle TFT-GNN, construit au premier usage (torch importé à la demande)"""
+        from eva_banker.models.gnn_model import TFTGNNModel
+
+        # Dims fictives pour l'exemple
+        return TFTGNNModel(asset_dim=5, temporal_dim=64, hidden_dim=128)
 
     def plan_strategy(self, market_history: dict) -> SkilledBehavior:
         """
@@ -166,6 +174,7 @@ async def lifespan(app: FastAPI):
     Gestion du cycle de vie de l'application Banker.
     """
     logger.info("🏦 Démarrage The Banker (Hierarchical Architecture)...")
+    instrument_app(app, "banker")
     settings = get_settings()
 
     # Redis
@@ -197,11 +206,6 @@ async def lifespan(app: FastAPI):
         filter_minutes=settings.risk_news_filter_minutes
     )
 
-    # Telemetry
-    app.state.start_time = datetime.now()
-    app.state.request_count = 0
-    app.state.error_count = 0
-
     # Intégration SWARM
     app.state.swarm = BankerSwarm()
     await app.state.swarm.init_mqtt()
@@ -224,7 +228,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("🛑 Arrêt The Banker...")
+    await uninstrument_app(app)
     await mt5_service.disconnect()
+    await get_redis_client().disconnect()
 
 
 async def hard_heartbeat():
@@ -233,13 +239,17 @@ async def hard_heartbeat():
     Persiste l'état dans Redis pour la découverte des agents.
     """
     from shared.redis_client import get_redis_client
+    from shared.presence import get_presence_table
     redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         payload = {"status": "online", "ts": datetime.now().timestamp(), "expert": "banker"}
-        # Publication Pub/Sub (temps réel)
-        await redis.publish("eva.banker.heartbeat", payload)
-        # Persistence (découverte)
-        await redis.cache_set("eva.banker.status", payload, ttl_seconds=10)
+        # Un seul aller-retour Redis par cycle (pipeline)
+        async with redis.pipeline() as batch:
+            # Publication Pub/Sub (temps réel)
+            batch.publish("eva.banker.heartbeat", payload)
+            # Table de présence (découverte)
+            await presence.beat("banker", payload, batch=batch)
         await asyncio.sleep(0.3)
 
 
@@ -262,9 +272,38 @@ async def swarm_listener():
             )
 
     await redis.subscribe(["eva.all.swarm_command", "eva.banker.swarm_command"], handle_swarm)
+    # Requêtes RPC du Core (request/reply sur le bus, sans HTTP ni JWT).
+    # Une requête expirée (ordre arrivé trop tard) est conservée dans
+    # eva.dead_letter pour audit au lieu d'être abandonnée en silence
+    await redis.handle_requests(
+        "banker",
+        {"TRADING_STATUS": handle_trading_status_request},
+        policy=ChannelPolicy(on_expired=ExpiryPolicy.DEAD_LETTER),
+    )
     await redis.listen()
 
 
+async def handle_trading_status_request(payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    Répond à la requête bus TRADING_STATUS du Core.
+
+    Même contenu que GET /account, /positions et /risk/status, en un seul message.
+    """
+    mt5_service: MT5Service = app.state.mt5_service
+    risk_validator: RiskValidator = app.state.risk_validator
+
+    account, positions, risk = await asyncio.gather(
+        mt5_service.get_account_info(),
+        mt5_service.get_open_positions(),
+        risk_validator.get_current_status(),
+    )
+    return {
+        "account": account.model_dump(mode="json"),
+        "positions": [p.model_dump(mode="json") for p in positions],
+        "risk": risk.model_dump(mode="json"),
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # APPLICATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -330,8 +369,10 @@ async def create_order(request: OrderRequest) -> OrderResponse:
     skill = manager.plan_strategy(market_data)
 
     # 3. Vérification de la "Sincérité Cognitive"
-    # On simule l'obtention des activations du LLM
+    # On simule l'obtention des activations du LLM (torch chargé à la demande)
     import torch
+    from eva_core.probes import check_cognitive_sincerity
+
     mock_activations = torch.randn(1, 4096)
     is_sincere, sincerity_msg = check_cognitive_sincerity(
         mock_activations, 
@@ -415,20 +456,21 @@ async def close_position(ticket: int) -> dict[str, Any]:
         profit = result.get("profit", 0)
         
         if profit and float(profit) != 0:
-            # Signal pour Compliance (URSSAF)
-            await redis.publish("eva.compliance.trades", {
-                "ticket_id": ticket,
-                "profit": profit,
-                "symbol": result.get("symbol", "UNKNOWN"),
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Signal pour Master Notification (Sentinel/Telegram)
-            await redis.publish("eva.banker.trades", {
-                "ticket_id": ticket,
-                "profit": profit,
-                "symbol": result.get("symbol", "UNKNOWN")
-            })
+            await redis.publish_many([
+                # Signal pour Compliance (URSSAF)
+                ("eva.compliance.trades", {
+                    "ticket_id": ticket,
+                    "profit": profit,
+                    "symbol": result.get("symbol", "UNKNOWN"),
+                    "timestamp": datetime.now().isoformat()
+                }),
+                # Signal pour Master Notification (Sentinel/Telegram)
+                ("eva.banker.trades", {
+                    "ticket_id": ticket,
+                    "profit": profit,
+                    "symbol": result.get("symbol", "UNKNOWN")
+                }),
+            ])
             
             logger.info(f"⚖️ Trade profit envoyé à Compliance et Sentinel")
     except Exception as e:
@@ -510,7 +552,8 @@ async def trigger_kill_switch() -> dict[str, str]:
         dict[str, str]: Rapport des fermetures effectuées.
     """
     mt5_service: MT5Service = app.state.mt5_service
-    positions = await mt5_service.get_open_positions()
+    # Hors circuit breaker : l'arrêt d'urgence ne doit jamais être rejeté
+    positions = await mt5_service.get_open_positions(force=True)
 
     closed = 0
     for pos in positions:
@@ -611,16 +654,14 @@ async def get_trading_status():
 
 @app.get("/telemetry", tags=["Système"])
 async def get_telemetry():
-    """Retourne les métriques de télémétrie du Banker"""
-    start_time: datetime = app.state.start_time
-    uptime = (datetime.now() - start_time).total_seconds()
-    return {
-        "service_name": "banker",
-        "uptime_seconds": int(uptime),
-        "requests_total": app.state.request_count,
-        "errors_total": app.state.error_count,
-        "timestamp": datetime.now().isoformat(),
-    }
+    """Retourne les métriques de télémétrie du Banker (requêtes, latences par route, sources)"""
+    return app.state.telemetry.get_metrics()
+
+
+@app.get("/circuit-breakers", tags=["Système"])
+async def list_circuit_breakers():
+    """État de tous les circuit breakers du processus (LLM, MT5, Qdrant...)"""
+    return get_circuit_breaker_registry().get_status()
 
 
 @app.get("/circuit-breaker/status", tags=["Système"])
@@ -3,6 +3,7 @@ Service MT5 - Client MetaTrader 5
 Gère la connexion et l'exécution des ordres sur MT5
 """
 
+import functools
 import logging
 import sys
 from datetime import datetime
@@ -11,6 +12,8 @@ from functools import lru_cache
 from typing import Any
 
 from shared import AccountBalance, Position, TradeAction, TradeOrder, get_settings
+from shared.circuit_breaker import get_circuit_breaker
+from shared.tracing import SpanKind, traced
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +28,22 @@ if MT5_AVAILABLE:
         logger.warning("MetaTrader5 non installé")
 
 
+def _guarded(method):
+    """
+    Fait passer les appels MT5 réels par le circuit breaker (pas en mock).
+
+    `force=True` contourne le breaker : le kill-switch doit pouvoir lister
+    les positions même quand le circuit "mt5" est ouvert (y compris par un
+    autre replica via l'état partagé).
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, force: bool = False, **kwargs):
+        if self.mock_mode or force:
+            return await method(self, *args, **kwargs)
+        return await self._breaker.execute(method, self, *args, **kwargs)
+    return wrapper
+
+
 class MT5Service:
     """
     Client MetaTrader 5 pour exécution des ordres.
@@ -44,6 +63,10 @@ class MT5Service:
         self._login = login
         self._password = password
         self._server = server
+        # Terminal MT5 figé / déconnecté : rejet immédiat plutôt qu'un blocage
+        self._breaker = get_circuit_breaker(
+            "mt5", failure_threshold=3, recovery_timeout=20, slow_call_duration=5.0
+        )
         logger.info(f"MT5Service initialise (mock={self.mock_mode}, login={login}, server={server})")
 
     async def connect(self) -> bool:
@@ -102,6 +125,7 @@ class MT5Service:
         self.is_connected = False
         logger.info("MT5 déconnecté")
 
+    @_guarded
     async def get_account_info(self) -> AccountBalance:
         """Récupère les informations du compte"""
         if self.mock_mode:
@@ -131,6 +155,7 @@ class MT5Service:
             leverage=info.leverage,
         )
 
+    @_guarded
     async def get_open_positions(self) -> list[Position]:
         """Récupère les positions ouvertes"""
         if self.mock_mode:
@@ -161,6 +186,8 @@ class MT5Service:
             )
         return positions
 
+    @traced("mt5.execute_order", SpanKind.CLIENT)
+    @_guarded
     async def execute_order(self, order: TradeOrder) -> dict[str, Any]:
         """Exécute un ordre de trading"""
         if self.mock_mode:
@@ -208,7 +235,12 @@ class MT5Service:
         }
 
     async def close_position(self, ticket: int) -> dict[str, Any]:
-        """Ferme une position par son ticket"""
+        """
+        Ferme une position par son ticket.
+
+        Hors circuit breaker : une fermeture réduit le risque et doit
+        toujours être tentée, même terminal dégradé.
+        """
         if self.mock_mode:
             self._mock_positions = [p for p in self._mock_positions if p.ticket != ticket]
             return {"success": True, "message": f"Position {ticket} fermée (mock)"}
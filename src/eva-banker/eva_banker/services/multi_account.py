@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from shared import PropFirmAccount
+from shared.registry import PROPFIRM_LEGACY_PREFIX, get_propfirm_registry
 
 logger = logging.getLogger(__name__)
 
@@ -24,24 +25,20 @@ class MultiAccountManager:
     Chaque compte est isolé avec ses propres limites de risque.
     """
 
-    REDIS_PREFIX = "propfirm:account:"
-
     def __init__(self):
         self.accounts: Dict[UUID, PropFirmAccount] = {}
+        self.registry = get_propfirm_registry()
         self._initialized = False
 
     async def initialize(self) -> None:
         """Charge les comptes depuis Redis au démarrage."""
         try:
-            from shared.redis_client import get_redis_client
-            redis = get_redis_client()
+            # Reprise des comptes persistés sous l'ancien format (une clé par compte)
+            await self.registry.migrate_from_keys(PROPFIRM_LEGACY_PREFIX)
 
-            keys = await redis._client.keys(f"{self.REDIS_PREFIX}*")
-            for key in keys:
-                data = await redis.cache_get(key)
-                if data:
-                    account = PropFirmAccount(**data)
-                    self.accounts[account.id] = account
+            for data in await self.registry.list_all():
+                account = PropFirmAccount(**data)
+                self.accounts[account.id] = account
 
             self._initialized = True
             logger.info(
@@ -59,13 +56,7 @@ class MultiAccountManager:
         self.accounts[account.id] = account
 
         try:
-            from shared.redis_client import get_redis_client
-            redis = get_redis_client()
-            await redis.cache_set(
-                f"{self.REDIS_PREFIX}{account.id}",
-                account.model_dump(mode="json"),
-                ttl_seconds=None,
-            )
+            await self.registry.put(account.id, account.model_dump(mode="json"))
         except Exception as e:
             logger.warning(f"Persistance Redis échouée: {e}")
 
@@ -86,9 +77,7 @@ class MultiAccountManager:
         del self.accounts[account_id]
 
         try:
-            from shared.redis_client import get_redis_client
-            redis = get_redis_client()
-            await redis._client.delete(f"{self.REDIS_PREFIX}{account_id}")
+            await self.registry.remove(account_id)
         except Exception:
             pass
 
@@ -17,6 +17,7 @@ from shared import (
     calculate_var, 
     calculate_cvar
 )
+from shared.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +64,7 @@ class RiskValidator:
             f"max_dd_daily={max_daily_drawdown}%, max_dd_total={max_total_drawdown}%"
         )
 
+    @traced("risk.validate")
     async def validate_order(self, order: TradeOrder) -> dict[str, Any]:
         """
         Valide un ordre selon les règles de risque.
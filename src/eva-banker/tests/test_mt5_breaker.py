@@ -0,0 +1,38 @@
+"""
+Tests du circuit breaker MT5 : le chemin du kill-switch n'est jamais rejeté.
+"""
+
+import pytest
+
+from shared.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitState
+from eva_banker.services import mt5 as mt5_module
+from eva_banker.services.mt5 import MT5Service
+
+
+class FakeMT5:
+    def positions_get(self, ticket=None):
+        return ()
+
+
+@pytest.fixture
+def tripped_service(monkeypatch):
+    """Service en mode réel (terminal simulé) avec le circuit "mt5" ouvert"""
+    monkeypatch.setattr(mt5_module, "mt5", FakeMT5(), raising=False)
+    service = MT5Service(mock_mode=True)
+    service.mock_mode = False
+    service._breaker = CircuitBreaker("mt5-test", recovery_timeout=60)
+    service._breaker._transition(CircuitState.OPEN)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_rejects_regular_reads(tripped_service):
+    with pytest.raises(CircuitBreakerOpenError):
+        await tripped_service.get_open_positions()
+
+
+@pytest.mark.asyncio
+async def test_kill_switch_path_bypasses_open_breaker(tripped_service):
+    assert await tripped_service.get_open_positions(force=True) == []
+    result = await tripped_service.close_position(42)
+    assert result == {"success": False, "message": "Position 42 non trouvée"}
@@ -20,7 +20,9 @@ from datetime import datetime
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from shared.redis_client import init_redis, get_redis_client
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
+from shared.instrumentation import instrument_app, uninstrument_app
 
 from eva_builder.services.librarian import LibrarianService
 
@@ -47,6 +49,7 @@ async def lifespan(app: FastAPI):
         None: Rend la main une fois l'initialisation terminée.
     """
     logger.info("🛠️ Démarrage The Builder (DevOps Agent)...")
+    instrument_app(app, "builder")
 
     # Redis — tolérant aux pannes au démarrage
     try:
@@ -64,6 +67,7 @@ async def lifespan(app: FastAPI):
     logger.info("✅ The Builder est au travail (prêt)")
     yield
     logger.info("🛑 Arrêt The Builder")
+    await uninstrument_app(app)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -77,7 +81,7 @@ async def hard_heartbeat():
 
     Publie l'état « online » dans Redis toutes les 2 secondes.
     """
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {
@@ -85,7 +89,7 @@ async def hard_heartbeat():
                 "ts": datetime.now().timestamp(),
                 "expert": "builder",
             }
-            await redis.cache_set("eva.builder.status", payload, ttl_seconds=10)
+            await presence.beat("builder", payload)
         except Exception as e:
             logger.error(f"Heartbeat error: {e}")
         await asyncio.sleep(2.0)
@@ -23,7 +23,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from eva_compliance.legal_wrapper import LegalWrapper
 from eva_compliance.tax_manager import TaxManager
 from shared.redis_client import init_redis, get_redis_client
+from shared.presence import get_presence_table
 from shared.auth_middleware import InternalAuthMiddleware
+from shared.instrumentation import instrument_app, uninstrument_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -50,6 +52,7 @@ async def lifespan(app: FastAPI):
         None: Rend la main à l'application une fois l'initialisation terminée.
     """
     logger.info("⚖️ Démarrage EVA Compliance (Le Keeper)...")
+    instrument_app(app, "compliance")
 
     # Redis — tolérant aux pannes au démarrage
     try:
@@ -69,6 +72,7 @@ async def lifespan(app: FastAPI):
     logger.info("✅ EVA Compliance actif et à l'écoute du Banker")
     yield
     logger.info("🛑 Arrêt EVA Compliance")
+    await uninstrument_app(app)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -118,7 +122,7 @@ async def trade_listener(tax_manager: TaxManager):
         logger.info(f"📝 Résultat provision: {result.get('message', result.get('status'))}")
 
     try:
-        await redis.subscribe(["eva.compliance.trades"], handle_trade)
+        await redis.subscribe(["eva.compliance.trades"], handle_trade, group="compliance")
         await redis.listen()
     except Exception as e:
         logger.error(f"Erreur listener trades: {e}")
@@ -128,10 +132,10 @@ async def hard_heartbeat():
     """
     Signal haute fréquence pour l'Orchestrateur Core.
 
-    Publie l'état « online » dans Redis sous la clé `eva.keeper.status`
-    (le Core attend le nom « keeper » dans sa découverte d'agents).
+    Publie l'état « online » dans la table de présence sous le nom « keeper »
+    (le Core attend ce nom dans sa découverte d'agents).
     """
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {
@@ -139,7 +143,7 @@ async def hard_heartbeat():
                 "ts": datetime.now().timestamp(),
                 "expert": "keeper",
             }
-            await redis.cache_set("eva.keeper.status", payload, ttl_seconds=10)
+            await presence.beat("keeper", payload)
         except Exception as e:
             logger.error(f"Heartbeat error: {e}")
         await asyncio.sleep(1.0)
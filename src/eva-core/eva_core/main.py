@@ -15,27 +15,36 @@ Architecture :
 """
 
 import asyncio
+import json
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any
+from typing import Any, AsyncIterator
 from uuid import UUID, uuid4
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 
 from shared import (
     ChatMessage,
     Intent,
+    IntentType,
+    MessagePriority,
     MessageRole,
     Settings,
     get_settings,
 )
-from shared.redis_client import get_redis_client, init_redis
+from shared.redis_client import AgentRequestError, get_redis_client, init_redis
+from shared.presence import get_presence_table
+from shared.circuit_breaker import get_circuit_breaker_registry
+from shared.registry import DRONE_LEGACY_PREFIX, get_drone_registry
 from shared.mqtt_client import EVAMQTTClient
 from shared.auth_middleware import InternalAuthMiddleware
 from shared.internal_auth import get_internal_headers
+from shared.instrumentation import instrument_app, uninstrument_app
+from shared.system_sampler import get_system_sampler
 
 from eva_core.router.intent import IntentRouter
 from eva_core.services.llm import LLMService, get_llm_service
@@ -89,6 +98,14 @@ class SessionResponse(BaseModel):
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+async def on_presence_transition(event: dict[str, Any]) -> None:
+    """Journalise les arrivées et départs d'experts (table de présence)"""
+    if event.get("state") == "offline":
+        logger.warning(f"📴 Expert {event.get('agent')} hors ligne")
+    else:
+        logger.info(f"📶 Expert {event.get('agent')} en ligne")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -109,6 +126,7 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("🚀 Démarrage EVA Core...")
+    instrument_app(app, "core")
     settings = get_settings()
     logger.info(f"Environnement: {settings.environment}")
 
@@ -116,6 +134,8 @@ async def lifespan(app: FastAPI):
     try:
         await init_redis()
         logger.info("✅ Redis connecté")
+        # Reprise des drones encore publiés sous l'ancien format swarm:drone:<id>
+        await get_drone_registry().migrate_from_keys(DRONE_LEGACY_PREFIX)
     except Exception as e:
         logger.warning(f"⚠️ Redis non disponible: {e}")
 
@@ -139,20 +159,25 @@ async def lifespan(app: FastAPI):
     # System Monitor (Docker + Hardware)
     app.state.system_monitor = SystemMonitor()
     
-    # Telemetry
-    app.state.start_time = datetime.now()
-    app.state.request_count = 0
-    app.state.error_count = 0
-
     logger.info("✅ EVA Core prêt avec moteur de prompts Biblio_IA et lien MQTT")
 
     # Démarrage de l'orchestrateur de survie Phoenix
     asyncio.create_task(app.state.self_healing.start_monitoring())
 
+    # Présence des experts : le Core balaie la table et réagit aux transitions
+    presence = get_presence_table()
+    try:
+        await presence.on_transition(on_presence_transition)
+        presence.start_sweeper()
+    except Exception as e:
+        logger.warning(f"⚠️ Suivi de présence indisponible: {e}")
+
     yield
 
     # Shutdown
     logger.info("🛑 Arrêt EVA Core...")
+    await uninstrument_app(app)
+    await presence.close()
     redis_client = get_redis_client()
     await redis_client.disconnect()
 
@@ -234,8 +259,9 @@ async def chat(request: ChatRequest) -> ChatResponse:
     2. **Classification** : Le Router analyse l'intention (Intent) du message.
     3. **Routage** :
         - Si l'intent concerne le CORE (Chat général), le LLM répond directement.
-        - Si l'intent est spécialisé (ex: Trading), le message est publié sur Redis
-          pour l'Expert concerné (ex: Banker).
+        - Si l'intent est spécialisé (ex: Trading), la requête est envoyée sur Redis
+          à l'Expert concerné (ex: Banker), dont la réponse est attendue un temps
+          borné (accusé de consultation sinon).
     4. **Mémorisation** : Le message utilisateur est archivé dans la mémoire vectorielle.
 
     Args:
@@ -250,72 +276,20 @@ async def chat(request: ChatRequest) -> ChatResponse:
     session_id = request.session_id or uuid4()
     
     try:
-        # Créer le message utilisateur
-        user_message = ChatMessage(
-            session_id=session_id,
-            role=MessageRole.USER,
-            content=request.message,
-        )
-
-        # Classification de l'intent (Via Strategy Orchestrator pour plus de "profondeur")
-        strategy: StrategyOrchestrator = app.state.strategy_orchestrator
-        intent = await strategy.route_request(request.message)
-        logger.info(f"Intent orchestré: {intent.intent_type} -> {intent.target_expert} (confiance: {intent.confidence:.2f})")
+        user_message, intent = await _classify(request, session_id)
 
         # Générer la réponse selon l'intent
         llm_service: LLMService = app.state.llm_service
         
         if intent.target_expert == "core":
             # Le Core répond directement
-            prompt_master: PromptMaster = app.state.prompt_master
-            method = "react" if intent.confidence < 0.8 else "costar"
-            wrapped_message = prompt_master.wrap_with_method(request.message, method=method)
-            expert_injector = prompt_master.get_expert_injector("core")
-            
+            messages, system_prompt = _core_prompt(request.message, session_id, intent)
             response_text = await llm_service.generate_response(
-                messages=[ChatMessage(
-                    session_id=session_id,
-                    role=MessageRole.USER,
-                    content=wrapped_message
-                )],
-                system_prompt=f"{expert_injector}\nTu es EVA, une IA assistante personnelle intelligente.",
-            )
-        elif intent.target_expert == "all":
-            # SWARM MODE: Parallélisation sur tous les agents concernés
-            redis_client = get_redis_client()
-            await redis_client.broadcast_to_swarm(
-                source="core",
-                action=intent.intent_type.value,
-                payload={
-                    "session_id": str(session_id),
-                    "message": request.message,
-                    "entities": intent.entities,
-                    "mode": "parallel"
-                },
+                messages=messages,
+                system_prompt=system_prompt,
             )
-            response_text = "Activation du Swarm Mode. Tous les experts concernés travaillent en parallèle..."
         else:
-            # Routage classique vers un expert unique
-            redis_client = get_redis_client()
-            payload = {
-                "session_id": str(session_id),
-                "message": request.message,
-                "entities": intent.entities,
-            }
-            await redis_client.send_to_agent(
-                source="core",
-                target=intent.target_expert,
-                action=intent.intent_type.value,
-                payload=payload,
-            )
-            
-            # Si l'expert est le Banker, on double l'envoi sur MQTT pour la fiabilité (Critical Path)
-            if intent.target_expert == "banker" and intent.intent_type.value in ["TRADE", "ORDER"]:
-                mqtt_client: EVAMQTTClient = app.state.mqtt
-                await mqtt_client.publish("eva/banker/requests/critical", payload, qos=2)
-                logger.info("🛡️ Critical Order mirrored on MQTT (QoS 2)")
-
-            response_text = f"Consultation de l'expert {intent.target_expert} lancée."
+            response_text = await _dispatch_to_experts(request, session_id, user_message, intent)
 
         # Sauvegarder en mémoire
         memory_service: MemoryService = app.state.memory_service
@@ -336,19 +310,222 @@ async def chat(request: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _classify(request: ChatRequest, session_id: UUID) -> tuple[ChatMessage, Intent]:
+    """Crée le message utilisateur et classifie son intent (Strategy Orchestrator)"""
+    user_message = ChatMessage(
+        session_id=session_id,
+        role=MessageRole.USER,
+        content=request.message,
+    )
+
+    # Classification de l'intent (Via Strategy Orchestrator pour plus de "profondeur")
+    strategy: StrategyOrchestrator = app.state.strategy_orchestrator
+    intent = await strategy.route_request(request.message)
+    logger.info(f"Intent orchestré: {intent.intent_type} -> {intent.target_expert} (confiance: {intent.confidence:.2f})")
+    return user_message, intent
+
+
+def _core_prompt(message: str, session_id: UUID, intent: Intent) -> tuple[list[ChatMessage], str]:
+    """Messages et prompt système quand le Core répond lui-même"""
+    prompt_master: PromptMaster = app.state.prompt_master
+    method = "react" if intent.confidence < 0.8 else "costar"
+    wrapped_message = prompt_master.wrap_with_method(message, method=method)
+    expert_injector = prompt_master.get_expert_injector("core")
+    messages = [ChatMessage(
+        session_id=session_id,
+        role=MessageRole.USER,
+        content=wrapped_message
+    )]
+    return messages, f"{expert_injector}\nTu es EVA, une IA assistante personnelle intelligente."
+
+
+async def _dispatch_to_experts(
+    request: ChatRequest, session_id: UUID, user_message: ChatMessage, intent: Intent
+) -> str:
+    """
+    Transmet la demande à l'expert (ou au Swarm) et retourne le texte pour l'utilisateur.
+
+    Si l'expert sert l'action en request/reply (`handle_requests`), sa réponse
+    (`message`) est renvoyée telle quelle, ou l'accusé de consultation sans
+    réponse dans `chat_expert_timeout_seconds` (expert hors ligne). Sinon la
+    demande lui est simplement envoyée et l'accusé renvoyé sans attendre.
+    """
+    redis_client = get_redis_client()
+    if intent.target_expert == "all":
+        # SWARM MODE: Parallélisation sur tous les agents concernés
+        await redis_client.broadcast_to_swarm(
+            source="core",
+            action=intent.intent_type.value,
+            payload={
+                "session_id": str(session_id),
+                "message": request.message,
+                "entities": intent.entities,
+                "mode": "parallel"
+            },
+        )
+        return "Activation du Swarm Mode. Tous les experts concernés travaillent en parallèle..."
+
+    # Routage classique vers un expert unique
+    payload = {
+        "session_id": str(session_id),
+        "message": request.message,
+        "entities": intent.entities,
+    }
+    # Ordres de trading : voie CRITICAL côté Banker, devant la télémétrie
+    is_order = intent.target_expert == "banker" and intent.intent_type == IntentType.TRADING_ORDER
+    priority = MessagePriority.CRITICAL if is_order else MessagePriority.NORMAL
+    request_task = None
+    if await redis_client.serves(intent.target_expert, intent.intent_type.value):
+        request_task = asyncio.create_task(
+            redis_client.request(
+                target=intent.target_expert,
+                action=intent.intent_type.value,
+                payload=payload,
+                timeout=app.state.settings.chat_expert_timeout_seconds,
+                priority=priority,
+            )
+        )
+    else:
+        # Aucun handler RPC pour cette action : une réponse n'arriverait jamais
+        await redis_client.send_to_agent(
+            source="core",
+            target=intent.target_expert,
+            action=intent.intent_type.value,
+            payload=payload,
+            priority=priority,
+        )
+
+    # Si l'expert est le Banker, on double l'envoi sur MQTT pour la fiabilité (Critical Path)
+    if is_order:
+        mqtt_client: EVAMQTTClient = app.state.mqtt
+        # Sans broker : outbox, rejouée à la reconnexion tant que l'ordre n'a pas expiré
+        await mqtt_client.publish(
+            "eva/banker/requests/critical",
+            payload,
+            qos=2,
+            ttl_seconds=30,
+            message_id=str(user_message.id),
+        )
+        logger.info("🛡️ Critical Order mirrored on MQTT (QoS 2)")
+
+    acknowledgement = f"Consultation de l'expert {intent.target_expert} lancée."
+    if request_task is None:
+        return acknowledgement
+    try:
+        reply = await request_task
+    except TimeoutError:
+        logger.info(f"Pas de réponse de {intent.target_expert} à temps, accusé renvoyé")
+        return acknowledgement
+    except AgentRequestError as e:
+        logger.warning(f"Erreur de l'expert {intent.target_expert}: {e}")
+        return acknowledgement
+    return reply.get("message") or acknowledgement
+
+
+async def _chat_events(request: ChatRequest) -> AsyncIterator[dict[str, Any]]:
+    """
+    Déroulé d'un échange en flux : `meta` (session, intent), des `token`
+    au fil de la génération (réponse du Core), puis `done` avec le texte
+    complet ; `error` en cas d'échec.
+    """
+    session_id = request.session_id or uuid4()
+    try:
+        user_message, intent = await _classify(request, session_id)
+        yield {"type": "meta", "session_id": str(session_id), "intent": intent.model_dump(mode="json")}
+
+        if intent.target_expert == "core":
+            llm_service: LLMService = app.state.llm_service
+            messages, system_prompt = _core_prompt(request.message, session_id, intent)
+            parts = []
+            async for chunk in llm_service.stream_response(messages, system_prompt=system_prompt):
+                parts.append(chunk)
+                yield {"type": "token", "text": chunk}
+            response_text = "".join(parts)
+        else:
+            response_text = await _dispatch_to_experts(request, session_id, user_message, intent)
+            yield {"type": "token", "text": response_text}
+
+        memory_service: MemoryService = app.state.memory_service
+        await memory_service.store_message(user_message)
+        yield {
+            "type": "done",
+            "message": response_text,
+            "metadata": {"expert": intent.target_expert, "confidence": intent.confidence},
+        }
+    except Exception as e:
+        logger.exception(f"Erreur chat (flux): {e}")
+        yield {"type": "error", "detail": str(e)}
+
+
+@app.post("/chat/stream", tags=["Chat"])
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Variante de /chat en Server-Sent Events : les tokens arrivent dès leur
+    génération au lieu d'attendre la réponse complète.
+
+    Événements : `meta`, `token` (répété), puis `done` ou `error` ; chaque
+    `data` est un objet JSON.
+    """
+    async def sse() -> AsyncIterator[str]:
+        async for event in _chat_events(request):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        # Pas de mise en tampon par un reverse proxy (nginx)
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/chat/ws")
+async def chat_websocket(websocket: WebSocket) -> None:
+    """
+    Variante WebSocket de /chat/stream : chaque message reçu
+    ({"message": ..., "session_id": ...}) produit la même suite
+    d'événements JSON `meta` / `token` / `done`.
+
+    Un message invalide (JSON malformé, autre chose qu'un objet) reçoit un
+    événement `error`. La socket reste lue pendant la génération : une
+    déconnexion du client annule la réponse en cours.
+    """
+    async def reply(request: ChatRequest) -> None:
+        async for event in _chat_events(request):
+            await websocket.send_json(event)
+
+    await websocket.accept()
+    receive = asyncio.create_task(websocket.receive_text())
+    replying: asyncio.Task | None = None
+    try:
+        while True:
+            raw = await receive
+            receive = asyncio.create_task(websocket.receive_text())
+            try:
+                request = ChatRequest.model_validate_json(raw)
+            except ValidationError as e:
+                detail = e.errors(include_url=False, include_context=False)
+                await websocket.send_json({"type": "error", "detail": detail})
+                continue
+            replying = asyncio.create_task(reply(request))
+            await asyncio.wait({replying, receive}, return_when=asyncio.FIRST_COMPLETED)
+            if receive.done() and receive.exception() is not None:
+                await receive  # déconnexion : la réponse est annulée ci-dessous
+            # Message suivant déjà reçu : traité une fois la réponse terminée
+            await replying
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in (receive, replying):
+            if task is not None and not task.done():
+                task.cancel()
+
+
 @app.get("/swarm/drones", tags=["Swarm"])
 async def get_active_drones() -> list[dict]:
     """
     Récupère la liste des drones autonomes actifs dans la ruche.
     """
-    redis_client = get_redis_client()
-    keys = await redis_client._client.keys("swarm:drone:*")
-    drones = []
-    for key in keys:
-        drone_data = await redis_client.cache_get(key)
-        if drone_data:
-            drones.append(drone_data)
-    return drones
+    return await get_drone_registry().list_all()
 
 
 # Note: The old self_healing_orchestrator is replaced by SelfHealingService
@@ -387,29 +564,25 @@ async def search_memory(
 async def agents_status() -> dict[str, Any]:
     """
     Récupère l'état de connexion de tous les Experts du Conseil via Redis.
+
+    Une seule lecture de la table de présence (un aller-retour Redis).
     """
-    redis_client = get_redis_client()
-    now = datetime.now().timestamp()
-    
+    presence = await get_presence_table().snapshot()
+
     # On définit les agents attendus (The Hive Council)
     agents = ["banker", "sentinel", "shadow", "wraith", "keeper", "substrate", "accountant"]
     status_report = {
         "core": {"status": "online", "version": "0.1.0", "uptime": "active"}
     }
-    
+
     for agent in agents:
-        # Le Banker publie sur eva.banker.heartbeat
-        # On peut aussi vérifier des clés de statut persistantes
-        heartbeat = await redis_client.cache_get(f"eva.{agent}.status")
-        if not heartbeat:
-            # Fallback sur la vérification du channel PubSub (pour le banker spécifique à son heartbeat 300ms)
+        entry = presence.get(agent)
+        if entry is None or entry["status"] == "offline":
             status_report[agent] = {"status": "offline"}
+        elif entry["status"] == "online":
+            status_report[agent] = {**entry["payload"], "status": "online"}
         else:
-            last_seen = heartbeat.get("ts", 0)
-            if now - last_seen < 30: # 30 secondes de grâce
-                status_report[agent] = {"status": "online", **heartbeat}
-            else:
-                status_report[agent] = {"status": "stale", "last_seen": last_seen}
+            status_report[agent] = {"status": "stale", "last_seen": entry["last_seen"]}
 
     return status_report
 
@@ -418,41 +591,30 @@ async def agents_status() -> dict[str, Any]:
 async def trading_status() -> dict[str, Any]:
     """
     Agrège les données de trading provenant de l'expert Banker.
+
+    Une seule requête sur le bus Redis (request/reply) au lieu de trois
+    appels HTTP authentifiés.
     """
-    import httpx
-    settings: Settings = app.state.settings
-    banker_url = f"http://localhost:{settings.banker_api_port}"
-    
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            # On récupère tout en parallèle avec les headers de sécurité internes
-            internal_headers = get_internal_headers("core")
-            responses = await asyncio.gather(
-                client.get(f"{banker_url}/account", headers=internal_headers),
-                client.get(f"{banker_url}/positions", headers=internal_headers),
-                client.get(f"{banker_url}/risk/status", headers=internal_headers),
-                return_exceptions=True
-            )
-            
-            # Parsing des résultats
-            account = responses[0].json() if not isinstance(responses[0], Exception) and responses[0].status_code == 200 else {}
-            positions = responses[1].json() if not isinstance(responses[1], Exception) and responses[1].status_code == 200 else []
-            risk = responses[2].json() if not isinstance(responses[2], Exception) and responses[2].status_code == 200 else {}
-            
-            return {
-                "account": account,
-                "positions": positions,
-                "risk": risk,
-                "banker": {"status": "online" if not isinstance(responses[0], Exception) else "offline"}
-            }
-        except Exception as e:
-            logger.error(f"Erreur proxy Banker: {e}")
-            return {
-                "account": {},
-                "positions": [],
-                "risk": {},
-                "banker": {"status": "offline", "error": str(e)}
-            }
+    redis_client = get_redis_client()
+    try:
+        status = await redis_client.request(
+            "banker", "TRADING_STATUS", timeout=5.0, priority=MessagePriority.CRITICAL
+        )
+        return {
+            "account": status.get("account", {}),
+            "positions": status.get("positions", []),
+            "risk": status.get("risk", {}),
+            "banker": {"status": "online"},
+        }
+    except Exception as e:
+        # TimeoutError : Banker hors ligne ; AgentRequestError : erreur côté Banker
+        logger.error(f"Erreur requête Banker: {e!r}")
+        return {
+            "account": {},
+            "positions": [],
+            "risk": {},
+            "banker": {"status": "offline", "error": repr(e)}
+        }
 
 
 @app.get("/system/status", tags=["Système"])
@@ -498,6 +660,12 @@ async def get_system_metrics_direct() -> dict[str, Any]:
     return await monitor.get_system_metrics()
 
 
+@app.get("/system/history", tags=["Monitoring"])
+async def get_system_history(seconds: float | None = None) -> list[dict[str, Any]]:
+    """Historique court des instantanés système (échantillonneur partagé)"""
+    return get_system_sampler().history(seconds)
+
+
 @app.get("/docker/containers", tags=["Monitoring"])
 async def get_docker_containers() -> list[dict[str, Any]]:
     """
@@ -509,16 +677,14 @@ async def get_docker_containers() -> list[dict[str, Any]]:
 
 @app.get("/telemetry", tags=["Système"])
 async def get_telemetry():
-    """Retourne les métriques de télémétrie du Core"""
-    start_time: datetime = app.state.start_time
-    uptime = (datetime.now() - start_time).total_seconds()
-    return {
-        "service_name": "core",
-        "uptime_seconds": int(uptime),
-        "requests_total": app.state.request_count,
-        "errors_total": app.state.error_count,
-        "timestamp": datetime.now().isoformat(),
-    }
+    """Retourne les métriques de télémétrie du Core (requêtes, latences par route, sources)"""
+    return app.state.telemetry.get_metrics()
+
+
+@app.get("/circuit-breakers", tags=["Système"])
+async def list_circuit_breakers():
+    """État de tous les circuit breakers du processus (LLM, MT5, Qdrant...)"""
+    return get_circuit_breaker_registry().get_status()
 
 
 @app.get("/circuit-breaker/status", tags=["Système"])
@@ -0,0 +1,270 @@
+"""
+Routing Cache — Décisions de routage du Strategy Orchestrator
+═════════════════════════════════════════════════════════════
+
+Chaque /chat paie un aller-retour LLM dans `route_request` rien que pour
+choisir l'expert, y compris pour des messages répétés ("statut positions",
+"quel est le drawdown"). Ce cache conserve l'Intent décidé :
+
+  - clé : texte normalisé (casse, accents, ponctuation et espaces ignorés)
+    préfixé d'un espace de noms (empreinte du prompt de routage : changer
+    le manifeste des experts invalide les anciennes décisions)
+  - niveau local : LRU borné à TTL
+  - niveau partagé optionnel : Redis (`routing:{ns}:{hash}`), pour que les
+    replicas du Core profitent des décisions des autres
+  - misses concurrents sur la même clé coalescés en un seul appel LLM
+
+Règles de contournement (configurables) :
+
+  - à la lecture : message trop long, ou correspondant à un motif de
+    `bypass_patterns` (par défaut tout chiffre : lots, prix, quantités)
+  - à l'écriture : confiance sous `min_confidence`, entités extraites
+    (`skip_entities`) ou type d'intent listé dans `bypass_intents`
+    → les entités de trading sont toujours ré-extraites par le LLM.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable
+
+from shared import Intent, IntentType
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "routing:"
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    """Minuscules, sans accents ni ponctuation, espaces réduits"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", stripped).strip()
+
+
+class RoutingCache:
+    """
+    Cache à deux niveaux des Intent décidés par le routage LLM.
+
+    Args:
+        ttl_seconds: Durée de vie d'une décision (local et Redis).
+        max_entries: Taille du niveau local (éviction LRU au-delà).
+        min_confidence: Confiance minimale pour mettre une décision en cache.
+        skip_entities: Ne jamais cacher une décision portant des entités.
+        bypass_intents: Types d'intent jamais mis en cache.
+        bypass_patterns: Regex (sur le texte normalisé) court-circuitant le cache.
+        max_chars: Longueur normalisée au-delà de laquelle le cache est ignoré.
+        namespace: Préfixe des clés (version du prompt de routage).
+        redis: Client Redis (`cache_get`/`cache_set`) du niveau partagé, ou None.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 2048,
+        min_confidence: float = 0.7,
+        skip_entities: bool = True,
+        bypass_intents: Iterable[IntentType | str] = (IntentType.TRADING_ORDER,),
+        bypass_patterns: Iterable[str] = (r"\d",),
+        max_chars: int = 200,
+        namespace: str = "",
+        redis: Any = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.min_confidence = min_confidence
+        self.skip_entities = skip_entities
+        self.bypass_intents = frozenset(IntentType(i) for i in bypass_intents)
+        self.bypass_patterns = [re.compile(p) for p in bypass_patterns]
+        self.max_chars = max_chars
+        self.namespace = namespace
+        self.redis = redis
+        self._entries: "OrderedDict[str, tuple[float, Intent]]" = OrderedDict()
+        self._inflight: dict[str, "asyncio.Future[Intent]"] = {}
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.coalesced = 0
+        self.stored = 0
+        self.rejected = 0
+        self.evictions = 0
+        self.shared_errors = 0
+
+    @classmethod
+    def from_settings(cls, namespace: str = "", redis: Any = None) -> "RoutingCache":
+        """Construit le cache depuis les settings (`routing_cache_*`)"""
+        from shared.config import get_settings
+
+        settings = get_settings()
+        if redis is None and settings.routing_cache_shared:
+            from shared.redis_client import get_redis_client
+
+            redis = get_redis_client()
+        return cls(
+            ttl_seconds=settings.routing_cache_ttl_seconds,
+            max_entries=settings.routing_cache_max_entries,
+            min_confidence=settings.routing_cache_min_confidence,
+            skip_entities=settings.routing_cache_skip_entities,
+            bypass_intents=settings.routing_cache_bypass_intents,
+            bypass_patterns=settings.routing_cache_bypass_patterns,
+            max_chars=settings.routing_cache_max_chars,
+            namespace=namespace,
+            redis=redis,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    # ─── Règles ───────────────────────────────────────────────────────────
+
+    def key_for(self, message: str) -> str | None:
+        """Clé de cache du message, ou None s'il doit toujours passer par le LLM"""
+        if not self.enabled:
+            return None
+        text = normalize(message)
+        if not text or len(text) > self.max_chars:
+            return None
+        if any(p.search(text) for p in self.bypass_patterns):
+            return None
+        digest = hashlib.sha256(text.encode()).hexdigest()[:32]
+        return f"{REDIS_KEY_PREFIX}{self.namespace}:{digest}"
+
+    def admits(self, intent: Intent) -> bool:
+        """Vrai si la décision peut être réutilisée pour un message identique"""
+        if intent.confidence < self.min_confidence:
+            return False
+        if self.skip_entities and intent.entities:
+            return False
+        return intent.intent_type not in self.bypass_intents
+
+    # ─── Lecture / écriture ───────────────────────────────────────────────
+
+    async def get(self, key: str) -> Intent | None:
+        """Intent en cache (local puis Redis), ou None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, intent = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                # Copie : un appelant qui modifie l'Intent ne corrompt pas le cache
+                return intent.model_copy(deep=True)
+            del self._entries[key]
+
+        if self.redis is not None:
+            try:
+                data = await self.redis.cache_get(key)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.debug(f"Routing cache Redis indisponible: {e}")
+                data = None
+            if data:
+                remaining = self.ttl_seconds - (time.time() - data.pop("stored_at", 0.0))
+                if remaining > 0:
+                    intent = Intent.model_validate(data)
+                    self._store_local(key, intent, remaining)
+                    self.shared_hits += 1
+                    return intent.model_copy(deep=True)
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, intent: Intent) -> bool:
+        """Met la décision en cache si les règles l'admettent"""
+        if not self.admits(intent):
+            self.rejected += 1
+            return False
+        cached = intent.model_copy(update={"raw_text": ""}, deep=True)
+        self._store_local(key, cached, self.ttl_seconds)
+        self.stored += 1
+        if self.redis is not None:
+            try:
+                await self.redis.cache_set(
+                    key,
+                    {**cached.model_dump(mode="json"), "stored_at": time.time()},
+                    ttl_seconds=max(int(self.ttl_seconds), 1),
+                )
+            except Exception as e:
+                self.shared_errors += 1
+                logger.debug(f"Routing cache Redis indisponible: {e}")
+        return True
+
+    def _store_local(self, key: str, intent: Intent, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, intent)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def resolve(self, message: str, decide: Callable[[], Awaitable[Intent]]) -> Intent:
+        """
+        Intent du message : depuis le cache, sinon via `decide()` (appel LLM).
+
+        Les appels concurrents pour une même clé attendent la même décision.
+        """
+        key = self.key_for(message)
+        if key is None:
+            self.bypassed += 1
+            return await decide()
+
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            # asyncio.wait n'annule pas la décision partagée si cet appelant l'est
+            await asyncio.wait({pending})
+            if pending.cancelled():
+                return await decide()
+            return pending.result().model_copy(deep=True)
+
+        future: "asyncio.Future[Intent]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            intent = await decide()
+            await self.put(key, intent)
+            future.set_result(intent)
+            return intent
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Marquée récupérée si personne n'attendait
+            raise
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "shared": self.redis is not None,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "coalesced": self.coalesced,
+            "stored": self.stored,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+            "shared_errors": self.shared_errors,
+        }
@@ -9,17 +9,11 @@ import platform
 import time
 from typing import Any
 
+from shared.system_sampler import PSUTIL_AVAILABLE, get_system_sampler
+
 logger = logging.getLogger(__name__)
 
 # ═══ Conditional Imports ═══
-try:
-    import psutil
-
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    logger.warning("⚠️ psutil not available — system metrics will be simulated")
-
 try:
     import docker as docker_sdk
 
@@ -69,10 +63,6 @@ class SystemMonitor:
     def __init__(self):
         self._docker_client = None
         self._boot_time = time.time()
-        self._last_net_io = None
-        self._last_net_time = 0.0
-        self._last_disk_io = None
-        self._last_disk_time = 0.0
         self._init_docker()
 
     def _init_docker(self):
@@ -94,99 +84,47 @@ class SystemMonitor:
             return self._simulated_metrics()
 
         try:
-            # CPU
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            cpu_freq = psutil.cpu_freq()
-            cpu_count = psutil.cpu_count(logical=True) or 4
-
+            # Instantané de l'échantillonneur partagé : aucun appel psutil
+            # bloquant sur le chemin de la requête
+            snap = get_system_sampler().latest()
+            if "cpu" not in snap:
+                # Aucun échantillon encore (échantillonneur pas démarré)
+                return self._simulated_metrics()
+            cpu, mem, disk, net = snap["cpu"], snap["memory"], snap["disk"], snap["network"]
+            cpu_count = cpu["count"] or 4
             cpu_model = platform.processor() or f"{cpu_count}-Core Processor"
 
-            # CPU temperature
-            cpu_temp = 0.0
-            try:
-                temps = psutil.sensors_temperatures()
-                if temps:
-                    for _, entries in temps.items():
-                        if entries:
-                            cpu_temp = entries[0].current
-                            break
-            except (AttributeError, Exception):
-                pass
-
-            # Memory
-            mem = psutil.virtual_memory()
-
-            # Disk
-            disk = psutil.disk_usage("/")
-            disk_read_speed = 0.0
-            disk_write_speed = 0.0
-            try:
-                disk_io = psutil.disk_io_counters()
-                now = time.time()
-                if self._last_disk_io and (now - self._last_disk_time) > 0:
-                    dt = now - self._last_disk_time
-                    disk_read_speed = (
-                        disk_io.read_bytes - self._last_disk_io.read_bytes
-                    ) / dt / (1024 * 1024)
-                    disk_write_speed = (
-                        disk_io.write_bytes - self._last_disk_io.write_bytes
-                    ) / dt / (1024 * 1024)
-                self._last_disk_io = disk_io
-                self._last_disk_time = now
-            except Exception:
-                pass
-
-            # Network (with delta for speed)
-            net_io = psutil.net_io_counters()
-            rx_speed = 0.0
-            tx_speed = 0.0
-            now = time.time()
-            if self._last_net_io and (now - self._last_net_time) > 0:
-                dt = now - self._last_net_time
-                rx_speed = (
-                    net_io.bytes_recv - self._last_net_io.bytes_recv
-                ) / dt / (1024 * 1024)
-                tx_speed = (
-                    net_io.bytes_sent - self._last_net_io.bytes_sent
-                ) / dt / (1024 * 1024)
-            self._last_net_io = net_io
-            self._last_net_time = now
-
-            # Uptime
-            boot_time = psutil.boot_time()
-            uptime = time.time() - boot_time
-
             # GPU
             gpu_info = await self._get_gpu_info()
 
             return {
                 "cpu": {
-                    "usage": round(cpu_percent, 1),
+                    "usage": round(cpu["percent"], 1),
                     "cores": cpu_count,
                     "model": cpu_model[:50],
-                    "temp": round(cpu_temp, 0),
-                    "freq": round(cpu_freq.current, 0) if cpu_freq else 0,
+                    "temp": round(cpu.get("temp_c", 0.0), 0),
+                    "freq": cpu.get("freq_mhz", 0),
                 },
                 "memory": {
-                    "used": round(mem.used / (1024**3), 1),
-                    "total": round(mem.total / (1024**3), 1),
-                    "percent": round(mem.percent, 1),
+                    "used": round(mem["used_mb"] / 1024, 1),
+                    "total": round(mem["total_mb"] / 1024, 1),
+                    "percent": round(mem["percent"], 1),
                 },
                 "gpu": gpu_info,
                 "disk": {
-                    "used": round(disk.used / (1024**3), 0),
-                    "total": round(disk.total / (1024**3), 0),
-                    "percent": round(disk.percent, 1),
-                    "read_speed": round(max(disk_read_speed, 0), 1),
-                    "write_speed": round(max(disk_write_speed, 0), 1),
+                    "used": round(disk.get("used_gb", 0), 0),
+                    "total": round(disk.get("total_gb", 0), 0),
+                    "percent": round(disk.get("percent", 0.0), 1),
+                    "read_speed": round(disk.get("read_bytes_per_s", 0) / (1024 * 1024), 1),
+                    "write_speed": round(disk.get("write_bytes_per_s", 0) / (1024 * 1024), 1),
                 },
                 "network": {
-                    "rx_bytes": net_io.bytes_recv,
-                    "tx_bytes": net_io.bytes_sent,
-                    "rx_speed": round(max(rx_speed, 0), 1),
-                    "tx_speed": round(max(tx_speed, 0), 1),
+                    "rx_bytes": net["rx_bytes"],
+                    "tx_bytes": net["tx_bytes"],
+                    "rx_speed": round(net.get("rx_bytes_per_s", 0) / (1024 * 1024), 1),
+                    "tx_speed": round(net.get("tx_bytes_per_s", 0) / (1024 * 1024), 1),
                 },
-                "uptime": round(uptime),
+                "uptime": snap["uptime_seconds"],
                 "platform": platform.system(),
                 "hostname": platform.node(),
                 "real_data": True,
@@ -3,15 +3,25 @@ Service LLM - Client pour vLLM / Ollama
 Gère les appels au modèle de langage pour la génération de réponses
 """
 
+import asyncio
+import json
 import logging
+import time
 from functools import lru_cache
+from typing import Any, AsyncIterator
 
 import httpx
 
 from shared import ChatMessage, get_settings
+from shared.bulkhead import BulkheadFullError, get_bulkhead
+from shared.circuit_breaker import CircuitBreakerOpenError, get_circuit_breaker
+from shared.telemetry import get_telemetry
+from shared.tracing import SpanKind, start_span, traced
 
 logger = logging.getLogger(__name__)
 
+_END_OF_STREAM = object()
+
 
 class LLMService:
     """
@@ -35,8 +45,18 @@ class LLMService:
         self.use_ollama = use_ollama
         self.base_url = f"http://{host}:{port}"
         self._client = httpx.AsyncClient(timeout=120.0)
+        # LLM indisponible : réponse mock immédiate au lieu d'attendre le timeout
+        self._breaker = get_circuit_breaker(
+            "llm", failure_threshold=3, recovery_timeout=30, slow_call_duration=60.0
+        )
+        # LLM saturé : générations simultanées bornées, file courte
+        self._bulkhead = get_bulkhead(
+            "llm", initial_limit=4, max_limit=16, max_queue=32,
+            queue_timeout=10.0, latency_target=30.0,
+        )
         logger.info(f"LLMService initialisé: {self.base_url} (model={model})")
 
+    @traced("llm.generate", SpanKind.CLIENT)
     async def generate_response(
         self,
         messages: list[ChatMessage],
@@ -47,15 +67,18 @@ class LLMService:
         """
         Génère une réponse à partir d'une liste de messages.
         """
+        generate = self._generate_ollama if self.use_ollama else self._generate_vllm
         try:
-            if self.use_ollama:
-                return await self._generate_ollama(
-                    messages, system_prompt, max_tokens, temperature
-                )
-            else:
-                return await self._generate_vllm(
-                    messages, system_prompt, max_tokens, temperature
-                )
+            return await self._breaker.execute(
+                self._bulkhead.execute,
+                generate, messages, system_prompt, max_tokens, temperature,
+            )
+        except CircuitBreakerOpenError:
+            logger.warning("LLM en échec répété (circuit ouvert) - mode mock")
+            return self._mock_response(messages)
+        except BulkheadFullError:
+            logger.warning("LLM saturé (file d'attente pleine) - mode mock")
+            return self._mock_response(messages)
         except httpx.ConnectError:
             logger.warning("LLM non disponible - mode mock")
             return self._mock_response(messages)
@@ -63,15 +86,74 @@ class LLMService:
             logger.exception(f"Erreur LLM: {e}")
             return f"Désolé, j'ai rencontré une erreur: {str(e)}"
 
-    async def _generate_ollama(
+    async def stream_response(
         self,
         messages: list[ChatMessage],
-        system_prompt: str,
-        max_tokens: int,
-        temperature: float,
-    ) -> str:
-        """Génération via Ollama API"""
-        # Construire le prompt
+        system_prompt: str = "",
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en flux, morceau par morceau (NDJSON Ollama ou
+        SSE vLLM).
+
+        La génération tourne dans une tâche qui passe par le même circuit
+        breaker et le même bulkhead que `generate_response` (le slot est
+        tenu jusqu'au dernier token). Tous deux ne jugent que le temps
+        jusqu'au premier token : un long flux sain n'est un appel lent ni
+        pour l'AIMD ni pour le breaker. Les morceaux arrivent par une file.
+        Mêmes replis : réponse mock si le LLM est indisponible ou saturé.
+        Enregistre le temps jusqu'au premier token dans la télémétrie.
+        """
+        stream = self._stream_ollama if self.use_ollama else self._stream_vllm
+        backend = "ollama" if self.use_ollama else "vllm"
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run() -> None:
+            try:
+                async with self._breaker.call() as call, self._bulkhead.slot() as slot:
+                    with start_span("llm.stream", SpanKind.CLIENT, attributes={"llm.model": self.model}):
+                        async for chunk in stream(messages, system_prompt, max_tokens, temperature):
+                            call.responded()
+                            slot.responded()
+                            queue.put_nowait(chunk)
+            finally:
+                queue.put_nowait(_END_OF_STREAM)
+
+        telemetry = get_telemetry()
+        start = time.perf_counter()
+        chunks = 0
+        task = asyncio.create_task(run(), name="llm-stream")
+        try:
+            while (chunk := await queue.get()) is not _END_OF_STREAM:
+                if chunks == 0:
+                    telemetry.observe(
+                        "hive_llm_time_to_first_token_seconds", time.perf_counter() - start, backend=backend
+                    )
+                chunks += 1
+                yield chunk
+            # Le marqueur de fin précède de peu la fin de la tâche
+            await asyncio.wait({task})
+            error = task.exception()
+        finally:
+            # Client parti en cours de route : la génération est abandonnée
+            if not task.done():
+                task.cancel()
+
+        if error is None:
+            telemetry.observe("hive_llm_stream_duration_seconds", time.perf_counter() - start, backend=backend)
+            telemetry.inc("hive_llm_stream_chunks_total", chunks, backend=backend)
+            return
+        if chunks == 0 and isinstance(error, (CircuitBreakerOpenError, BulkheadFullError, httpx.ConnectError)):
+            logger.warning(f"LLM indisponible ou saturé ({type(error).__name__}) - mode mock")
+            yield self._mock_response(messages)
+            return
+        logger.error(f"Erreur LLM (flux): {error!r}")
+        yield f"Désolé, j'ai rencontré une erreur: {str(error)}"
+
+    @staticmethod
+    def _ollama_prompt(messages: list[ChatMessage], system_prompt: str) -> str:
+        """Prompt texte unique de l'API /api/generate d'Ollama"""
         prompt_parts = []
         if system_prompt:
             prompt_parts.append(f"System: {system_prompt}\n")
@@ -81,19 +163,53 @@ class LLMService:
             prompt_parts.append(f"{role}: {msg.content}\n")
 
         prompt_parts.append("Assistant: ")
-        prompt = "".join(prompt_parts)
+        return "".join(prompt_parts)
+
+    def _ollama_request(
+        self, messages: list[ChatMessage], system_prompt: str, max_tokens: int, temperature: float, stream: bool
+    ) -> dict[str, Any]:
+        return {
+            "model": self.model,
+            "prompt": self._ollama_prompt(messages, system_prompt),
+            "stream": stream,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+            },
+        }
+
+    def _vllm_request(
+        self, messages: list[ChatMessage], system_prompt: str, max_tokens: int, temperature: float, stream: bool
+    ) -> dict[str, Any]:
+        api_messages = []
+        if system_prompt:
+            api_messages.append({"role": "system", "content": system_prompt})
+
+        for msg in messages:
+            api_messages.append({
+                "role": msg.role.value,
+                "content": msg.content,
+            })
+
+        return {
+            "model": self.model,
+            "messages": api_messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": stream,
+        }
 
+    async def _generate_ollama(
+        self,
+        messages: list[ChatMessage],
+        system_prompt: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> str:
+        """Génération via Ollama API"""
         response = await self._client.post(
             f"{self.base_url}/api/generate",
-            json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                },
-            },
+            json=self._ollama_request(messages, system_prompt, max_tokens, temperature, stream=False),
         )
         response.raise_for_status()
         data = response.json()
@@ -107,29 +223,64 @@ class LLMService:
         temperature: float,
     ) -> str:
         """Génération via vLLM (API OpenAI-compatible)"""
-        api_messages = []
-        if system_prompt:
-            api_messages.append({"role": "system", "content": system_prompt})
-
-        for msg in messages:
-            api_messages.append({
-                "role": msg.role.value,
-                "content": msg.content,
-            })
-
         response = await self._client.post(
             f"{self.base_url}/v1/chat/completions",
-            json={
-                "model": self.model,
-                "messages": api_messages,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-            },
+            json=self._vllm_request(messages, system_prompt, max_tokens, temperature, stream=False),
         )
         response.raise_for_status()
         data = response.json()
         return data["choices"][0]["message"]["content"]
 
+    async def _stream_ollama(
+        self,
+        messages: list[ChatMessage],
+        system_prompt: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> AsyncIterator[str]:
+        """Flux Ollama : une ligne JSON par morceau, `done` sur la dernière"""
+        async with self._client.stream(
+            "POST",
+            f"{self.base_url}/api/generate",
+            json=self._ollama_request(messages, system_prompt, max_tokens, temperature, stream=True),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(data["error"])
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    return
+
+    async def _stream_vllm(
+        self,
+        messages: list[ChatMessage],
+        system_prompt: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> AsyncIterator[str]:
+        """Flux vLLM : Server-Sent Events `data: {...}`, terminé par `data: [DONE]`"""
+        async with self._client.stream(
+            "POST",
+            f"{self.base_url}/v1/chat/completions",
+            json=self._vllm_request(messages, system_prompt, max_tokens, temperature, stream=True),
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                choices = json.loads(data).get("choices") or [{}]
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+
     def _mock_response(self, messages: list[ChatMessage]) -> str:
         """Réponse mock quand le LLM n'est pas disponible"""
         last_msg = messages[-1].content if messages else ""
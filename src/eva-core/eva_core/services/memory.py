@@ -12,6 +12,9 @@ from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import Distance, PointStruct, VectorParams
 
 from shared import ChatMessage, get_settings
+from shared.bulkhead import get_bulkhead
+from shared.circuit_breaker import get_circuit_breaker
+from shared.tracing import SpanKind, traced
 
 from eva_core.memory_layer import MemoryLayer
 
@@ -40,6 +43,14 @@ class MemoryService:
         self._client: AsyncQdrantClient | None = None
         self._embedding_dim = 768  # nomic-embed-text
         self.adaptive_memory = MemoryLayer()
+        # Qdrant indisponible : échec immédiat (les appelants ont un repli)
+        self._breaker = get_circuit_breaker(
+            "qdrant", failure_threshold=5, recovery_timeout=30, slow_call_duration=5.0
+        )
+        self._bulkhead = get_bulkhead(
+            "qdrant", initial_limit=16, max_limit=64, max_queue=128,
+            queue_timeout=2.0, latency_target=0.5,
+        )
         logger.info(f"MemoryService initialisé: {host}:{port}/{collection_name} + Mem0 Adaptive")
 
     async def _get_client(self) -> AsyncQdrantClient:
@@ -107,6 +118,7 @@ class MemoryService:
                 floats.append(0.0)
             return floats[: self._embedding_dim]
 
+    @traced("qdrant.upsert", SpanKind.CLIENT)
     async def store_message(self, message: ChatMessage) -> str:
         """Stocke un message dans la mémoire vectorielle"""
         try:
@@ -127,7 +139,9 @@ class MemoryService:
                 },
             )
 
-            await client.upsert(
+            await self._breaker.execute(
+                self._bulkhead.execute,
+                client.upsert,
                 collection_name=self.collection_name,
                 points=[point],
             )
@@ -146,6 +160,7 @@ class MemoryService:
         """Récupère les préférences apprises par Mem0"""
         return self.adaptive_memory.get_user_profile()
 
+    @traced("qdrant.search", SpanKind.CLIENT)
     async def search(
         self,
         query: str,
@@ -173,7 +188,9 @@ class MemoryService:
                     ]
                 )
 
-            results = await client.search(
+            results = await self._breaker.execute(
+                self._bulkhead.execute,
+                client.search,
                 collection_name=self.collection_name,
                 query_vector=query_vector,
                 query_filter=query_filter,
@@ -196,6 +213,7 @@ class MemoryService:
             logger.warning(f"Erreur recherche mémoire: {e}")
             return []
 
+    @traced("qdrant.scroll", SpanKind.CLIENT)
     async def get_session_history(
         self,
         session_id: UUID,
@@ -206,7 +224,9 @@ class MemoryService:
             client = await self._get_client()
             from qdrant_client.models import FieldCondition, Filter, MatchValue
 
-            results, _ = await client.scroll(
+            results, _ = await self._breaker.execute(
+                self._bulkhead.execute,
+                client.scroll,
                 collection_name=self.collection_name,
                 scroll_filter=Filter(
                     must=[
@@ -9,12 +9,13 @@ Gère les connexions WebSocket bidirectionnelles pour :
 """
 
 import asyncio
-import json
 import logging
 from typing import Any, Dict, List
 
 from fastapi import WebSocket
 
+from shared.codec import get_text_codec
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +25,8 @@ class WebSocketService:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
         self._lock = asyncio.Lock()
+        # Le navigateur attend du JSON texte : jamais de codec binaire ici
+        self._codec = get_text_codec()
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accepte et enregistre une nouvelle connexion WebSocket."""
@@ -48,7 +51,8 @@ class WebSocketService:
         if not self.active_connections:
             return
 
-        payload = json.dumps(message, default=str)
+        # Encodé une seule fois pour tous les clients
+        payload = self._codec.encode(message).decode()
         disconnected = []
 
         for conn in self.active_connections:
@@ -71,7 +75,7 @@ class WebSocketService:
     async def send_personal(self, websocket: WebSocket, message: Dict[str, Any]) -> None:
         """Envoie un message à un client spécifique."""
         try:
-            await websocket.send_text(json.dumps(message, default=str))
+            await websocket.send_text(self._codec.encode(message).decode())
         except Exception:
             await self.disconnect(websocket)
 
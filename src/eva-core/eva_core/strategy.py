@@ -3,9 +3,14 @@ Strategy Orchestrator — THE HIVE
 Deep logic for Mixture of Experts (MoE) routing and intention analysis.
 """
 
+import hashlib
 import logging
 from typing import Any
-from shared import Intent, IntentType
+from uuid import uuid4
+from shared import ChatMessage, Intent, IntentType, MessageRole
+from shared.telemetry import register_source
+from shared.tracing import traced
+from eva_core.router.cache import RoutingCache
 from eva_core.services.llm import get_llm_service
 
 logger = logging.getLogger(__name__)
@@ -28,11 +33,21 @@ class StrategyOrchestrator:
             "compliance": "Legal regulations, KYC/AML, and corporate documentation.",
             "substrate": "Energy management, circadian rhythm optimization, and lifestyle automation."
         }
+        # Décisions réutilisées pour les messages répétés (clés versionnées par le manifeste)
+        manifest_hash = hashlib.sha256(self._format_manifest().encode()).hexdigest()[:12]
+        self.routing_cache = RoutingCache.from_settings(namespace=manifest_hash)
+        register_source("routing_cache", self.routing_cache.get_stats)
 
+    @traced("strategy.route")
     async def route_request(self, message: str, history: list = None) -> Intent:
         """
         Analyzes the message and returns a high-confidence Intent with a target Expert.
+        Repeated messages are served from the routing cache (see eva_core.router.cache).
         """
+        return await self.routing_cache.resolve(message, lambda: self._decide(message))
+
+    async def _decide(self, message: str) -> Intent:
+        """Full LLM routing round-trip."""
         logger.info(f"Orchestrating strategy for: {message[:50]}...")
 
         # Construct a prompt for the 'Orchestrator' persona
@@ -46,7 +61,7 @@ class StrategyOrchestrator:
         Classify the user intent and choose the target expert.
         Return your decision in JSON format:
         {{
-            "intent_type": "TRADE|INTEL|RESEARCH|MANAGEMENT|CHAT",
+            "intent_type": "{"|".join(t.value for t in IntentType)}",
             "target_expert": "expert_name",
             "confidence": 0.0-1.0,
             "entities": {{"key": "value"}}
@@ -57,16 +72,16 @@ class StrategyOrchestrator:
             # We use the LLM to perform the high-level semantic routing
             # This is much more 'divine' than simple keyword matching
             response = await self.llm.generate_response(
-                messages=[{"role": "user", "content": message}],
+                messages=[ChatMessage(session_id=uuid4(), role=MessageRole.USER, content=message)],
                 system_prompt=system_prompt,
-                json_mode=True
+                temperature=0.0,
             )
             
             import json
             data = json.loads(response)
             
             return Intent(
-                intent_type=IntentType(data.get("intent_type", "CHAT")),
+                intent_type=IntentType(data.get("intent_type", IntentType.GENERAL_CHAT)),
                 target_expert=data.get("target_expert", "core"),
                 confidence=float(data.get("confidence", 0.5)),
                 entities=data.get("entities", {})
@@ -74,7 +89,7 @@ class StrategyOrchestrator:
             
         except Exception as e:
             logger.error(f"Strategy Orchestration failed: {e}. Falling back to default routing.")
-            return Intent(intent_type=IntentType.CHAT, target_expert="core", confidence=0.1)
+            return Intent(intent_type=IntentType.GENERAL_CHAT, target_expert="core", confidence=0.1)
 
     def _format_manifest(self) -> str:
         return "\n".join([f"- {name}: {desc}" for name, desc in self.experts_manifest.items()])
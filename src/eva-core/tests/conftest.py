@@ -0,0 +1,5 @@
+"""
+Fixtures des tests du Core : RedisClient branché sur fakeredis.
+"""
+
+from shared.testing import make_redis_client, redis_server  # noqa: F401
@@ -0,0 +1,136 @@
+"""
+Tests du dispatch /chat vers un expert unique (request/reply sur le bus).
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from shared import ChatMessage, Intent, IntentType, MessagePriority, MessageRole, get_settings
+from eva_core import main
+from eva_core.main import ChatRequest, _dispatch_to_experts
+
+
+def make_intent(expert: str) -> Intent:
+    return Intent(
+        intent_type=IntentType.OSINT_REQUEST,
+        confidence=0.9,
+        target_expert=expert,
+    )
+
+
+@pytest.fixture
+def core_bus(make_redis_client, monkeypatch):
+    """Core sur fakeredis, délai de réponse des experts par défaut (5 s)"""
+    core = make_redis_client()
+    monkeypatch.setattr(main, "get_redis_client", lambda: core)
+    monkeypatch.setattr(main.app.state, "settings", get_settings(), raising=False)
+    return core
+
+
+async def dispatch(expert: str) -> str:
+    session_id = uuid4()
+    request = ChatRequest(message="Qui possède ce domaine ?", session_id=session_id)
+    user_message = ChatMessage(session_id=session_id, role=MessageRole.USER, content=request.message)
+    return await _dispatch_to_experts(request, session_id, user_message, make_intent(expert))
+
+
+@pytest.mark.asyncio
+async def test_expert_reply_is_returned(core_bus, make_redis_client):
+    sentinel = make_redis_client()
+
+    async def osint(payload):
+        return {"message": f"Réponse à : {payload['message']}"}
+
+    await sentinel.handle_requests("sentinel", {IntentType.OSINT_REQUEST.value: osint})
+    listener = asyncio.create_task(sentinel.listen())
+    await asyncio.sleep(0.05)
+    try:
+        assert await dispatch("sentinel") == "Réponse à : Qui possède ce domaine ?"
+    finally:
+        listener.cancel()
+        await core_bus.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_action_without_rpc_handler_is_acknowledged_without_waiting(core_bus, make_redis_client):
+    sentinel = make_redis_client()
+    received = []
+
+    async def on_request(channel, data):
+        received.append(data["action"])
+
+    await sentinel.subscribe(["eva.sentinel.requests"], on_request)
+    listener = asyncio.create_task(sentinel.listen())
+    await asyncio.sleep(0.05)
+    loop = asyncio.get_running_loop()
+    try:
+        start = loop.time()
+        assert await dispatch("sentinel") == "Consultation de l'expert sentinel lancée."
+        assert loop.time() - start < 1.0  # pas d'attente des 5 s
+        await asyncio.sleep(0.05)
+    finally:
+        listener.cancel()
+        await core_bus.disconnect()
+    assert received == [IntentType.OSINT_REQUEST.value]
+
+
+@pytest.mark.asyncio
+async def test_offline_expert_falls_back_to_acknowledgement(core_bus, make_redis_client, monkeypatch):
+    monkeypatch.setattr(
+        main.app.state,
+        "settings",
+        get_settings().model_copy(update={"chat_expert_timeout_seconds": 0.2}),
+    )
+
+    async def osint(payload):
+        return {"message": "jamais servi"}
+
+    # Handler annoncé, mais aucune boucle listen() : l'expert est hors ligne
+    await make_redis_client().handle_requests("sentinel", {IntentType.OSINT_REQUEST.value: osint})
+    try:
+        assert await dispatch("sentinel") == "Consultation de l'expert sentinel lancée."
+    finally:
+        await core_bus.disconnect()
+
+
+class FakeMQTT:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, topic, payload, **kwargs):
+        self.published.append((topic, kwargs["qos"]))
+
+
+@pytest.mark.asyncio
+async def test_trading_order_goes_critical_and_mirrored(core_bus, make_redis_client, monkeypatch):
+    mqtt = FakeMQTT()
+    monkeypatch.setattr(main.app.state, "mqtt", mqtt, raising=False)
+    banker = make_redis_client()
+    priorities = []
+
+    async def on_request(channel, data):
+        priorities.append(data["priority"])
+
+    await banker.subscribe(["eva.banker.requests"], on_request)
+    listener = asyncio.create_task(banker.listen())
+    await asyncio.sleep(0.05)
+
+    session_id = uuid4()
+    request = ChatRequest(message="Achète 0.1 lot d'or", session_id=session_id)
+    user_message = ChatMessage(session_id=session_id, role=MessageRole.USER, content=request.message)
+    intent = Intent(intent_type=IntentType.TRADING_ORDER, confidence=0.95, target_expert="banker")
+    try:
+        # Pas de handler RPC TRADING_ORDER : accusé immédiat, ordre transmis
+        reply = await asyncio.wait_for(
+            _dispatch_to_experts(request, session_id, user_message, intent), timeout=1.0
+        )
+        assert reply == "Consultation de l'expert banker lancée."
+        await asyncio.sleep(0.05)
+    finally:
+        listener.cancel()
+        await core_bus.disconnect()
+
+    assert priorities == [MessagePriority.CRITICAL.value]
+    assert mqtt.published == [("eva/banker/requests/critical", 2)]
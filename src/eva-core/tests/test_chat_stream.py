@@ -0,0 +1,196 @@
+"""
+Tests de /chat/stream (SSE) et /chat/ws : suite d'événements, messages
+invalides et annulation de la génération quand le client part.
+"""
+
+import asyncio
+import json
+import re
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from shared import Intent, IntentType
+from shared.internal_auth import InternalAuth
+from eva_core import main
+
+TOKENS = ["Bon", "jour", " !"]
+TOKEN_EVENT = re.compile(rb'"type":\s*"token"')
+
+
+class FakeStrategy:
+    async def route_request(self, message):
+        return Intent(intent_type=IntentType.GENERAL_CHAT, confidence=0.9, target_expert="core")
+
+
+class FakePromptMaster:
+    def wrap_with_method(self, message, method):
+        return message
+
+    def get_expert_injector(self, expert):
+        return ""
+
+
+class FakeMemory:
+    def __init__(self):
+        self.stored = []
+
+    async def store_message(self, message):
+        self.stored.append(message.content)
+
+
+class FakeLLM:
+    """Flux de tokens ; `hang` bloque après le premier jusqu'à annulation"""
+
+    def __init__(self, hang: bool = False):
+        self.hang = hang
+        self.cancelled = threading.Event()
+
+    async def stream_response(self, messages, system_prompt=""):
+        try:
+            for token in TOKENS:
+                yield token
+                if self.hang:
+                    await asyncio.Event().wait()
+        except (asyncio.CancelledError, GeneratorExit):
+            self.cancelled.set()
+            raise
+
+
+@pytest.fixture
+def core_chat(monkeypatch):
+    """Core sans dépendances externes ; retourne (llm, mémoire, en-têtes)"""
+
+    def install(llm: FakeLLM):
+        memory = FakeMemory()
+        for name, value in (
+            ("strategy_orchestrator", FakeStrategy()),
+            ("prompt_master", FakePromptMaster()),
+            ("llm_service", llm),
+            ("memory_service", memory),
+        ):
+            monkeypatch.setattr(main.app.state, name, value, raising=False)
+        return memory, {"X-Hive-Internal-Token": InternalAuth.get_token("core")}
+
+    return install
+
+
+def parse_sse(body: str) -> list[dict]:
+    return [
+        json.loads(line.removeprefix("data: "))
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_emits_meta_tokens_and_done(core_chat):
+    memory, headers = core_chat(FakeLLM())
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        response = await client.post("/chat/stream", json={"message": "Salut"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert [e["type"] for e in events] == ["meta", "token", "token", "token", "done"]
+    assert [e["text"] for e in events if e["type"] == "token"] == TOKENS
+    assert events[-1]["message"] == "Bonjour !"
+    assert memory.stored == ["Salut"]
+
+
+def asgi_scope(kind: str, path: str, token: str) -> dict:
+    scope = {
+        "type": kind,
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "http" if kind == "http" else "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"x-hive-internal-token", token.encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("t", 80),
+    }
+    if kind == "http":
+        scope["method"] = "POST"
+    return scope
+
+
+async def run_until_disconnect(scope: dict, messages: list[dict], disconnect: dict) -> bool:
+    """
+    Exécute l'application en direct (ASGI) : le client part dès le premier
+    token reçu. Retourne True si le premier token a été envoyé.
+    """
+    first_token = asyncio.Event()
+    pending = list(messages)
+
+    async def receive():
+        if pending:
+            return pending.pop(0)
+        await first_token.wait()
+        return disconnect
+
+    async def send(message):
+        data = message.get("body") or message.get("text") or b""
+        if isinstance(data, str):
+            data = data.encode()
+        if TOKEN_EVENT.search(data):
+            first_token.set()
+
+    # Génération bloquée après le premier token : l'application ne rend la
+    # main que si la déconnexion l'annule
+    await asyncio.wait_for(main.app(scope, receive, send), timeout=5)
+    return first_token.is_set()
+
+
+@pytest.mark.asyncio
+async def test_sse_client_disconnect_cancels_generation(core_chat):
+    llm = FakeLLM(hang=True)
+    _, headers = core_chat(llm)
+    scope = asgi_scope("http", "/chat/stream", headers["X-Hive-Internal-Token"])
+    body = json.dumps({"message": "Salut"}).encode()
+    request = {"type": "http.request", "body": body, "more_body": False}
+
+    assert await run_until_disconnect(scope, [request], {"type": "http.disconnect"})
+    assert llm.cancelled.is_set()
+
+
+def test_websocket_streams_events_and_rejects_invalid_payloads(core_chat):
+    memory, headers = core_chat(FakeLLM())
+    with TestClient(main.app).websocket_connect("/chat/ws", headers=headers) as ws:
+        # Ni JSON valide, ni objet : événement d'erreur, la socket reste ouverte
+        for payload in ("pas du json", "[1, 2]", '"Salut"', '{"message": ""}'):
+            ws.send_text(payload)
+            event = ws.receive_json()
+            assert event["type"] == "error" and event["detail"]
+
+        ws.send_json({"message": "Salut"})
+        events = [ws.receive_json()]
+        while events[-1]["type"] not in ("done", "error"):
+            events.append(ws.receive_json())
+
+    assert [e["type"] for e in events] == ["meta", "token", "token", "token", "done"]
+    assert events[-1]["message"] == "Bonjour !"
+    assert memory.stored == ["Salut"]
+
+
+@pytest.mark.asyncio
+async def test_websocket_disconnect_cancels_generation(core_chat):
+    llm = FakeLLM(hang=True)
+    _, headers = core_chat(llm)
+    scope = asgi_scope("websocket", "/chat/ws", headers["X-Hive-Internal-Token"])
+    messages = [
+        {"type": "websocket.connect"},
+        {"type": "websocket.receive", "text": json.dumps({"message": "Salut"})},
+    ]
+
+    disconnect = {"type": "websocket.disconnect", "code": 1001}
+    assert await run_until_disconnect(scope, messages, disconnect)
+    assert llm.cancelled.is_set()
@@ -0,0 +1,117 @@
+"""
+Tests du flux de tokens de LLMService contre un faux serveur LLM local
+(HTTP/1.1 chunked : NDJSON façon Ollama, SSE façon vLLM).
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from shared import ChatMessage, MessageRole
+from shared.telemetry import get_telemetry
+from eva_core.services.llm import LLMService
+
+TOKENS = ["Bon", "jour", " !"]
+DELAY = 0.05
+
+
+def ollama_chunks():
+    for token in TOKENS:
+        yield json.dumps({"response": token, "done": False}) + "\n"
+    yield json.dumps({"response": "", "done": True}) + "\n"
+
+
+def vllm_chunks():
+    yield 'data: {"choices": [{"delta": {"role": "assistant"}}]}\n\n'
+    for token in TOKENS:
+        yield "data: " + json.dumps({"choices": [{"delta": {"content": token}}]}) + "\n\n"
+    yield "data: [DONE]\n\n"
+
+
+async def start_fake_llm():
+    """Serveur répondant en flux sur /api/generate et /v1/chat/completions"""
+    requests = []
+
+    async def handle(reader, writer):
+        request_line = await reader.readline()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            key, _, value = line.decode().partition(":")
+            headers[key.strip().lower()] = value.strip()
+        body = json.loads(await reader.readexactly(int(headers["content-length"])))
+        requests.append(body)
+        path = request_line.split()[1].decode()
+        chunks = ollama_chunks() if path == "/api/generate" else vllm_chunks()
+        writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        for chunk in chunks:
+            data = chunk.encode()
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+            await asyncio.sleep(DELAY)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], requests
+
+
+def user(text):
+    return [ChatMessage(session_id="00000000-0000-0000-0000-000000000001", role=MessageRole.USER, content=text)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_ollama", [True, False], ids=["ollama", "vllm"])
+async def test_stream_yields_tokens_as_they_arrive(use_ollama):
+    server, port, requests = await start_fake_llm()
+    llm = LLMService(host="127.0.0.1", port=port, model="fake", use_ollama=use_ollama)
+    loop = asyncio.get_running_loop()
+    try:
+        start = loop.time()
+        arrivals = []
+        async for chunk in llm.stream_response(user("Salut"), system_prompt="Sois bref"):
+            arrivals.append((chunk, loop.time() - start))
+    finally:
+        server.close()
+        await llm._client.aclose()
+
+    assert [chunk for chunk, _ in arrivals] == TOKENS
+    # Premier token reçu bien avant la fin de la génération
+    assert arrivals[0][1] < arrivals[-1][1] - DELAY
+    assert requests[0]["stream"] is True
+
+    backend = "ollama" if use_ollama else "vllm"
+    ttft = get_telemetry().histogram("hive_llm_time_to_first_token_seconds", backend=backend)
+    assert ttft.count >= 1
+
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_to_mock_when_llm_is_down():
+    llm = LLMService(host="127.0.0.1", port=9, model="fake", use_ollama=True)
+    try:
+        chunks = [chunk async for chunk in llm.stream_response(user("Salut"))]
+    finally:
+        await llm._client.aclose()
+    assert len(chunks) == 1 and chunks[0].startswith("[Mode Dev]")
+
+
+@pytest.mark.asyncio
+async def test_stream_duration_is_not_a_slow_call(monkeypatch):
+    server, port, _ = await start_fake_llm()
+    llm = LLMService(host="127.0.0.1", port=port, model="fake", use_ollama=True)
+    # Flux (~4 × DELAY) plus long que les seuils, premier token bien en deçà
+    monkeypatch.setattr(llm._bulkhead, "latency_target", 2 * DELAY)
+    monkeypatch.setattr(llm._breaker, "slow_call_duration", 2 * DELAY)
+    slow_calls, limit = llm._bulkhead.total_slow_calls, llm._bulkhead.limit
+    breaker_slow_calls = llm._breaker.total_slow_calls
+    try:
+        chunks = [chunk async for chunk in llm.stream_response(user("Salut"))]
+    finally:
+        server.close()
+        await llm._client.aclose()
+
+    assert chunks == TOKENS
+    assert llm._bulkhead.total_slow_calls == slow_calls
+    assert llm._bulkhead.limit >= limit
+    assert llm._breaker.total_slow_calls == breaker_slow_calls
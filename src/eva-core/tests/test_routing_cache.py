@@ -0,0 +1,110 @@
+"""
+Tests du cache des décisions de routage (StrategyOrchestrator).
+"""
+
+import asyncio
+
+import pytest
+
+from shared import Intent, IntentType
+from eva_core.router.cache import RoutingCache, normalize
+
+
+class CountingDecider:
+    """Décision LLM simulée : compte les appels, répond après `delay`"""
+
+    def __init__(self, intent: Intent, delay: float = 0.0):
+        self.intent = intent
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> Intent:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.intent.model_copy(deep=True)
+
+
+def status_intent(**overrides) -> Intent:
+    fields = dict(intent_type=IntentType.POSITION_STATUS, target_expert="banker", confidence=0.9)
+    fields.update(overrides)
+    return Intent(**fields)
+
+
+def test_normalization_ignores_case_accents_and_punctuation():
+    assert normalize("  Quel est le DRAWDOWN ?! ") == normalize("quel   est le drawdown")
+    assert normalize("État des positions") == "etat des positions"
+
+
+@pytest.mark.asyncio
+async def test_repeated_message_skips_the_llm():
+    cache = RoutingCache()
+    decide = CountingDecider(status_intent())
+
+    first = await cache.resolve("Statut positions", decide)
+    second = await cache.resolve("statut   positions !", decide)
+
+    assert decide.calls == 1
+    assert second == first
+    second.entities["mutated"] = True
+    assert (await cache.resolve("statut positions", decide)).entities == {}
+    assert cache.get_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "message, intent",
+    [
+        ("quel est le drawdown", status_intent(confidence=0.4)),
+        ("ouvre une position sur l'or", status_intent(entities={"symbol": "XAUUSD"})),
+        ("achète de l'or", status_intent(intent_type=IntentType.TRADING_ORDER)),
+        ("achète 0.1 lot XAUUSD", status_intent()),
+    ],
+    ids=["low-confidence", "entities", "trading-order", "digits"],
+)
+async def test_bypass_rules_always_reach_the_llm(message, intent):
+    cache = RoutingCache()
+    decide = CountingDecider(intent)
+    await cache.resolve(message, decide)
+    await cache.resolve(message, decide)
+    assert decide.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_lru_bounds():
+    cache = RoutingCache(ttl_seconds=0.05, max_entries=2)
+    decide = CountingDecider(status_intent())
+    for message in ("a", "b", "c"):
+        await cache.resolve(message, decide)
+    assert cache.get_stats()["size"] == 2 and cache.evictions == 1
+
+    await asyncio.sleep(0.06)
+    await cache.resolve("c", decide)
+    assert decide.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_decision():
+    cache = RoutingCache()
+    decide = CountingDecider(status_intent(), delay=0.05)
+    results = await asyncio.gather(*(cache.resolve("statut positions", decide) for _ in range(5)))
+    assert decide.calls == 1
+    assert all(r == results[0] for r in results)
+    assert cache.coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_serves_other_replicas(make_redis_client):
+    replica_a = RoutingCache(namespace="v1", redis=make_redis_client())
+    replica_b = RoutingCache(namespace="v1", redis=make_redis_client())
+    decide = CountingDecider(status_intent())
+
+    await replica_a.resolve("statut positions", decide)
+    intent = await replica_b.resolve("Statut positions", decide)
+
+    assert decide.calls == 1
+    assert intent.target_expert == "banker"
+    assert replica_b.shared_hits == 1
+
+    # Un autre manifeste (namespace) ne réutilise pas ces décisions
+    await RoutingCache(namespace="v2", redis=make_redis_client()).resolve("statut positions", decide)
+    assert decide.calls == 2
@@ -15,7 +15,9 @@ from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from shared import get_settings
-from shared.redis_client import init_redis, get_redis_client
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
+from shared.instrumentation import instrument_app, uninstrument_app
 
 from eva_lab.arena import Arena
 from eva_lab.backtester import Backtester
@@ -52,6 +54,7 @@ class ArenaRequest(BaseModel):
 async def lifespan(app: FastAPI):
     """Cycle de vie Lab"""
     logger.info("🧪 Démarrage EVA Lab (Le Colisée)...")
+    instrument_app(app, "lab")
 
     try:
         await init_redis()
@@ -69,15 +72,16 @@ async def lifespan(app: FastAPI):
     logger.info("✅ EVA Lab opérationnel — les stratégies peuvent combattre")
     yield
     logger.info("🛑 Arrêt EVA Lab")
+    await uninstrument_app(app)
 
 
 async def hard_heartbeat():
     """Signal de présence"""
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {"status": "online", "ts": datetime.now().timestamp(), "expert": "lab"}
-            await redis.cache_set("eva.lab.status", payload, ttl_seconds=10)
+            await presence.beat("lab", payload)
         except Exception:
             pass
         await asyncio.sleep(2.0)
@@ -16,7 +16,9 @@ from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from shared import get_settings
-from shared.redis_client import init_redis, get_redis_client
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
+from shared.instrumentation import instrument_app, uninstrument_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -163,6 +165,7 @@ class MuseService:
 async def lifespan(app: FastAPI):
     """Cycle de vie Muse"""
     logger.info("🎨 Démarrage The Muse (Media Factory)...")
+    instrument_app(app, "muse")
 
     try:
         await init_redis()
@@ -176,15 +179,16 @@ async def lifespan(app: FastAPI):
     logger.info("✅ The Muse est inspirée (prête)")
     yield
     logger.info("🛑 Arrêt The Muse")
+    await uninstrument_app(app)
 
 
 async def hard_heartbeat():
     """Signal de présence"""
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {"status": "online", "ts": datetime.now().timestamp(), "expert": "muse"}
-            await redis.cache_set("eva.muse.status", payload, ttl_seconds=10)
+            await presence.beat("muse", payload)
         except Exception:
             pass
         await asyncio.sleep(2.0)
@@ -40,6 +40,7 @@ type Metrics struct {
 	MessagesRouted   atomic.Int64
 	ErrorsTotal      atomic.Int64
 	LastHeartbeatAt  sync.Map // agent_name -> time.Time
+	Presence         sync.Map // agent_name -> "online" | "offline" (eva.presence)
 	UptimeStart      time.Time
 }
 
@@ -206,6 +207,49 @@ func listenHeartbeats(rdb *redis.Client) {
 	}
 }
 
+// PresenceEvent — transition publiée par la table de présence partagée
+type PresenceEvent struct {
+	Agent string  `json:"agent"`
+	State string  `json:"state"`
+	Ts    float64 `json:"ts"`
+}
+
+// Agents dont la perte déclenche une alerte Kernel
+var criticalPresence = map[string]bool{"banker": true}
+
+// listenPresence réagit aux transitions online/offline sans polling
+func listenPresence(rdb *redis.Client) {
+	for {
+		pubsub := rdb.Subscribe(ctx, "eva.presence")
+		ch := pubsub.Channel()
+
+		for msg := range ch {
+			var event PresenceEvent
+			if err := json.Unmarshal([]byte(msg.Payload), &event); err != nil {
+				continue
+			}
+			metrics.Presence.Store(event.Agent, event.State)
+
+			if event.State != "offline" {
+				log.Printf("📶 PRESENCE: %s en ligne", event.Agent)
+				continue
+			}
+			lastSeen := time.Unix(int64(event.Ts), 0)
+			if criticalPresence[event.Agent] {
+				metrics.ErrorsTotal.Add(1)
+				promErrors.Inc()
+				log.Printf("🚨 PRESENCE: %s HORS LIGNE ! Alerte Kernel.", event.Agent)
+				rdb.Publish(ctx, "kernel_action", fmt.Sprintf(`{"action":"WATCHDOG_ALERT","agent":"%s","last_seen":"%s"}`, event.Agent, lastSeen.Format(time.RFC3339)))
+			} else {
+				log.Printf("⚠️ PRESENCE: %s hors ligne depuis %s", event.Agent, lastSeen.Format(time.RFC3339))
+			}
+		}
+
+		pubsub.Close()
+		time.Sleep(1 * time.Second)
+	}
+}
+
 func watchdogLoop(rdb *redis.Client) {
 	criticalAgents := []string{
 		"eva.banker.heartbeat",
@@ -262,6 +306,7 @@ type HealthResponse struct {
 	TotalRouted    int64             `json:"total_messages_routed"`
 	Errors         int64             `json:"errors_total"`
 	AgentStatus    map[string]string `json:"agent_status"`
+	Presence       map[string]string `json:"presence"`
 }
 
 func healthHandler(w http.ResponseWriter, r *http.Request) {
@@ -283,6 +328,12 @@ func healthHandler(w http.ResponseWriter, r *http.Request) {
 		return true
 	})
 
+	presence := make(map[string]string)
+	metrics.Presence.Range(func(key, value any) bool {
+		presence[key.(string)] = value.(string)
+		return true
+	})
+
 	resp := HealthResponse{
 		Status:        "operational",
 		Uptime:        time.Since(metrics.UptimeStart).Round(time.Second).String(),
@@ -293,6 +344,7 @@ func healthHandler(w http.ResponseWriter, r *http.Request) {
 		TotalRouted:   metrics.MessagesRouted.Load(),
 		Errors:        metrics.ErrorsTotal.Load(),
 		AgentStatus:   agentStatus,
+		Presence:      presence,
 	}
 
 	w.Header().Set("Content-Type", "application/json")
@@ -345,6 +397,7 @@ func main() {
 	go listenTradeSignals(rdb)      // P1: Opportunités trading → Banker
 	go listenSwarmEvents(rdb)       // P2: Coordination Swarm
 	go listenHeartbeats(rdb)        // Heartbeat monitoring
+	go listenPresence(rdb)          // Transitions online/offline (table de présence)
 
 	// Watchdog (détection d'agents morts)
 	go watchdogLoop(rdb)
@@ -20,7 +20,10 @@ from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from shared import get_settings
-from shared.redis_client import init_redis, get_redis_client
+from shared.bulkhead import get_bulkhead
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
+from shared.instrumentation import instrument_app, uninstrument_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -98,6 +101,11 @@ class ResearchService:
             timeout=30.0,
             headers={"User-Agent": "Mozilla/5.0 THE-HIVE-Researcher/1.0"}
         )
+        # Scraping DuckDuckGo : peu d'appels simultanés, rejet rapide sinon
+        self._search_bulkhead = get_bulkhead(
+            "duckduckgo", initial_limit=4, max_limit=8, max_queue=16,
+            queue_timeout=5.0, latency_target=3.0,
+        )
 
     async def search(self, request: ResearchQuery) -> ResearchReport:
         """Effectue une recherche et synthétise les résultats"""
@@ -124,7 +132,7 @@ class ResearchService:
         """Recherche web via DuckDuckGo HTML"""
         try:
             url = f"https://html.duckduckgo.com/html/?q={query}"
-            response = await self._client.get(url)
+            response = await self._search_bulkhead.execute(self._client.get, url)
 
             if response.status_code != 200:
                 return []
@@ -204,6 +212,7 @@ class ResearchService:
 async def lifespan(app: FastAPI):
     """Cycle de vie Researcher"""
     logger.info("🔬 Démarrage The Researcher (Veille & Analyse)...")
+    instrument_app(app, "researcher")
 
     try:
         await init_redis()
@@ -217,15 +226,16 @@ async def lifespan(app: FastAPI):
     logger.info("✅ The Researcher est en veille active")
     yield
     logger.info("🛑 Arrêt The Researcher")
+    await uninstrument_app(app)
 
 
 async def hard_heartbeat():
     """Signal de présence"""
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {"status": "online", "ts": datetime.now().timestamp(), "expert": "researcher"}
-            await redis.cache_set("eva.researcher.status", payload, ttl_seconds=10)
+            await presence.beat("researcher", payload)
         except Exception:
             pass
         await asyncio.sleep(2.0)
@@ -1,8 +1,20 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from shared.instrumentation import instrument_app, uninstrument_app
 from eva_rwa.token_bridge import TokenBridge
 from eva_rwa.iot_controller import IotController
 
-app = FastAPI(title="EVA RWA")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cycle de vie RWA : échantillonneur et watchdog tournent dans la boucle du service"""
+    instrument_app(app, "rwa")
+    yield
+    await uninstrument_app(app)
+
+
+app = FastAPI(title="EVA RWA", lifespan=lifespan)
 bridge = TokenBridge()
 iot = IotController()
 
@@ -17,7 +17,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from shared import get_settings
-from shared.redis_client import init_redis, get_redis_client
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
+from shared.instrumentation import instrument_app, uninstrument_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -165,6 +167,7 @@ class WellnessService:
 async def lifespan(app: FastAPI):
     """Cycle de vie Sage"""
     logger.info("🧘 Démarrage The Sage (Wellness Coach)...")
+    instrument_app(app, "sage")
 
     try:
         await init_redis()
@@ -178,15 +181,16 @@ async def lifespan(app: FastAPI):
     logger.info("✅ The Sage veille sur votre bien-être")
     yield
     logger.info("🛑 Arrêt The Sage")
+    await uninstrument_app(app)
 
 
 async def hard_heartbeat():
     """Signal de présence"""
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {"status": "online", "ts": datetime.now().timestamp(), "expert": "sage"}
-            await redis.cache_set("eva.sage.status", payload, ttl_seconds=10)
+            await presence.beat("sage", payload)
         except Exception:
             pass
         await asyncio.sleep(2.0)
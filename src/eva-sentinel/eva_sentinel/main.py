@@ -24,7 +24,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from shared import Settings, get_settings
 from shared.redis_client import init_redis
+from shared.dispatcher import ChannelPolicy, OverflowPolicy
 from shared.auth_middleware import InternalAuthMiddleware
+from shared.instrumentation import instrument_app, uninstrument_app
 
 from eva_sentinel.services.monitor import SystemMonitor
 from eva_sentinel.services.notifier import TelegramNotifier
@@ -54,6 +56,7 @@ async def lifespan(app: FastAPI):
         None: Rend la main une fois l'initialisation terminée.
     """
     logger.info("🛡️ Démarrage The Sentinel...")
+    instrument_app(app, "sentinel")
     
     # Redis
     try:
@@ -94,6 +97,7 @@ async def lifespan(app: FastAPI):
     app.state.security_task.cancel()
     await app.state.monitor.stop()
     logger.info("🛑 Arrêt The Sentinel")
+    await uninstrument_app(app)
 
 
 async def hard_heartbeat():
@@ -101,15 +105,15 @@ async def hard_heartbeat():
     Signal haute fréquence pour l'Orchestrateur Core.
     Persiste l'état dans Redis pour la découverte des agents.
     """
-    from shared.redis_client import get_redis_client
+    from shared.presence import get_presence_table
     from datetime import datetime
     import asyncio
     
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {"status": "online", "ts": datetime.now().timestamp(), "expert": "sentinel"}
-            await redis.cache_set("eva.sentinel.status", payload, ttl_seconds=10)
+            await presence.beat("sentinel", payload)
         except Exception as e:
             logger.error(f"Heartbeat error: {e}")
         await asyncio.sleep(1.0)
@@ -144,11 +148,17 @@ async def notif_listener(notifier: TelegramNotifier):
                 event=message.get("event", "restart")
             )
 
+    # Telegram peut prendre jusqu'à 10s : workers parallèles et files bornées
+    # pour qu'une notification lente ne bloque pas les autres channels
     await redis.subscribe([
         "danger_signal", 
         "eva.banker.trades", 
         "eva.swarm.healing"
-    ], handle_alert)
+    ], handle_alert, group="sentinel", policy=ChannelPolicy(
+        concurrency=4,
+        max_queue=200,
+        overflow=OverflowPolicy.DROP_OLDEST,
+    ))
     
     logger.info("📡 Listener de notifications opérationnel")
     await redis.listen()
@@ -1,35 +1,21 @@
 """
 Service Monitoring — Surveillance Hardware THE HIVE.
 
-Collecte en continu les métriques système (CPU, RAM, Disque, GPU)
-via psutil et les expose à Sentinel, au Core et à Grafana.
-
-Compatible Windows et Linux (détection automatique du disque racine).
+Expose les métriques système (CPU, RAM, Disque, GPU) à Sentinel, au
+Core et à Grafana, à partir de l'échantillonneur partagé
+(`shared.system_sampler`, compatible Windows et Linux).
 """
 
 import asyncio
 import logging
-import sys
 from datetime import datetime
 
-import psutil
 from shared import GPUMetrics, HardwareMetrics
+from shared.system_sampler import get_system_sampler
 
 logger = logging.getLogger(__name__)
 
 
-def _get_disk_root() -> str:
-    """
-    Retourne le chemin racine du disque selon le système d'exploitation.
-
-    Returns:
-        str: 'C:\\\\' sur Windows, '/' sur Linux/macOS.
-    """
-    if sys.platform == "win32":
-        return "C:\\"
-    return "/"
-
-
 class SystemMonitor:
     """
     Surveille l'utilisation des ressources hardware en temps réel.
@@ -77,24 +63,17 @@ class SystemMonitor:
 
     def _collect_metrics(self) -> HardwareMetrics:
         """
-        Collecte les métriques système via psutil.
+        Construit les métriques à partir de l'instantané de
+        l'échantillonneur système partagé (aucun appel psutil ici).
 
-        Utilise le bon chemin racine selon l'OS (Windows vs Linux).
         Le GPU est simulé en mode lite ; en production, remplacer
         par nvidia-smi ou pynvml.
 
         Returns:
             HardwareMetrics: Snapshot des métriques hardware.
         """
-        cpu_percent = psutil.cpu_percent(interval=None)
-        ram = psutil.virtual_memory()
-
-        # Disque — compatible Windows et Linux
-        disk_root = _get_disk_root()
-        try:
-            disk_percent = psutil.disk_usage(disk_root).percent
-        except Exception:
-            disk_percent = 0.0
+        snap = get_system_sampler().latest()
+        mem = snap.get("memory", {})
 
         # Simulation GPU (à remplacer par nvidia-smi / pynvml en prod)
         gpu = GPUMetrics(
@@ -106,10 +85,10 @@ class SystemMonitor:
 
         return HardwareMetrics(
             timestamp=datetime.now(),
-            cpu_percent=cpu_percent,
-            ram_used_gb=round(ram.used / (1024**3), 2),
-            ram_total_gb=round(ram.total / (1024**3), 2),
-            disk_used_percent=disk_percent,
+            cpu_percent=snap.get("cpu", {}).get("percent", 0.0),
+            ram_used_gb=round(mem.get("used_mb", 0) / 1024, 2),
+            ram_total_gb=round(mem.get("total_mb", 0) / 1024, 2),
+            disk_used_percent=snap.get("disk", {}).get("percent", 0.0),
             gpu=gpu,
         )
 
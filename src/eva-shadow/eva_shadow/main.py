@@ -22,7 +22,9 @@ from typing import Any
 from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from shared import get_settings
-from shared.redis_client import init_redis, get_redis_client
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
+from shared.instrumentation import instrument_app, uninstrument_app
 
 from eva_shadow.services.osint import OSINTService
 
@@ -49,6 +51,7 @@ async def lifespan(app: FastAPI):
         None: Rend la main une fois l'initialisation terminée.
     """
     logger.info("🌑 Démarrage The Shadow (OSINT Agent)...")
+    instrument_app(app, "shadow")
 
     # Redis — tolérant aux pannes au démarrage
     try:
@@ -68,6 +71,7 @@ async def lifespan(app: FastAPI):
     yield
 
     logger.info("🛑 Arrêt The Shadow")
+    await uninstrument_app(app)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -82,7 +86,7 @@ async def hard_heartbeat():
     Sans ce heartbeat, le Shadow apparaissait comme « offline »
     dans le dashboard du Core (/agents/status).
     """
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {
@@ -90,7 +94,7 @@ async def hard_heartbeat():
                 "ts": datetime.now().timestamp(),
                 "expert": "shadow",
             }
-            await redis.cache_set("eva.shadow.status", payload, ttl_seconds=10)
+            await presence.beat("shadow", payload)
         except Exception as e:
             logger.error(f"Heartbeat error: {e}")
         await asyncio.sleep(2.0)
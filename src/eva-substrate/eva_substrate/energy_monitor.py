@@ -1,6 +1,7 @@
-import psutil
 import random
 
+from shared.system_sampler import get_system_sampler
+
 class EnergyMonitor:
     """Surveillance de la consommation énergétique (Mock IPMI)"""
     
@@ -9,8 +10,8 @@ class EnergyMonitor:
         self.max_load_watts = 650  # EPYC + 3090 Full Load
 
     def get_current_consumption(self):
-        # Simulation basée sur l'usage CPU réel si possible
-        cpu_usage = psutil.cpu_percent()
+        # Simulation basée sur l'usage CPU réel (instantané échantillonné)
+        cpu_usage = get_system_sampler().latest().get("cpu", {}).get("percent", 0.0)
         estimated_watts = self.base_idle_watts + (self.max_load_watts - self.base_idle_watts) * (cpu_usage / 100)
         
         return {
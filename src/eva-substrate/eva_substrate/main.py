@@ -21,7 +21,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from eva_substrate.energy_monitor import EnergyMonitor
 from eva_substrate.circadian_rhythm import CircadianRhythm
 from eva_substrate.resource_allocator import ResourceAllocator
-from shared.redis_client import init_redis, get_redis_client
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
+from shared.instrumentation import instrument_app, uninstrument_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -47,6 +49,7 @@ async def lifespan(app: FastAPI):
         None: Rend la main une fois l'initialisation terminée.
     """
     logger.info("🌿 Démarrage EVA Substrate (Le Corps)...")
+    instrument_app(app, "substrate")
 
     # Redis — tolérant aux pannes au démarrage
     try:
@@ -66,6 +69,7 @@ async def lifespan(app: FastAPI):
     logger.info("✅ EVA Substrate actif")
     yield
     logger.info("🛑 Arrêt EVA Substrate")
+    await uninstrument_app(app)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -104,7 +108,7 @@ async def hard_heartbeat(rhythm: CircadianRhythm):
     Args:
         rhythm (CircadianRhythm): Service de rythme circadien.
     """
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             mode_info = rhythm.get_current_mode()
@@ -115,7 +119,7 @@ async def hard_heartbeat(rhythm: CircadianRhythm):
                 "mode": mode_info["mode"],
                 "is_night": mode_info["is_night"],
             }
-            await redis.cache_set("eva.substrate.status", payload, ttl_seconds=10)
+            await presence.beat("substrate", payload)
         except Exception as e:
             logger.error(f"Heartbeat error: {e}")
         await asyncio.sleep(2.0)
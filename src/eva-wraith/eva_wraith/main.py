@@ -21,7 +21,9 @@ from fastapi import FastAPI, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from shared import get_settings
-from shared.redis_client import init_redis, get_redis_client
+from shared.redis_client import init_redis
+from shared.presence import get_presence_table
+from shared.instrumentation import instrument_app, uninstrument_app
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -147,6 +149,7 @@ class VisionService:
 async def lifespan(app: FastAPI):
     """Cycle de vie Wraith"""
     logger.info("👁️ Démarrage The Wraith (Vision Lite)...")
+    instrument_app(app, "wraith")
 
     try:
         await init_redis()
@@ -160,15 +163,16 @@ async def lifespan(app: FastAPI):
     logger.info("✅ The Wraith observe (mode lite)")
     yield
     logger.info("🛑 Arrêt The Wraith")
+    await uninstrument_app(app)
 
 
 async def hard_heartbeat():
     """Signal de présence"""
-    redis = get_redis_client()
+    presence = get_presence_table()
     while True:
         try:
             payload = {"status": "online", "ts": datetime.now().timestamp(), "expert": "wraith"}
-            await redis.cache_set("eva.wraith.status", payload, ttl_seconds=10)
+            await presence.beat("wraith", payload)
         except Exception:
             pass
         await asyncio.sleep(2.0)
@@ -19,6 +19,7 @@ from shared.models import (
     # Communication
     AgentMessage,
     AgentMessageType,
+    MessagePriority,
     # Chat
     ChatMessage,
     Intent,
@@ -33,8 +34,24 @@ from shared.models import (
 )
 from shared.math_ops import symlog, inv_symlog, calculate_var, calculate_cvar
 from shared.config import Settings, get_settings
-from shared.telemetry import Telemetry
-from shared.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from shared.telemetry import Telemetry, get_telemetry
+from shared.circuit_breaker import (
+    BreakerCall,
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitBreakerRegistry,
+    get_circuit_breaker,
+    get_circuit_breaker_registry,
+)
+from shared.bulkhead import (
+    Bulkhead,
+    BulkheadFullError,
+    BulkheadRegistry,
+    BulkheadSlot,
+    get_bulkhead,
+    get_bulkhead_registry,
+)
+from shared.tracing import Tracer, get_tracer, start_span, traced
 
 __all__ = [
     # Enums
@@ -53,6 +70,7 @@ __all__ = [
     # Communication
     "AgentMessage",
     "AgentMessageType",
+    "MessagePriority",
     # Chat
     "ChatMessage",
     "Intent",
@@ -73,6 +91,21 @@ __all__ = [
     "calculate_cvar",
     # Résilience & Observabilité
     "Telemetry",
+    "get_telemetry",
+    "BreakerCall",
     "CircuitBreaker",
     "CircuitBreakerOpenError",
+    "CircuitBreakerRegistry",
+    "get_circuit_breaker",
+    "get_circuit_breaker_registry",
+    "Bulkhead",
+    "BulkheadFullError",
+    "BulkheadRegistry",
+    "BulkheadSlot",
+    "get_bulkhead",
+    "get_bulkhead_registry",
+    "Tracer",
+    "get_tracer",
+    "start_span",
+    "traced",
 ]
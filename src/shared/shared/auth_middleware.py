@@ -1,41 +1,124 @@
 """
 Internal Auth Middleware — THE HIVE
-FastAPI middleware to protect expert endpoints.
+ASGI middleware to protect expert endpoints (HTTP and WebSocket).
+
+Pure ASGI (no BaseHTTPMiddleware): no extra task or memory stream per
+request, streaming responses pass through untouched, and rejections are
+sent directly as 401/403 responses instead of unwinding an HTTPException.
 """
 
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from shared.internal_auth import InternalAuth
+import json
 import logging
+from typing import Any, Callable, Iterable, Optional
+
+from shared.internal_auth import InternalAuth
 
 logger = logging.getLogger(__name__)
 
-class InternalAuthMiddleware(BaseHTTPMiddleware):
+TOKEN_HEADER = b"x-hive-internal-token"
+DEFAULT_EXCLUDE_PATHS = ["/health", "/metrics", "/docs", "/openapi.json"]
+
+# WebSocket close code for a rejected handshake (policy violation)
+WS_POLICY_VIOLATION = 1008
+
+
+class PathPrefixTrie:
+    """
+    Precompiled exclusion rules: a path matches when it starts with one of
+    the prefixes (same semantics as `str.startswith`), in a single walk
+    over the path characters whatever the number of rules.
+    """
+
+    _END = ""
+
+    def __init__(self, prefixes: Iterable[str]):
+        self._root: dict = {}
+        self.prefixes = sorted(set(prefixes))
+        for prefix in self.prefixes:
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[self._END] = True
+
+    def matches(self, path: str) -> bool:
+        node = self._root
+        if self._END in node:
+            return True
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+
+def _error_body(detail: str) -> bytes:
+    return json.dumps({"detail": detail}).encode()
+
+
+_MISSING_TOKEN = _error_body("X-Hive-Internal-Token header missing")
+_INVALID_TOKEN = _error_body("Invalid or expired internal token")
+
+
+class InternalAuthMiddleware:
     """
     Middleware that checks for a valid X-Hive-Internal-Token header.
     Allows opting out for health checks or public endpoints.
+
+    The source agent of a valid token is exposed as
+    `request.state.source_agent` (scope["state"]).
     """
-    
-    def __init__(self, app, exclude_paths: list[str] = None):
-        super().__init__(app)
-        self.exclude_paths = exclude_paths or ["/health", "/docs", "/openapi.json"]
 
-    async def dispatch(self, request: Request, call_next):
-        # Skip authentication for excluded paths
-        if any(request.url.path.startswith(p) for p in self.exclude_paths):
-            return await call_next(request)
+    def __init__(self, app: Callable, exclude_paths: Optional[list[str]] = None):
+        self.app = app
+        self.exclude_paths = exclude_paths or DEFAULT_EXCLUDE_PATHS
+        self._excluded = PathPrefixTrie(self.exclude_paths)
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        scope_type = scope["type"]
+        if scope_type not in ("http", "websocket") or self._excluded.matches(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        for key, value in scope.get("headers", ()):
+            if key == TOKEN_HEADER:
+                token = value.decode("latin-1")
+                break
 
-        token = request.headers.get("X-Hive-Internal-Token")
         if not token:
-            logger.warning(f"🚨 Unauthorized access attempt from {request.client.host} to {request.url.path}")
-            raise HTTPException(status_code=401, detail="X-Hive-Internal-Token header missing")
+            logger.warning(f"🚨 Unauthorized access attempt from {self._client(scope)} to {scope['path']}")
+            await self._reject(scope_type, send, 401, _MISSING_TOKEN)
+            return
 
         payload = InternalAuth.verify_token(token)
         if not payload:
-            logger.error(f"🚨 Invalid or expired token from {request.client.host}")
-            raise HTTPException(status_code=403, detail="Invalid or expired internal token")
+            logger.error(f"🚨 Invalid or expired token from {self._client(scope)}")
+            await self._reject(scope_type, send, 403, _INVALID_TOKEN)
+            return
+
+        # Source agent available to handlers as request.state.source_agent
+        scope.setdefault("state", {})["source_agent"] = payload.get("src")
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _client(scope: dict) -> Any:
+        client = scope.get("client")
+        return client[0] if client else "unknown"
 
-        # Optional: Inject source agent into request state
-        request.state.source_agent = payload.get("src")
-        
-        return await call_next(request)
+    @staticmethod
+    async def _reject(scope_type: str, send: Callable, status: int, body: bytes) -> None:
+        if scope_type == "websocket":
+            # Closing before accept: the server answers the handshake with 403
+            await send({"type": "websocket.close", "code": WS_POLICY_VIOLATION})
+            return
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
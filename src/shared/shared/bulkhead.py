@@ -0,0 +1,341 @@
+"""
+Bulkhead — Limiteur de concurrence adaptatif par dépendance
+═══════════════════════════════════════════════════════════
+
+Borne le nombre d'appels simultanés vers une dépendance lente (Ollama,
+Qdrant, scraping web) pour qu'une saturation ne s'accumule pas en
+requêtes en vol jusqu'au timeout.
+
+  - Limite adaptative AIMD : +1 par « tour » de `limit` appels rapides
+    pendant que la limite est atteinte, × `backoff_ratio` sur un appel
+    lent ou en échec. La limite reste dans [`min_limit`, `max_limit`].
+  - Latence cible fixe (`latency_target`) ou dérivée : `latency_tolerance`
+    × latence minimale observée sur les `baseline_window` derniers appels.
+  - File d'attente bornée (`max_queue`) avec échéance (`queue_timeout`) :
+    au-delà, `BulkheadFullError` immédiate plutôt qu'une attente sans fin.
+
+Composition avec le circuit breaker (breaker à l'extérieur : un circuit
+ouvert rejette sans faire la queue, et un rejet du bulkhead n'est pas
+compté comme une défaillance du service) :
+
+    await breaker.execute(bulkhead.execute, func, *args)
+
+Réponses en flux : `async with bulkhead.slot() as slot` tient la place jusqu'à
+la fin du bloc ; `slot.responded()` au premier morceau fait du temps jusqu'à
+la première réponse la latence vue par l'AIMD, au lieu de la durée du flux.
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable
+
+from shared.telemetry import register_source
+
+logger = logging.getLogger(__name__)
+
+
+class BulkheadFullError(Exception):
+    """Levée quand le bulkhead est saturé (file pleine ou attente expirée)."""
+    pass
+
+
+class BulkheadSlot:
+    """Place acquise dans un bulkhead (voir `Bulkhead.slot`)"""
+
+    def __init__(self, saturated: bool):
+        self.saturated = saturated
+        self.started = time.monotonic()
+        self._responded: float | None = None
+
+    def responded(self) -> None:
+        """Marque la première réponse : fige la latence mesurée de l'appel"""
+        if self._responded is None:
+            self._responded = time.monotonic()
+
+    def latency(self) -> float:
+        return (self._responded or time.monotonic()) - self.started
+
+
+class Bulkhead:
+    """
+    Limiteur de concurrence adaptatif.
+
+    Usage comme décorateur:
+        limiter = Bulkhead("qdrant", initial_limit=16, latency_target=0.5)
+
+        @limiter
+        async def search(...):
+            ...
+
+    Usage programmatique:
+        try:
+            result = await limiter.execute(client.search, **params)
+        except BulkheadFullError:
+            # Fallback (dépendance saturée)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        max_queue: int = 50,
+        queue_timeout: float = 5.0,
+        latency_target: float | None = None,
+        latency_tolerance: float = 2.0,
+        baseline_window: int = 100,
+        backoff_ratio: float = 0.7,
+        ignore_exceptions: tuple[type[BaseException], ...] = (),
+    ):
+        """
+        Args:
+            name: Identifiant du bulkhead (clé du registre).
+            initial_limit: Appels simultanés autorisés au démarrage.
+            min_limit: Plancher de la limite adaptative.
+            max_limit: Plafond de la limite adaptative.
+            max_queue: Appels en attente au-delà desquels on rejette.
+            queue_timeout: Attente maximale (s) d'une place.
+            latency_target: Durée (s) au-delà de laquelle un appel réduit la
+                limite (None = dérivée de la latence minimale observée).
+            latency_tolerance: Multiplicateur de la latence minimale quand
+                `latency_target` est None.
+            baseline_window: Nombre d'appels sur lesquels la latence
+                minimale est recalculée.
+            backoff_ratio: Facteur de réduction multiplicative (0-1).
+            ignore_exceptions: Exceptions métier qui ne réduisent pas la limite.
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.baseline_window = baseline_window
+        self.backoff_ratio = backoff_ratio
+        self.ignore_exceptions = ignore_exceptions
+
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._baseline: float | None = None
+        self._period_min: float | None = None
+        self._period_calls = 0
+        self._last_decrease = 0.0
+
+        self.total_calls = 0
+        self.total_rejected = 0
+        self.total_timeouts = 0
+        self.total_slow_calls = 0
+        self.total_failures = 0
+
+        logger.info(
+            f"🚧 Bulkhead '{name}' initialisé "
+            f"(limite={int(self.limit)} [{min_limit}-{max_limit}], file={max_queue})"
+        )
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def target(self) -> float | None:
+        """Latence cible courante (None tant qu'aucun appel n'a été mesuré)"""
+        if self.latency_target is not None:
+            return self.latency_target
+        if self._baseline is None:
+            return None
+        return self._baseline * self.latency_tolerance
+
+    # ─── Places ───────────────────────────────────────────────────────────
+
+    async def _acquire(self) -> None:
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.total_rejected += 1
+            raise BulkheadFullError(
+                f"Bulkhead '{self.name}' saturé "
+                f"({self.in_flight} en vol, {len(self._waiters)} en attente)"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except TimeoutError:
+            if not self._abandon(waiter):
+                return
+            self.total_timeouts += 1
+            raise BulkheadFullError(
+                f"Bulkhead '{self.name}': aucune place libérée en {self.queue_timeout:g}s"
+            ) from None
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                self._release()
+            raise
+
+    def _abandon(self, waiter: asyncio.Future) -> bool:
+        """Retire un appelant de la file. False si une place lui a déjà été cédée."""
+        if waiter.done():
+            return False
+        waiter.cancel()
+        with contextlib.suppress(ValueError):
+            self._waiters.remove(waiter)
+        return True
+
+    def _release(self) -> None:
+        """Libère une place et la cède aux appelants en attente (ordre FIFO)"""
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    # ─── Adaptation ───────────────────────────────────────────────────────
+
+    def _observe_latency(self, duration: float) -> None:
+        """Latence minimale, recalculée tous les `baseline_window` appels"""
+        if self._period_min is None or duration < self._period_min:
+            self._period_min = duration
+        if self._baseline is None or duration < self._baseline:
+            self._baseline = duration
+        self._period_calls += 1
+        if self._period_calls >= self.baseline_window:
+            self._baseline = self._period_min
+            self._period_min = None
+            self._period_calls = 0
+
+    def _decrease(self, started: float) -> None:
+        # Une seule réduction par vague : les appels partis avant la
+        # dernière réduction reflètent encore l'ancienne limite
+        if started < self._last_decrease:
+            return
+        self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+        self._last_decrease = time.monotonic()
+        logger.debug(f"Bulkhead '{self.name}': limite réduite à {self.current_limit}")
+
+    def _record(self, failed: bool, duration: float, started: float, saturated: bool) -> None:
+        if failed:
+            self.total_failures += 1
+            self._decrease(started)
+            return
+        target = self.target()
+        self._observe_latency(duration)
+        if target is not None and duration > target:
+            self.total_slow_calls += 1
+            self._decrease(started)
+        elif saturated and self.limit < self.max_limit:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    # ─── Exécution ────────────────────────────────────────────────────────
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[BulkheadSlot]:
+        """
+        Tient une place pendant le bloc.
+
+        La latence mesurée est la durée du bloc, ou le délai jusqu'à
+        `slot.responded()` s'il est appelé (réponses en flux).
+        """
+        self.total_calls += 1
+        await self._acquire()
+        slot = BulkheadSlot(saturated=self.in_flight >= self.current_limit)
+        try:
+            yield slot
+        except asyncio.CancelledError:
+            raise
+        except self.ignore_exceptions:
+            self._record(False, slot.latency(), slot.started, slot.saturated)
+            raise
+        except Exception:
+            self._record(True, slot.latency(), slot.started, slot.saturated)
+            raise
+        finally:
+            self._release()
+        self._record(False, slot.latency(), slot.started, slot.saturated)
+
+    async def execute(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Exécute une fonction dans la limite de concurrence"""
+        async with self.slot():
+            return await func(*args, **kwargs)
+
+    def __call__(self, func: Callable) -> Callable:
+        """Utilisable comme décorateur"""
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await self.execute(func, *args, **kwargs)
+        return wrapper
+
+    def get_status(self) -> dict[str, Any]:
+        target = self.target()
+        return {
+            "name": self.name,
+            "limit": self.current_limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "latency_target_ms": round(target * 1000, 1) if target is not None else None,
+            "total_calls": self.total_calls,
+            "total_rejected": self.total_rejected,
+            "total_timeouts": self.total_timeouts,
+            "total_slow_calls": self.total_slow_calls,
+            "total_failures": self.total_failures,
+        }
+
+
+class BulkheadRegistry:
+    """
+    Registre des bulkheads du processus.
+
+    Usage:
+        registry = get_bulkhead_registry()
+        limiter = registry.get_or_create("llm", initial_limit=4)
+        registry.get_status()  # {"llm": {...}, ...}
+    """
+
+    def __init__(self) -> None:
+        self._bulkheads: dict[str, Bulkhead] = {}
+
+    def get_or_create(self, name: str, **kwargs: Any) -> Bulkhead:
+        """Retourne le bulkhead `name`, créé avec `kwargs` s'il n'existe pas"""
+        limiter = self._bulkheads.get(name)
+        if limiter is None:
+            limiter = self._bulkheads[name] = Bulkhead(name, **kwargs)
+        return limiter
+
+    def get(self, name: str) -> Bulkhead | None:
+        return self._bulkheads.get(name)
+
+    def get_status(self) -> dict[str, dict[str, Any]]:
+        """État de tous les bulkheads du processus"""
+        return {name: b.get_status() for name, b in self._bulkheads.items()}
+
+
+_registry: BulkheadRegistry | None = None
+
+
+def get_bulkhead_registry() -> BulkheadRegistry:
+    """Retourne le registre global (exposé dans la télémétrie)"""
+    global _registry
+    if _registry is None:
+        _registry = BulkheadRegistry()
+        register_source("bulkheads", _registry.get_status)
+    return _registry
+
+
+def get_bulkhead(name: str, **kwargs: Any) -> Bulkhead:
+    """Raccourci : bulkhead `name` du registre global (créé au besoin)"""
+    return get_bulkhead_registry().get_or_create(name, **kwargs)
@@ -10,18 +10,44 @@ Empêche les défaillances en cascade dans THE HIVE.
   HALF_OPEN → Test de récupération, N requêtes autorisées
 
 Transitions :
-  CLOSED  --[failures >= threshold]--> OPEN
+  CLOSED  --[seuil dépassé]----------> OPEN
   OPEN    --[timeout écoulé]---------> HALF_OPEN
   HALF_OPEN --[succès]--------------> CLOSED
   HALF_OPEN --[échec]---------------> OPEN
+
+Fenêtre glissante : les appels sont comptés dans des buckets temporels
+(`window_seconds` découpé en `window_buckets`). Le circuit s'ouvre quand,
+sur la fenêtre :
+  - le nombre d'échecs atteint `failure_threshold`, ou
+  - au moins `minimum_calls` appels ont eu lieu et le taux d'échec
+    atteint `failure_rate_threshold`, ou
+  - le taux d'appels lents (> `slow_call_duration`) atteint
+    `slow_call_rate_threshold`.
+
+Registre : `get_circuit_breaker(name)` crée ou retrouve un breaker du registre
+de processus ; `get_circuit_breaker_registry().get_status()` les expose
+tous. Avec un état partagé Redis (`enable_shared_state`), l'ouverture d'un
+breaker sur un replica ouvre celui des autres replicas.
+
+Avec un bulkhead (`shared.bulkhead`) en aval, ses rejets
+(`BulkheadFullError`) ne comptent ni comme succès ni comme échecs.
+
+Réponses en flux : `async with breaker.call() as call` protège un bloc ;
+`call.responded()` au premier morceau fait du temps jusqu'à la première
+réponse la durée jugée pour les appels lents, pas la durée du flux.
 """
 
 import asyncio
+import contextlib
+import functools
 import logging
 import time
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Type
+
+from shared.bulkhead import BulkheadFullError
+from shared.telemetry import register_source
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +64,81 @@ class CircuitBreakerOpenError(Exception):
     pass
 
 
+class BreakerCall:
+    """Appel en cours à travers un breaker (voir `CircuitBreaker.call`)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._responded: Optional[float] = None
+
+    def responded(self) -> None:
+        """Marque la première réponse : fige la durée jugée de l'appel"""
+        if self._responded is None:
+            self._responded = time.perf_counter()
+
+    def duration(self) -> float:
+        return (self._responded or time.perf_counter()) - self.started
+
+
+class _SlidingWindow:
+    """Compteurs d'appels / échecs / appels lents par bucket temporel"""
+
+    def __init__(self, window_seconds: float, buckets: int):
+        self.bucket_seconds = window_seconds / buckets
+        # [époque du bucket, appels, échecs, appels lents]
+        self._buckets: List[List[int]] = [[-1, 0, 0, 0] for _ in range(buckets)]
+
+    def record(self, failed: bool, slow: bool, now: float) -> None:
+        epoch = int(now // self.bucket_seconds)
+        bucket = self._buckets[epoch % len(self._buckets)]
+        if bucket[0] != epoch:
+            bucket[:] = [epoch, 0, 0, 0]
+        bucket[1] += 1
+        bucket[2] += failed
+        bucket[3] += slow
+
+    def totals(self, now: float) -> Tuple[int, int, int]:
+        """(appels, échecs, appels lents) sur la fenêtre"""
+        oldest = int(now // self.bucket_seconds) - len(self._buckets) + 1
+        calls = failures = slow = 0
+        for epoch, c, f, s in self._buckets:
+            if epoch >= oldest:
+                calls += c
+                failures += f
+                slow += s
+        return calls, failures, slow
+
+    def reset(self) -> None:
+        for bucket in self._buckets:
+            bucket[:] = [-1, 0, 0, 0]
+
+
+class RedisCircuitStore:
+    """
+    État partagé des breakers entre replicas (clé Redis par breaker).
+
+    Un breaker qui s'ouvre écrit son échéance de réouverture
+    (`eva:cb:<nom>`, expirant avec elle) ; les autres replicas relisent la
+    clé au plus une fois par `sync_interval` et s'ouvrent à leur tour.
+    """
+
+    def __init__(self, redis_client: Any, prefix: str = "eva:cb:", sync_interval: float = 1.0):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.sync_interval = sync_interval
+
+    async def publish_open(self, name: str, until: float) -> None:
+        ttl_ms = max(1, int((until - time.time()) * 1000))
+        await self.redis.commands.set(f"{self.prefix}{name}", repr(until), px=ttl_ms)
+
+    async def publish_closed(self, name: str) -> None:
+        await self.redis.commands.delete(f"{self.prefix}{name}")
+
+    async def fetch_open_until(self, name: str) -> Optional[float]:
+        value = await self.redis.commands.get(f"{self.prefix}{name}")
+        return float(value) if value else None
+
+
 class CircuitBreaker:
     """
     Implémentation du pattern Circuit Breaker pour THE HIVE.
@@ -63,27 +164,67 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: int = 30,
         half_open_max_requests: int = 2,
+        window_seconds: float = 60.0,
+        window_buckets: int = 12,
+        minimum_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 0.8,
+        ignore_exceptions: Tuple[Type[BaseException], ...] = (),
     ):
+        """
+        Args:
+            name: Identifiant du breaker (clé du registre et de l'état partagé).
+            failure_threshold: Nombre d'échecs sur la fenêtre ouvrant le circuit.
+            recovery_timeout: Durée (s) en OPEN avant un test HALF_OPEN.
+            half_open_max_requests: Appels de test (et succès requis) en HALF_OPEN.
+            window_seconds: Durée de la fenêtre glissante.
+            window_buckets: Nombre de buckets de la fenêtre (granularité).
+            minimum_calls: Appels minimum sur la fenêtre avant d'évaluer les taux.
+            failure_rate_threshold: Taux d'échec ouvrant le circuit (0-1).
+            slow_call_duration: Durée (s) au-delà de laquelle un appel est lent
+                (None = pas de détection d'appels lents).
+            slow_call_rate_threshold: Taux d'appels lents ouvrant le circuit.
+            ignore_exceptions: Exceptions métier qui ne comptent pas comme
+                des défaillances du service (ex: erreur de validation).
+        """
         self.name = name
         self.state = CircuitState.CLOSED
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.half_open_max_requests = half_open_max_requests
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.ignore_exceptions = ignore_exceptions
+        self.window_seconds = window_seconds
+        self._window = _SlidingWindow(window_seconds, window_buckets)
 
-        self.failures = 0
         self.successes_in_half_open = 0
         self.half_open_requests = 0
         self.last_failure_time: Optional[float] = None
         self.last_state_change: float = time.time()
+        self.open_until: Optional[float] = None
         self.total_calls = 0
         self.total_failures = 0
+        self.total_slow_calls = 0
         self.total_rejected = 0
 
+        self.store: Optional[RedisCircuitStore] = None
+        self._last_sync = 0.0
+
         logger.info(
             f"⚡ Circuit Breaker '{name}' initialisé "
-            f"(seuil={failure_threshold}, recovery={recovery_timeout}s)"
+            f"(seuil={failure_threshold}, taux={failure_rate_threshold:.0%}, "
+            f"fenêtre={window_seconds:g}s, recovery={recovery_timeout}s)"
         )
 
+    @property
+    def failures(self) -> int:
+        """Échecs sur la fenêtre glissante"""
+        return self._window.totals(time.time())[1]
+
     def _transition(self, new_state: CircuitState) -> None:
         """Transition d'état avec logging"""
         old = self.state
@@ -91,6 +232,7 @@ class CircuitBreaker:
         self.last_state_change = time.time()
 
         if new_state == CircuitState.OPEN:
+            self.open_until = self.last_state_change + self.recovery_timeout
             logger.error(f"🔴 CB '{self.name}': {old} → OPEN (service défaillant)")
         elif new_state == CircuitState.HALF_OPEN:
             logger.warning(f"🟡 CB '{self.name}': {old} → HALF_OPEN (test récupération)")
@@ -98,46 +240,93 @@ class CircuitBreaker:
             self.successes_in_half_open = 0
         elif new_state == CircuitState.CLOSED:
             logger.info(f"🟢 CB '{self.name}': {old} → CLOSED (service rétabli)")
-            self.failures = 0
+            self.open_until = None
+            self._window.reset()
 
     def _check_state(self) -> None:
         """Vérifie les transitions automatiques (OPEN → HALF_OPEN)"""
-        if self.state == CircuitState.OPEN and self.last_failure_time:
-            if time.time() - self.last_failure_time > self.recovery_timeout:
+        if self.state == CircuitState.OPEN and self.open_until is not None:
+            if time.time() >= self.open_until:
                 self._transition(CircuitState.HALF_OPEN)
 
-    def _record_success(self) -> None:
-        """Enregistre un succès"""
-        if self.state == CircuitState.HALF_OPEN:
-            self.successes_in_half_open += 1
-            if self.successes_in_half_open >= self.half_open_max_requests:
-                self._transition(CircuitState.CLOSED)
-        elif self.state == CircuitState.CLOSED:
-            # Reset progressif des failures sur succès
-            self.failures = max(0, self.failures - 1)
+    def _should_trip(self, now: float) -> bool:
+        calls, failures, slow = self._window.totals(now)
+        if failures >= self.failure_threshold:
+            return True
+        if calls < self.minimum_calls:
+            return False
+        return (
+            failures / calls >= self.failure_rate_threshold
+            or (self.slow_call_duration is not None and slow / calls >= self.slow_call_rate_threshold)
+        )
 
-    def _record_failure(self) -> None:
-        """Enregistre un échec"""
-        self.failures += 1
-        self.total_failures += 1
-        self.last_failure_time = time.time()
+    def _record(self, failed: bool, duration: float) -> None:
+        """Enregistre l'issue d'un appel et applique les transitions"""
+        now = time.time()
+        slow = self.slow_call_duration is not None and duration > self.slow_call_duration
+        self.total_slow_calls += slow
+        if failed:
+            self.total_failures += 1
+            self.last_failure_time = now
 
         if self.state == CircuitState.HALF_OPEN:
-            self._transition(CircuitState.OPEN)
+            if failed or slow:
+                self._transition(CircuitState.OPEN)
+            else:
+                self.successes_in_half_open += 1
+                if self.successes_in_half_open >= self.half_open_max_requests:
+                    self._transition(CircuitState.CLOSED)
         elif self.state == CircuitState.CLOSED:
-            if self.failures >= self.failure_threshold:
+            self._window.record(failed, slow, now)
+            if self._should_trip(now):
                 self._transition(CircuitState.OPEN)
 
-    async def execute(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
-        """Exécute une fonction à travers le circuit breaker"""
+    async def _sync(self) -> None:
+        """Aligne l'état local sur l'état partagé (au plus une fois par intervalle)"""
+        now = time.time()
+        if self.store is None or now - self._last_sync < self.store.sync_interval:
+            return
+        self._last_sync = now
+        try:
+            open_until = await self.store.fetch_open_until(self.name)
+        except Exception as e:
+            logger.debug(f"CB '{self.name}': état partagé indisponible ({e})")
+            return
+        if open_until and open_until > now and self.state != CircuitState.OPEN:
+            logger.warning(f"CB '{self.name}': ouvert par un autre replica")
+            self._transition(CircuitState.OPEN)
+            self.open_until = open_until
+
+    async def _share(self, previous: CircuitState) -> None:
+        """Publie une ouverture / fermeture locale vers l'état partagé"""
+        if self.store is None or self.state == previous:
+            return
+        try:
+            if self.state == CircuitState.OPEN:
+                await self.store.publish_open(self.name, self.open_until)
+            elif self.state == CircuitState.CLOSED:
+                await self.store.publish_closed(self.name)
+        except Exception as e:
+            logger.debug(f"CB '{self.name}': publication de l'état partagé impossible ({e})")
+
+    @contextlib.asynccontextmanager
+    async def call(self) -> AsyncIterator[BreakerCall]:
+        """
+        Protège le bloc comme un appel du breaker.
+
+        La durée jugée (appels lents) est celle du bloc, ou le délai jusqu'à
+        `call.responded()` s'il est appelé (réponses en flux).
+        """
+        await self._sync()
         self._check_state()
         self.total_calls += 1
 
         if self.state == CircuitState.OPEN:
             self.total_rejected += 1
+            retry_in = max(0.0, (self.open_until or 0) - time.time())
             raise CircuitBreakerOpenError(
                 f"Circuit Breaker '{self.name}' est OPEN. "
-                f"Retry dans {self.recovery_timeout}s."
+                f"Retry dans {retry_in:.0f}s."
             )
 
         if self.state == CircuitState.HALF_OPEN:
@@ -148,31 +337,57 @@ class CircuitBreaker:
                     f"Circuit Breaker '{self.name}' HALF_OPEN — quota de test atteint."
                 )
 
+        previous = self.state
+        call = BreakerCall()
         try:
-            result = await func(*args, **kwargs)
-            self._record_success()
-            return result
-        except Exception as e:
-            self._record_failure()
+            yield call
+        except (asyncio.CancelledError, BulkheadFullError):
+            # Annulation ou rejet de charge local (bulkhead interne) : ni succès
+            # ni échec, le créneau de test HALF_OPEN est rendu
+            if previous == CircuitState.HALF_OPEN and self.state == CircuitState.HALF_OPEN:
+                self.half_open_requests = max(0, self.half_open_requests - 1)
+            raise
+        except self.ignore_exceptions:
+            self._record(False, call.duration())
             raise
+        except Exception:
+            self._record(True, call.duration())
+            await self._share(previous)
+            raise
+        self._record(False, call.duration())
+        await self._share(previous)
+
+    async def execute(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Exécute une fonction à travers le circuit breaker"""
+        async with self.call():
+            return await func(*args, **kwargs)
 
     def __call__(self, func: Callable) -> Callable:
         """Utilisable comme décorateur"""
+        @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             return await self.execute(func, *args, **kwargs)
-        wrapper.__name__ = func.__name__
-        wrapper.__doc__ = func.__doc__
         return wrapper
 
     def get_status(self) -> Dict[str, Any]:
         """Retourne l'état complet du circuit breaker"""
         self._check_state()
+        calls, failures, slow = self._window.totals(time.time())
         return {
             "name": self.name,
             "state": self.state.value,
-            "failures": self.failures,
+            "failures": failures,
             "failure_threshold": self.failure_threshold,
             "recovery_timeout": self.recovery_timeout,
+            "window": {
+                "seconds": self.window_seconds,
+                "calls": calls,
+                "failures": failures,
+                "slow_calls": slow,
+                "failure_rate": round(failures / calls, 3) if calls else 0.0,
+                "slow_call_rate": round(slow / calls, 3) if calls else 0.0,
+            },
+            "shared": self.store is not None,
             "last_failure_time": (
                 datetime.fromtimestamp(self.last_failure_time).isoformat()
                 if self.last_failure_time
@@ -181,5 +396,61 @@ class CircuitBreaker:
             "time_in_state_seconds": round(time.time() - self.last_state_change, 1),
             "total_calls": self.total_calls,
             "total_failures": self.total_failures,
+            "total_slow_calls": self.total_slow_calls,
             "total_rejected": self.total_rejected,
         }
+
+
+class CircuitBreakerRegistry:
+    """
+    Registre des circuit breakers du processus.
+
+    Usage:
+        registry = get_circuit_breaker_registry()
+        cb = registry.get_or_create("llm", failure_threshold=3)
+        registry.get_status()  # {"llm": {...}, ...}
+    """
+
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._store: Optional[RedisCircuitStore] = None
+
+    def get_or_create(self, name: str, **kwargs: Any) -> CircuitBreaker:
+        """Retourne le breaker `name`, créé avec `kwargs` s'il n'existe pas"""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **kwargs)
+            breaker.store = self._store
+            self._breakers[name] = breaker
+        return breaker
+
+    def get(self, name: str) -> Optional[CircuitBreaker]:
+        return self._breakers.get(name)
+
+    def enable_shared_state(self, redis_client: Any, sync_interval: float = 1.0) -> None:
+        """Partage l'état des breakers (existants et futurs) via Redis"""
+        self._store = RedisCircuitStore(redis_client, sync_interval=sync_interval)
+        for breaker in self._breakers.values():
+            breaker.store = self._store
+        logger.info("⚡ État des circuit breakers partagé via Redis")
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """État de tous les breakers du processus"""
+        return {name: cb.get_status() for name, cb in self._breakers.items()}
+
+
+_registry: Optional[CircuitBreakerRegistry] = None
+
+
+def get_circuit_breaker_registry() -> CircuitBreakerRegistry:
+    """Retourne le registre global (exposé dans la télémétrie)"""
+    global _registry
+    if _registry is None:
+        _registry = CircuitBreakerRegistry()
+        register_source("circuit_breakers", _registry.get_status)
+    return _registry
+
+
+def get_circuit_breaker(name: str, **kwargs: Any) -> CircuitBreaker:
+    """Raccourci : breaker `name` du registre global (créé au besoin)"""
+    return get_circuit_breaker_registry().get_or_create(name, **kwargs)
@@ -0,0 +1,199 @@
+"""
+Codec — Sérialisation rapide des messages inter-agents
+══════════════════════════════════════════════════════
+
+Couche de (dé)sérialisation commune à Redis, MQTT et WebSocket.
+
+Backends :
+  json    → stdlib, référence (lent)
+  orjson  → JSON natif Rust, 5-10x plus rapide, sortie JSON standard
+  msgpack → binaire compact, préfixé par MSGPACK_PREFIX
+
+Format auto-descriptif :
+  - Les payloads JSON (json/orjson) ne portent aucun préfixe : les anciens
+    consumers `json.loads` continuent de fonctionner.
+  - Les payloads msgpack commencent par l'octet 0xC1, jamais utilisé par
+    msgpack et invalide en début de JSON/UTF-8. `decode()` détecte donc
+    le format sans configuration côté lecteur.
+
+Dépendances optionnelles : orjson, msgpack. Si absentes, le codec bascule
+sur le JSON stdlib.
+"""
+
+import json
+import logging
+import sys
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Octet 0xC1 : "never used" dans la spec msgpack, invalide en UTF-8
+MSGPACK_PREFIX = b"\xc1"
+
+
+class CodecError(ValueError):
+    """Levée quand un payload ne peut pas être décodé."""
+    pass
+
+
+def _default(obj: Any) -> Any:
+    """
+    Conversion des types non natifs (UUID, dates, Decimal, modèles, numpy).
+
+    Raises:
+        TypeError: Type inconnu (jamais converti silencieusement en texte).
+    """
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    # Scalaires et tableaux numpy (VaR, symlog de math_ops) : valeurs natives.
+    # numpy n'est pas importé ici : s'il ne l'est pas déjà, obj n'en vient pas.
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+    raise TypeError(f"Type non sérialisable: {type(obj).__qualname__}")
+
+
+def _to_plain(obj: Any) -> Any:
+    """Aplatit un modèle Pydantic en dict (les autres valeurs sont inchangées)"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    return obj
+
+
+class Codec(ABC):
+    """Interface d'un codec de transport"""
+
+    name = "base"
+    binary = False
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        """Sérialise un message (dict ou modèle Pydantic)"""
+
+    def decode(self, data: bytes | str) -> Any:
+        return decode(data)
+
+
+class JSONCodec(Codec):
+    """JSON stdlib (référence, compatible avec tous les consumers)"""
+
+    name = "json"
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(_to_plain(obj), default=_default).encode()
+
+
+class OrjsonCodec(Codec):
+    """JSON via orjson (même format que JSONCodec, beaucoup plus rapide)"""
+
+    name = "orjson"
+
+    def encode(self, obj: Any) -> bytes:
+        return orjson.dumps(
+            _to_plain(obj),
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
+class MsgpackCodec(Codec):
+    """msgpack binaire préfixé (lecteurs à jour uniquement)"""
+
+    name = "msgpack"
+    binary = True
+
+    def encode(self, obj: Any) -> bytes:
+        return MSGPACK_PREFIX + msgpack.packb(
+            _to_plain(obj), default=_default, use_bin_type=True
+        )
+
+
+def decode(data: bytes | str) -> Any:
+    """
+    Décode un payload quel que soit le codec qui l'a produit.
+
+    Raises:
+        CodecError: Payload corrompu ou format inconnu.
+    """
+    try:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+            if data[:1] == MSGPACK_PREFIX:
+                if not MSGPACK_AVAILABLE:
+                    raise CodecError("Payload msgpack reçu mais msgpack non installé")
+                return msgpack.unpackb(data[1:], raw=False)
+        if ORJSON_AVAILABLE:
+            return orjson.loads(data)
+        return json.loads(data)
+    except CodecError:
+        raise
+    except ValueError as e:
+        raise CodecError(str(e)) from e
+
+
+_CODECS: dict[str, Codec] = {"json": JSONCodec()}
+if ORJSON_AVAILABLE:
+    _CODECS["orjson"] = OrjsonCodec()
+if MSGPACK_AVAILABLE:
+    _CODECS["msgpack"] = MsgpackCodec()
+
+
+def get_codec(name: str | None = None) -> Codec:
+    """
+    Retourne le codec demandé (défaut: `settings.wire_codec`).
+
+    Bascule sur le JSON stdlib si la dépendance optionnelle est absente.
+    """
+    if name is None:
+        from shared.config import get_settings
+
+        name = get_settings().wire_codec
+    codec = _CODECS.get(name)
+    if codec is None:
+        logger.warning(f"Codec '{name}' indisponible, repli sur json")
+        codec = _CODECS["json"]
+    return codec
+
+
+def get_text_codec(name: str | None = None) -> Codec:
+    """
+    Codec garantissant une sortie JSON texte (WebSocket navigateur, logs).
+
+    Si le codec configuré est binaire, orjson (ou json) est utilisé.
+    """
+    codec = get_codec(name)
+    if codec.binary:
+        codec = _CODECS.get("orjson", _CODECS["json"])
+    return codec
@@ -36,6 +36,8 @@ class Settings(BaseSettings):
     jwt_secret_key: SecretStr = Field(default=SecretStr("dev-secret-change-in-prod"))
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
+    # Attente de la réponse d'un expert sur /chat avant l'accusé de consultation
+    chat_expert_timeout_seconds: float = 5.0
 
     # ═══════════════════════════════════════════════════════════════════════════
     # LLM SERVER
@@ -57,6 +59,84 @@ class Settings(BaseSettings):
     redis_password: SecretStr = Field(default=SecretStr(""))
     redis_db: int = 0
 
+    # Pools de connexions (commandes / écoute Pub/Sub et Streams bloquante)
+    redis_max_connections: int = 50
+    redis_listener_max_connections: int = 10
+    redis_socket_timeout: float = 5.0
+    redis_socket_connect_timeout: float = 2.0
+    redis_health_check_interval: int = 30
+    # Retry des commandes et reconnexion des écoutes (backoff exponentiel + jitter)
+    redis_retry_attempts: int = 3
+    redis_reconnect_backoff_base: float = 0.1
+    redis_reconnect_backoff_max: float = 10.0
+
+    # Mode Streams (opt-in) : livraison at-least-once pour les channels critiques
+    redis_streams_enabled: bool = False
+    redis_stream_channels: list[str] = Field(
+        default_factory=lambda: ["eva.compliance.trades", "eva.banker.trades"]
+    )
+    redis_stream_maxlen: int = 10_000
+    redis_stream_batch_size: int = 64
+    redis_stream_block_ms: int = 1000
+    redis_stream_reclaim_idle_ms: int = 60_000
+    redis_stream_max_deliveries: int = 5  # Au-delà : entrée versée dans eva.dead_letter (0 = jamais)
+    redis_stream_consumer: str = ""  # Défaut: hostname (stable entre redémarrages Docker)
+    # Coalescence des écritures concurrentes en pipelines (0 = désactivé)
+    redis_auto_batch_window_ms: float = 0.0
+    # Near-cache en processus devant cache_get : préfixe → TTL local (s), vide = désactivé
+    # (ex: {"nemesis:": 1.0}). Opt-in : l'invalidation exige les notifications
+    # keyspace côté serveur (`notify-keyspace-events K$gxe` dans redis.conf) ;
+    # à défaut, le client tente un CONFIG SET au démarrage
+    redis_near_cache_prefixes: dict[str, float] = Field(default_factory=dict)
+    redis_near_cache_max_entries: int = 1024
+    # Circuit breakers : ouverture partagée entre replicas via Redis
+    circuit_breaker_shared_state: bool = False
+
+    # Codec des messages inter-agents (Redis, MQTT, WebSocket)
+    # orjson reste du JSON standard ; msgpack exige des lecteurs à jour
+    wire_codec: Literal["json", "orjson", "msgpack"] = "orjson"
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # CACHE DE ROUTAGE (Strategy Orchestrator)
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Décisions de routage réutilisées (TTL 0 = désactivé)
+    routing_cache_ttl_seconds: float = 300.0
+    routing_cache_max_entries: int = 2048
+    routing_cache_shared: bool = False  # Niveau Redis partagé entre replicas
+    # Règles de contournement : décisions incertaines ou porteuses d'entités
+    # jamais réutilisées, messages chiffrés (lots, prix) toujours ré-analysés
+    routing_cache_min_confidence: float = 0.7
+    routing_cache_skip_entities: bool = True
+    routing_cache_bypass_intents: list[str] = Field(default_factory=lambda: ["TRADING_ORDER"])
+    routing_cache_bypass_patterns: list[str] = Field(default_factory=lambda: [r"\d"])
+    routing_cache_max_chars: int = 200
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # MQTT (Critical Path)
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Outbox hors-ligne : publications QoS 1/2 conservées sans broker
+    mqtt_outbox_max_messages: int = 10_000
+    mqtt_outbox_dir: str = ""  # Vide = outbox en mémoire (perdue au redémarrage)
+    mqtt_outbox_ttl_seconds: float = 60.0
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # OBSERVABILITÉ
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Échantillonnage système en tâche de fond (psutil hors chemin des requêtes)
+    system_sampler_interval_seconds: float = 5.0
+    system_sampler_history: int = 120  # Instantanés conservés (10 min à 5 s)
+    # Traces distribuées : "otlp" (collecteur OTLP/HTTP) ou "jsonl" (fichier local)
+    tracing_exporter: Literal["none", "otlp", "jsonl"] = "none"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_jsonl_path: str = "data/traces.jsonl"
+    tracing_sample_ratio: float = 1.0  # Fraction des traces racines conservées
+    # Watchdog de la boucle asyncio : services surveillés (["*"] = tous)
+    loop_watchdog_services: list[str] = Field(default_factory=list)
+    loop_watchdog_interval_seconds: float = 0.1
+    loop_watchdog_threshold_seconds: float = 0.25  # Retard au-delà duquel la pile est capturée
+    # Routes /debug (profil CPU, tâches, tracemalloc), jeton interne exigé
+    debug_endpoints_enabled: bool = True
+
     # ═══════════════════════════════════════════════════════════════════════════
     # QDRANT
     # ═══════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,467 @@
+"""
+Dispatcher — Exécution concurrente et bornée des callbacks inter-agents
+═══════════════════════════════════════════════════════════════════════
+
+Découple la lecture des messages (Pub/Sub, Streams) de l'exécution des
+callbacks : un callback lent (ex: notification Telegram) ne bloque plus
+les autres channels de la même connexion.
+
+Chaque channel dispose de son propre pool de workers :
+  - `concurrency` workers, chacun avec une file bornée (`max_queue`).
+  - Ordonnancement par clé : les messages de même clé (`ordering_key`)
+    sont toujours traités par le même worker, donc dans l'ordre.
+  - Politique de débordement quand la file est pleine :
+      BLOCK       → le lecteur attend (backpressure)
+      DROP_OLDEST → le plus ancien message en attente est abandonné
+      SHED        → le nouveau message est rejeté
+
+Voies de priorité : la file de chaque worker est découpée en trois voies
+(CRITICAL, NORMAL, BULK), servies par un round-robin pondéré lissé. Un
+flot de télémétrie ne retarde donc plus une requête de trading du même
+channel. La voie vient du champ `priority` du message, sinon de la
+politique du channel.
+
+TTL : un message portant `timestamp` et `ttl_seconds` (AgentMessage) déjà
+expiré n'est jamais passé au handler ; il est abandonné ou envoyé en
+dead-letter selon `on_expired`.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+from shared.models import MessagePriority
+
+logger = logging.getLogger(__name__)
+
+# Poids par défaut du round-robin entre voies (8:3:1)
+DEFAULT_LANE_WEIGHTS: dict[MessagePriority, int] = {
+    MessagePriority.CRITICAL: 8,
+    MessagePriority.NORMAL: 3,
+    MessagePriority.BULK: 1,
+}
+
+
+class OverflowPolicy(str, Enum):
+    """Comportement quand la file d'un worker est pleine"""
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SHED = "shed"
+
+
+class ExpiryPolicy(str, Enum):
+    """Sort d'un message dont le TTL est dépassé"""
+    DROP = "drop"
+    DEAD_LETTER = "dead_letter"
+
+
+@dataclass
+class ChannelPolicy:
+    """
+    Configuration de dispatch d'un channel.
+
+    Attributes:
+        concurrency: Nombre de workers (callbacks exécutés en parallèle).
+        max_queue: Taille maximale de la file de chaque worker.
+        overflow: Politique appliquée quand la file est pleine.
+        ordering_key: Extrait une clé du message ; même clé → même worker
+            (ordre garanti). Sans clé, répartition round-robin.
+        priority: Voie des messages sans champ `priority`.
+        on_expired: Abandon ou dead-letter des messages expirés.
+    """
+    concurrency: int = 1
+    max_queue: int = 1000
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    ordering_key: Callable[[dict], Any] | None = None
+    priority: MessagePriority = MessagePriority.NORMAL
+    on_expired: ExpiryPolicy = ExpiryPolicy.DROP
+
+
+# Callback de fin de traitement : (acquittable) — True si traité ou expiré,
+# False en cas d'échec ou de rejet par la file
+CompletionCallback = Callable[[bool], None]
+# Destination des messages expirés : (channel, message)
+DeadLetterHandler = Callable[[str, dict], Awaitable[None]]
+
+_Item = tuple[dict, CompletionCallback | None]
+
+
+def is_expired(data: Any) -> bool:
+    """
+    Indique si le TTL d'un message est dépassé.
+
+    Sans `timestamp` exploitable ou avec `ttl_seconds <= 0`, le message
+    n'expire jamais. Un timestamp naïf est comparé à l'heure locale
+    (comme `AgentMessage.timestamp`).
+    """
+    if not isinstance(data, dict):
+        return False
+    ttl = data.get("ttl_seconds")
+    timestamp = data.get("timestamp")
+    if not isinstance(ttl, (int, float)) or ttl <= 0 or timestamp is None:
+        return False
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            return False
+    if not isinstance(timestamp, datetime):
+        return False
+    return (datetime.now(timestamp.tzinfo) - timestamp).total_seconds() > ttl
+
+
+class _LaneQueue:
+    """
+    File d'un worker : une deque bornée par voie de priorité.
+
+    Même contrat qu'asyncio.Queue (put/get bloquants, task_done/join) ;
+    `get` choisit la voie par round-robin pondéré lissé, donc sans famine
+    des voies basses.
+    """
+
+    def __init__(self, maxsize: int, weights: dict[MessagePriority, int]):
+        self.maxsize = maxsize
+        self._weights = weights
+        self._lanes: dict[MessagePriority, deque[_Item]] = {
+            lane: deque() for lane in MessagePriority
+        }
+        self._credits: dict[MessagePriority, int] = dict.fromkeys(MessagePriority, 0)
+        self._getters: deque[asyncio.Future] = deque()
+        self._putters: dict[MessagePriority, deque[asyncio.Future]] = {
+            lane: deque() for lane in MessagePriority
+        }
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def qsize(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def lane_size(self, lane: MessagePriority) -> int:
+        return len(self._lanes[lane])
+
+    def full(self, lane: MessagePriority) -> bool:
+        return len(self._lanes[lane]) >= self.maxsize
+
+    async def put(self, lane: MessagePriority, item: _Item) -> None:
+        while self.full(lane):
+            await self._wait(self._putters[lane])
+        self.put_nowait(lane, item)
+
+    def put_nowait(self, lane: MessagePriority, item: _Item) -> None:
+        self._lanes[lane].append(item)
+        self._unfinished += 1
+        self._finished.clear()
+        self._wakeup(self._getters)
+
+    async def get(self) -> _Item:
+        while not self.qsize():
+            await self._wait(self._getters)
+        return self._pop(self._next_lane())
+
+    def pop_oldest(self, lane: MessagePriority) -> _Item:
+        """Retire le plus ancien message d'une voie (DROP_OLDEST)"""
+        item = self._pop(lane)
+        self.task_done()
+        return item
+
+    def task_done(self) -> None:
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        if self._unfinished:
+            await self._finished.wait()
+
+    def _pop(self, lane: MessagePriority) -> _Item:
+        item = self._lanes[lane].popleft()
+        if not self._lanes[lane]:
+            self._credits[lane] = 0
+        self._wakeup(self._putters[lane])
+        return item
+
+    def _next_lane(self) -> MessagePriority:
+        ready = [lane for lane, items in self._lanes.items() if items]
+        if len(ready) == 1:
+            return ready[0]
+        total = 0
+        for lane in ready:
+            self._credits[lane] += self._weights[lane]
+            total += self._weights[lane]
+        lane = max(ready, key=self._credits.__getitem__)
+        self._credits[lane] -= total
+        return lane
+
+    @staticmethod
+    async def _wait(waiters: deque[asyncio.Future]) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in waiters:
+                waiters.remove(waiter)
+            elif not waiter.cancelled():
+                # Réveil reçu mais non consommé : on le transmet
+                _LaneQueue._wakeup(waiters)
+            raise
+
+    @staticmethod
+    def _wakeup(waiters: deque[asyncio.Future]) -> None:
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+
+class _ChannelPool:
+    """Pool de workers d'un channel"""
+
+    def __init__(
+        self,
+        channel: str,
+        policy: ChannelPolicy,
+        handler: Callable[[str, dict], Awaitable[None]],
+        latency_window: int,
+        lane_weights: dict[MessagePriority, int],
+        dead_letter: DeadLetterHandler | None,
+    ):
+        self.channel = channel
+        self.policy = policy
+        self._handler = handler
+        self._dead_letter = dead_letter
+        self._queues: list[_LaneQueue] = [
+            _LaneQueue(policy.max_queue, lane_weights) for _ in range(max(1, policy.concurrency))
+        ]
+        self._round_robin = itertools.cycle(range(len(self._queues)))
+        self._workers = [
+            asyncio.create_task(self._worker(q), name=f"dispatch:{channel}:{i}")
+            for i, q in enumerate(self._queues)
+        ]
+
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.expired = 0
+        self.dead_lettered = 0
+        self.in_flight = 0
+        self._latencies: deque = deque(maxlen=latency_window)
+
+    def _lane(self, data: dict) -> MessagePriority:
+        value = data.get("priority") if isinstance(data, dict) else None
+        if value is None:
+            return self.policy.priority
+        try:
+            return MessagePriority(value)
+        except ValueError:
+            return self.policy.priority
+
+    def _select_queue(self, data: dict) -> _LaneQueue:
+        if self.policy.ordering_key is None or len(self._queues) == 1:
+            return self._queues[next(self._round_robin)]
+        try:
+            key = self.policy.ordering_key(data)
+        except Exception:
+            key = None
+        return self._queues[hash(key) % len(self._queues)]
+
+    async def submit(self, data: dict, on_done: CompletionCallback | None) -> bool:
+        """Enfile un message. Retourne False s'il a été rejeté (SHED)."""
+        if is_expired(data):
+            await self._expire(data, on_done)
+            return True
+
+        queue = self._select_queue(data)
+        lane = self._lane(data)
+        item = (data, on_done)
+
+        if self.policy.overflow == OverflowPolicy.BLOCK:
+            await queue.put(lane, item)
+            return True
+
+        if queue.full(lane):
+            self.dropped += 1
+            if self.policy.overflow == OverflowPolicy.SHED:
+                logger.warning(f"Dispatch {self.channel}: file pleine, message rejeté")
+                if on_done:
+                    on_done(False)
+                return False
+            # DROP_OLDEST
+            _, dropped_done = queue.pop_oldest(lane)
+            logger.warning(f"Dispatch {self.channel}: file pleine, plus ancien message abandonné")
+            if dropped_done:
+                dropped_done(False)
+
+        queue.put_nowait(lane, item)
+        return True
+
+    async def _expire(self, data: dict, on_done: CompletionCallback | None) -> None:
+        """Écarte un message expiré (acquitté : le rejouer n'a plus de sens)"""
+        self.expired += 1
+        if self.policy.on_expired == ExpiryPolicy.DEAD_LETTER and self._dead_letter:
+            try:
+                await self._dead_letter(self.channel, data)
+                self.dead_lettered += 1
+            except Exception as e:
+                logger.error(f"Dispatch {self.channel}: dead-letter impossible: {e}")
+        else:
+            logger.debug(f"Dispatch {self.channel}: message expiré abandonné")
+        if on_done:
+            on_done(True)
+
+    async def _worker(self, queue: _LaneQueue) -> None:
+        while True:
+            data, on_done = await queue.get()
+            if is_expired(data):
+                try:
+                    await self._expire(data, on_done)
+                finally:
+                    queue.task_done()
+                continue
+            self.in_flight += 1
+            start = time.perf_counter()
+            ok = True
+            try:
+                await self._handler(self.channel, data)
+            except Exception as e:
+                ok = False
+                logger.exception(f"Erreur callback sur {self.channel}: {e}")
+            finally:
+                self.in_flight -= 1
+                self._latencies.append(time.perf_counter() - start)
+                queue.task_done()
+
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+            if on_done:
+                on_done(ok)
+
+    @property
+    def depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    async def drain(self) -> None:
+        """Attend que toutes les files soient vides"""
+        await asyncio.gather(*(q.join() for q in self._queues))
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+
+    def get_stats(self) -> dict[str, Any]:
+        latencies = sorted(self._latencies)
+        n = len(latencies)
+        return {
+            "concurrency": len(self._queues),
+            "overflow": self.policy.overflow.value,
+            "queue_depth": self.depth,
+            "queue_capacity": self.policy.max_queue * len(self._queues) * len(MessagePriority),
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "expired": self.expired,
+            "dead_lettered": self.dead_lettered,
+            "lane_depth": {
+                lane.value: sum(q.lane_size(lane) for q in self._queues)
+                for lane in MessagePriority
+            },
+            "handler_latency_avg_ms": round(sum(latencies) / n * 1000, 2) if n else 0.0,
+            "handler_latency_p95_ms": (
+                round(latencies[min(int(n * 0.95), n - 1)] * 1000, 2) if n else 0.0
+            ),
+            "handler_latency_max_ms": round(latencies[-1] * 1000, 2) if n else 0.0,
+        }
+
+
+class ChannelDispatcher:
+    """
+    Dispatcher de messages avec un pool de workers par channel.
+
+    Usage:
+        dispatcher = ChannelDispatcher(handler)
+        dispatcher.configure("eva.banker.trades", ChannelPolicy(concurrency=4))
+        await dispatcher.submit("eva.banker.trades", data)
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, dict], Awaitable[None]],
+        default_policy: ChannelPolicy | None = None,
+        latency_window: int = 100,
+        dead_letter: DeadLetterHandler | None = None,
+        lane_weights: dict[MessagePriority, int] | None = None,
+    ):
+        self._handler = handler
+        self._default_policy = default_policy or ChannelPolicy()
+        self._latency_window = latency_window
+        self._dead_letter = dead_letter
+        self._lane_weights = {**DEFAULT_LANE_WEIGHTS, **(lane_weights or {})}
+        self._policies: dict[str, ChannelPolicy] = {}
+        self._pools: dict[str, _ChannelPool] = {}
+
+    def configure(self, channel: str, policy: ChannelPolicy) -> None:
+        """Définit la politique d'un channel (avant le premier message)"""
+        if channel in self._pools:
+            logger.warning(f"Dispatch {channel}: pool déjà démarré, politique ignorée")
+            return
+        self._policies[channel] = policy
+
+    def _get_pool(self, channel: str) -> _ChannelPool:
+        pool = self._pools.get(channel)
+        if pool is None:
+            policy = self._policies.get(channel, self._default_policy)
+            pool = _ChannelPool(
+                channel,
+                policy,
+                self._handler,
+                self._latency_window,
+                self._lane_weights,
+                self._dead_letter,
+            )
+            self._pools[channel] = pool
+        return pool
+
+    async def submit(
+        self,
+        channel: str,
+        data: dict,
+        on_done: CompletionCallback | None = None,
+    ) -> bool:
+        """
+        Soumet un message au pool du channel.
+
+        Args:
+            channel: Channel d'origine.
+            data: Message décodé.
+            on_done: Appelé avec True (succès) ou False (échec / abandon)
+                une fois le message traité.
+
+        Returns:
+            bool: False si le message a été rejeté immédiatement.
+        """
+        return await self._get_pool(channel).submit(data, on_done)
+
+    async def drain(self) -> None:
+        """Attend la fin du traitement de tous les messages en file"""
+        await asyncio.gather(*(pool.drain() for pool in self._pools.values()))
+
+    def close(self) -> None:
+        """Arrête tous les workers"""
+        for pool in self._pools.values():
+            pool.close()
+        self._pools.clear()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Profondeur de file (par voie), compteurs et latence des handlers par channel"""
+        return {channel: pool.get_stats() for channel, pool in self._pools.items()}
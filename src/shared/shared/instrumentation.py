@@ -0,0 +1,224 @@
+"""
+Instrumentation HTTP — Métriques par route pour les experts THE HIVE
+═══════════════════════════════════════════════════════════════════
+
+Middleware ASGI pur (sans BaseHTTPMiddleware ni tâche intermédiaire) qui
+alimente la `Telemetry` du processus pour chaque requête HTTP :
+
+  - hive_http_request_duration_seconds{method, route}   histogramme
+  - hive_http_requests_total{method, route, status}     compteur
+  - hive_http_requests_in_flight                        jauge
+  - hive_http_request_bytes_total{method, route}        compteur
+  - hive_http_response_bytes_total{method, route}       compteur
+
+La route est le gabarit FastAPI (`/agents/{agent_id}`), pas le chemin
+brut, pour garder une cardinalité bornée ; les chemins sans route
+correspondante sont regroupés sous `<unmatched>`.
+
+Usage (dans le lifespan de chaque service) :
+    instrument_app(app, "core")
+    yield
+    await uninstrument_app(app)
+"""
+
+import logging
+import time
+from typing import Any, Callable
+
+from shared.config import get_settings
+from shared.loop_watchdog import get_loop_watchdog, watchdog_enabled_for
+from shared.profiling import attach_debug_routes
+from shared.system_sampler import get_system_sampler
+from shared.telemetry import (
+    PROMETHEUS_CONTENT_TYPE,
+    LatencyHistogram,
+    Telemetry,
+    get_telemetry,
+)
+from shared.tracing import TracingMiddleware, get_tracer
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _RouteSeries:
+    """Séries d'un couple (méthode, route), résolues une seule fois"""
+
+    __slots__ = ("duration", "request_bytes", "response_bytes", "statuses")
+
+    def __init__(self, telemetry: Telemetry, method: str, route: str):
+        self.duration: LatencyHistogram = telemetry.histogram(
+            "hive_http_request_duration_seconds", method=method, route=route
+        )
+        self.request_bytes = telemetry.counter("hive_http_request_bytes_total", method=method, route=route)
+        self.response_bytes = telemetry.counter("hive_http_response_bytes_total", method=method, route=route)
+        self.statuses: dict[int, Callable[..., None]] = {}
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI de métriques HTTP par route.
+
+    Les séries sont résolues une fois par couple (méthode, route) puis
+    gardées en cache : le coût par requête se limite à deux horloges et
+    quelques incréments.
+    """
+
+    def __init__(self, app: Callable, telemetry: Telemetry):
+        self.app = app
+        self.telemetry = telemetry
+        self.in_flight = 0
+        self._set_in_flight = telemetry.gauge("hive_http_requests_in_flight")
+        self._routes: dict[tuple[str, str], _RouteSeries] = {}
+
+    def _series(self, method: str, route: str) -> _RouteSeries:
+        series = self._routes.get((method, route))
+        if series is None:
+            series = self._routes[(method, route)] = _RouteSeries(self.telemetry, method, route)
+        return series
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        telemetry = self.telemetry
+        status = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_wrapper() -> dict[str, Any]:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        self.in_flight += 1
+        self._set_in_flight(self.in_flight)
+        telemetry.record_request()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            self.in_flight -= 1
+            self._set_in_flight(self.in_flight)
+
+            # Renseignée par le routeur FastAPI pendant l'appel
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            series = self._series(method, route)
+            series.duration.record(duration)
+            telemetry.record_latency(duration)
+            count = series.statuses.get(status)
+            if count is None:
+                count = series.statuses[status] = telemetry.counter(
+                    "hive_http_requests_total", method=method, route=route, status=status
+                )
+            count()
+            if request_bytes:
+                series.request_bytes(request_bytes)
+            if response_bytes:
+                series.response_bytes(response_bytes)
+            if status >= 500:
+                telemetry.record_error()
+            elif status >= 400:
+                telemetry.record_warning()
+
+
+def _expose_routes(app: Any, telemetry: Telemetry) -> None:
+    """Ajoute /metrics et /telemetry si le service ne les définit pas déjà"""
+    from starlette.responses import JSONResponse, Response
+
+    existing = {getattr(route, "path", None) for route in app.routes}
+
+    async def prometheus_metrics(request: Any) -> Response:
+        return Response(telemetry.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    async def telemetry_metrics(request: Any) -> JSONResponse:
+        return JSONResponse(telemetry.get_metrics())
+
+    if "/metrics" not in existing:
+        app.add_route("/metrics", prometheus_metrics, methods=["GET"], include_in_schema=False)
+    if "/telemetry" not in existing:
+        app.add_route("/telemetry", telemetry_metrics, methods=["GET"], include_in_schema=False)
+
+
+def instrument_app(app: Any, service_name: str, expose: bool = True) -> Telemetry:
+    """
+    Instrumente une application FastAPI / Starlette.
+
+    Appelable depuis le lifespan : la pile de middlewares est déjà
+    construite à ce moment-là, le middleware est alors placé en tête de
+    pile (il mesure aussi l'authentification et le CORS). Démarre aussi
+    l'échantillonneur système partagé et, si un exporteur de traces est
+    configuré, ouvre un span SERVER par requête. Le watchdog de boucle
+    démarre si le service figure dans `loop_watchdog_services`, et les
+    routes de diagnostic /debug sont ajoutées (FastAPI uniquement) si
+    `debug_endpoints_enabled`.
+
+    Idempotent : un second appel (lifespan relancé, tests) ne réempile pas
+    les middlewares et se contente de redémarrer les tâches de fond
+    arrêtées par `uninstrument_app`.
+
+    Args:
+        app: Application FastAPI / Starlette.
+        service_name: Nom du service dans la télémétrie.
+        expose: Ajoute les routes /metrics (Prometheus) et /telemetry (JSON).
+
+    Returns:
+        Telemetry: La télémétrie du processus (aussi dans `app.state.telemetry`).
+    """
+    telemetry = get_telemetry(service_name)
+    if getattr(app.state, "instrumented_as", None) is None:
+        app.state.instrumented_as = service_name
+        app.state.telemetry = telemetry
+        if app.middleware_stack is None:
+            app.add_middleware(MetricsMiddleware, telemetry=telemetry)
+        else:
+            app.middleware_stack = MetricsMiddleware(app.middleware_stack, telemetry)
+        tracer = get_tracer()
+        if tracer.enabled:
+            tracer.service_name = service_name
+            if app.middleware_stack is None:
+                app.add_middleware(TracingMiddleware, tracer=tracer)
+            else:
+                app.middleware_stack = TracingMiddleware(app.middleware_stack, tracer)
+        if expose:
+            _expose_routes(app, telemetry)
+        if get_settings().debug_endpoints_enabled and hasattr(app, "include_router"):
+            attach_debug_routes(app, service_name)
+        logger.info(f"📊 Instrumentation HTTP active pour '{service_name}'")
+    get_system_sampler().start()
+    if watchdog_enabled_for(service_name):
+        get_loop_watchdog(telemetry).start()
+    return telemetry
+
+
+async def uninstrument_app(app: Any) -> None:
+    """
+    Arrête les tâches de fond démarrées par `instrument_app` (sortie du lifespan).
+
+    Échantillonneur système et watchdog de boucle sont arrêtés, les spans en
+    attente exportés. Middlewares et routes restent en place.
+    """
+    service_name = getattr(app.state, "instrumented_as", None)
+    if service_name is None:
+        return
+    await get_system_sampler().stop()
+    if watchdog_enabled_for(service_name):
+        get_loop_watchdog().stop()
+    tracer = get_tracer()
+    if tracer.enabled:
+        await tracer.shutdown()
+    logger.info(f"📊 Tâches d'instrumentation arrêtées pour '{service_name}'")
@@ -3,11 +3,15 @@ Internal Authentication System — THE HIVE
 Secures inter-service communication using JWT tokens with a shared secret.
 """
 
+import hashlib
 import jwt
 import time
 import logging
+from collections import OrderedDict
 from typing import Optional
 from shared.config import get_settings
+from shared.telemetry import register_source
+from shared.tracing import inject
 
 logger = logging.getLogger(__name__)
 
@@ -15,32 +19,122 @@ logger = logging.getLogger(__name__)
 # In production, this should come from a secure env var or Vault.
 INTERNAL_SECRET = "hive-swarm-distributed-secret-2026"
 
+TOKEN_TTL_SECONDS = 60  # 60 seconds expiry (high speed swarm)
+# A cached token is re-signed this long before it expires, so a request
+# in flight (or a slightly skewed clock) never carries an expired token.
+TOKEN_REFRESH_MARGIN_SECONDS = 15
+
+
+class VerifiedTokenCache:
+    """
+    LRU of already-verified token payloads, keyed by the SHA-256 of the token.
+
+    An entry is only served while its `exp` is in the future, so a cached
+    token is rejected exactly when a full JWT decode would reject it.
+    Invalid tokens are never cached.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes, now: float) -> Optional[dict]:
+        payload = self._entries.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        if payload["exp"] <= now:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, key: bytes, payload: dict) -> None:
+        if "exp" not in payload:
+            return
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
 class InternalAuth:
     """
     Handles generation and validation of tokens for internal expert requests.
+
+    Signing and verifying an HS256 JWT on every internal call is avoidable:
+    the client reuses its signed token until shortly before expiry
+    (`get_token`), and the server remembers tokens it already verified
+    (`verify_token`, see VerifiedTokenCache).
     """
 
+    # Client side: agent name -> (token, exp)
+    _issued: dict[str, tuple[str, int]] = {}
+    # Server side: verified payloads
+    verified_cache = VerifiedTokenCache()
+
     @staticmethod
     def generate_token(source_agent: str) -> str:
         """
         Generates a short-lived token for an internal request.
         """
+        now = int(time.time())
         payload = {
             "iss": "hive-core",
             "sub": "internal-swarm-request",
             "src": source_agent,
-            "iat": int(time.time()),
-            "exp": int(time.time()) + 60  # 60 seconds expiry (high speed swarm)
+            "iat": now,
+            "exp": now + TOKEN_TTL_SECONDS,
         }
         return jwt.encode(payload, INTERNAL_SECRET, algorithm="HS256")
 
-    @staticmethod
-    def verify_token(token: str) -> Optional[dict]:
+    @classmethod
+    def get_token(cls, source_agent: str) -> str:
+        """
+        Returns a signed token for `source_agent`, re-signed only when the
+        cached one is within TOKEN_REFRESH_MARGIN_SECONDS of expiry.
+        """
+        now = time.time()
+        cached = cls._issued.get(source_agent)
+        if cached is not None and cached[1] - now > TOKEN_REFRESH_MARGIN_SECONDS:
+            return cached[0]
+        token = cls.generate_token(source_agent)
+        cls._issued[source_agent] = (token, int(now) + TOKEN_TTL_SECONDS)
+        return token
+
+    @classmethod
+    def verify_token(cls, token: str) -> Optional[dict]:
         """
         Verifies an internal token and returns the payload if valid.
+        A token seen before is answered from the cache until its `exp`.
         """
+        key = cls.verified_cache.key(token)
+        payload = cls.verified_cache.get(key, time.time())
+        if payload is not None:
+            return payload
         try:
             payload = jwt.decode(token, INTERNAL_SECRET, algorithms=["HS256"])
+            cls.verified_cache.put(key, payload)
             return payload
         except jwt.ExpiredSignatureError:
             logger.warning("Internal token expired")
@@ -48,12 +142,17 @@ class InternalAuth:
             logger.error(f"Invalid internal token: {e}")
         return None
 
+
+register_source("internal_auth", InternalAuth.verified_cache.get_stats)
+
+
 def get_internal_headers(agent_name: str) -> dict:
     """
     Helper to get the required headers for an internal request.
+    Includes the W3C traceparent of the active span, if any.
     """
-    token = InternalAuth.generate_token(agent_name)
-    return {
+    token = InternalAuth.get_token(agent_name)
+    return inject({
         "X-Hive-Internal-Token": token,
         "User-Agent": f"TheHive/{agent_name}"
-    }
+    })
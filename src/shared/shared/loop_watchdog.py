@@ -0,0 +1,191 @@
+"""
+Loop Watchdog — Retard de la boucle asyncio et capture des appels bloquants
+═══════════════════════════════════════════════════════════════════════════
+
+Un appel synchrone dans une coroutine (API mt5, pbkdf2, lecture de
+fichier, parsing HTML...) gèle toute la boucle : chaque requête en cours
+prend ce retard.
+
+  - Battement : un callback replanifié toutes les `interval` secondes
+    mesure son propre retard d'ordonnancement, enregistré dans
+    l'histogramme hive_event_loop_lag_seconds de la télémétrie.
+  - Capture : un thread de surveillance repère un battement manquant
+    depuis plus de `threshold` secondes et relève la pile du thread de la
+    boucle pendant le blocage (la tâche fautive est encore dessus).
+  - Les derniers blocages (durée, tâche, pile) sont exposés dans
+    /telemetry (source "loop_watchdog") et journalisés.
+
+Activation par service : `loop_watchdog_services` (ex: ["core", "banker"]).
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from shared.telemetry import Telemetry, register_source
+
+logger = logging.getLogger(__name__)
+
+
+class LoopWatchdog:
+    """
+    Surveille le retard d'ordonnancement d'une boucle asyncio.
+
+    Attributes:
+        interval: Période du battement (s).
+        threshold: Retard au-delà duquel la pile bloquante est capturée (s).
+    """
+
+    def __init__(
+        self,
+        telemetry: Telemetry | None = None,
+        interval: float = 0.1,
+        threshold: float = 0.25,
+        max_stalls: int = 20,
+        stack_depth: int = 30,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self._lag = telemetry.histogram("hive_event_loop_lag_seconds") if telemetry else None
+        self._count_stall = telemetry.counter("hive_event_loop_stalls_total") if telemetry else None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._expected = 0.0
+        self._last_beat = 0.0
+        self._captured_beat = 0.0
+        self.stalls: deque[dict[str, Any]] = deque(maxlen=max_stalls)
+        self.beats = 0
+        self.max_lag = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    # ─── Cycle de vie ─────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Démarre la surveillance de la boucle courante (sans effet si active)"""
+        if self.running:
+            return
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        now = time.monotonic()
+        self._last_beat = self._captured_beat = now
+        self._expected = now + self.interval
+        self._handle = self._loop.call_later(self.interval, self._beat)
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"🐕 Watchdog de boucle actif (battement {self.interval * 1000:.0f} ms, "
+            f"seuil {self.threshold * 1000:.0f} ms)"
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # ─── Battement (thread de la boucle) ──────────────────────────────────
+
+    def _beat(self) -> None:
+        now = time.monotonic()
+        lag = max(now - self._expected, 0.0)
+        self._last_beat = now
+        self.beats += 1
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if self._lag is not None:
+            self._lag.record(lag)
+        if lag > self.threshold and self._count_stall is not None:
+            self._count_stall()
+        self._expected = now + self.interval
+        self._handle = self._loop.call_later(self.interval, self._beat)
+
+    # ─── Surveillance (thread dédié) ──────────────────────────────────────
+
+    def _watch(self) -> None:
+        period = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(period):
+            last_beat = self._last_beat
+            stalled = time.monotonic() - last_beat - self.interval
+            # Une seule capture par blocage
+            if stalled > self.threshold and last_beat != self._captured_beat:
+                self._captured_beat = last_beat
+                self._capture(stalled)
+
+    def _capture(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame, limit=self.stack_depth) if frame else []
+        task = None
+        try:
+            current = asyncio.current_task(self._loop)
+            task = current.get_name() if current else None
+        except RuntimeError:
+            pass
+        self.stalls.append({
+            "timestamp": datetime.now().isoformat(),
+            "blocked_ms": round(stalled * 1000, 1),
+            "task": task,
+            "stack": [line.rstrip() for line in stack],
+        })
+        logger.warning(
+            f"🐢 Boucle asyncio bloquée depuis {stalled * 1000:.0f} ms"
+            f" (tâche: {task or '-'}) :\n{''.join(stack[-8:])}"
+        )
+
+    # ─── Lecture ──────────────────────────────────────────────────────────
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "beats": self.beats,
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "recent_stalls": list(self.stalls),
+        }
+
+
+_watchdog: LoopWatchdog | None = None
+
+
+def get_loop_watchdog(telemetry: Telemetry | None = None) -> LoopWatchdog:
+    """Retourne le watchdog du processus (configuré depuis les settings)"""
+    global _watchdog
+    if _watchdog is None:
+        from shared.config import get_settings
+
+        settings = get_settings()
+        _watchdog = LoopWatchdog(
+            telemetry,
+            interval=settings.loop_watchdog_interval_seconds,
+            threshold=settings.loop_watchdog_threshold_seconds,
+        )
+        register_source("loop_watchdog", _watchdog.get_stats)
+    return _watchdog
+
+
+def watchdog_enabled_for(service_name: str) -> bool:
+    """Vrai si `service_name` figure dans `loop_watchdog_services` (ou "*")"""
+    from shared.config import get_settings
+
+    services = get_settings().loop_watchdog_services
+    return "*" in services or service_name in services
@@ -1,5 +1,16 @@
+import sys
+
 import numpy as np
-import torch
+
+
+def _is_tensor(x) -> bool:
+    """
+    Vrai si `x` est un tenseur torch, sans importer torch : si le module
+    n'est pas encore chargé, aucun tenseur ne peut exister.
+    """
+    torch = sys.modules.get("torch")
+    return torch is not None and torch.is_tensor(x)
+
 
 def symlog(x):
     """
@@ -10,8 +21,8 @@ def symlog(x):
         return np.sign(x) * np.log1p(abs(x))
     elif isinstance(x, np.ndarray):
         return np.sign(x) * np.log1p(np.abs(x))
-    elif torch.is_tensor(x):
-        return torch.sign(x) * torch.log1p(torch.abs(x))
+    elif _is_tensor(x):
+        return x.sign() * x.abs().log1p()
     else:
         # Fallback pour d'autres types scalaires
         return (1 if x > 0 else -1 if x < 0 else 0) * np.log1p(abs(x))
@@ -25,8 +36,8 @@ def inv_symlog(x):
         return np.sign(x) * (np.expm1(abs(x)))
     elif isinstance(x, np.ndarray):
         return np.sign(x) * (np.expm1(np.abs(x)))
-    elif torch.is_tensor(x):
-        return torch.sign(x) * (torch.expm1(torch.abs(x)))
+    elif _is_tensor(x):
+        return x.sign() * x.abs().expm1()
     else:
         return (1 if x > 0 else -1 if x < 0 else 0) * (np.expm1(abs(x)))
 
@@ -117,6 +117,13 @@ class AgentMessageType(str, Enum):
     SWARM_COMMAND = "swarm_command"
 
 
+class MessagePriority(str, Enum):
+    """Voie de priorité d'un message sur le bus (ordonnancement pondéré)"""
+    CRITICAL = "critical"  # Trading, risque, compliance
+    NORMAL = "normal"
+    BULK = "bulk"  # Télémétrie, heartbeats
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TRADING MODELS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -280,8 +287,11 @@ class AgentMessage(BaseModel):
     action: str
     payload: dict[str, Any] = {}
     correlation_id: UUID | None = None
+    reply_to: str | None = Field(None, description="Channel de réponse (RPC)")
     timestamp: datetime = Field(default_factory=datetime.now)
-    ttl_seconds: int = 30
+    ttl_seconds: int = Field(30, description="Durée de validité (0 = sans expiration)")
+    priority: MessagePriority = MessagePriority.NORMAL
+    trace_context: str | None = Field(None, description="En-tête W3C traceparent de l'émetteur")
 
     def to_redis_channel(self) -> str:
         """
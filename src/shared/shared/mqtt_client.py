@@ -7,15 +7,44 @@ en complément de Redis Pub/Sub. Utilisé principalement pour :
 - Le Last Will and Testament (LWT) pour la détection de pannes.
 - La communication avec le Kernel Rust et les futurs composants IoT.
 
+Routage : les filtres d'abonnement (wildcards `+` et `#` compris) sont
+indexés dans un TopicTrie ; plusieurs callbacks peuvent partager un filtre.
+Les callbacks s'exécutent dans un pool de workers borné par filtre
+(shared.dispatcher) : ordre garanti par topic, backpressure quand la file
+est pleine (le PUBACK QoS 1/2 n'est émis qu'une fois le message en file,
+la fenêtre d'inflight du broker freine donc l'émetteur).
+
+Hors-ligne : les publications QoS 1/2 émises sans broker sont conservées
+dans une outbox bornée (shared.mqtt_outbox, persistante en option) puis
+rejouées dans l'ordre à la reconnexion. Si le broker est injoignable au
+démarrage, la connexion est retentée en tâche de fond ; les abonnements
+sont refaits à chaque connexion.
+
 Dépendance optionnelle : gmqtt (pip install gmqtt).
 Si gmqtt n'est pas installé, le client bascule en mode noop (silencieux).
 """
 
 import asyncio
+import contextlib
 import logging
 import json
+import os
 from typing import Any, Callable
 
+from shared.codec import CodecError, get_codec
+from shared.config import get_settings
+from shared.dispatcher import ChannelDispatcher, ChannelPolicy
+from shared.mqtt_outbox import MQTTOutbox
+from shared.telemetry import register_source, unregister_source
+from shared.topic_trie import TopicTrie, validate_filter
+from shared.tracing import (
+    TRACE_CONTEXT_KEY,
+    SpanKind,
+    current_traceparent,
+    parse_traceparent,
+    start_span,
+)
+
 try:
     from gmqtt import Client as MQTTClient
 except ImportError:
@@ -25,6 +54,18 @@ logger = logging.getLogger(__name__)
 
 # Timeout de connexion MQTT en secondes (évite les blocages au démarrage)
 MQTT_CONNECT_TIMEOUT = 5
+# Nouvelle tentative de connexion en tâche de fond (backoff plafonné)
+MQTT_RECONNECT_MAX_DELAY = 60
+# Le rejeu de l'outbox rend la main à la boucle tous les N messages
+_DRAIN_YIELD_EVERY = 256
+
+
+def _topic_of(delivery: dict) -> str:
+    return delivery["topic"]
+
+
+# Politique de dispatch par défaut d'un filtre : 4 workers, ordre par topic
+DEFAULT_MQTT_POLICY = ChannelPolicy(concurrency=4, max_queue=1000, ordering_key=_topic_of)
 
 
 class EVAMQTTClient:
@@ -37,26 +78,45 @@ class EVAMQTTClient:
     Attributes:
         agent_name: Nom de l'agent (utilisé comme client ID MQTT).
         client: Instance du client gmqtt (ou None si non installé).
+        subscriptions: Filtre MQTT → callbacks enregistrés.
+        outbox: Publications en attente du broker.
     """
 
-    def __init__(self, agent_name: str):
+    def __init__(self, agent_name: str, outbox: MQTTOutbox | None = None):
         """
         Initialise le client MQTT pour un agent donné.
 
         Args:
             agent_name: Identifiant unique de l'agent (ex: 'core', 'banker').
+            outbox: File hors-ligne (défaut: selon la configuration
+                `mqtt_outbox_*`, un fichier SQLite par agent).
         """
+        settings = get_settings()
         self.agent_name = agent_name
         self.client = None
         self._connected = asyncio.Event()
-        self.subscriptions: dict[str, Callable] = {}
+        if outbox is None:
+            path = ""
+            if settings.mqtt_outbox_dir:
+                path = os.path.join(settings.mqtt_outbox_dir, f"mqtt_outbox_{agent_name}.db")
+            outbox = MQTTOutbox(settings.mqtt_outbox_max_messages, path)
+        self.outbox = outbox
+        self._outbox_ttl = settings.mqtt_outbox_ttl_seconds
+        self._drain_task: asyncio.Task | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self.subscriptions: dict[str, list[Callable]] = {}
+        self._routes: TopicTrie[str] = TopicTrie()
+        self._dispatcher = ChannelDispatcher(self._run_callbacks, default_policy=DEFAULT_MQTT_POLICY)
+        self.codec = get_codec()
 
     async def connect(self, host: str = "localhost", port: int = 1883):
         """
         Se connecte au broker MQTT avec un testament (LWT).
 
         Si gmqtt n'est pas installé ou si le broker n'est pas joignable,
-        la connexion échoue silencieusement (mode dégradé).
+        la connexion échoue silencieusement (mode dégradé). Dans le second
+        cas, elle est retentée en tâche de fond et l'outbox conserve les
+        publications critiques en attendant.
 
         Le timeout de connexion est de 5 secondes pour ne pas bloquer
         le démarrage des services si Mosquitto n'est pas lancé.
@@ -69,6 +129,24 @@ class EVAMQTTClient:
             logger.warning("gmqtt non installé. MQTT désactivé (mode dégradé).")
             return
 
+        register_source("mqtt_outbox", self.outbox.get_stats)
+        if not await self._open(host, port) and self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(
+                self._retry_connect(host, port), name="mqtt-reconnect"
+            )
+
+    async def _retry_connect(self, host: str, port: int) -> None:
+        """Retente la connexion initiale jusqu'au succès (backoff exponentiel)"""
+        delay = 1
+        try:
+            while not await self._open(host, port):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MQTT_RECONNECT_MAX_DELAY)
+        finally:
+            self._reconnect_task = None
+
+    async def _open(self, host: str, port: int) -> bool:
+        """Une tentative de connexion. Retourne True si le broker a répondu."""
         self.client = MQTTClient(self.agent_name)
 
         # Configuration du Testament (LWT)
@@ -96,67 +174,185 @@ class EVAMQTTClient:
                 retain=True,
             )
             logger.info(f"MQTT: Agent '{self.agent_name}' connecté au lien neural.")
+            return True
         except asyncio.TimeoutError:
             logger.warning(
                 f"MQTT: Timeout connexion ({MQTT_CONNECT_TIMEOUT}s). "
                 f"Broker probablement non lancé — mode dégradé."
             )
-            self.client = None
         except Exception as e:
             logger.warning(f"MQTT: Connexion échouée — {e} (mode dégradé)")
-            self.client = None
+        self.client = None
+        return False
 
     def _on_connect(self, client, flags, rc, properties):
-        """Callback déclenché lors de la connexion réussie au broker."""
+        """
+        Callback déclenché lors de la connexion réussie au broker.
+
+        (Ré)abonne tous les filtres enregistrés : ceux déclarés avant que le
+        broker ne soit joignable comme ceux perdus à la reconnexion.
+        """
         self._connected.set()
         logger.info("MQTT Neural Link: Connected.")
+        for topic in self.subscriptions:
+            client.subscribe(topic, qos=1)
+        if self.subscriptions:
+            logger.info(f"MQTT: Subscribed to {', '.join(self.subscriptions)}")
+        self._start_drain()
+
+    def _start_drain(self) -> None:
+        """Lance le rejeu de l'outbox s'il reste des messages en attente"""
+        if len(self.outbox) and self._drain_task is None:
+            self._drain_task = asyncio.create_task(self._drain_outbox(), name="mqtt-outbox")
+
+    async def _drain_outbox(self) -> None:
+        """
+        Rejoue l'outbox dans l'ordre, sans délai entre messages.
+
+        S'interrompt (messages conservés) si la connexion retombe.
+        """
+        replayed = 0
+        entries = self.outbox.drain()
+        try:
+            for entry in entries:
+                if not (self.client and self._connected.is_set()):
+                    break
+                self.client.publish(entry.topic, entry.payload, qos=entry.qos, retain=entry.retain)
+                replayed += 1
+                if replayed % _DRAIN_YIELD_EVERY == 0:
+                    await self.outbox.persist()
+                    await asyncio.sleep(0)
+        finally:
+            entries.close()
+            self._drain_task = None
+            await self.outbox.persist()
+        if replayed:
+            logger.info(f"📮 MQTT: {replayed} message(s) rejoué(s) depuis l'outbox")
 
     def _on_disconnect(self, client, packet, exc):
         """Callback déclenché lors de la déconnexion du broker."""
         self._connected.clear()
         logger.warning("MQTT Neural Link: Disconnected.")
 
-    def _on_message(self, client, topic, payload, qos, properties):
+    async def _on_message(self, client, topic, payload, qos, properties):
         """
         Callback déclenché à la réception d'un message.
 
-        Dispatch le message vers le callback enregistré pour le topic.
+        Soumet le message au pool de chaque filtre correspondant au topic ;
+        attend si une file est pleine (backpressure).
         """
-        if topic in self.subscriptions:
-            try:
-                data = json.loads(payload.decode())
-                asyncio.create_task(self.subscriptions[topic](topic, data))
-            except Exception as e:
-                logger.error(f"MQTT Callback error on {topic}: {e}")
-
-    async def subscribe(self, topic: str, callback: Callable):
+        filters = self._routes.match(topic)
+        if not filters:
+            return
+        try:
+            data = self.codec.decode(payload)
+        except CodecError:
+            logger.error(f"MQTT: Message invalide sur {topic}: {payload!r}")
+            return
+        # Contexte de trace retiré avant les callbacks (payload métier intact)
+        trace_context = data.pop(TRACE_CONTEXT_KEY, None) if isinstance(data, dict) else None
+        for topic_filter in filters:
+            await self._dispatcher.submit(
+                topic_filter, {"topic": topic, "data": data, "trace_context": trace_context}
+            )
+
+    async def _run_callbacks(self, topic_filter: str, delivery: dict) -> None:
+        """Exécute les callbacks d'un filtre (appelé par les workers)"""
+        with start_span(
+            f"mqtt.handle {topic_filter}",
+            SpanKind.CONSUMER,
+            parent=parse_traceparent(delivery.get("trace_context")),
+            attributes={"messaging.system": "mqtt", "messaging.destination": delivery["topic"]},
+        ):
+            for callback in self.subscriptions.get(topic_filter, []):
+                await callback(delivery["topic"], delivery["data"])
+
+    async def subscribe(
+        self,
+        topic: str,
+        callback: Callable,
+        policy: ChannelPolicy | None = None,
+    ):
         """
         S'abonne à un sujet MQTT avec une fonction de rappel.
 
         Args:
-            topic: Le sujet MQTT à écouter (ex: 'eva/banker/requests/critical').
+            topic: Le filtre MQTT à écouter, wildcards `+`/`#` acceptés
+                (ex: 'eva/banker/requests/critical', 'eva/status/+').
             callback: Fonction async(topic, data) appelée à chaque message.
+            policy: Concurrence et file des callbacks de ce filtre (défaut:
+                4 workers, BLOCK, ordre par topic). L'ordre par topic n'est
+                garanti que si `ordering_key` reste celui par défaut.
+
+        Raises:
+            ValueError: Filtre MQTT invalide.
         """
-        self.subscriptions[topic] = callback
-        if self.client:
+        validate_filter(topic)
+        if policy is not None:
+            self._dispatcher.configure(topic, policy)
+        callbacks = self.subscriptions.setdefault(topic, [])
+        callbacks.append(callback)
+        self._routes.add(topic, topic)
+        # Sinon, abonnement fait par _on_connect
+        if self.client and self._connected.is_set() and len(callbacks) == 1:
             self.client.subscribe(topic, qos=1)
             logger.info(f"MQTT: Subscribed to {topic}")
 
-    async def publish(self, topic: str, payload: Any, qos: int = 1, retain: bool = False):
+    def get_dispatch_stats(self) -> dict[str, dict[str, Any]]:
+        """Profondeur de file et latence des callbacks par filtre"""
+        return self._dispatcher.get_stats()
+
+    async def publish(
+        self,
+        topic: str,
+        payload: Any,
+        qos: int = 1,
+        retain: bool = False,
+        ttl_seconds: float | None = None,
+        message_id: str | None = None,
+    ):
         """
         Publie un message sur un sujet MQTT.
 
+        Sans broker, les messages QoS 1/2 sont mis en outbox et rejoués
+        dans l'ordre à la reconnexion ; tant que l'outbox n'est pas vide,
+        les nouveaux messages passent derrière pour préserver l'ordre.
+
         Args:
             topic: Le sujet de publication.
-            payload: Les données à publier (sérialisées en JSON).
+            payload: Les données à publier (sérialisées via le codec partagé).
             qos: Niveau de qualité de service (0, 1 ou 2).
             retain: Si True, le broker conserve le dernier message.
+            ttl_seconds: Au-delà, le message n'est plus rejoué depuis
+                l'outbox (défaut: `mqtt_outbox_ttl_seconds`).
+            message_id: Identifiant de dédoublonnage dans l'outbox.
         """
-        if self.client and self._connected.is_set():
-            msg_payload = json.dumps(payload)
+        if isinstance(payload, dict) and TRACE_CONTEXT_KEY not in payload:
+            traceparent = current_traceparent()
+            if traceparent is not None:
+                payload = {**payload, TRACE_CONTEXT_KEY: traceparent}
+        msg_payload = self.codec.encode(payload)
+        if self.client and self._connected.is_set() and not len(self.outbox):
             self.client.publish(topic, msg_payload, qos=qos, retain=retain)
-        else:
+            return
+        if not MQTTClient:
             logger.debug(f"MQTT: Cannot publish to {topic}, client not ready.")
+            return
+
+        if self.outbox.put(
+            topic,
+            msg_payload,
+            qos=qos,
+            retain=retain,
+            ttl_seconds=ttl_seconds if ttl_seconds is not None else self._outbox_ttl,
+            message_id=message_id,
+        ):
+            logger.debug(f"MQTT: {topic} mis en outbox ({len(self.outbox)} en attente)")
+        else:
+            logger.debug(f"MQTT: {topic} non conservé (QoS 0 ou doublon)")
+        await self.outbox.persist()
+        if self._connected.is_set():
+            self._start_drain()
 
     async def disconnect(self):
         """Déconnexion propre du broker MQTT avec notification de statut."""
@@ -168,3 +364,15 @@ class EVAMQTTClient:
                 retain=True,
             )
             await self.client.disconnect()
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        # Rejeu arrêté (et relancé par le statut offline le cas échéant) avant
+        # la fermeture de l'outbox : les messages non rejoués y restent
+        if self._drain_task:
+            self._drain_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._drain_task
+        self._dispatcher.close()
+        await self.outbox.persist()
+        self.outbox.close()
+        unregister_source("mqtt_outbox")
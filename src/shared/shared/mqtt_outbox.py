@@ -0,0 +1,240 @@
+"""
+MQTT Outbox — File d'envoi hors-ligne du Critical Path
+══════════════════════════════════════════════════════
+
+Conserve les publications QoS 1/2 émises pendant que le broker est
+injoignable, puis les rejoue dans l'ordre dès la reconnexion.
+
+  - Bornée (`max_messages`) : au-delà, le plus ancien message est abandonné.
+  - Persistante en option : miroir SQLite (WAL), rechargé au démarrage,
+    pour survivre au redémarrage du service. La file en mémoire fait foi ;
+    les écritures SQLite s'accumulent et partent hors de la boucle asyncio
+    via `persist()` (un thread, dans l'ordre des appels).
+  - Expiration par message : un ordre périmé n'est jamais rejoué.
+  - Dédoublonnage par `message_id` : un même ordre mis deux fois en file
+    (ou déjà rejoué récemment) n'est envoyé qu'une fois.
+  - QoS 0 (at-most-once) n'est pas conservé : le perdre est dans le contrat.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Nombre d'identifiants rejoués mémorisés pour le dédoublonnage
+_SENT_IDS_WINDOW = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_id TEXT,
+    topic TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    qos INTEGER NOT NULL,
+    retain INTEGER NOT NULL,
+    expires_at REAL
+)
+"""
+
+
+@dataclass
+class OutboxEntry:
+    """Publication en attente"""
+    seq: int
+    topic: str
+    payload: bytes
+    qos: int
+    retain: bool
+    expires_at: float | None = None
+    message_id: str | None = None
+
+    def expired(self, now: float) -> bool:
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class MQTTOutbox:
+    """
+    File d'envoi bornée, éventuellement adossée à SQLite.
+
+    Usage:
+        outbox = MQTTOutbox(max_messages=10_000, path="/data/mqtt_outbox.db")
+        outbox.put("eva/banker/requests/critical", payload, qos=2, ttl_seconds=30)
+        await outbox.persist()
+        for entry in outbox.drain():
+            client.publish(entry.topic, entry.payload, qos=entry.qos)
+        await outbox.persist()
+    """
+
+    def __init__(self, max_messages: int = 10_000, path: str = ""):
+        self.max_messages = max_messages
+        self.path = path
+        self._entries: deque[OutboxEntry] = deque()
+        self._pending_ids: set[str] = set()
+        self._sent_ids: OrderedDict[str, None] = OrderedDict()
+        self._next_seq = 1
+        self._db: sqlite3.Connection | None = None
+        # Écritures SQLite en attente de persist() (appliquées dans cet ordre)
+        self._inserts: list[OutboxEntry] = []
+        self._deletes: list[int] = []
+        self._persist_lock = asyncio.Lock()
+        self._db_lock = threading.Lock()
+
+        self.enqueued = 0
+        self.replayed = 0
+        self.expired = 0
+        self.duplicates = 0
+        self.dropped = 0
+
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        """Ouvre le miroir SQLite et recharge les messages non envoyés"""
+        # Écritures faites depuis le thread de persist()
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        rows = self._db.execute(
+            "SELECT seq, topic, payload, qos, retain, expires_at, message_id "
+            "FROM outbox ORDER BY seq"
+        ).fetchall()
+        for seq, topic, payload, qos, retain, expires_at, message_id in rows:
+            self._entries.append(
+                OutboxEntry(seq, topic, bytes(payload), qos, bool(retain), expires_at, message_id)
+            )
+            if message_id:
+                self._pending_ids.add(message_id)
+            self._next_seq = seq + 1
+        if rows:
+            logger.warning(f"📮 Outbox MQTT: {len(rows)} message(s) rechargé(s) depuis {path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(
+        self,
+        topic: str,
+        payload: bytes,
+        qos: int = 1,
+        retain: bool = False,
+        ttl_seconds: float | None = None,
+        message_id: str | None = None,
+    ) -> bool:
+        """
+        Met une publication en file.
+
+        Returns:
+            bool: False si le message n'a pas été conservé (QoS 0, doublon).
+        """
+        if qos == 0:
+            return False
+        if message_id and (message_id in self._pending_ids or message_id in self._sent_ids):
+            self.duplicates += 1
+            logger.debug(f"Outbox MQTT: doublon ignoré ({message_id})")
+            return False
+
+        while len(self._entries) >= self.max_messages:
+            self._remove(self._entries[0])
+            self.dropped += 1
+            logger.warning("Outbox MQTT pleine: plus ancien message abandonné")
+
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        entry = OutboxEntry(self._next_seq, topic, payload, qos, retain, expires_at, message_id)
+        if self._db is not None:
+            self._inserts.append(entry)
+        self._next_seq = entry.seq + 1
+        self._entries.append(entry)
+        if message_id:
+            self._pending_ids.add(message_id)
+        self.enqueued += 1
+        return True
+
+    def drain(self) -> Iterator[OutboxEntry]:
+        """
+        Itère sur les messages à rejouer, dans l'ordre d'émission.
+
+        Chaque message est retiré de la file quand l'itération passe au
+        suivant (ou se termine) : si l'appelant lève pendant la publication,
+        le message courant reste en tête de file. Les suppressions SQLite
+        partent au `persist()` suivant, en une transaction.
+        """
+        while self._entries:
+            entry = self._entries[0]
+            if entry.expired(time.time()):
+                self._remove(entry)
+                self.expired += 1
+                logger.warning(f"Outbox MQTT: message expiré non rejoué ({entry.topic})")
+                continue
+            yield entry
+            self._remove(entry)
+            self.replayed += 1
+            if entry.message_id:
+                self._sent_ids[entry.message_id] = None
+                if len(self._sent_ids) > _SENT_IDS_WINDOW:
+                    self._sent_ids.popitem(last=False)
+
+    def _remove(self, entry: OutboxEntry) -> None:
+        """Retire l'entrée de tête (suppression SQLite différée)"""
+        # Déjà évincée (outbox pleine pendant un rejeu)
+        if not self._entries or self._entries[0] is not entry:
+            return
+        self._entries.popleft()
+        if entry.message_id:
+            self._pending_ids.discard(entry.message_id)
+        if self._db is not None:
+            self._deletes.append(entry.seq)
+
+    async def persist(self) -> None:
+        """Applique les écritures en attente au miroir SQLite, hors de la boucle"""
+        async with self._persist_lock:
+            if self._db is None or not (self._inserts or self._deletes):
+                return
+            inserts, self._inserts = self._inserts, []
+            deletes, self._deletes = self._deletes, []
+            await asyncio.to_thread(self._write, inserts, deletes)
+
+    def _write(self, inserts: list[OutboxEntry], deletes: list[int]) -> None:
+        """Insertions puis suppressions, en une seule transaction"""
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO outbox (seq, message_id, topic, payload, qos, retain, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (e.seq, e.message_id, e.topic, e.payload, e.qos, int(e.retain), e.expires_at)
+                    for e in inserts
+                ],
+            )
+            self._db.executemany("DELETE FROM outbox WHERE seq = ?", [(s,) for s in deletes])
+            self._db.execute("COMMIT")
+
+    def close(self) -> None:
+        """Écrit les modifications en attente et ferme le miroir SQLite"""
+        if self._db is not None:
+            inserts, self._inserts = self._inserts, []
+            deletes, self._deletes = self._deletes, []
+            self._write(inserts, deletes)
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "pending": len(self._entries),
+            "capacity": self.max_messages,
+            "persistent": self._db is not None,
+            "enqueued": self.enqueued,
+            "replayed": self.replayed,
+            "expired": self.expired,
+            "duplicates": self.duplicates,
+            "dropped": self.dropped,
+        }
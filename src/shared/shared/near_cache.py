@@ -0,0 +1,110 @@
+"""
+Near Cache — Cache LRU en mémoire devant Redis
+═══════════════════════════════════════════════
+
+Les clés chaudes (`nemesis:state`, décisions de routage `routing:*`...) sont
+relues à chaque requête alors qu'elles changent au plus toutes les quelques
+centaines de millisecondes. Le near-cache garde leur dernière valeur en
+processus :
+
+  - TTL configurable par préfixe de clé (le préfixe le plus long gagne)
+  - taille bornée, éviction LRU
+  - invalidation par les notifications keyspace Redis (voir
+    `RedisClient.enable_near_cache`) ; le TTL borne l'obsolescence si les
+    notifications sont indisponibles
+
+Les valeurs sont conservées encodées (bytes) et décodées à chaque lecture :
+un appelant qui modifie le dict retourné ne corrompt pas le cache.
+
+Les compteurs hit/miss sont exposés via `shared.telemetry`.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class NearCache:
+    """
+    Cache LRU à TTL par préfixe.
+
+    Args:
+        prefixes: Préfixe de clé → TTL local en secondes. Les clés sans
+            préfixe correspondant ne sont jamais mises en cache.
+        max_entries: Nombre maximal d'entrées (éviction LRU au-delà).
+    """
+
+    def __init__(self, prefixes: dict[str, float], max_entries: int = 1024):
+        # Tri par longueur décroissante : le préfixe le plus spécifique gagne
+        self.prefixes = dict(sorted(prefixes.items(), key=lambda p: -len(p[0])))
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        # Incrémenté à chaque invalidation : une lecture Redis lancée avant
+        # une invalidation ne doit pas réinsérer une valeur périmée
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def ttl_for(self, key: str) -> float | None:
+        """TTL local applicable à la clé, ou None si elle n'est pas cachée"""
+        for prefix, ttl in self.prefixes.items():
+            if key.startswith(prefix):
+                return ttl
+        return None
+
+    def get(self, key: str) -> bytes | None:
+        """Retourne la valeur encodée si présente et fraîche (compte hit/miss)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes, generation: int | None = None) -> None:
+        """
+        Met en cache une valeur lue depuis Redis.
+
+        Args:
+            generation: `self.generation` relevé avant la lecture Redis ; la
+                valeur est ignorée si une invalidation est survenue entre-temps.
+        """
+        ttl = self.ttl_for(key)
+        if ttl is None or (generation is not None and generation != self.generation):
+            return
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Retire une clé (écriture locale ou notification keyspace)"""
+        self.generation += 1
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Vide le cache (perte du flux d'invalidation)"""
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
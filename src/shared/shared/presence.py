@@ -0,0 +1,245 @@
+"""
+Presence — Table de présence consolidée de la ruche
+═══════════════════════════════════════════════════
+
+Tous les experts écrivent leur heartbeat dans un seul hash Redis :
+
+  swarm:presence
+    {agent}         → dernier payload de statut (encodé via le codec)
+    {agent}:ts      → horodatage serveur du dernier heartbeat (TIME Redis)
+    {agent}:state   → "online" | "offline"
+
+Les écritures passent par un script Lua (horloge du serveur Redis : pas de
+dérive entre conteneurs). Les transitions online/offline sont publiées sur
+`eva.presence` en JSON {"agent", "state", "ts"} :
+  - online  → au premier heartbeat après une absence (script `beat`)
+  - offline → détecté par `sweep()`, exécuté périodiquement par un lecteur
+              (le Core) ; le script est atomique, plusieurs balayeurs
+              ne dupliquent pas les transitions.
+
+Les lecteurs obtiennent statut, vivacité et ancienneté de tous les agents
+en un seul aller-retour (`snapshot()`).
+
+Usage:
+    presence = get_presence_table()
+    await presence.beat("banker", {"status": "online", "expert": "banker"})
+    agents = await presence.snapshot()
+    await presence.on_transition(callback)  # callback(event: dict)
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from shared.redis_batch import RedisBatch
+    from shared.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_KEY = "swarm:presence"
+PRESENCE_CHANNEL = "eva.presence"
+
+# KEYS[1]=hash ; ARGV: agent, payload, channel
+_BEAT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local agent = ARGV[1]
+local previous = redis.call('HGET', KEYS[1], agent .. ':state')
+redis.call('HSET', KEYS[1], agent, ARGV[2], agent .. ':ts', tostring(now), agent .. ':state', 'online')
+if previous ~= 'online' then
+    redis.call('PUBLISH', ARGV[3], cjson.encode({agent = agent, state = 'online', ts = now}))
+    return 1
+end
+return 0
+"""
+
+# KEYS[1]=hash ; ARGV: offline_after (s), channel
+_SWEEP_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local fields = redis.call('HGETALL', KEYS[1])
+local changed = {}
+for i = 1, #fields, 2 do
+    local field = fields[i]
+    if string.sub(field, -6) == ':state' and fields[i + 1] == 'online' then
+        local agent = string.sub(field, 1, -7)
+        local ts = tonumber(redis.call('HGET', KEYS[1], agent .. ':ts') or '0')
+        if now - ts > tonumber(ARGV[1]) then
+            redis.call('HSET', KEYS[1], field, 'offline')
+            redis.call('PUBLISH', ARGV[2], cjson.encode({agent = agent, state = 'offline', ts = ts}))
+            table.insert(changed, agent)
+        end
+    end
+end
+return changed
+"""
+
+TransitionCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class PresenceTable:
+    """
+    Table de présence partagée (un hash Redis pour toute la ruche).
+
+    Args:
+        redis: Client à utiliser (défaut: client global).
+        stale_after: Ancienneté (s) au-delà de laquelle un agent est "stale".
+        offline_after: Ancienneté (s) au-delà de laquelle il est "offline".
+    """
+
+    def __init__(
+        self,
+        redis: "RedisClient | None" = None,
+        stale_after: float = 5.0,
+        offline_after: float = 10.0,
+    ):
+        self._redis = redis
+        self.stale_after = stale_after
+        self.offline_after = offline_after
+        self._callbacks: list[TransitionCallback] = []
+        self._listen_task: asyncio.Task | None = None
+        self._sweeper_task: asyncio.Task | None = None
+
+    @property
+    def redis(self) -> "RedisClient":
+        if self._redis is None:
+            from shared.redis_client import get_redis_client
+
+            self._redis = get_redis_client()
+        return self._redis
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # ÉCRITURE
+    # ═══════════════════════════════════════════════════════════════════════
+
+    async def beat(
+        self,
+        agent: str,
+        payload: dict[str, Any],
+        batch: "RedisBatch | None" = None,
+    ) -> None:
+        """
+        Enregistre un heartbeat (publie la transition online si besoin).
+
+        Args:
+            agent: Nom de l'expert (ex: 'banker').
+            payload: Statut courant de l'expert.
+            batch: Lot existant auquel ajouter l'écriture (ex: avec le publish
+                du heartbeat Pub/Sub).
+        """
+        args = (agent, self.redis.codec.encode(payload), PRESENCE_CHANNEL)
+        if batch is not None:
+            batch.eval_script(_BEAT_SCRIPT, [PRESENCE_KEY], list(args))
+            return
+        await self.redis.eval_script(_BEAT_SCRIPT, keys=[PRESENCE_KEY], args=list(args))
+
+    async def sweep(self) -> list[str]:
+        """Marque offline les agents silencieux. Retourne les agents basculés."""
+        return await self.redis.eval_script(
+            _SWEEP_SCRIPT, keys=[PRESENCE_KEY], args=[self.offline_after, PRESENCE_CHANNEL]
+        )
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # LECTURE
+    # ═══════════════════════════════════════════════════════════════════════
+
+    async def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Statut de tous les agents en un seul aller-retour.
+
+        Returns:
+            dict: agent → {"status": online|stale|offline, "last_seen",
+            "age_seconds", "payload"}.
+        """
+        async with self.redis.command_pipeline(raw=True) as pipe:
+            pipe.time()
+            pipe.hgetall(PRESENCE_KEY)
+            (seconds, micros), raw = await pipe.execute()
+        now = seconds + micros / 1_000_000
+
+        fields = {field.decode(): value for field, value in raw.items()}
+        agents: dict[str, dict[str, Any]] = {}
+        for field, value in fields.items():
+            if ":" in field:
+                continue
+            last_seen = float(fields.get(f"{field}:ts", 0))
+            age = now - last_seen
+            if fields.get(f"{field}:state") == b"offline" or age > self.offline_after:
+                status = "offline"
+            elif age > self.stale_after:
+                status = "stale"
+            else:
+                status = "online"
+            try:
+                payload = self.redis.codec.decode(value)
+            except ValueError:
+                payload = {}
+            agents[field] = {
+                "status": status,
+                "last_seen": last_seen,
+                "age_seconds": round(age, 3),
+                "payload": payload,
+            }
+        return agents
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # TRANSITIONS
+    # ═══════════════════════════════════════════════════════════════════════
+
+    async def on_transition(self, callback: TransitionCallback) -> None:
+        """
+        Appelle `callback(event)` à chaque transition online/offline.
+
+        L'écoute tourne dans sa propre tâche : pas besoin de boucle `listen()`.
+        """
+        self._callbacks.append(callback)
+        if self._listen_task is None:
+            self._listen_task = await self.redis.listen_channels(
+                "presence", [PRESENCE_CHANNEL], self._notify
+            )
+
+    async def _notify(self, data: bytes) -> None:
+        try:
+            event = self.redis.codec.decode(data)
+        except ValueError:
+            return
+        for callback in list(self._callbacks):
+            try:
+                await callback(event)
+            except Exception as e:
+                logger.error(f"Erreur callback présence: {e}")
+
+    def start_sweeper(self, interval: float = 1.0) -> None:
+        """Lance le balayage périodique qui détecte les agents offline"""
+        if self._sweeper_task is None:
+            self._sweeper_task = asyncio.create_task(
+                self._sweep_loop(interval), name="presence-sweeper"
+            )
+
+    async def _sweep_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"Balayage présence échoué: {e}")
+            await asyncio.sleep(interval)
+
+    async def close(self) -> None:
+        """Arrête l'écoute des transitions et le balayage"""
+        for task in (self._listen_task, self._sweeper_task):
+            if task:
+                task.cancel()
+        self._listen_task = self._sweeper_task = None
+
+
+# Instance globale
+_presence_table: PresenceTable | None = None
+
+
+def get_presence_table() -> PresenceTable:
+    """Retourne la table de présence globale"""
+    global _presence_table
+    if _presence_table is None:
+        _presence_table = PresenceTable()
+    return _presence_table
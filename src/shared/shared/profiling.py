@@ -0,0 +1,330 @@
+"""
+Profiling — Diagnostic à la demande des experts THE HIVE
+════════════════════════════════════════════════════════
+
+Routes /debug (jeton interne exigé) pour comprendre un service lent en
+production, sans redémarrage ni outil externe :
+
+  - GET    /debug/profile       profil CPU par échantillonnage, borné dans
+                                le temps (speedscope JSON ou pile repliée
+                                pour flamegraph.pl)
+  - GET    /debug/tasks         tâches asyncio en cours et leur pile
+  - POST   /debug/tracemalloc   démarre le suivi des allocations
+  - GET    /debug/tracemalloc   top-N des allocations (+ diff avec le
+                                relevé précédent)
+  - DELETE /debug/tracemalloc   arrête le suivi
+  - GET    /debug/objects       objets vivants par type (+ diff)
+
+Coût au repos nul : aucun thread, hook ni tracemalloc actif tant qu'une
+route n'est pas appelée.
+
+Usage (fait par instrument_app si `debug_endpoints_enabled`) :
+    attach_debug_routes(app)
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any
+
+from shared.internal_auth import InternalAuth
+
+MAX_PROFILE_SECONDS = 60.0
+MIN_SAMPLE_INTERVAL = 0.001
+
+Frame = tuple[str, str, int]  # (fonction, fichier, ligne de définition)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Un profil est déjà en cours dans ce processus"""
+
+
+class SamplingProfiler:
+    """
+    Profileur CPU par échantillonnage : un thread relève la pile de chaque
+    thread Python toutes les `interval` secondes (sys._current_frames),
+    sans instrumenter le code profilé.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, interval: float = 0.01, include_idle: bool = False):
+        self.interval = max(interval, MIN_SAMPLE_INTERVAL)
+        self.include_idle = include_idle
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+
+    @staticmethod
+    def _stack(frame: Any, thread_name: str) -> tuple[Frame, ...]:
+        stack: list[Frame] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        stack.append((f"thread:{thread_name}", "", 0))
+        return tuple(reversed(stack))
+
+    # Fonctions feuilles d'un thread qui attend (sélecteur, verrou, file)
+    _IDLE = frozenset({"select", "poll", "epoll", "wait", "_wait_for_tstate_lock", "get", "sleep"})
+
+    def _sample(self, duration: float) -> None:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Profil déjà en cours")
+        try:
+            own = threading.get_ident()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            start = time.perf_counter()
+            deadline = start + duration
+            while time.perf_counter() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own:
+                        continue
+                    stack = self._stack(frame, names.get(thread_id, str(thread_id)))
+                    if not self.include_idle and stack[-1][0] in self._IDLE:
+                        continue
+                    self.samples[stack] += 1
+                time.sleep(self.interval)
+            self.duration = time.perf_counter() - start
+        finally:
+            self._lock.release()
+
+    async def run(self, seconds: float) -> "SamplingProfiler":
+        """Échantillonne pendant `seconds` (borné à MAX_PROFILE_SECONDS)"""
+        await asyncio.to_thread(self._sample, min(max(seconds, 0.0), MAX_PROFILE_SECONDS))
+        return self
+
+    # ─── Formats de sortie ────────────────────────────────────────────────
+
+    @staticmethod
+    def _label(frame: Frame) -> str:
+        name, filename, line = frame
+        return f"{name} ({os.path.basename(filename)}:{line})" if filename else name
+
+    def to_collapsed(self) -> str:
+        """Piles repliées `a;b;c N` (flamegraph.pl, speedscope, inferno)"""
+        lines = [
+            ";".join(self._label(f) for f in stack) + f" {count}"
+            for stack, count in self.samples.most_common()
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def to_speedscope(self, name: str = "the-hive") -> dict[str, Any]:
+        """Profil au format speedscope (https://www.speedscope.app)"""
+        frames: list[dict[str, Any]] = []
+        index: dict[Frame, int] = {}
+        samples: list[list[int]] = []
+        weights: list[float] = []
+        for stack, count in self.samples.most_common():
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    entry: dict[str, Any] = {"name": frame[0]}
+                    if frame[1]:
+                        entry.update(file=frame[1], line=frame[2])
+                    frames.append(entry)
+                ids.append(index[frame])
+            samples.append(ids)
+            weights.append(round(count * self.interval, 6))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "shared.profiling",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+def dump_tasks(limit: int = 20) -> list[dict[str, Any]]:
+    """Tâches asyncio de la boucle courante avec leur pile (coroutine en attente)"""
+    tasks = []
+    for task in asyncio.all_tasks():
+        coro = task.get_coro()
+        stack = [
+            f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+            for frame in task.get_stack(limit=limit)
+        ]
+        tasks.append({
+            "name": task.get_name(),
+            "coro": getattr(coro, "__qualname__", repr(coro)),
+            "done": task.done(),
+            "cancelling": task.cancelling() if hasattr(task, "cancelling") else 0,
+            "stack": stack,
+        })
+    return sorted(tasks, key=lambda t: t["name"])
+
+
+class AllocationTracker:
+    """tracemalloc démarré à la demande, relevés top-N et diff entre relevés"""
+
+    def __init__(self):
+        self._previous: tracemalloc.Snapshot | None = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._previous = None
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._previous = None
+
+    def snapshot(self, limit: int = 20, group_by: str = "lineno") -> dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc inactif (POST /debug/tracemalloc)")
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        result: dict[str, Any] = {
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "top": [
+                {"location": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+                for stat in snapshot.statistics(group_by)[:limit]
+            ],
+        }
+        if self._previous is not None:
+            result["diff"] = [
+                {
+                    "location": str(stat.traceback),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(self._previous, group_by)[:limit]
+            ]
+        self._previous = snapshot
+        return result
+
+
+class ObjectCounter:
+    """Objets vivants suivis par le GC, par type, et variation depuis le relevé précédent"""
+
+    def __init__(self):
+        self._previous: Counter | None = None
+        # Relevés exécutés dans un thread : `_previous` partagé entre requêtes
+        self._lock = threading.Lock()
+
+    def snapshot(self, limit: int = 20) -> dict[str, Any]:
+        with self._lock:
+            return self._snapshot(limit)
+
+    def _snapshot(self, limit: int) -> dict[str, Any]:
+        gc.collect()
+        counts = Counter(type(obj).__qualname__ for obj in gc.get_objects())
+        result: dict[str, Any] = {
+            "total": sum(counts.values()),
+            "top": counts.most_common(limit),
+        }
+        if self._previous is not None:
+            diff = counts.copy()
+            diff.subtract(self._previous)
+            result["diff"] = sorted(
+                ((name, delta) for name, delta in diff.items() if delta),
+                key=lambda item: abs(item[1]),
+                reverse=True,
+            )[:limit]
+        self._previous = counts
+        return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ROUTES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def create_debug_router(service_name: str = "the-hive") -> Any:
+    """APIRouter /debug protégé par le jeton interne"""
+    from fastapi import APIRouter, Depends, HTTPException, Query, Request
+    from fastapi.responses import PlainTextResponse
+
+    async def require_internal_token(request: Request) -> None:
+        # Déjà vérifié par InternalAuthMiddleware quand le service l'utilise
+        if getattr(request.state, "source_agent", None):
+            return
+        token = request.headers.get("X-Hive-Internal-Token")
+        if not token:
+            raise HTTPException(status_code=401, detail="X-Hive-Internal-Token header missing")
+        if not InternalAuth.verify_token(token):
+            raise HTTPException(status_code=403, detail="Invalid or expired internal token")
+
+    router = APIRouter(
+        prefix="/debug",
+        tags=["Debug"],
+        dependencies=[Depends(require_internal_token)],
+        include_in_schema=False,
+    )
+    allocations = AllocationTracker()
+    objects = ObjectCounter()
+
+    @router.get("/profile")
+    async def cpu_profile(
+        seconds: float = Query(5.0, gt=0, le=MAX_PROFILE_SECONDS),
+        interval_ms: float = Query(10.0, ge=1, le=1000),
+        format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+        include_idle: bool = False,
+    ):
+        try:
+            profiler = await SamplingProfiler(interval_ms / 1000, include_idle).run(seconds)
+        except ProfilerBusyError as e:
+            raise HTTPException(status_code=409, detail=str(e)) from e
+        if format == "collapsed":
+            return PlainTextResponse(profiler.to_collapsed())
+        return profiler.to_speedscope(f"{service_name} ({profiler.duration:.1f}s)")
+
+    @router.get("/tasks")
+    async def tasks(limit: int = Query(20, ge=1, le=200)):
+        dump = dump_tasks(limit)
+        return {"count": len(dump), "tasks": dump}
+
+    @router.post("/tracemalloc")
+    async def tracemalloc_start(frames: int = Query(10, ge=1, le=100)):
+        allocations.start(frames)
+        return {"tracing": True, "frames": frames}
+
+    @router.get("/tracemalloc")
+    async def tracemalloc_snapshot(
+        limit: int = Query(20, ge=1, le=200),
+        group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    ):
+        try:
+            return await asyncio.to_thread(allocations.snapshot, limit, group_by)
+        except RuntimeError as e:
+            raise HTTPException(status_code=409, detail=str(e)) from e
+
+    @router.delete("/tracemalloc")
+    async def tracemalloc_stop():
+        allocations.stop()
+        return {"tracing": False}
+
+    @router.get("/objects")
+    async def object_counts(limit: int = Query(20, ge=1, le=200)):
+        # gc.collect() + get_objects() : plusieurs centaines de ms sur un gros tas
+        return await asyncio.to_thread(objects.snapshot, limit)
+
+    return router
+
+
+def attach_debug_routes(app: Any, service_name: str = "the-hive") -> None:
+    """Ajoute les routes /debug à une application FastAPI (une seule fois)"""
+    if any(getattr(route, "path", "").startswith("/debug/") for route in app.routes):
+        return
+    app.include_router(create_debug_router(service_name))
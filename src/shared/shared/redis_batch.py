@@ -0,0 +1,166 @@
+"""
+Redis Batch — Écritures pipelinées et coalescence automatique
+══════════════════════════════════════════════════════════════
+
+Réduit le nombre d'allers-retours réseau vers Redis :
+
+  RedisBatch   → lot explicite (publish + cache_set d'un heartbeat)
+                 exécuté en un seul pipeline.
+  AutoBatcher  → tâche de fond qui regroupe les écritures émises dans
+                 une petite fenêtre de temps (ex: 2 ms) par des coroutines
+                 concurrentes (drones, heartbeats) en un seul pipeline.
+
+Usage:
+    async with redis.pipeline() as batch:
+        batch.publish("eva.banker.heartbeat", payload)
+        batch.cache_set("eva.banker.status", payload, ttl_seconds=10)
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from shared.models import AgentMessage
+
+logger = logging.getLogger(__name__)
+
+# Opération élémentaire : ("publish", (channel, message)), ("set", (key, value, ex)),
+# ("eval", (script, keys, args)) ou ("command", (nom, *args)) pour une commande brute
+BatchOp = tuple[str, tuple]
+
+
+class RedisBatch:
+    """Lot d'écritures exécuté en un seul aller-retour (pipeline non transactionnel)"""
+
+    def __init__(self, execute: Callable[[list[BatchOp]], Awaitable[list[Any]]]):
+        self._execute = execute
+        self._ops: list[BatchOp] = []
+
+    def publish(self, channel: str, message: "AgentMessage | dict") -> "RedisBatch":
+        """Ajoute une publication au lot"""
+        self._ops.append(("publish", (channel, message)))
+        return self
+
+    def set(self, key: str, value: str | dict, ex: int | None = None) -> "RedisBatch":
+        """Ajoute un SET au lot"""
+        self._ops.append(("set", (key, value, ex)))
+        return self
+
+    def cache_set(self, key: str, value: dict, ttl_seconds: int = 300) -> "RedisBatch":
+        """Ajoute une mise en cache au lot"""
+        return self.set(key, value, ex=ttl_seconds)
+
+    def eval_script(self, script: str, keys: list[str], args: list[Any]) -> "RedisBatch":
+        """Ajoute l'exécution d'un script Lua au lot (EVALSHA, pas le source)"""
+        self._ops.append(("eval", (script, keys, args)))
+        return self
+
+    def command(self, *args: Any) -> "RedisBatch":
+        """Ajoute une commande Redis brute au lot (ex: "HSET", key, field, value)"""
+        self._ops.append(("command", args))
+        return self
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    async def execute(self) -> list[Any]:
+        """Exécute le lot et retourne les résultats dans l'ordre d'ajout"""
+        ops, self._ops = self._ops, []
+        if not ops:
+            return []
+        return await self._execute(ops)
+
+
+class AutoBatcher:
+    """
+    Coalesce les écritures concurrentes en pipelines.
+
+    La première écriture ouvre une fenêtre de `window_ms` ; toutes les
+    écritures reçues pendant cette fenêtre (ou jusqu'à `max_batch`) partent
+    dans le même pipeline. Chaque appelant attend le résultat de sa propre
+    opération ; une erreur du pipeline est propagée à tous les appelants.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[list[BatchOp]], Awaitable[list[Any]]],
+        window_ms: float = 2.0,
+        max_batch: int = 256,
+    ):
+        self._execute = execute
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: list[tuple[BatchOp, asyncio.Future]] = []
+        self._has_items = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+        self.batches_sent = 0
+        self.ops_sent = 0
+
+    async def submit(self, kind: str, args: tuple) -> Any:
+        """Enfile une opération et attend son résultat"""
+        if self._closed:
+            raise RuntimeError("AutoBatcher fermé")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="redis-autobatcher")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(((kind, args), future))
+        self._has_items.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        return await future
+
+    async def _run(self) -> None:
+        while not self._closed:
+            await self._has_items.wait()
+            if not self._closed and len(self._pending) < self.max_batch:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), timeout=self.window)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Envoie immédiatement toutes les opérations en attente"""
+        while self._pending:
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            try:
+                results = await self._execute([op for op, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results, strict=True):
+                    if not future.done():
+                        future.set_result(result)
+            self.batches_sent += 1
+            self.ops_sent += len(batch)
+
+        self._has_items.clear()
+        self._full.clear()
+
+    async def close(self) -> None:
+        """Arrête la tâche de fond après avoir vidé la file (flush-on-shutdown)"""
+        self._closed = True
+        if self._task is not None:
+            # Réveille la boucle sans l'annuler : un pipeline en vol se termine
+            self._has_items.set()
+            self._full.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "batches_sent": self.batches_sent,
+            "ops_sent": self.ops_sent,
+            "avg_batch_size": round(self.ops_sent / self.batches_sent, 2)
+            if self.batches_sent
+            else 0.0,
+        }
@@ -1,25 +1,103 @@
 """
 Client Redis Pub/Sub - Communication Inter-Agents THE HIVE
+
+Deux transports coexistent derrière la même API `publish`/`subscribe` :
+  - Pub/Sub (défaut) : fire-and-forget, aucun message conservé.
+  - Streams (opt-in) : XADD / XREADGROUP avec consumer groups, acks,
+    reprise des entrées pendantes et trimming MAXLEN. Les channels
+    critiques (trades, compliance) survivent ainsi aux redémarrages Phoenix.
+
+Request/Reply : `request()` attend la réponse d'un expert (corrélée par
+`correlation_id` sur un channel de réponse propre au processus) ;
+`handle_requests()` permet à un expert de servir ces requêtes et annonce
+les actions servies (`serves()`), pour que l'appelant n'attende pas une
+réponse qui ne viendra jamais.
+
+TTL et priorités : les messages expirés (`ttl_seconds`) ne sont jamais
+passés aux callbacks — abandonnés ou versés dans le stream dead-letter
+`eva.dead_letter` — et les messages sont servis par voie de priorité
+(voir shared.dispatcher).
+
+Near-cache (opt-in) : `cache_get` sert les clés chaudes depuis un LRU en
+processus, invalidé par les notifications keyspace Redis.
+
+Connexions : trois pools dimensionnés explicitement (commandes, payloads
+binaires, écoute Pub/Sub/Streams bloquante), keepalive TCP, timeouts et
+retry avec backoff exponentiel à jitter. Les boucles d'écoute survivent à
+un redémarrage de Redis (reconnexion + réabonnement automatiques), état
+publié dans la télémétrie (`redis_connection`).
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+import math
+import socket
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Callable
-from uuid import UUID
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+from uuid import UUID, uuid4
 
 import redis.asyncio as redis
-from pydantic import BaseModel
+from pydantic import ValidationError
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.commands.core import AsyncScript
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import NoScriptError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from redis.retry import Retry
 
+from shared.circuit_breaker import get_circuit_breaker_registry
+from shared.codec import Codec, CodecError, get_codec
 from shared.config import get_settings
-from shared.models import AgentMessage, AgentMessageType
+from shared.dispatcher import ChannelDispatcher, ChannelPolicy
+from shared.models import AgentMessage, AgentMessageType, MessagePriority
+from shared.near_cache import NearCache
+from shared.redis_batch import AutoBatcher, BatchOp, RedisBatch
+from shared.telemetry import register_source, unregister_source
+from shared.tracing import (
+    TRACE_CONTEXT_KEY,
+    SpanKind,
+    current_traceparent,
+    parse_traceparent,
+    start_span,
+)
 
 logger = logging.getLogger(__name__)
 
+# Stream recevant les messages expirés (politique ExpiryPolicy.DEAD_LETTER)
+# et les entrées Streams dont les callbacks échouent à chaque livraison
+DEAD_LETTER_STREAM = "eva.dead_letter"
+
+# Actions servies en request/reply par chaque expert (set Redis)
+RPC_ACTIONS_KEY = "swarm:rpc:{agent}"
+
+# Erreurs réseau (coupure, redémarrage Redis) justifiant une reconnexion
+CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError, ConnectionError, OSError)
+
+# Keepalive TCP agressif : une connexion morte est détectée en ~25 s
+# (sans cela, une lecture Pub/Sub bloquante peut attendre indéfiniment)
+_KEEPALIVE_OPTIONS = {
+    opt: value
+    for name, value in (("TCP_KEEPIDLE", 10), ("TCP_KEEPINTVL", 5), ("TCP_KEEPCNT", 3))
+    if (opt := getattr(socket, name, None)) is not None
+}
+
+
+def _script_sha(script: str) -> str:
+    """SHA1 d'un script Lua, tel que calculé par SCRIPT LOAD"""
+    return hashlib.sha1(script.encode()).hexdigest()
+
+
+class AgentRequestError(Exception):
+    """Levée quand l'expert répond à une requête par une erreur."""
+    pass
+
 
 class UUIDEncoder(json.JSONEncoder):
-    """Encoder JSON pour UUID et datetime"""
+    """Encoder JSON pour UUID et datetime (conservé pour compatibilité, voir shared.codec)"""
 
     def default(self, obj: Any) -> Any:
         if isinstance(obj, UUID):
@@ -32,40 +110,300 @@ class UUIDEncoder(json.JSONEncoder):
 class RedisClient:
     """Client Redis pour communication inter-agents"""
 
-    def __init__(self, url: str | None = None):
+    def __init__(
+        self,
+        url: str | None = None,
+        stream_channels: list[str] | None = None,
+        codec: Codec | None = None,
+        connection_factory: Callable[..., redis.Redis] | None = None,
+    ):
+        """
+        Args:
+            url: URL Redis (défaut: settings.redis_url).
+            stream_channels: Channels en mode Streams (défaut: settings).
+            codec: Codec des messages (défaut: codec configuré).
+            connection_factory: Fabrique des trois clients, appelée comme
+                `_create_client(decode_responses, listener=...)` (ex: fakeredis
+                dans les tests). Défaut: pools dimensionnés sur `url`.
+        """
         settings = get_settings()
         self.url = url or settings.redis_url
-        self._client: redis.Redis | None = None
+        self.codec = codec or get_codec()
+        self._settings = settings
+        self._backoff = ExponentialWithJitterBackoff(
+            cap=settings.redis_reconnect_backoff_max,
+            base=settings.redis_reconnect_backoff_base,
+        )
+        # Pools créés d'emblée, connexions ouvertes à la demande :
+        #   _client        → commandes (réponses décodées UTF-8)
+        #   _raw_client    → lectures de payloads (msgpack binaire)
+        #   _listen_client → Pub/Sub et XREADGROUP bloquants, sans timeout de
+        #                    lecture, isolés pour ne pas affamer les commandes
+        create = connection_factory or self._create_client
+        self._client = create(decode_responses=True)
+        self._raw_client = create(decode_responses=False)
+        self._listen_client = create(decode_responses=False, listener=True)
+        self._connected = False
+        self.reconnects = 0
+        self._listeners: dict[str, str] = {}
         self._pubsub: redis.client.PubSub | None = None
         self._subscribers: dict[str, list[Callable]] = {}
+        self._dispatcher = ChannelDispatcher(self._run_callbacks, dead_letter=self._dead_letter)
+        self._batcher: AutoBatcher | None = None
+        self._scripts: dict[str, AsyncScript] = {}
+
+        # Mode Streams : channels publiés via XADD et consommés via XREADGROUP
+        if stream_channels is None:
+            stream_channels = (
+                settings.redis_stream_channels if settings.redis_streams_enabled else []
+            )
+        self._stream_channels: set[str] = set(stream_channels)
+        self._stream_group: str | None = None
+        self._stream_consumer = settings.redis_stream_consumer or socket.gethostname()
+        self._stream_maxlen = settings.redis_stream_maxlen
+        self._stream_batch_size = settings.redis_stream_batch_size
+        self._stream_block_ms = settings.redis_stream_block_ms
+        self._stream_reclaim_idle_ms = settings.redis_stream_reclaim_idle_ms
+        self._stream_max_deliveries = settings.redis_stream_max_deliveries
+        self._stream_acks: dict[str, list[str]] = {}
+
+        # Request/Reply : futures en attente indexées par correlation_id
+        self._reply_channel = f"eva.reply.{self._stream_consumer}.{uuid4().hex[:8]}"
+        self._reply_pubsub: redis.client.PubSub | None = None
+        self._reply_task: asyncio.Task | None = None
+        self._pending_replies: dict[str, asyncio.Future] = {}
+
+        # Near-cache : LRU local devant cache_get, invalidé par keyspace events
+        self._near_cache: NearCache | None = None
+        self._near_cache_pubsub: redis.client.PubSub | None = None
+        self._near_cache_task: asyncio.Task | None = None
+
+    def _create_client(self, decode_responses: bool, listener: bool = False) -> redis.Redis:
+        """Crée un client sur un pool dédié (taille, timeouts, keepalive, retry)"""
+        settings = self._settings
+        return redis.from_url(
+            self.url,
+            decode_responses=decode_responses,
+            max_connections=(
+                settings.redis_listener_max_connections
+                if listener
+                else settings.redis_max_connections
+            ),
+            socket_timeout=None if listener else settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_connect_timeout,
+            socket_keepalive=True,
+            socket_keepalive_options=_KEEPALIVE_OPTIONS,
+            health_check_interval=settings.redis_health_check_interval,
+            retry=Retry(self._backoff, settings.redis_retry_attempts),
+            retry_on_error=[RedisConnectionError, RedisTimeoutError],
+        )
 
     async def connect(self) -> None:
-        """Connexion à Redis"""
-        if self._client is None:
-            self._client = redis.from_url(self.url, decode_responses=True)
+        """
+        Vérifie la connexion à Redis (PING au premier appel).
+
+        Facultatif : les pools ouvrent leurs connexions à la demande.
+        """
+        if not self._connected:
             await self._client.ping()
+            self._connected = True
+            register_source("redis_connection", self.get_connection_stats)
             logger.info(f"Connecté à Redis: {self.url}")
 
     async def disconnect(self) -> None:
-        """Déconnexion de Redis"""
+        """Déconnexion de Redis (vide d'abord les écritures en attente)"""
+        if self._batcher:
+            await self._batcher.close()
+            self._batcher = None
+        self._dispatcher.close()
+        unregister_source("bus_dispatch")
+        unregister_source("redis_connection")
+        if self._near_cache_task:
+            self._near_cache_task.cancel()
+            unregister_source("near_cache")
+        if self._near_cache_pubsub:
+            await self._near_cache_pubsub.aclose()
+        if self._reply_task:
+            self._reply_task.cancel()
+        if self._reply_pubsub:
+            await self._reply_pubsub.aclose()
         if self._pubsub:
-            await self._pubsub.close()
-        if self._client:
-            await self._client.close()
-            logger.info("Déconnecté de Redis")
+            await self._pubsub.aclose()
+        await self._listen_client.aclose()
+        await self._raw_client.aclose()
+        await self._client.aclose()
+        self._connected = False
+        logger.info("Déconnecté de Redis")
+
+    def get_connection_stats(self) -> dict[str, Any]:
+        """
+        État des boucles d'écoute et nombre de reconnexions (source télémétrie
+        `redis_connection`) : `degraded` tant qu'une écoute se reconnecte.
+        """
+        degraded = any(state == "reconnecting" for state in self._listeners.values())
+        return {
+            "status": "degraded" if degraded else "ok",
+            "listeners": dict(self._listeners),
+            "reconnects": self.reconnects,
+        }
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # ACCÈS DIRECT (structures indexées, scripts Lua)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    @property
+    def commands(self) -> redis.Redis:
+        """Client de commandes (réponses décodées UTF-8)"""
+        return self._client
+
+    @property
+    def raw(self) -> redis.Redis:
+        """Client de lecture des payloads (réponses binaires, ex: msgpack)"""
+        return self._raw_client
+
+    @asynccontextmanager
+    async def command_pipeline(self, raw: bool = False) -> AsyncIterator[redis.client.Pipeline]:
+        """
+        Pipeline redis-py non transactionnel (lectures groupées en un aller-retour).
+
+        Contrairement à `pipeline()`, les résultats sont lus via `pipe.execute()`.
+
+        Args:
+            raw: Réponses binaires (payloads encodés par le codec).
+        """
+        client = self._raw_client if raw else self._client
+        async with client.pipeline(transaction=False) as pipe:
+            yield pipe
+
+    async def eval_script(
+        self,
+        script: str,
+        keys: list[str],
+        args: list[Any],
+    ) -> Any:
+        """
+        Exécute un script Lua par EVALSHA (rechargé si le serveur l'a oublié).
+
+        Les scripts sont enregistrés une fois par processus : le source n'est
+        envoyé qu'au premier appel ou après un redémarrage de Redis.
+        """
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = self._scripts[script] = self._client.register_script(script)
+        return await registered(keys=keys, args=args)
+
+    def is_stream_channel(self, channel: str) -> bool:
+        """Indique si le channel utilise le transport Streams (durable)"""
+        return channel in self._stream_channels
 
     async def publish(self, channel: str, message: AgentMessage | dict) -> int:
-        """Publie un message sur un channel"""
-        await self.connect()
-        if isinstance(message, BaseModel):
-            data = message.model_dump()
-        else:
-            data = message
+        """
+        Publie un message sur un channel.
 
-        json_data = json.dumps(data, cls=UUIDEncoder)
-        result = await self._client.publish(channel, json_data)
+        Returns:
+            int: Nombre d'abonnés Pub/Sub ayant reçu le message, ou 1 si le
+            message a été persisté dans un stream.
+        """
+        if self._batcher:
+            return await self._batcher.submit("publish", (channel, message))
+        result = await self._queue_publish(self._client, channel, message)
         logger.debug(f"Publié sur {channel}: {message}")
-        return result
+        return 1 if self.is_stream_channel(channel) else result
+
+    def _queue_publish(self, target: Any, channel: str, message: AgentMessage | dict) -> Any:
+        """Émet la commande de publication sur un client ou un pipeline"""
+        payload = self.codec.encode(message)
+        if self.is_stream_channel(channel):
+            return target.xadd(
+                channel,
+                {"data": payload},
+                maxlen=self._stream_maxlen,
+                approximate=True,
+            )
+        return target.publish(channel, payload)
+
+    def _queue_set(self, target: Any, key: str, value: str | dict, ex: int | None) -> Any:
+        """Émet un SET (dict encodé via le codec) sur un client ou un pipeline"""
+        if self._near_cache is not None:
+            self._near_cache.invalidate(key)
+        if isinstance(value, dict):
+            value = self.codec.encode(value)
+        return target.set(key, value, ex=ex)
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # BATCHING (pipeline)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def _execute_batch(self, ops: list[BatchOp]) -> list[Any]:
+        """
+        Exécute un lot d'écritures en un seul aller-retour.
+
+        Les scripts partent en EVALSHA ; ceux que le serveur ne connaît pas
+        (premier envoi, Redis redémarré) sont rejoués via `eval_script`.
+        """
+        async with self._client.pipeline(transaction=False) as pipe:
+            for kind, args in ops:
+                if kind == "publish":
+                    self._queue_publish(pipe, *args)
+                elif kind == "set":
+                    self._queue_set(pipe, *args)
+                elif kind == "eval":
+                    script, keys, script_args = args
+                    pipe.evalsha(_script_sha(script), len(keys), *keys, *script_args)
+                else:
+                    pipe.execute_command(*args)
+            results = await pipe.execute(raise_on_error=False)
+
+        for index, ((kind, args), result) in enumerate(zip(ops, results, strict=True)):
+            if kind == "eval" and isinstance(result, NoScriptError):
+                results[index] = await self.eval_script(*args)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return [
+            1 if kind == "publish" and self.is_stream_channel(args[0]) else result
+            for (kind, args), result in zip(ops, results, strict=True)
+        ]
+
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[RedisBatch]:
+        """
+        Regroupe des écritures en un seul aller-retour, exécuté en sortie de bloc.
+
+        Usage:
+            async with redis.pipeline() as batch:
+                batch.publish("eva.banker.heartbeat", payload)
+                batch.cache_set("eva.banker.status", payload, ttl_seconds=10)
+        """
+        batch = RedisBatch(self._execute_batch)
+        yield batch
+        await batch.execute()
+
+    async def publish_many(
+        self,
+        messages: Iterable[tuple[str, AgentMessage | dict]],
+    ) -> list[int]:
+        """Publie plusieurs messages (channel, message) en un seul aller-retour"""
+        batch = RedisBatch(self._execute_batch)
+        for channel, message in messages:
+            batch.publish(channel, message)
+        return await batch.execute()
+
+    def enable_auto_batching(self, window_ms: float = 2.0, max_batch: int = 256) -> None:
+        """
+        Active la coalescence automatique de `publish` et `set`/`cache_set`.
+
+        Les écritures concurrentes émises dans la fenêtre partent dans un même
+        pipeline. Chaque appel attend toujours son résultat (ajoute au plus
+        `window_ms` de latence). Les lectures ne passent pas par le batcher.
+        """
+        if self._batcher is None:
+            self._batcher = AutoBatcher(self._execute_batch, window_ms, max_batch)
+
+    async def flush(self) -> None:
+        """Envoie immédiatement les écritures en attente de l'auto-batcher"""
+        if self._batcher:
+            await self._batcher.flush()
 
     async def send_to_agent(
         self,
@@ -75,18 +413,30 @@ class RedisClient:
         payload: dict[str, Any] | None = None,
         msg_type: AgentMessageType = AgentMessageType.REQUEST,
         correlation_id: UUID | None = None,
+        reply_to: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        ttl_seconds: int = 30,
     ) -> AgentMessage:
         """Envoie un message à un agent spécifique"""
-        message = AgentMessage(
-            type=msg_type,
-            source_agent=source,
-            target_agent=target,
-            action=action,
-            payload=payload or {},
-            correlation_id=correlation_id,
-        )
-        channel = message.to_redis_channel()
-        await self.publish(channel, message)
+        with start_span(
+            f"bus.send {target}.{action}",
+            SpanKind.PRODUCER,
+            attributes={"messaging.system": "redis", "hive.target": target, "hive.action": action},
+        ):
+            message = AgentMessage(
+                type=msg_type,
+                source_agent=source,
+                target_agent=target,
+                action=action,
+                payload=payload or {},
+                correlation_id=correlation_id,
+                reply_to=reply_to,
+                priority=priority,
+                ttl_seconds=ttl_seconds,
+                trace_context=current_traceparent(),
+            )
+            channel = message.to_redis_channel()
+            await self.publish(channel, message)
         return message
 
     async def broadcast_to_swarm(
@@ -104,45 +454,635 @@ class RedisClient:
             msg_type=AgentMessageType.SWARM_COMMAND
         )
 
+    # ═══════════════════════════════════════════════════════════════════════════
+    # REQUEST / REPLY
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def request(
+        self,
+        target: str,
+        action: str,
+        payload: dict[str, Any] | None = None,
+        timeout: float = 5.0,
+        source: str = "core",
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> dict[str, Any]:
+        """
+        Envoie une requête à un expert et attend sa réponse (un aller-retour bus).
+
+        Args:
+            target: Expert destinataire (ex: 'banker').
+            action: Action demandée (ex: 'TRADING_STATUS').
+            payload: Paramètres de la requête.
+            timeout: Délai maximal d'attente de la réponse (secondes).
+            source: Agent émetteur.
+            priority: Voie de traitement côté expert (CRITICAL pour le trading).
+
+        Returns:
+            dict: Payload de la réponse de l'expert.
+
+        Raises:
+            TimeoutError: Aucune réponse dans le délai imparti.
+            AgentRequestError: L'expert a répondu par une erreur.
+        """
+        await self._ensure_reply_listener()
+
+        correlation_id = uuid4()
+        future = asyncio.get_running_loop().create_future()
+        self._pending_replies[str(correlation_id)] = future
+        try:
+            with start_span(f"bus.request {target}.{action}", SpanKind.CLIENT):
+                await self.send_to_agent(
+                    source=source,
+                    target=target,
+                    action=action,
+                    payload=payload,
+                    correlation_id=correlation_id,
+                    reply_to=self._reply_channel,
+                    priority=priority,
+                    # Plus personne n'attend la réponse après le timeout
+                    ttl_seconds=max(1, math.ceil(timeout)),
+                )
+                response = await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending_replies.pop(str(correlation_id), None)
+
+        error = response.get("payload", {}).get("error")
+        if error:
+            raise AgentRequestError(f"{target}.{action}: {error}")
+        return response.get("payload", {})
+
+    async def _ensure_reply_listener(self) -> None:
+        """Abonne le processus à son channel de réponse (une seule fois)"""
+        if self._reply_task is not None:
+            return
+        self._reply_pubsub = self._listen_client.pubsub(ignore_subscribe_messages=True)
+        await self._reply_pubsub.subscribe(self._reply_channel)
+        self._reply_task = asyncio.create_task(
+            self._run_listener("replies", self._listen_replies, self._reply_pubsub.connect),
+            name="redis-replies",
+        )
+
+    async def _listen_replies(self) -> None:
+        """Résout les futures en attente à la réception des réponses"""
+        async for message in self._reply_pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                data = self.codec.decode(message["data"])
+            except CodecError:
+                logger.error(f"Réponse invalide sur {self._reply_channel}")
+                continue
+            future = self._pending_replies.get(str(data.get("correlation_id")))
+            if future and not future.done():
+                future.set_result(data)
+
+    async def reply(
+        self,
+        request: AgentMessage,
+        payload: dict[str, Any] | None = None,
+        error: str | None = None,
+        source: str | None = None,
+    ) -> None:
+        """
+        Répond à une requête reçue (côté expert).
+
+        Sans `reply_to`, la requête était fire-and-forget : rien n'est envoyé.
+        """
+        if not request.reply_to:
+            return
+        response = AgentMessage(
+            type=AgentMessageType.RESPONSE,
+            source_agent=source or request.target_agent,
+            target_agent=request.source_agent,
+            action=request.action,
+            payload={"error": error} if error else (payload or {}),
+            correlation_id=request.correlation_id or request.id,
+            trace_context=current_traceparent(),
+        )
+        await self.publish(request.reply_to, response)
+
+    async def handle_requests(
+        self,
+        agent: str,
+        handlers: dict[str, Callable[[dict[str, Any]], Any]],
+        policy: ChannelPolicy | None = None,
+    ) -> None:
+        """
+        Sert les requêtes adressées à `agent` (channel `eva.{agent}.requests`).
+
+        Chaque handler reçoit le payload de la requête et retourne le dict de
+        réponse ; une exception est renvoyée à l'appelant comme erreur.
+        Comme `subscribe`, nécessite une boucle `listen()` active.
+
+        Args:
+            agent: Nom de l'expert (ex: 'banker').
+            handlers: Action → coroutine(payload) -> dict.
+            policy: Politique de dispatch du channel de requêtes.
+        """
+
+        async def on_request(channel: str, data: dict) -> None:
+            try:
+                request = AgentMessage(**data)
+            except ValidationError:
+                # Commande brute (ex: genesis_cli) : pas de réponse attendue
+                logger.debug(f"Message non-RPC ignoré sur {channel}: {data}")
+                return
+            handler = handlers.get(request.action)
+            if handler is None:
+                # Peut être traité par un autre abonné du même channel
+                return
+            try:
+                result = await handler(request.payload)
+            except Exception as e:
+                logger.exception(f"Erreur handler {agent}.{request.action}: {e}")
+                await self.reply(request, error=str(e), source=agent)
+            else:
+                await self.reply(request, result, source=agent)
+
+        await self.subscribe([f"eva.{agent}.requests"], on_request, policy=policy)
+        # Annonce remplacée à chaque démarrage (MULTI : jamais vide entre les
+        # deux commandes) ; une action retirée disparaît
+        key = RPC_ACTIONS_KEY.format(agent=agent)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if handlers:
+                pipe.sadd(key, *handlers)
+            await pipe.execute()
+
+    async def serves(self, agent: str, action: str) -> bool:
+        """
+        Indique si `agent` sert `action` en request/reply (`handle_requests`).
+
+        Sans handler, `request()` n'obtiendrait jamais de réponse : l'appelant
+        envoie alors un simple message plutôt que d'attendre le timeout.
+        """
+        return bool(await self._client.sismember(RPC_ACTIONS_KEY.format(agent=agent), action))
+
     async def subscribe(
         self,
         channels: list[str],
         callback: Callable[[str, dict], Any],
+        group: str | None = None,
+        policy: ChannelPolicy | None = None,
     ) -> None:
-        """S'abonne à des channels avec callback"""
-        await self.connect()
+        """
+        S'abonne à des channels avec callback.
+
+        Les channels en mode Streams sont lus via le consumer group `group`
+        (typiquement le nom de l'expert) : chaque service reçoit tous les
+        messages, et les replicas d'un même service se les partagent.
 
-        if self._pubsub is None:
-            self._pubsub = self._client.pubsub()
+        Args:
+            channels: Channels à écouter.
+            callback: Fonction async(channel, data) appelée à chaque message.
+            group: Consumer group pour les channels Streams (défaut: 'hive').
+            policy: Concurrence, taille de file et politique de débordement
+                des callbacks de ces channels (défaut: 1 worker, BLOCK).
+        """
+
+        stream_channels = [c for c in channels if self.is_stream_channel(c)]
+        pubsub_channels = [c for c in channels if not self.is_stream_channel(c)]
 
         for channel in channels:
             if channel not in self._subscribers:
                 self._subscribers[channel] = []
             self._subscribers[channel].append(callback)
+            if policy is not None:
+                self._dispatcher.configure(channel, policy)
+        register_source("bus_dispatch", self._dispatcher.get_stats)
+
+        if stream_channels:
+            group = group or self._stream_group or "hive"
+            if self._stream_group and group != self._stream_group:
+                raise ValueError(
+                    f"Consumer group déjà défini ({self._stream_group}), reçu: {group}"
+                )
+            self._stream_group = group
+            for channel in stream_channels:
+                await self._ensure_stream_group(channel, group)
+            logger.info(f"Abonné aux streams {stream_channels} (groupe: {group})")
 
-        await self._pubsub.subscribe(*channels)
-        logger.info(f"Abonné aux channels: {channels}")
+        if pubsub_channels:
+            if self._pubsub is None:
+                self._pubsub = self._listen_client.pubsub()
+            await self._pubsub.subscribe(*pubsub_channels)
+            logger.info(f"Abonné aux channels: {pubsub_channels}")
 
     async def listen(self) -> None:
-        """Écoute les messages en continu"""
-        if self._pubsub is None:
+        """Écoute les messages en continu (Pub/Sub et Streams)"""
+        listeners = []
+        if self._pubsub is not None:
+            listeners.append(
+                self._run_listener("pubsub", self._listen_pubsub, self._pubsub.connect)
+            )
+        if self._stream_group is not None:
+            # Reprise : la boucle repart du rejeu des entrées pendantes
+            listeners.append(self._run_listener("streams", self._listen_streams))
+        if not listeners:
             raise RuntimeError("Pas d'abonnement actif")
+        await asyncio.gather(*listeners)
+
+    async def listen_channels(
+        self,
+        name: str,
+        channels: list[str],
+        callback: Callable[[bytes], Awaitable[None]],
+    ) -> asyncio.Task:
+        """
+        Écoute des channels Pub/Sub dans une tâche dédiée, hors de `listen()`.
+
+        Même reconnexion que les autres écoutes (réabonnement compris) ;
+        annuler la tâche ferme l'abonnement.
+
+        Args:
+            name: Nom de l'écoute (état exposé par `get_connection_stats()`).
+            channels: Channels Pub/Sub à écouter.
+            callback: Coroutine recevant le payload brut de chaque message.
+
+        Returns:
+            asyncio.Task: Tâche d'écoute.
+        """
+        pubsub = self._listen_client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(*channels)
+
+        async def loop() -> None:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    await callback(message["data"])
+
+        async def run() -> None:
+            try:
+                await self._run_listener(name, loop, pubsub.connect)
+            finally:
+                await pubsub.aclose()
+
+        return asyncio.create_task(run(), name=f"redis-{name}")
 
+    async def _run_listener(
+        self,
+        name: str,
+        loop: Callable[[], Awaitable[None]],
+        on_reconnect: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        """
+        Exécute une boucle d'écoute et la relance après une coupure Redis.
+
+        Attente entre tentatives : backoff exponentiel avec jitter, remis à
+        zéro dès que la boucle a tenu plus longtemps que le plafond.
+        `on_reconnect` rétablit l'abonnement avant de relancer la boucle
+        (PubSub.connect réabonne tous les channels et patterns).
+        """
+        failures = 0
+        while True:
+            started = time.monotonic()
+            try:
+                if failures and on_reconnect is not None:
+                    await on_reconnect()
+                self._listeners[name] = "listening"
+                await loop()
+                return
+            except CONNECTION_ERRORS as e:
+                if time.monotonic() - started > self._settings.redis_reconnect_backoff_max:
+                    failures = 0
+                delay = self._backoff.compute(failures)
+                failures += 1
+                self.reconnects += 1
+                self._listeners[name] = "reconnecting"
+                logger.warning(
+                    f"🔌 Écoute Redis '{name}' interrompue ({e!r}), "
+                    f"tentative {failures} dans {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            finally:
+                if self._listeners.get(name) == "listening":
+                    self._listeners[name] = "stopped"
+
+    async def _listen_pubsub(self) -> None:
+        """Boucle de lecture Pub/Sub"""
         async for message in self._pubsub.listen():
             if message["type"] == "message":
-                channel = message["channel"]
-                try:
-                    data = json.loads(message["data"])
-                    for callback in self._subscribers.get(channel, []):
-                        await callback(channel, data)
-                except json.JSONDecodeError:
-                    logger.error(f"Message invalide sur {channel}: {message['data']}")
-                except Exception as e:
-                    logger.exception(f"Erreur callback sur {channel}: {e}")
+                await self._dispatch(message["channel"].decode(), message["data"])
+
+    async def _dispatch(
+        self,
+        channel: str,
+        raw: bytes,
+        on_done: Callable[[bool], None] | None = None,
+    ) -> None:
+        """
+        Décode un message et le soumet au pool de workers du channel.
+
+        `on_done(ok)` est appelé une fois les callbacks exécutés. Un message
+        invalide est considéré comme traité (inutile de le rejouer).
+        """
+        try:
+            data = self.codec.decode(raw)
+        except CodecError:
+            logger.error(f"Message invalide sur {channel}: {raw!r}")
+            if on_done:
+                on_done(True)
+            return
+
+        await self._dispatcher.submit(channel, data, on_done)
+
+    async def _run_callbacks(self, channel: str, data: dict) -> None:
+        """Exécute les callbacks d'un channel (appelé par les workers)"""
+        # Span consommateur rattaché à la trace de l'émetteur (AgentMessage.trace_context)
+        with start_span(
+            f"bus.handle {channel}",
+            SpanKind.CONSUMER,
+            parent=parse_traceparent(data.get(TRACE_CONTEXT_KEY)) if isinstance(data, dict) else None,
+            attributes={"messaging.system": "redis", "messaging.destination": channel},
+        ):
+            for callback in self._subscribers.get(channel, []):
+                await callback(channel, data)
+
+    async def _dead_letter(self, channel: str, data: dict) -> None:
+        """Conserve un message expiré dans le stream dead-letter"""
+        await self._add_dead_letter(channel, "expired", self.codec.encode(data))
+        logger.warning(f"⏱️ Message expiré sur {channel} versé en dead-letter")
+
+    async def _add_dead_letter(self, channel: str, reason: str, data: bytes) -> None:
+        """XADD d'un payload encodé dans le stream dead-letter"""
+        async with self._client.pipeline(transaction=False) as pipe:
+            self._queue_dead_letter(pipe, channel, reason, data)
+            await pipe.execute()
+
+    def _queue_dead_letter(
+        self,
+        pipe: redis.client.Pipeline,
+        channel: str,
+        reason: str,
+        data: bytes,
+    ) -> None:
+        pipe.xadd(
+            DEAD_LETTER_STREAM,
+            {"channel": channel, "reason": reason, "data": data},
+            maxlen=self._stream_maxlen,
+            approximate=True,
+        )
+
+    def get_dispatch_stats(self) -> dict[str, dict[str, Any]]:
+        """Profondeur de file par voie, messages expirés et latence des callbacks par channel"""
+        return self._dispatcher.get_stats()
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # NEAR-CACHE (LRU local + keyspace notifications)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def enable_near_cache(
+        self,
+        prefixes: dict[str, float],
+        max_entries: int = 1024,
+    ) -> None:
+        """
+        Active le near-cache de `cache_get` pour les clés des préfixes donnés.
+
+        L'invalidation suit les notifications keyspace Redis : le serveur doit
+        tourner avec `notify-keyspace-events` incluant `K$gxe` (sinon le
+        client tente un CONFIG SET, souvent interdit en production). Sans
+        elles, seul le TTL local borne l'obsolescence : choisir des TTL courts.
+
+        Args:
+            prefixes: Préfixe de clé → TTL local en secondes.
+            max_entries: Taille maximale du cache (éviction LRU).
+        """
+        if self._near_cache is not None or not prefixes:
+            return
+        self._near_cache = NearCache(prefixes, max_entries)
+        await self._enable_keyspace_events()
+
+        db = self._listen_client.connection_pool.connection_kwargs.get("db", 0)
+        self._near_cache_pubsub = self._listen_client.pubsub()
+        await self._near_cache_pubsub.psubscribe(
+            *(f"__keyspace@{db}__:{prefix}*" for prefix in prefixes)
+        )
+        self._near_cache_task = asyncio.create_task(
+            self._run_listener(
+                "near_cache", self._listen_invalidations, self._reconnect_invalidations
+            ),
+            name="redis-near-cache",
+        )
+        register_source("near_cache", self._near_cache.get_stats)
+        logger.info(f"🧊 Near-cache Redis actif ({', '.join(prefixes)})")
+
+    async def _enable_keyspace_events(self) -> None:
+        """Active les notifications keyspace nécessaires (K + set/del/expire/evict)"""
+        try:
+            config = await self._client.config_get("notify-keyspace-events")
+            flags = config.get("notify-keyspace-events", "")
+            if "K" in flags and ("A" in flags or all(f in flags for f in "$gxe")):
+                return
+            await self._client.config_set(
+                "notify-keyspace-events", "".join(sorted(set(flags) | set("K$gxe")))
+            )
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Notifications keyspace non configurables ({e}) : si elles sont "
+                "désactivées côté serveur, le near-cache n'expire que par TTL"
+            )
+
+    async def _listen_invalidations(self) -> None:
+        """Invalide les entrées locales à chaque modification côté Redis"""
+        async for message in self._near_cache_pubsub.listen():
+            if message["type"] != "pmessage":
+                continue
+            # Channel: __keyspace@<db>__:<clé>
+            key = message["channel"].decode().split("__:", 1)[1]
+            self._near_cache.invalidate(key)
+
+    async def _reconnect_invalidations(self) -> None:
+        """Invalidations potentiellement perdues pendant la coupure : on repart à froid"""
+        self._near_cache.clear()
+        await self._near_cache_pubsub.connect()
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # STREAMS (at-least-once)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def _ensure_stream_group(self, channel: str, group: str, start_id: str = "$") -> None:
+        """Crée le stream et son consumer group s'ils n'existent pas"""
+        try:
+            await self._client.xgroup_create(channel, group, id=start_id, mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _listen_streams(self) -> None:
+        """
+        Boucle de lecture Streams, résistante à la perte des consumer groups.
+
+        Après un redémarrage Redis sans persistance ou un FLUSH, XREADGROUP
+        lève NOGROUP : les groupes sont recréés depuis le début du stream
+        (les entrées publiées depuis le redémarrage ne sont pas perdues) et
+        la lecture reprend.
+        """
+        channels = [c for c in self._subscribers if self.is_stream_channel(c)]
+        while True:
+            try:
+                await self._consume_streams(channels)
+                return
+            except redis.ResponseError as e:
+                if not str(e).startswith("NOGROUP"):
+                    raise
+                logger.warning(
+                    f"♻️ Consumer group '{self._stream_group}' disparu ({e}), recréation"
+                )
+                # Entrées de l'ancien stream : plus rien à acquitter
+                self._stream_acks.clear()
+                for channel in channels:
+                    await self._ensure_stream_group(channel, self._stream_group, start_id="0")
+
+    async def _consume_streams(self, channels: list[str]) -> None:
+        """
+        1. Rejoue les entrées pendantes de ce consumer (crash avant ACK).
+        2. Lit les nouveaux messages par lots (un seul XREADGROUP pour
+           tous les streams) et acquitte chaque lot en un seul pipeline.
+        3. Récupère périodiquement (XAUTOCLAIM) les entrées abandonnées
+           par des consumers morts, ou dont les callbacks ont échoué.
+        """
+        loop = asyncio.get_running_loop()
+        reclaim_interval = self._stream_reclaim_idle_ms / 1000
+        next_reclaim = loop.time() + reclaim_interval
+
+        await self._replay_own_pending(channels)
+
+        while True:
+            await self._flush_stream_acks()
+            response = await self._listen_client.xreadgroup(
+                self._stream_group,
+                self._stream_consumer,
+                {c: ">" for c in channels},
+                count=self._stream_batch_size,
+                block=self._stream_block_ms,
+            )
+            for channel, entries in response or []:
+                await self._process_stream_entries(channel.decode(), entries)
+            if loop.time() >= next_reclaim:
+                await self._reclaim_pending(channels)
+                next_reclaim = loop.time() + reclaim_interval
+
+    async def _replay_own_pending(self, channels: list[str]) -> None:
+        """Rejoue l'historique pendant de ce consumer, lot par lot"""
+        cursors = {c: "0" for c in channels}
+        while cursors:
+            response = await self._raw_client.xreadgroup(
+                self._stream_group,
+                self._stream_consumer,
+                cursors,
+                count=self._stream_batch_size,
+            )
+            if not response:
+                break
+            for channel, entries in response:
+                channel = channel.decode()
+                if not entries:
+                    cursors.pop(channel, None)
+                    continue
+                cursors[channel] = entries[-1][0].decode()
+                logger.warning(f"♻️ Rejeu de {len(entries)} message(s) pendant(s) sur {channel}")
+                entries = await self._dead_letter_poison(channel, entries)
+                await self._process_stream_entries(channel, entries)
+
+    async def _process_stream_entries(
+        self,
+        channel: str,
+        entries: list[tuple[bytes, dict]],
+    ) -> None:
+        """
+        Soumet les entrées d'un stream au dispatcher.
+
+        Les entrées traitées avec succès sont mises en attente d'ACK puis
+        acquittées par lot (`_flush_stream_acks`). Celles en échec restent
+        pendantes et seront reprises par XAUTOCLAIM.
+        """
+        for entry_id, fields in entries:
+            entry_id = entry_id.decode()
+            # Entrée supprimée par MAXLEN alors qu'elle était pendante
+            if not fields:
+                self._stream_acks.setdefault(channel, []).append(entry_id)
+                continue
+
+            def on_done(ok: bool, entry_id: str = entry_id) -> None:
+                if ok:
+                    self._stream_acks.setdefault(channel, []).append(entry_id)
+
+            await self._dispatch(channel, fields.get(b"data", b""), on_done)
+
+    async def _flush_stream_acks(self) -> None:
+        """Acquitte en un seul pipeline toutes les entrées traitées"""
+        pending = {c: ids for c, ids in self._stream_acks.items() if ids}
+        if not pending:
+            return
+        async with self._client.pipeline(transaction=False) as pipe:
+            for channel, ids in pending.items():
+                pipe.xack(channel, self._stream_group, *ids)
+                self._stream_acks[channel] = []
+            await pipe.execute()
+
+    async def _reclaim_pending(self, channels: list[str]) -> None:
+        """Reprend les entrées pendantes inactives (consumers morts)"""
+        for channel in channels:
+            try:
+                _, entries, *_ = await self._raw_client.xautoclaim(
+                    channel,
+                    self._stream_group,
+                    self._stream_consumer,
+                    min_idle_time=self._stream_reclaim_idle_ms,
+                    count=self._stream_batch_size,
+                )
+            except redis.ResponseError as e:
+                logger.error(f"XAUTOCLAIM échoué sur {channel}: {e}")
+                continue
+            if entries:
+                logger.warning(f"♻️ {len(entries)} message(s) repris sur {channel}")
+                entries = await self._dead_letter_poison(channel, entries)
+                await self._process_stream_entries(channel, entries)
+
+    async def _dead_letter_poison(
+        self,
+        channel: str,
+        entries: list[tuple[bytes, dict]],
+    ) -> list[tuple[bytes, dict]]:
+        """
+        Écarte les entrées livrées plus de `redis_stream_max_deliveries` fois.
+
+        Une entrée dont les callbacks échouent systématiquement serait sinon
+        reprise à chaque cycle, indéfiniment : elle est versée dans le stream
+        dead-letter puis acquittée. Retourne les entrées à traiter.
+        """
+        if not entries or self._stream_max_deliveries <= 0:
+            return entries
+        # XAUTOCLAIM et le rejeu de l'historique incrémentent le compteur de livraisons
+        pending = await self._client.xpending_range(
+            channel,
+            self._stream_group,
+            min=entries[0][0].decode(),
+            max=entries[-1][0].decode(),
+            count=len(entries),
+        )
+        deliveries = {p["message_id"]: p["times_delivered"] for p in pending}
+        keep, poison = [], []
+        for entry_id, fields in entries:
+            if fields and deliveries.get(entry_id.decode(), 0) > self._stream_max_deliveries:
+                poison.append((entry_id, fields))
+            else:
+                keep.append((entry_id, fields))
+        if poison:
+            async with self._client.pipeline(transaction=True) as pipe:
+                for _entry_id, fields in poison:
+                    self._queue_dead_letter(pipe, channel, "max_deliveries", fields.get(b"data", b""))
+                pipe.xack(channel, self._stream_group, *(entry_id for entry_id, _ in poison))
+                await pipe.execute()
+            logger.error(
+                f"☠️ {len(poison)} message(s) de {channel} versé(s) en dead-letter "
+                f"après {self._stream_max_deliveries} livraisons en échec"
+            )
+        return keep
 
     async def get(self, key: str) -> str | None:
         """Récupère une valeur Redis"""
-        await self.connect()
         return await self._client.get(key)
 
     async def set(
@@ -152,16 +1092,24 @@ class RedisClient:
         ex: int | None = None,
     ) -> bool:
         """Définit une valeur Redis"""
-        await self.connect()
-        if isinstance(value, dict):
-            value = json.dumps(value, cls=UUIDEncoder)
-        return await self._client.set(key, value, ex=ex)
+        if self._batcher:
+            return await self._batcher.submit("set", (key, value, ex))
+        return await self._queue_set(self._client, key, value, ex)
 
     async def cache_get(self, key: str) -> dict | None:
-        """Récupère une valeur JSON du cache"""
-        data = await self.get(key)
+        """Récupère une valeur du cache (JSON ou msgpack, auto-détecté)"""
+        near = self._near_cache
+        if near is not None and near.ttl_for(key) is not None:
+            data = near.get(key)
+            if data is None:
+                generation = near.generation
+                data = await self._raw_client.get(key)
+                if data:
+                    near.put(key, data, generation)
+        else:
+            data = await self._raw_client.get(key)
         if data:
-            return json.loads(data)
+            return self.codec.decode(data)
         return None
 
     async def cache_set(
@@ -170,7 +1118,7 @@ class RedisClient:
         value: dict,
         ttl_seconds: int = 300,
     ) -> bool:
-        """Met en cache une valeur JSON"""
+        """Met en cache une valeur (encodée avec le codec du client)"""
         return await self.set(key, value, ex=ttl_seconds)
 
 
@@ -190,4 +1138,14 @@ async def init_redis() -> RedisClient:
     """Initialise la connexion Redis"""
     client = get_redis_client()
     await client.connect()
+    settings = get_settings()
+    if settings.redis_auto_batch_window_ms > 0:
+        client.enable_auto_batching(window_ms=settings.redis_auto_batch_window_ms)
+    if settings.redis_near_cache_prefixes:
+        await client.enable_near_cache(
+            settings.redis_near_cache_prefixes,
+            max_entries=settings.redis_near_cache_max_entries,
+        )
+    if settings.circuit_breaker_shared_state:
+        get_circuit_breaker_registry().enable_shared_state(client)
     return client
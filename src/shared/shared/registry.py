@@ -0,0 +1,227 @@
+"""
+Registry — Registres indexés Redis (drones, comptes Prop Firm)
+══════════════════════════════════════════════════════════════
+
+Remplace le motif `KEYS prefix:*` + un GET par clé (bloquant pour Redis,
+N+1 allers-retours) par deux structures indexées :
+
+  {key}          → HASH   id → enregistrement (encodé via le codec)
+  {key}:expiry   → ZSET   id → échéance (timestamp Unix)
+
+`list_all()` lit tout le registre en un seul aller-retour (HGETALL +
+ZRANGEBYSCORE pipelinés). Les entrées échues sont filtrées à la lecture
+puis purgées par un script Lua atomique, qui revérifie le score : une
+entrée rafraîchie entre-temps n'est jamais supprimée.
+
+Migration : `migrate_from_keys()` importe les anciennes clés
+`prefix:<id>` par SCAN incrémental (jamais de KEYS).
+
+Usage:
+    registry = get_drone_registry()
+    await registry.put(drone_id, drone.model_dump(), ttl_seconds=60)
+    drones = await registry.list_all()
+"""
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from shared.redis_batch import RedisBatch
+    from shared.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Registres de la ruche (et préfixes des anciennes clés unitaires)
+DRONE_REGISTRY = "swarm:drones"
+DRONE_LEGACY_PREFIX = "swarm:drone:"
+PROPFIRM_REGISTRY = "propfirm:accounts"
+PROPFIRM_LEGACY_PREFIX = "propfirm:account:"
+
+# Supprime les ids dont l'échéance est passée (revérifiée côté serveur)
+_SWEEP_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, 1000)
+if #ids > 0 then
+    redis.call('HDEL', KEYS[1], unpack(ids))
+    redis.call('ZREM', KEYS[2], unpack(ids))
+end
+return #ids
+"""
+
+
+class RedisRegistry:
+    """
+    Registre d'enregistrements indexé par id, avec TTL optionnel par entrée.
+
+    Args:
+        key: Clé du hash Redis (le ZSET d'échéances est `{key}:expiry`).
+        redis: Client à utiliser (défaut: client global).
+    """
+
+    def __init__(self, key: str, redis: "RedisClient | None" = None):
+        self.key = key
+        self.expiry_key = f"{key}:expiry"
+        self._redis = redis
+
+    @property
+    def redis(self) -> "RedisClient":
+        if self._redis is None:
+            from shared.redis_client import get_redis_client
+
+            self._redis = get_redis_client()
+        return self._redis
+
+    def _queue_put(
+        self,
+        batch: "RedisBatch",
+        member_id: str,
+        record: dict,
+        ttl_seconds: float | None,
+    ) -> None:
+        batch.command("HSET", self.key, member_id, self.redis.codec.encode(record))
+        if ttl_seconds is None:
+            batch.command("ZREM", self.expiry_key, member_id)
+        else:
+            batch.command("ZADD", self.expiry_key, time.time() + ttl_seconds, member_id)
+
+    async def put(
+        self,
+        member_id: Any,
+        record: dict,
+        ttl_seconds: float | None = None,
+        batch: "RedisBatch | None" = None,
+    ) -> None:
+        """
+        Enregistre ou rafraîchit une entrée.
+
+        Args:
+            member_id: Identifiant de l'entrée.
+            record: Enregistrement (dict encodable par le codec).
+            ttl_seconds: Durée de vie ; None = permanent.
+            batch: Lot existant auquel ajouter l'écriture (sinon pipeline dédié).
+        """
+        if batch is not None:
+            self._queue_put(batch, str(member_id), record, ttl_seconds)
+            return
+        async with self.redis.pipeline() as own_batch:
+            self._queue_put(own_batch, str(member_id), record, ttl_seconds)
+
+    async def remove(self, member_id: Any) -> bool:
+        """Supprime une entrée. Retourne True si elle existait."""
+        async with self.redis.command_pipeline() as pipe:
+            pipe.hdel(self.key, str(member_id))
+            pipe.zrem(self.expiry_key, str(member_id))
+            deleted, _ = await pipe.execute()
+        return bool(deleted)
+
+    async def get(self, member_id: Any) -> dict | None:
+        """Retourne une entrée, ou None si absente ou échue."""
+        async with self.redis.command_pipeline(raw=True) as pipe:
+            pipe.hget(self.key, str(member_id))
+            pipe.zscore(self.expiry_key, str(member_id))
+            data, expires_at = await pipe.execute()
+        if data is None or (expires_at is not None and expires_at <= time.time()):
+            return None
+        return self.redis.codec.decode(data)
+
+    async def list_all(self) -> list[dict]:
+        """Retourne toutes les entrées vivantes en un seul aller-retour."""
+        now = time.time()
+        async with self.redis.command_pipeline(raw=True) as pipe:
+            pipe.hgetall(self.key)
+            pipe.zrangebyscore(self.expiry_key, "-inf", now)
+            raw, expired = await pipe.execute()
+
+        expired_ids = {member.decode() for member in expired}
+        entries: list[dict] = []
+        for field, data in raw.items():
+            member_id = field.decode()
+            if member_id in expired_ids:
+                continue
+            try:
+                entries.append(self.redis.codec.decode(data))
+            except ValueError as e:
+                logger.warning(f"Entrée illisible {self.key}[{member_id}]: {e}")
+
+        if expired_ids:
+            await self.sweep(now)
+        return entries
+
+    async def count(self) -> int:
+        """Nombre d'entrées vivantes (purge les échues au passage)."""
+        await self.sweep()
+        return await self.redis.commands.hlen(self.key)
+
+    async def sweep(self, now: float | None = None) -> int:
+        """Purge les entrées échues. Retourne le nombre d'entrées supprimées."""
+        removed = await self.redis.eval_script(
+            _SWEEP_SCRIPT,
+            keys=[self.key, self.expiry_key],
+            args=[now if now is not None else time.time()],
+        )
+        if removed:
+            logger.debug(f"🧹 {removed} entrée(s) échue(s) purgée(s) de {self.key}")
+        return removed
+
+    async def migrate_from_keys(
+        self,
+        prefix: str,
+        ttl_seconds: float | None = None,
+        scan_count: int = 500,
+    ) -> int:
+        """
+        Déplace les anciennes clés `{prefix}<id>` dans le registre.
+
+        Parcours par SCAN incrémental (non bloquant) et MGET par page. Le TTL
+        restant de chaque clé est conservé ; `ttl_seconds` s'applique aux
+        clés sans expiration. Les clés importées sont supprimées, pour qu'une
+        entrée retirée du registre ne soit pas réimportée au démarrage suivant.
+
+        Returns:
+            int: Nombre d'entrées importées.
+        """
+        raw_client = self.redis.raw
+        migrated = 0
+        cursor = 0
+        while True:
+            cursor, keys = await raw_client.scan(cursor, match=f"{prefix}*", count=scan_count)
+            if keys:
+                async with raw_client.pipeline(transaction=False) as pipe:
+                    pipe.mget(keys)
+                    for key in keys:
+                        pipe.ttl(key)
+                    values, *ttls = await pipe.execute()
+
+                async with self.redis.pipeline() as batch:
+                    for key, data, ttl in zip(keys, values, ttls, strict=True):
+                        if data is None:
+                            continue
+                        try:
+                            record = self.redis.codec.decode(data)
+                        except ValueError:
+                            continue
+                        member_id = key.decode()[len(prefix):]
+                        self._queue_put(
+                            batch,
+                            member_id,
+                            record,
+                            ttl if ttl > 0 else ttl_seconds,
+                        )
+                        batch.command("UNLINK", key)
+                        migrated += 1
+            if cursor == 0:
+                break
+
+        if migrated:
+            logger.info(f"📦 {migrated} clé(s) {prefix}* migrée(s) vers {self.key}")
+        return migrated
+
+
+def get_drone_registry(redis: "RedisClient | None" = None) -> RedisRegistry:
+    """Registre des drones du swarm (heartbeat = rafraîchissement du TTL)"""
+    return RedisRegistry(DRONE_REGISTRY, redis)
+
+
+def get_propfirm_registry(redis: "RedisClient | None" = None) -> RedisRegistry:
+    """Registre des comptes Prop Firm (entrées permanentes)"""
+    return RedisRegistry(PROPFIRM_REGISTRY, redis)
@@ -6,6 +6,7 @@ from typing import Any, Dict, Optional
 
 from shared.models import AgentMessage, AgentMessageType, SwarmDrone
 from shared.redis_client import get_redis_client
+from shared.registry import get_drone_registry
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,7 @@ class DroneRunner:
         self.agent_name = agent_name
         self.active_drones: Dict[str, asyncio.Task] = {}
         self.redis = get_redis_client()
+        self.registry = get_drone_registry(self.redis)
         self.mqtt = EVAMQTTClient(agent_name)
 
     async def init_mqtt(self):
@@ -40,7 +42,7 @@ class DroneRunner:
         )
         
         # Enregistrement initial dans Redis
-        await self.redis.cache_set(f"swarm:drone:{drone_id}", drone_info.model_dump(), ttl_seconds=3600)
+        await self.registry.put(drone_id, drone_info.model_dump(), ttl_seconds=3600)
         
         # Lancement de la tâche
         task = asyncio.create_task(self._run_drone_loop(drone_info, coro))
@@ -58,16 +60,16 @@ class DroneRunner:
             mission_task = asyncio.create_task(coro)
             
             while not mission_task.done():
-                # Heartbeat toutes les 30 secondes
+                # Heartbeat toutes les 30 secondes (un seul aller-retour Redis)
                 drone.last_callback = datetime.now()
-                await self.redis.cache_set(f"swarm:drone:{drone.id}", drone.model_dump(), ttl_seconds=60)
-                
-                # Notification de progression au swarm
-                await self.redis.publish(f"eva.swarm.events", {
-                    "type": "DRONE_HEARTBEAT",
-                    "drone_id": str(drone.id),
-                    "status": drone.status
-                })
+                async with self.redis.pipeline() as batch:
+                    await self.registry.put(drone.id, drone.model_dump(), ttl_seconds=60, batch=batch)
+                    # Notification de progression au swarm
+                    batch.publish(f"eva.swarm.events", {
+                        "type": "DRONE_HEARTBEAT",
+                        "drone_id": str(drone.id),
+                        "status": drone.status
+                    })
                 
                 await asyncio.sleep(30)
                 
@@ -75,14 +77,14 @@ class DroneRunner:
             result = await mission_task
             drone.status = "completed"
             drone.metadata["result"] = str(result)
-            await self.redis.cache_set(f"swarm:drone:{drone.id}", drone.model_dump(), ttl_seconds=3600)
+            await self.registry.put(drone.id, drone.model_dump(), ttl_seconds=3600)
             logger.info(f"Drone [{drone.name}] finished mission successfully.")
             
         except Exception as e:
             logger.error(f"Drone [{drone.name}] failed: {e}")
             drone.status = "error"
             drone.metadata["error"] = str(e)
-            await self.redis.cache_set(f"swarm:drone:{drone.id}", drone.model_dump(), ttl_seconds=3600)
+            await self.registry.put(drone.id, drone.model_dump(), ttl_seconds=3600)
         finally:
             if str(drone.id) in self.active_drones:
                 del self.active_drones[str(drone.id)]
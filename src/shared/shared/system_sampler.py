@@ -0,0 +1,272 @@
+"""
+System Sampler — Métriques système échantillonnées en tâche de fond
+═══════════════════════════════════════════════════════════════════
+
+Une seule tâche par processus interroge psutil à intervalle fixe (dans un
+thread, pour ne jamais bloquer la boucle) ; les endpoints lisent le
+dernier instantané au lieu d'appeler psutil sur le chemin de la requête.
+
+  - CPU (global, fréquence, load average, température), RAM, swap
+  - Disque (occupation, débits et IOPS)
+  - Réseau (totaux, débits, paquets/s, erreurs)
+  - Processus courant (CPU, RSS, threads, descripteurs)
+  - Débits calculés par différence entre deux échantillons
+  - Historique court en anneau (`history` derniers instantanés)
+
+Usage:
+    sampler = get_system_sampler()
+    sampler.start()          # idempotent, depuis une boucle active
+    sampler.latest()         # dernier instantané (dict JSON)
+    sampler.history(60)      # instantanés des 60 dernières secondes
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+# Import optionnel de psutil pour les métriques système réelles
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+_GB = 1024 * 1024 * 1024
+
+
+def _disk_root() -> str:
+    return "C:\\" if sys.platform == "win32" else "/"
+
+
+class SystemSampler:
+    """
+    Échantillonneur des métriques système du processus et de l'hôte.
+
+    Attributes:
+        interval: Période d'échantillonnage (s).
+        disk_path: Point de montage dont on mesure l'occupation.
+    """
+
+    def __init__(self, interval: float = 5.0, history: int = 120, disk_path: str = ""):
+        self.interval = interval
+        self.disk_path = disk_path or _disk_root()
+        self._history: deque[dict[str, Any]] = deque(maxlen=history)
+        self._latest: dict[str, Any] | None = None
+        self._task: asyncio.Task | None = None
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+        # Compteurs cumulés de l'échantillon précédent (calcul des débits)
+        self._last_time: float | None = None
+        self._last_disk: Any = None
+        self._last_net: Any = None
+        self.samples = 0
+        self.errors = 0
+
+    # ─── Cycle de vie ─────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Démarre la tâche d'échantillonnage (sans effet si déjà active)"""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+        except RuntimeError:
+            # Hors boucle (import de module) : `latest()` reste marqué stale
+            # jusqu'à un appel depuis une boucle active (lifespan)
+            return
+        logger.info(f"🩺 Échantillonnage système toutes les {self.interval:g}s")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Échantillonnage système en erreur: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ─── Lecture ──────────────────────────────────────────────────────────
+
+    def latest(self) -> dict[str, Any]:
+        """
+        Dernier instantané, sans jamais appeler psutil (lu sur le chemin des
+        requêtes). `stale` est vrai s'il date de plus de 3 périodes (tâche
+        arrêtée) ; tant qu'aucun échantillon n'existe, seul le marqueur est
+        retourné.
+        """
+        snapshot = self._latest
+        if snapshot is None:
+            return {"psutil_available": PSUTIL_AVAILABLE, "stale": True}
+        data = {k: v for k, v in snapshot.items() if k != "_monotonic"}
+        data["stale"] = time.monotonic() - snapshot["_monotonic"] > 3 * self.interval
+        return data
+
+    def history(self, seconds: float | None = None) -> list[dict[str, Any]]:
+        """Instantanés conservés, éventuellement limités aux `seconds` dernières secondes"""
+        now = time.monotonic()
+        return [
+            {k: v for k, v in snap.items() if k != "_monotonic"}
+            for snap in list(self._history)
+            if seconds is None or now - snap["_monotonic"] <= seconds
+        ]
+
+    # ─── Collecte ─────────────────────────────────────────────────────────
+
+    def sample(self) -> dict[str, Any]:
+        """Prend un échantillon et le mémorise"""
+        now = time.monotonic()
+        if not PSUTIL_AVAILABLE:
+            snapshot = {
+                "timestamp": datetime.now().isoformat(),
+                "psutil_available": False,
+                "_monotonic": now,
+            }
+        else:
+            elapsed = now - self._last_time if self._last_time is not None else 0.0
+            snapshot = {
+                "timestamp": datetime.now().isoformat(),
+                "psutil_available": True,
+                "cpu": self._cpu(),
+                "memory": self._memory(),
+                "disk": self._disk(elapsed),
+                "network": self._network(elapsed),
+                "process": self._process_stats(),
+                "uptime_seconds": round(time.time() - psutil.boot_time()),
+                "_monotonic": now,
+            }
+            self._last_time = now
+        self._latest = snapshot
+        self._history.append(snapshot)
+        self.samples += 1
+        return snapshot
+
+    @staticmethod
+    def _rate(current: float, previous: float, elapsed: float) -> float:
+        if elapsed <= 0:
+            return 0.0
+        # Compteur remis à zéro (redémarrage d'interface) : pas de débit négatif
+        return round(max(current - previous, 0) / elapsed, 1)
+
+    def _cpu(self) -> dict[str, Any]:
+        # interval=None : différence avec l'appel précédent, sans attente
+        cpu: dict[str, Any] = {
+            "percent": psutil.cpu_percent(interval=None),
+            "count": psutil.cpu_count(logical=True) or 0,
+        }
+        try:
+            freq = psutil.cpu_freq()
+            cpu["freq_mhz"] = round(freq.current) if freq else 0
+        except Exception:
+            cpu["freq_mhz"] = 0
+        try:
+            cpu["load_1m"], cpu["load_5m"], cpu["load_15m"] = (round(x, 2) for x in psutil.getloadavg())
+        except (AttributeError, OSError):
+            pass
+        try:
+            temps = psutil.sensors_temperatures()
+            entries = next((e for e in temps.values() if e), None) if temps else None
+            cpu["temp_c"] = round(entries[0].current, 1) if entries else 0.0
+        except Exception:
+            cpu["temp_c"] = 0.0
+        return cpu
+
+    def _memory(self) -> dict[str, Any]:
+        mem = psutil.virtual_memory()
+        return {
+            "used_mb": round(mem.used / _MB),
+            "total_mb": round(mem.total / _MB),
+            "percent": mem.percent,
+            "swap_percent": psutil.swap_memory().percent,
+        }
+
+    def _disk(self, elapsed: float) -> dict[str, Any]:
+        disk: dict[str, Any] = {"path": self.disk_path}
+        try:
+            usage = psutil.disk_usage(self.disk_path)
+            disk.update(
+                used_gb=round(usage.used / _GB, 1),
+                total_gb=round(usage.total / _GB, 1),
+                percent=usage.percent,
+            )
+        except Exception:
+            disk["percent"] = 0.0
+        try:
+            io = psutil.disk_io_counters()
+        except Exception:
+            io = None
+        if io is not None:
+            last = self._last_disk
+            if last is not None:
+                disk.update(
+                    read_bytes_per_s=self._rate(io.read_bytes, last.read_bytes, elapsed),
+                    write_bytes_per_s=self._rate(io.write_bytes, last.write_bytes, elapsed),
+                    read_ops_per_s=self._rate(io.read_count, last.read_count, elapsed),
+                    write_ops_per_s=self._rate(io.write_count, last.write_count, elapsed),
+                )
+            self._last_disk = io
+        return disk
+
+    def _network(self, elapsed: float) -> dict[str, Any]:
+        net = psutil.net_io_counters()
+        stats: dict[str, Any] = {
+            "rx_bytes": net.bytes_recv,
+            "tx_bytes": net.bytes_sent,
+            "errors": net.errin + net.errout,
+            "drops": net.dropin + net.dropout,
+        }
+        last = self._last_net
+        if last is not None:
+            stats.update(
+                rx_bytes_per_s=self._rate(net.bytes_recv, last.bytes_recv, elapsed),
+                tx_bytes_per_s=self._rate(net.bytes_sent, last.bytes_sent, elapsed),
+                rx_packets_per_s=self._rate(net.packets_recv, last.packets_recv, elapsed),
+                tx_packets_per_s=self._rate(net.packets_sent, last.packets_sent, elapsed),
+            )
+        self._last_net = net
+        return stats
+
+    def _process_stats(self) -> dict[str, Any]:
+        proc = self._process
+        with proc.oneshot():
+            stats = {
+                "pid": proc.pid,
+                "cpu_percent": proc.cpu_percent(interval=None),
+                "rss_mb": round(proc.memory_info().rss / _MB, 1),
+                "threads": proc.num_threads(),
+            }
+            if hasattr(proc, "num_fds"):
+                stats["fds"] = proc.num_fds()
+        return stats
+
+
+_sampler: SystemSampler | None = None
+
+
+def get_system_sampler() -> SystemSampler:
+    """Retourne l'échantillonneur du processus (configuré depuis les settings)"""
+    global _sampler
+    if _sampler is None:
+        from shared.config import get_settings
+
+        settings = get_settings()
+        _sampler = SystemSampler(
+            interval=settings.system_sampler_interval_seconds,
+            history=settings.system_sampler_history,
+        )
+    return _sampler
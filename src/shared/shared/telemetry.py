@@ -5,28 +5,252 @@ Telemetry — Observabilité et métriques pour THE HIVE
 Collecte des métriques clés de chaque microservice :
   - Uptime
   - Compteurs de requêtes / erreurs
-  - Latence moyenne
-  - CPU / RAM (via psutil si disponible)
+  - Latence par opération (histogrammes en flux, quantiles p50 → p99.9)
+  - Compteurs et jauges nommés, avec labels
+  - CPU / RAM / disque / réseau (instantané de `shared.system_sampler`)
   - Métriques custom par service
+  - Sources de métriques enregistrées par les composants partagés
+    (ex: near-cache Redis) via `register_source()`
 
-Conçu pour être compatible OpenTelemetry dans le futur.
+Les histogrammes sont à buckets log-linéaires (type HDR) : enregistrement
+en O(1), quantiles à ~1.5 % près, fusionnables entre instances. Une
+lecture copie le tableau de compteurs sans verrou ni tri.
+
+Export : `get_metrics()` (JSON) et `render_prometheus()` (format texte
+Prometheus 0.0.4, servi sur `/metrics`).
 """
 
 import logging
+import math
+import re
 import time
-from collections import deque
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-# Import optionnel de psutil pour les métriques système réelles
-try:
-    import psutil
+logger = logging.getLogger(__name__)
 
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bornes `le` des histogrammes exposés à Prometheus (secondes)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Histogrammes : résolution 1 µs, 2^5 sous-buckets par puissance de 2
+# (erreur relative ≤ 1/32), valeurs plafonnées à 2^32 µs (~71 min)
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_MAX_MICROS = (1 << 32) - 1
+
+# Sources de métriques des composants partagés : nom → fonction retournant un dict
+_SOURCES: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_source(name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+    """Enregistre (ou remplace) une source de métriques exposée par la télémétrie"""
+    _SOURCES[name] = collector
+
+
+def unregister_source(name: str) -> None:
+    """Retire une source de métriques"""
+    _SOURCES.pop(name, None)
+
+
+def collect_sources() -> Dict[str, Dict[str, Any]]:
+    """Collecte les métriques de toutes les sources enregistrées"""
+    metrics = {}
+    for name, collector in list(_SOURCES.items()):
+        try:
+            metrics[name] = collector()
+        except Exception as e:
+            logger.debug(f"Source de métriques '{name}' en erreur: {e}")
+    return metrics
+
+
+def _bucket_index(micros: int) -> int:
+    """Index du bucket d'une valeur (µs) : linéaire puis log-linéaire"""
+    if micros < 2 * _SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - _SUB_BUCKET_BITS - 1
+    return (shift + 1) * _SUB_BUCKETS + (micros >> shift) - _SUB_BUCKETS
+
+
+def _bucket_upper(index: int) -> int:
+    """Borne supérieure (exclue, µs) d'un bucket"""
+    if index < 2 * _SUB_BUCKETS:
+        return index + 1
+    shift = index // _SUB_BUCKETS - 1
+    return (index % _SUB_BUCKETS + _SUB_BUCKETS + 1) << shift
+
+
+_BUCKET_COUNT = _bucket_index(_MAX_MICROS) + 1
+
+
+class LatencyHistogram:
+    """
+    Histogramme de latences en flux (buckets log-linéaires, type HDR).
+
+    Usage:
+        hist = LatencyHistogram()
+        hist.record(0.042)
+        hist.snapshot().quantiles((0.5, 0.99))  # [0.042.., 0.042..]
+    """
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Enregistre une durée (O(1))"""
+        micros = int(seconds * 1_000_000)
+        if micros < 2 * _SUB_BUCKETS:
+            index = micros if micros > 0 else 0
+        else:
+            # _bucket_index en ligne : chemin chaud de chaque requête
+            if micros > _MAX_MICROS:
+                micros = _MAX_MICROS
+            shift = micros.bit_length() - _SUB_BUCKET_BITS - 1
+            index = (shift + 1) * _SUB_BUCKETS + (micros >> shift) - _SUB_BUCKETS
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Ajoute les observations d'un autre histogramme (autre worker, replica)"""
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def snapshot(self) -> "LatencyHistogram":
+        """Copie cohérente pour la lecture, sans bloquer les enregistrements"""
+        snap = LatencyHistogram.__new__(LatencyHistogram)
+        snap.counts = list(self.counts)
+        snap.count = sum(snap.counts)
+        snap.sum = self.sum
+        snap.min = self.min
+        snap.max = self.max
+        return snap
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Quantiles (secondes) en une passe ; `qs` croissants"""
+        if not self.count:
+            return [0.0] * len(qs)
+        results: List[float] = []
+        ranks = [max(1, math.ceil(q * self.count)) for q in qs]
+        seen = 0
+        i = 0
+        for index, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            while i < len(ranks) and seen >= ranks[i]:
+                # Milieu du bucket : erreur relative ≤ 1/64
+                lower = _bucket_upper(index - 1) if index else 0
+                value = (lower + _bucket_upper(index)) / 2_000_000
+                results.append(min(max(value, self.min), self.max))
+                i += 1
+            if i == len(ranks):
+                break
+        results.extend([self.max] * (len(qs) - len(results)))
+        return results
+
+    def cumulative(self, bounds: Sequence[float]) -> List[int]:
+        """Nombre d'observations ≤ chaque borne (à la résolution d'un bucket)"""
+        results: List[int] = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            last = _bucket_index(min(int(bound * 1_000_000), _MAX_MICROS))
+            while index <= last:
+                seen += self.counts[index]
+                index += 1
+            results.append(seen)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p90, p95, p99, p999 = self.quantiles((0.5, 0.9, 0.95, 0.99, 0.999))
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum / self.count * 1000, 2) if self.count else 0.0,
+            "min_ms": round(self.min * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+            "p50_ms": round(p50 * 1000, 2),
+            "p90_ms": round(p90 * 1000, 2),
+            "p95_ms": round(p95 * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "p999_ms": round(p999 * 1000, 2),
+        }
+
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels_key(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
 
-logger = logging.getLogger(__name__)
+
+# Feuilles cumulatives de l'instantané système (compteurs psutil depuis le boot) :
+# exportées en `counter` suffixé `_total`, les autres feuilles restent des jauges
+SYSTEM_COUNTERS = frozenset({
+    "hive_system_network_rx_bytes",
+    "hive_system_network_tx_bytes",
+    "hive_system_network_errors",
+    "hive_system_network_drops",
+})
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+
+def _series_name(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+def _flatten_numeric(prefix: str, data: Any) -> Iterable[Tuple[str, float]]:
+    """Feuilles numériques d'un dict imbriqué (sources) → (nom, valeur)"""
+    if isinstance(data, bool):
+        yield prefix, int(data)
+    elif isinstance(data, (int, float)):
+        yield prefix, data
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            yield from _flatten_numeric(f"{prefix}_{key}", value)
 
 
 class Telemetry:
@@ -37,10 +261,13 @@ class Telemetry:
         telemetry = Telemetry("eva-core")
         telemetry.record_request()
         telemetry.record_latency(0.042)
+        telemetry.observe("llm_generate_seconds", 1.8, model="qwen2.5")
+        telemetry.inc("orders_total", side="buy")
         metrics = telemetry.get_metrics()
+        text = telemetry.render_prometheus()
     """
 
-    def __init__(self, service_name: str, latency_window: int = 100):
+    def __init__(self, service_name: str):
         self.service_name = service_name
         self.start_time = time.time()
 
@@ -49,9 +276,13 @@ class Telemetry:
         self.errors_total = 0
         self.warnings_total = 0
 
-        # Latence (fenêtre glissante)
-        self._latency_window = latency_window
-        self._latencies: deque = deque(maxlen=latency_window)
+        # Séries nommées : nom → labels → valeur / histogramme
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, LatencyHistogram]] = {}
+
+        # Latence des requêtes (histogramme par défaut)
+        self._latency = self.histogram("hive_request_latency_seconds")
 
         # Métriques custom
         self._custom_metrics: Dict[str, Any] = {}
@@ -76,7 +307,57 @@ class Telemetry:
 
     def record_latency(self, seconds: float) -> None:
         """Enregistre la latence d'une requête"""
-        self._latencies.append(seconds)
+        self._latency.record(seconds)
+
+    # ─── Séries nommées ───────────────────────────────────────────────────
+
+    def histogram(self, name: str, **labels: Any) -> LatencyHistogram:
+        """
+        Histogramme `name{labels}` (créé au besoin).
+
+        Les chemins chauds gardent la référence retournée pour éviter la
+        résolution des labels à chaque enregistrement.
+        """
+        series = self._histograms.setdefault(name, {})
+        key = _labels_key(labels)
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = LatencyHistogram()
+        return hist
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """Enregistre une durée dans l'histogramme `name{labels}`"""
+        self.histogram(name, **labels).record(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        """Incrémente le compteur `name{labels}`"""
+        series = self._counters.setdefault(name, {})
+        key = _labels_key(labels)
+        series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Fixe la jauge `name{labels}`"""
+        self._gauges.setdefault(name, {})[_labels_key(labels)] = value
+
+    def counter(self, name: str, **labels: Any) -> Callable[..., None]:
+        """Incrémenteur du compteur `name{labels}` (labels résolus une fois)"""
+        series = self._counters.setdefault(name, {})
+        key = _labels_key(labels)
+        series.setdefault(key, 0)
+
+        def add(amount: float = 1) -> None:
+            series[key] += amount
+        return add
+
+    def gauge(self, name: str, **labels: Any) -> Callable[[float], None]:
+        """Setter de la jauge `name{labels}` (labels résolus une fois)"""
+        series = self._gauges.setdefault(name, {})
+        key = _labels_key(labels)
+        series.setdefault(key, 0)
+
+        def set_value(value: float) -> None:
+            series[key] = value
+        return set_value
 
     def set_metric(self, key: str, value: Any) -> None:
         """Définit une métrique custom"""
@@ -87,49 +368,18 @@ class Telemetry:
         self._custom_metrics[key] = self._custom_metrics.get(key, 0) + amount
 
     def _get_system_metrics(self) -> Dict[str, Any]:
-        """Récupère les métriques système réelles (si psutil est disponible)"""
-        if not PSUTIL_AVAILABLE:
-            return {
-                "cpu_percent": 0.0,
-                "memory_used_mb": 0,
-                "memory_total_mb": 0,
-                "psutil_available": False,
-            }
+        """Dernier instantané de l'échantillonneur système (sans appel psutil en ligne)"""
+        from shared.system_sampler import get_system_sampler
 
         try:
-            mem = psutil.virtual_memory()
-            return {
-                "cpu_percent": psutil.cpu_percent(interval=None),
-                "memory_used_mb": round(mem.used / (1024 * 1024)),
-                "memory_total_mb": round(mem.total / (1024 * 1024)),
-                "memory_percent": mem.percent,
-                "disk_percent": psutil.disk_usage("/").percent,
-                "psutil_available": True,
-            }
-        except Exception:
-            return {"cpu_percent": 0.0, "memory_used_mb": 0, "psutil_available": False}
-
-    def _get_latency_stats(self) -> Dict[str, float]:
-        """Calcule les statistiques de latence"""
-        if not self._latencies:
-            return {
-                "avg_ms": 0.0,
-                "min_ms": 0.0,
-                "max_ms": 0.0,
-                "p95_ms": 0.0,
-                "p99_ms": 0.0,
-            }
-
-        sorted_lat = sorted(self._latencies)
-        n = len(sorted_lat)
+            return get_system_sampler().latest()
+        except Exception as e:
+            logger.debug(f"Métriques système indisponibles: {e}")
+            return {"psutil_available": False}
 
-        return {
-            "avg_ms": round(sum(sorted_lat) / n * 1000, 2),
-            "min_ms": round(sorted_lat[0] * 1000, 2),
-            "max_ms": round(sorted_lat[-1] * 1000, 2),
-            "p95_ms": round(sorted_lat[min(int(n * 0.95), n - 1)] * 1000, 2),
-            "p99_ms": round(sorted_lat[min(int(n * 0.99), n - 1)] * 1000, 2),
-        }
+    def _get_latency_stats(self) -> Dict[str, Any]:
+        """Calcule les statistiques de latence"""
+        return self._latency.snapshot().stats()
 
     def get_metrics(self) -> Dict[str, Any]:
         """Retourne toutes les métriques du service"""
@@ -155,10 +405,73 @@ class Telemetry:
                 else None
             ),
             "latency": self._get_latency_stats(),
+            "operations": {
+                _series_name(name, key): hist.snapshot().stats()
+                for name, series in list(self._histograms.items())
+                for key, hist in list(series.items())
+            },
+            "counters": {
+                _series_name(name, key): value
+                for name, series in list(self._counters.items())
+                for key, value in list(series.items())
+            },
+            "gauges": {
+                _series_name(name, key): value
+                for name, series in list(self._gauges.items())
+                for key, value in list(series.items())
+            },
             "system": self._get_system_metrics(),
             "custom": self._custom_metrics,
+            "sources": collect_sources(),
         }
 
+    def render_prometheus(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> str:
+        """Toutes les métriques au format texte Prometheus (exposition 0.0.4)"""
+        lines: List[str] = []
+
+        def emit(name: str, kind: str, samples: Iterable[Tuple[str, float]]) -> None:
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{series} {_format_value(value)}" for series, value in samples)
+
+        emit("hive_uptime_seconds", "gauge", [("hive_uptime_seconds", round(time.time() - self.start_time, 3))])
+        emit("hive_requests_total", "counter", [("hive_requests_total", self.requests_total)])
+        emit("hive_errors_total", "counter", [("hive_errors_total", self.errors_total)])
+        emit("hive_warnings_total", "counter", [("hive_warnings_total", self.warnings_total)])
+
+        for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+            for name, series in list(store.items()):
+                metric = _metric_name(name)
+                emit(metric, kind, [
+                    (metric + _format_labels(key), value) for key, value in list(series.items())
+                ])
+
+        for name, series in list(self._histograms.items()):
+            metric = _metric_name(name)
+            lines.append(f"# TYPE {metric} histogram")
+            for key, hist in list(series.items()):
+                snap = hist.snapshot()
+                for bound, count in zip(buckets, snap.cumulative(buckets), strict=True):
+                    lines.append(
+                        f"{metric}_bucket{_format_labels(key, (('le', _format_value(float(bound))),))} {count}"
+                    )
+                lines.append(f"{metric}_bucket{_format_labels(key, (('le', '+Inf'),))} {snap.count}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {_format_value(snap.sum)}")
+                lines.append(f"{metric}_count{_format_labels(key)} {snap.count}")
+
+        custom = dict(_flatten_numeric("hive_system", self._get_system_metrics()))
+        custom.update(_flatten_numeric("hive_custom", self._custom_metrics))
+        for source, data in collect_sources().items():
+            custom.update(_flatten_numeric(f"hive_{source}", data))
+        for name, value in custom.items():
+            metric = _metric_name(name)
+            if metric in SYSTEM_COUNTERS:
+                metric += "_total"
+                emit(metric, "counter", [(metric, value)])
+            else:
+                emit(metric, "gauge", [(metric, value)])
+
+        return "\n".join(lines) + "\n"
+
     @staticmethod
     def _format_duration(seconds: float) -> str:
         """Formate une durée en lisible humain"""
@@ -171,3 +484,14 @@ class Telemetry:
             return f"{minutes}m{secs:02d}s"
         else:
             return f"{secs}s"
+
+
+_telemetry: Optional[Telemetry] = None
+
+
+def get_telemetry(service_name: str = "the-hive") -> Telemetry:
+    """Retourne la télémétrie du processus (créée au premier appel)"""
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = Telemetry(service_name)
+    return _telemetry
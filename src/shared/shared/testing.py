@@ -0,0 +1,42 @@
+"""
+Fixtures pytest communes aux suites de tests des services THE HIVE.
+
+RedisClient branché sur fakeredis (extra `dev`) via `connection_factory`.
+Chaque suite les expose depuis son conftest :
+
+    from shared.testing import make_redis_client, redis_server  # noqa: F401
+"""
+
+from typing import Callable
+
+import pytest
+
+from shared.redis_client import RedisClient
+
+
+@pytest.fixture
+def redis_server():
+    """Serveur Redis en mémoire (fakeredis), commun aux clients d'un test"""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def make_redis_client(redis_server) -> Callable[..., RedisClient]:
+    """
+    Fabrique de RedisClient dont les trois pools pointent sur `redis_server`.
+
+    Plusieurs appels dans un même test simulent plusieurs services (ou
+    replicas) partageant le même serveur.
+    """
+    import fakeredis
+
+    def make(stream_channels: list[str] | None = None, server=None) -> RedisClient:
+        target = server or redis_server
+
+        def connect(decode_responses: bool, listener: bool = False) -> fakeredis.FakeAsyncRedis:
+            return fakeredis.FakeAsyncRedis(server=target, decode_responses=decode_responses)
+
+        return RedisClient(stream_channels=stream_channels or [], connection_factory=connect)
+
+    return make
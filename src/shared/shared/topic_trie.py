@@ -0,0 +1,126 @@
+"""
+Topic Trie — Routage MQTT avec wildcards
+════════════════════════════════════════
+
+Indexe les filtres d'abonnement MQTT niveau par niveau pour retrouver en
+une seule descente tous les filtres correspondant à un topic, au lieu de
+tester chaque filtre un par un.
+
+Règles MQTT 3.1.1 / 5 :
+  - `+` correspond à exactement un niveau (`eva/+/status`).
+  - `#` correspond au niveau parent et à tous les niveaux suivants ; il
+    doit être le dernier niveau du filtre (`eva/banker/#`).
+  - Les topics commençant par `$` (ex: `$SYS/...`) ne sont pas atteints
+    par un wildcard placé au premier niveau.
+"""
+
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+def validate_filter(topic_filter: str) -> list[str]:
+    """
+    Découpe un filtre en niveaux après validation.
+
+    Raises:
+        ValueError: Filtre vide ou wildcard mal placé.
+    """
+    if not topic_filter:
+        raise ValueError("Filtre MQTT vide")
+    levels = topic_filter.split("/")
+    for i, level in enumerate(levels):
+        if "#" in level and (level != "#" or i != len(levels) - 1):
+            raise ValueError(f"'#' doit occuper seul le dernier niveau: {topic_filter}")
+        if "+" in level and level != "+":
+            raise ValueError(f"'+' doit occuper un niveau entier: {topic_filter}")
+    return levels
+
+
+class _Node(Generic[T]):
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        self.children: dict[str, "_Node[T]"] = {}
+        self.values: set[T] = set()
+
+
+class TopicTrie(Generic[T]):
+    """
+    Arbre des filtres MQTT : filtre → ensemble de valeurs.
+
+    Usage:
+        trie = TopicTrie()
+        trie.add("eva/+/status", "status")
+        trie.add("eva/banker/#", "banker")
+        trie.match("eva/banker/status")  # {"status", "banker"}
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node[T] = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, topic_filter: str, value: T) -> None:
+        """Associe une valeur à un filtre (idempotent)"""
+        node = self._root
+        for level in validate_filter(topic_filter):
+            node = node.children.setdefault(level, _Node())
+        if value not in node.values:
+            node.values.add(value)
+            self._size += 1
+
+    def remove(self, topic_filter: str, value: T) -> bool:
+        """Retire une valeur d'un filtre. Retourne True si elle était présente."""
+        path = [self._root]
+        for level in validate_filter(topic_filter):
+            node = path[-1].children.get(level)
+            if node is None:
+                return False
+            path.append(node)
+        if value not in path[-1].values:
+            return False
+        path[-1].values.discard(value)
+        self._size -= 1
+        # Élagage des branches devenues vides
+        levels = topic_filter.split("/")
+        for depth in range(len(levels), 0, -1):
+            node = path[depth]
+            if node.values or node.children:
+                break
+            del path[depth - 1].children[levels[depth - 1]]
+        return True
+
+    def match(self, topic: str) -> set[T]:
+        """Retourne les valeurs de tous les filtres correspondant au topic"""
+        levels = topic.split("/")
+        result: set[T] = set()
+        self._collect(self._root, levels, 0, topic.startswith("$"), result)
+        return result
+
+    def _collect(
+        self,
+        node: _Node[T],
+        levels: list[str],
+        depth: int,
+        system: bool,
+        result: set[T],
+    ) -> None:
+        # Les wildcards de premier niveau ne couvrent pas les topics `$...`
+        wildcards = not (system and depth == 0)
+        if wildcards:
+            multi = node.children.get("#")
+            if multi is not None:
+                result |= multi.values
+        if depth == len(levels):
+            result |= node.values
+            return
+        exact: _Node[T] | None = node.children.get(levels[depth])
+        if exact is not None:
+            self._collect(exact, levels, depth + 1, system, result)
+        if wildcards:
+            single = node.children.get("+")
+            if single is not None:
+                self._collect(single, levels, depth + 1, system, result)
@@ -0,0 +1,499 @@
+"""
+Tracing — Traces distribuées HTTP / bus Redis / MQTT
+════════════════════════════════════════════════════
+
+Suit une requête d'un bout à l'autre de THE HIVE (chat Core → LLM → bus
+Redis → Banker → MT5 → Compliance) pour voir où part la latence.
+
+  - Contexte W3C Trace Context (`traceparent`) propagé dans les en-têtes
+    HTTP internes, le champ `AgentMessage.trace_context` et la clé
+    `trace_context` des payloads MQTT (dict).
+  - Span courant porté par une ContextVar : chaque tâche asyncio hérite
+    du span de son créateur.
+  - Export par lots en tâche de fond, vers un collecteur OTLP/HTTP (JSON)
+    ou un fichier JSONL pour l'analyse hors-ligne.
+  - Sans exporteur (`tracing_exporter="none"`), aucun span n'est créé :
+    coût quasi nul sur les chemins chauds.
+
+Usage:
+    with start_span("risk.validate", attributes={"symbol": order.symbol}):
+        ...
+
+    @traced("mt5.execute_order")
+    async def execute_order(...): ...
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+# Clé du contexte dans les messages du bus et les payloads MQTT
+TRACE_CONTEXT_KEY = "trace_context"
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class SpanKind(int, Enum):
+    """Nature d'un span (valeurs OTLP)"""
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+    PRODUCER = 4
+    CONSUMER = 5
+
+
+class SpanContext:
+    """Identité d'un span, transportée entre services"""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Any) -> SpanContext | None:
+    """Contexte d'un en-tête `traceparent` (None si absent ou invalide)"""
+    if not isinstance(value, str):
+        return None
+    match = _TRACEPARENT_RE.match(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
+
+
+class Span:
+    """Opération chronométrée d'une trace"""
+
+    __slots__ = (
+        "name", "context", "parent_id", "kind", "start_ns", "end_ns",
+        "attributes", "events", "error", "service",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: str | None,
+        kind: SpanKind,
+        service: str,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.service = service
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes: dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: list[tuple[int, str, dict[str, Any]]] = []
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append((time.time_ns(), name, attributes))
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.error = f"{type(exc).__name__}: {exc}"
+        self.add_event("exception", type=type(exc).__name__, message=str(exc))
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        """Enregistrement JSONL (une ligne par span)"""
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind.name,
+            "service": self.service,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "events": [
+                {"time_ns": t, "name": name, "attributes": attrs} for t, name, attrs in self.events
+            ],
+            "error": self.error,
+        }
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "hive_current_span", default=None
+)
+
+
+def current_span() -> Span | None:
+    """Span actif de la tâche courante"""
+    return _current_span.get()
+
+
+def current_traceparent() -> str | None:
+    """`traceparent` du span actif, à propager vers un autre service"""
+    span = _current_span.get()
+    return span.context.traceparent if span is not None else None
+
+
+def inject(carrier: dict[str, Any], key: str = TRACEPARENT_HEADER) -> dict[str, Any]:
+    """Ajoute le contexte du span actif à des en-têtes ou un payload"""
+    traceparent = current_traceparent()
+    if traceparent is not None:
+        carrier[key] = traceparent
+    return carrier
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EXPORTEURS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class JsonlSpanExporter:
+    """Ajoute les spans à un fichier JSONL (une ligne par span)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _write(self, lines: list[str]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    async def export(self, spans: list[Span]) -> None:
+        lines = [json.dumps(span.to_dict(), default=str) + "\n" for span in spans]
+        await asyncio.to_thread(self._write, lines)
+
+    async def close(self) -> None:
+        pass
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+class OTLPHttpSpanExporter:
+    """Envoie les spans à un collecteur OTLP/HTTP (encodage JSON, /v1/traces)"""
+
+    def __init__(self, endpoint: str, headers: dict[str, str] | None = None, timeout: float = 5.0):
+        import httpx
+
+        self.endpoint = endpoint
+        self._client = httpx.AsyncClient(timeout=timeout, headers=headers)
+
+    @staticmethod
+    def encode(spans: list[Span]) -> dict[str, Any]:
+        """Corps ExportTraceServiceRequest, un resource span par service"""
+        by_service: dict[str, list[dict[str, Any]]] = {}
+        for span in spans:
+            otlp = {
+                "traceId": span.context.trace_id,
+                "spanId": span.context.span_id,
+                "name": span.name,
+                "kind": int(span.kind),
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                "attributes": _otlp_attributes(span.attributes),
+                "events": [
+                    {"timeUnixNano": str(t), "name": name, "attributes": _otlp_attributes(attrs)}
+                    for t, name, attrs in span.events
+                ],
+                # 1 = OK, 2 = ERROR
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                otlp["parentSpanId"] = span.parent_id
+            by_service.setdefault(span.service, []).append(otlp)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": service})},
+                    "scopeSpans": [{"scope": {"name": "shared.tracing"}, "spans": otlp_spans}],
+                }
+                for service, otlp_spans in by_service.items()
+            ]
+        }
+
+    async def export(self, spans: list[Span]) -> None:
+        response = await self._client.post(self.endpoint, json=self.encode(spans))
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TRACER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class Tracer:
+    """
+    Crée les spans et les exporte par lots.
+
+    Les spans terminés sont mis en file (bornée : au-delà, les plus anciens
+    sont perdus) et envoyés par une tâche de fond toutes les
+    `flush_interval` secondes ou dès `batch_size` spans.
+    """
+
+    def __init__(
+        self,
+        service_name: str = "the-hive",
+        exporter: Any = None,
+        sample_ratio: float = 1.0,
+        max_queue: int = 4096,
+        batch_size: int = 256,
+        flush_interval: float = 2.0,
+    ):
+        self.service_name = service_name
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: deque[Span] = deque(maxlen=max_queue)
+        self._wakeup: asyncio.Event | None = None
+        self._flusher: asyncio.Task | None = None
+
+        self.started = 0
+        self.exported = 0
+        self.dropped = 0
+        self.export_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        parent: SpanContext | None = None,
+        attributes: dict[str, Any] | None = None,
+    ) -> Iterator[Span | None]:
+        """
+        Ouvre un span enfant du span actif (ou de `parent`, contexte reçu
+        d'un autre service). Produit None quand le tracing est désactivé.
+        """
+        if self.exporter is None:
+            yield None
+            return
+
+        if parent is None:
+            active = _current_span.get()
+            parent = active.context if active is not None else None
+        if parent is not None:
+            context = SpanContext(parent.trace_id, os.urandom(8).hex(), parent.sampled)
+        else:
+            context = SpanContext(
+                os.urandom(16).hex(), os.urandom(8).hex(), random.random() < self.sample_ratio
+            )
+        span = Span(
+            name, context, parent.span_id if parent else None, kind, self.service_name, attributes
+        )
+        self.started += 1
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
+                span.record_exception(e)
+            else:
+                span.set_attribute("cancelled", True)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            if context.sampled:
+                self._enqueue(span)
+
+    def _enqueue(self, span: Span) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(span)
+        self._ensure_flusher()
+        if len(self._queue) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._flusher = loop.create_task(self._flush_loop(), name="tracing-export")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Exporte les spans en attente"""
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                await self.exporter.export(batch)
+                self.exported += len(batch)
+            except Exception as e:
+                self.export_errors += 1
+                self.dropped += len(batch)
+                logger.debug(f"Export des spans impossible: {e}")
+                return
+
+    async def shutdown(self) -> None:
+        """Exporte le reliquat et arrête la tâche d'export"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if self.exporter is not None:
+            await self.flush()
+            await self.exporter.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "exporter": type(self.exporter).__name__ if self.exporter else None,
+            "sample_ratio": self.sample_ratio,
+            "started": self.started,
+            "exported": self.exported,
+            "queued": len(self._queue),
+            "dropped": self.dropped,
+            "export_errors": self.export_errors,
+        }
+
+
+_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer:
+    """Retourne le tracer du processus (exporteur choisi dans les settings)"""
+    global _tracer
+    if _tracer is None:
+        from shared.config import get_settings
+        from shared.telemetry import register_source
+
+        settings = get_settings()
+        exporter: Any = None
+        if settings.tracing_exporter == "otlp":
+            exporter = OTLPHttpSpanExporter(settings.tracing_otlp_endpoint)
+        elif settings.tracing_exporter == "jsonl":
+            exporter = JsonlSpanExporter(settings.tracing_jsonl_path)
+        _tracer = Tracer(exporter=exporter, sample_ratio=settings.tracing_sample_ratio)
+        register_source("tracing", _tracer.get_stats)
+    return _tracer
+
+
+def start_span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    parent: SpanContext | None = None,
+    attributes: dict[str, Any] | None = None,
+):
+    """Raccourci : span du tracer du processus"""
+    return get_tracer().start_span(name, kind, parent, attributes)
+
+
+def traced(name: str, kind: SpanKind = SpanKind.INTERNAL) -> Callable:
+    """Décorateur : exécute la coroutine dans un span `name`"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with get_tracer().start_span(name, kind):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HTTP (ASGI)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TracingMiddleware:
+    """
+    Middleware ASGI : un span SERVER par requête HTTP, enfant du
+    `traceparent` reçu. Nommé d'après le gabarit de route FastAPI.
+    """
+
+    def __init__(self, app: Callable, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+        status = 500
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        with self.tracer.start_span(f"{method} {scope['path']}", SpanKind.SERVER, parent) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.name = f"{method} {route}"
+                span.set_attribute("http.method", method)
+                span.set_attribute("http.route", route or scope["path"])
+                span.set_attribute("http.status_code", status)
+                if status >= 500 and span.error is None:
+                    span.error = f"HTTP {status}"
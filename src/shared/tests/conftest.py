@@ -0,0 +1,5 @@
+"""
+Fixtures partagées des tests shared : RedisClient branché sur fakeredis.
+"""
+
+from shared.testing import make_redis_client, redis_server  # noqa: F401
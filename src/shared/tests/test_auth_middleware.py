@@ -0,0 +1,85 @@
+"""
+Tests du middleware ASGI d'authentification interne.
+"""
+
+import json
+
+import pytest
+
+from shared.auth_middleware import InternalAuthMiddleware, PathPrefixTrie
+from shared.internal_auth import InternalAuth
+
+
+async def streaming_app(scope, receive, send):
+    """Réponse en plusieurs morceaux, renvoie l'agent source vu par le handler"""
+    if scope["type"] == "websocket":
+        await send({"type": "websocket.accept"})
+        return
+    source = scope.get("state", {}).get("source_agent", "-").encode()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for chunk in (b"a", b"b", source):
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def call(app, path, token=None, scope_type="http"):
+    headers = [(b"host", b"test")]
+    if token is not None:
+        headers.append((b"x-hive-internal-token", token.encode()))
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": scope_type, "path": path, "headers": headers, "client": ("10.0.0.1", 1234)}
+    if scope_type == "http":
+        scope["method"] = "GET"
+    await app(scope, receive, send)
+    return sent
+
+
+def test_prefix_trie_matches_like_startswith():
+    trie = PathPrefixTrie(["/health", "/docs", "/openapi.json"])
+    for path in ("/health", "/healthz", "/docs/oauth2-redirect", "/openapi.json"):
+        assert trie.matches(path)
+    for path in ("/", "/heal", "/agents/health", "/openapi"):
+        assert not trie.matches(path)
+    assert PathPrefixTrie([""]).matches("/anything")
+    assert not PathPrefixTrie([]).matches("/health")
+
+
+@pytest.mark.asyncio
+async def test_excluded_paths_skip_authentication():
+    sent = await call(InternalAuthMiddleware(streaming_app), "/health")
+    assert sent[0]["status"] == 200
+
+
+@pytest.mark.asyncio
+async def test_missing_and_invalid_tokens_are_rejected_without_calling_the_app():
+    app = InternalAuthMiddleware(streaming_app)
+
+    start, body = await call(app, "/agents/banker")
+    assert start["status"] == 401
+    assert json.loads(body["body"]) == {"detail": "X-Hive-Internal-Token header missing"}
+
+    start, body = await call(app, "/agents/banker", token="not-a-jwt")
+    assert start["status"] == 403
+    assert (b"content-length", str(len(body["body"])).encode()) in start["headers"]
+
+
+@pytest.mark.asyncio
+async def test_valid_token_streams_response_and_exposes_source_agent():
+    sent = await call(InternalAuthMiddleware(streaming_app), "/agents/banker", InternalAuth.get_token("core"))
+    assert sent[0]["status"] == 200
+    assert [m["body"] for m in sent[1:]] == [b"a", b"b", b"core", b""]
+
+
+@pytest.mark.asyncio
+async def test_websocket_handshake_is_closed_without_token():
+    app = InternalAuthMiddleware(streaming_app)
+    assert await call(app, "/ws", scope_type="websocket") == [{"type": "websocket.close", "code": 1008}]
+    sent = await call(app, "/ws", InternalAuth.get_token("core"), scope_type="websocket")
+    assert sent == [{"type": "websocket.accept"}]
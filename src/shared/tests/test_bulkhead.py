@@ -0,0 +1,137 @@
+"""
+Tests du bulkhead adaptatif (file bornée, AIMD, composition avec le breaker).
+"""
+
+import asyncio
+
+import pytest
+
+from shared.bulkhead import Bulkhead, BulkheadFullError
+from shared.circuit_breaker import CircuitBreaker, CircuitState
+
+
+async def hold(event: asyncio.Event):
+    await event.wait()
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded_and_served_in_order():
+    limiter = Bulkhead("svc", initial_limit=1, max_queue=2, queue_timeout=1.0)
+    gate = asyncio.Event()
+    order = []
+
+    async def tagged(tag):
+        order.append(tag)
+        return tag
+
+    first = asyncio.create_task(limiter.execute(hold, gate))
+    await asyncio.sleep(0)
+    queued = [asyncio.create_task(limiter.execute(tagged, i)) for i in range(2)]
+    await asyncio.sleep(0)
+    assert limiter.in_flight == 1 and limiter.queued == 2
+
+    # File pleine : rejet immédiat, sans attendre
+    with pytest.raises(BulkheadFullError):
+        await limiter.execute(tagged, "late")
+    assert limiter.total_rejected == 1
+
+    gate.set()
+    assert await first == "ok"
+    assert await asyncio.gather(*queued) == [0, 1]
+    assert order == [0, 1]
+    assert limiter.in_flight == 0 and limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_deadline_and_cancelled_waiter_free_their_slot():
+    limiter = Bulkhead("svc", initial_limit=1, max_queue=5, queue_timeout=0.01)
+    gate = asyncio.Event()
+    holder = asyncio.create_task(limiter.execute(hold, gate))
+    await asyncio.sleep(0)
+
+    with pytest.raises(BulkheadFullError):
+        await limiter.execute(hold, gate)
+    assert limiter.total_timeouts == 1 and limiter.queued == 0
+
+    limiter.queue_timeout = 5.0
+    waiter = asyncio.create_task(limiter.execute(hold, gate))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    gate.set()
+    await holder
+    assert limiter.in_flight == 0 and limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_when_saturated_and_backs_off_on_slow_calls():
+    limiter = Bulkhead("svc", initial_limit=2, max_limit=4, latency_target=1.0)
+
+    # Appels rapides à pleine charge : croissance additive
+    for _ in range(20):
+        limiter._record(False, 0.1, started=0.0, saturated=True)
+    assert limiter.current_limit == 4
+
+    # Appels rapides hors saturation : pas de croissance au-delà du besoin
+    limiter.limit = 2.0
+    for _ in range(20):
+        limiter._record(False, 0.1, started=0.0, saturated=False)
+    assert limiter.current_limit == 2
+
+    # Appel lent : réduction multiplicative, une seule par vague
+    limiter.limit = 4.0
+    limiter._record(False, 2.0, started=limiter._last_decrease, saturated=True)
+    assert limiter.limit == pytest.approx(2.8)
+    limiter._record(True, 0.1, started=limiter._last_decrease - 1, saturated=True)
+    assert limiter.limit == pytest.approx(2.8)
+    assert limiter.total_slow_calls == 1 and limiter.total_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_slot_measures_first_response_only():
+    limiter = Bulkhead("svc", initial_limit=2, latency_target=0.05)
+
+    async with limiter.slot() as slot:
+        assert limiter.in_flight == 1
+        slot.responded()
+        await asyncio.sleep(0.1)  # flux long après une première réponse rapide
+    assert limiter.total_slow_calls == 0 and limiter.current_limit == 2
+
+    async with limiter.slot():
+        await asyncio.sleep(0.1)  # aucune réponse avant la fin : durée du bloc
+    assert limiter.total_slow_calls == 1 and limiter.current_limit == 1
+    assert limiter.in_flight == 0
+
+
+def test_derived_latency_target_follows_observed_minimum():
+    limiter = Bulkhead("svc", latency_tolerance=2.0, baseline_window=3)
+    assert limiter.target() is None
+
+    for duration in (0.2, 0.1, 0.3):
+        limiter._record(False, duration, started=0.0, saturated=False)
+    assert limiter.target() == pytest.approx(0.2)
+
+    # Nouvelle période : la latence minimale se réajuste à la hausse
+    for duration in (0.5, 0.4, 0.6):
+        limiter._record(False, duration, started=0.0, saturated=False)
+    assert limiter.target() == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_rejections_do_not_trip_the_breaker():
+    breaker = CircuitBreaker("svc", failure_threshold=1)
+    limiter = Bulkhead("svc", initial_limit=1, max_queue=0)
+    gate = asyncio.Event()
+
+    holder = asyncio.create_task(breaker.execute(limiter.execute, hold, gate))
+    await asyncio.sleep(0)
+    with pytest.raises(BulkheadFullError):
+        await breaker.execute(limiter.execute, hold, gate)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.failures == 0
+
+    gate.set()
+    assert await holder == "ok"
@@ -0,0 +1,169 @@
+"""
+Tests des circuit breakers (fenêtre glissante, registre, état partagé).
+"""
+
+import asyncio
+
+import pytest
+
+from shared import circuit_breaker as cb_module
+from shared.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitBreakerRegistry,
+    CircuitState,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cb_module.time, "time", clock)
+    return clock
+
+
+async def ok():
+    return "ok"
+
+
+async def boom():
+    raise RuntimeError("down")
+
+
+async def call(cb, func):
+    try:
+        return await cb.execute(func)
+    except RuntimeError:
+        return "failed"
+
+
+@pytest.mark.asyncio
+async def test_failure_rate_trips_and_old_buckets_expire(clock):
+    cb = CircuitBreaker("svc", failure_threshold=100, minimum_calls=10, window_seconds=10)
+
+    # 4 échecs / 10 appels : sous le seuil de 50 %
+    for func in [boom] * 4 + [ok] * 6:
+        await call(cb, func)
+    assert cb.state == CircuitState.CLOSED
+
+    # Ces échecs sortent de la fenêtre : le succès ne les "compense" plus
+    clock.now += 11
+    for func in [ok] * 4 + [boom] * 6:
+        await call(cb, func)
+    assert cb.state == CircuitState.OPEN
+    assert cb.get_status()["window"]["failure_rate"] == 0.6
+
+    with pytest.raises(CircuitBreakerOpenError):
+        await cb.execute(ok)
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_trip_and_half_open_recovery(clock):
+    cb = CircuitBreaker(
+        "slow",
+        minimum_calls=2,
+        slow_call_duration=0.01,
+        slow_call_rate_threshold=1.0,
+        recovery_timeout=5,
+        half_open_max_requests=1,
+    )
+
+    async def slow():
+        await asyncio.sleep(0.02)
+
+    await cb.execute(slow)
+    await cb.execute(slow)
+    assert cb.state == CircuitState.OPEN
+
+    clock.now += 6
+    assert await cb.execute(ok) == "ok"
+    assert cb.state == CircuitState.CLOSED
+    assert cb.get_status()["window"]["calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_slot(clock):
+    cb = CircuitBreaker("probe", failure_threshold=1, recovery_timeout=5, half_open_max_requests=1)
+    await call(cb, boom)
+    clock.now += 6
+
+    # Client déconnecté pendant l'appel de test : le créneau est rendu
+    probe = asyncio.create_task(cb.execute(asyncio.sleep, 10))
+    await asyncio.sleep(0)
+    assert cb.state == CircuitState.HALF_OPEN and cb.half_open_requests == 1
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert cb.half_open_requests == 0
+
+    assert await cb.execute(ok) == "ok"
+    assert cb.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_streaming_call_judged_on_first_response(clock):
+    cb = CircuitBreaker(
+        "stream",
+        minimum_calls=1,
+        slow_call_duration=0.01,
+        slow_call_rate_threshold=0.5,
+        recovery_timeout=5,
+        half_open_max_requests=1,
+    )
+
+    # Premier morceau immédiat, flux plus long que le seuil : pas un appel lent
+    async with cb.call() as stream:
+        stream.responded()
+        await asyncio.sleep(0.02)
+    assert cb.state == CircuitState.CLOSED and cb.total_slow_calls == 0
+
+    # Premier morceau tardif : appel lent, le circuit s'ouvre
+    async with cb.call() as stream:
+        await asyncio.sleep(0.02)
+        stream.responded()
+    assert cb.state == CircuitState.OPEN
+
+    # Un long flux sain en HALF_OPEN referme le circuit
+    clock.now += 6
+    async with cb.call() as stream:
+        stream.responded()
+        await asyncio.sleep(0.02)
+    assert cb.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_ignored_exceptions_do_not_count(clock):
+    cb = CircuitBreaker("validation", failure_threshold=1, ignore_exceptions=(ValueError,))
+
+    async def invalid():
+        raise ValueError("ordre invalide")
+
+    with pytest.raises(ValueError):
+        await cb.execute(invalid)
+    assert cb.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_registry_and_shared_state_trip_all_replicas(clock, make_redis_client):
+    replicas = [CircuitBreakerRegistry(), CircuitBreakerRegistry()]
+    for registry in replicas:
+        registry.enable_shared_state(make_redis_client(), sync_interval=0)
+    a = replicas[0].get_or_create("mt5", failure_threshold=2)
+    b = replicas[1].get_or_create("mt5", failure_threshold=2)
+    assert replicas[0].get_or_create("mt5") is a
+
+    await call(a, boom)
+    await call(a, boom)
+    assert a.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitBreakerOpenError):
+        await b.execute(ok)
+    assert replicas[1].get_status()["mt5"]["state"] == "OPEN"
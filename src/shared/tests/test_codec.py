@@ -0,0 +1,70 @@
+"""
+Tests de la couche codec (shared.codec).
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from shared.codec import MSGPACK_PREFIX, CodecError, decode, get_codec
+from shared.models import AgentMessage, AgentMessageType, TradeAction, TradeOrder
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+def test_agent_message_roundtrip(name):
+    """Un AgentMessage survit à l'aller-retour et se relit en AgentMessage"""
+    if name != "json":
+        pytest.importorskip(name)
+    codec = get_codec(name)
+    message = AgentMessage(
+        type=AgentMessageType.REQUEST,
+        source_agent="core",
+        target_agent="banker",
+        action="TRADING_ORDER",
+        payload={"symbol": "XAUUSD"},
+    )
+    data = decode(codec.encode(message))
+    assert AgentMessage(**data) == message
+
+
+def test_json_family_stays_readable_by_legacy_consumers():
+    """orjson produit du JSON standard, msgpack est préfixé et auto-détecté"""
+    pytest.importorskip("orjson")
+    pytest.importorskip("msgpack")
+    order = TradeOrder(
+        symbol="XAUUSD",
+        action=TradeAction.BUY,
+        volume=Decimal("0.10"),
+        stop_loss_price=Decimal("2030.5"),
+    )
+    legacy = json.loads(get_codec("orjson").encode(order))
+    assert legacy["volume"] == "0.10"
+
+    packed = get_codec("msgpack").encode(order)
+    assert packed.startswith(MSGPACK_PREFIX)
+    assert decode(packed)["stop_loss_price"] == "2030.5"
+
+
+def test_decode_rejects_garbage():
+    with pytest.raises(CodecError):
+        decode(b"{not json")
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+def test_numpy_values_stay_numbers(name):
+    """Les scalaires numpy (VaR, symlog) restent des nombres, pas du texte"""
+    np = pytest.importorskip("numpy")
+    if name != "json":
+        pytest.importorskip(name)
+    codec = get_codec(name)
+    payload = {"var": np.float64(1.5), "n": np.int64(3), "curve": np.arange(3)}
+    assert decode(codec.encode(payload)) == {"var": 1.5, "n": 3, "curve": [0, 1, 2]}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+def test_unknown_types_are_rejected(name):
+    if name != "json":
+        pytest.importorskip(name)
+    with pytest.raises(TypeError):
+        get_codec(name).encode({"socket": object()})
@@ -0,0 +1,156 @@
+"""
+Tests du ChannelDispatcher (pools de workers par channel).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from shared.dispatcher import (
+    ChannelDispatcher,
+    ChannelPolicy,
+    ExpiryPolicy,
+    OverflowPolicy,
+    is_expired,
+)
+from shared.models import MessagePriority
+
+
+@pytest.mark.asyncio
+async def test_slow_channel_does_not_block_others():
+    """Un callback lent sur un channel ne retarde pas les autres channels"""
+    fast_done = asyncio.Event()
+
+    async def handler(channel, data):
+        if channel == "slow":
+            await asyncio.sleep(1)
+        else:
+            fast_done.set()
+
+    dispatcher = ChannelDispatcher(handler)
+    await dispatcher.submit("slow", {})
+    await dispatcher.submit("fast", {})
+
+    await asyncio.wait_for(fast_done.wait(), timeout=0.2)
+    dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_ordering_key_preserves_per_key_order():
+    """Les messages de même clé sont traités dans l'ordre malgré la concurrence"""
+    seen: dict[str, list[int]] = {}
+
+    async def handler(channel, data):
+        await asyncio.sleep(0.001 * (data["seq"] % 3))
+        seen.setdefault(data["symbol"], []).append(data["seq"])
+
+    dispatcher = ChannelDispatcher(handler)
+    dispatcher.configure(
+        "ticks", ChannelPolicy(concurrency=4, ordering_key=lambda d: d["symbol"])
+    )
+    for seq in range(20):
+        for symbol in ("XAUUSD", "EURUSD"):
+            await dispatcher.submit("ticks", {"symbol": symbol, "seq": seq})
+
+    await dispatcher.drain()
+    dispatcher.close()
+
+    assert seen["XAUUSD"] == list(range(20))
+    assert seen["EURUSD"] == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies():
+    """SHED rejette le nouveau message, DROP_OLDEST abandonne le plus ancien"""
+    release = asyncio.Event()
+    processed = []
+
+    async def handler(channel, data):
+        await release.wait()
+        processed.append((channel, data["n"]))
+
+    dispatcher = ChannelDispatcher(handler)
+    dispatcher.configure("shed", ChannelPolicy(max_queue=1, overflow=OverflowPolicy.SHED))
+    dispatcher.configure("drop", ChannelPolicy(max_queue=1, overflow=OverflowPolicy.DROP_OLDEST))
+
+    results = []
+    for channel in ("shed", "drop"):
+        for n in range(3):
+            results.append(await dispatcher.submit(channel, {"n": n}))
+            await asyncio.sleep(0)  # laisse le worker prendre le premier message
+
+    release.set()
+    await dispatcher.drain()
+    stats = dispatcher.get_stats()
+    dispatcher.close()
+
+    assert results == [True, True, False, True, True, True]
+    assert ("shed", 2) not in processed
+    assert ("drop", 1) not in processed and ("drop", 2) in processed
+    assert stats["shed"]["dropped"] == 1
+    assert stats["drop"]["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_messages_skip_handler_and_go_to_dead_letter():
+    """Un message dont le TTL est dépassé n'atteint jamais le handler"""
+    handled, dead, acks = [], [], []
+    stale = (datetime.now() - timedelta(seconds=60)).isoformat()
+
+    async def handler(channel, data):
+        handled.append(data["n"])
+
+    async def dead_letter(channel, data):
+        dead.append((channel, data["n"]))
+
+    dispatcher = ChannelDispatcher(handler, dead_letter=dead_letter)
+    dispatcher.configure("trades", ChannelPolicy(on_expired=ExpiryPolicy.DEAD_LETTER))
+    await dispatcher.submit("trades", {"n": 1, "timestamp": stale, "ttl_seconds": 30}, acks.append)
+    await dispatcher.submit("trades", {"n": 2, "timestamp": stale, "ttl_seconds": 0})
+    await dispatcher.submit("ticks", {"n": 3, "timestamp": stale, "ttl_seconds": 30})
+
+    await dispatcher.drain()
+    stats = dispatcher.get_stats()
+    dispatcher.close()
+
+    assert handled == [2]
+    assert dead == [("trades", 1)]
+    assert acks == [True]
+    assert stats["trades"]["expired"] == 1 and stats["trades"]["dead_lettered"] == 1
+    assert stats["ticks"]["expired"] == 1 and stats["ticks"]["dead_lettered"] == 0
+
+
+def test_is_expired_ignores_messages_without_ttl():
+    assert not is_expired({"n": 1})
+    assert not is_expired({"timestamp": "not-a-date", "ttl_seconds": 5})
+    assert is_expired({"timestamp": datetime.now() - timedelta(seconds=10), "ttl_seconds": 5})
+
+
+@pytest.mark.asyncio
+async def test_priority_lanes_weighted_scheduling():
+    """La voie CRITICAL passe devant le BULK sans l'affamer (8:3:1)"""
+    release = asyncio.Event()
+    order = []
+
+    async def handler(channel, data):
+        await release.wait()
+        order.append(data["lane"])
+
+    dispatcher = ChannelDispatcher(handler)
+    dispatcher.configure("bus", ChannelPolicy(priority=MessagePriority.BULK))
+    await dispatcher.submit("bus", {"lane": "first"})
+    await asyncio.sleep(0)  # le worker bloque sur le premier message
+    for _ in range(10):
+        await dispatcher.submit("bus", {"lane": "bulk"})
+    for _ in range(10):
+        await dispatcher.submit("bus", {"lane": "critical", "priority": "critical"})
+
+    depth = dispatcher.get_stats()["bus"]["lane_depth"]
+    release.set()
+    await dispatcher.drain()
+    dispatcher.close()
+
+    assert depth == {"critical": 10, "normal": 0, "bulk": 10}
+    served = order[1:10]
+    assert served.count("critical") == 8 and served.count("bulk") == 1
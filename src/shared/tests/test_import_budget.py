@@ -0,0 +1,85 @@
+"""
+Budget d'import à froid : `shared` et les experts ne doivent charger ni
+torch, ni jax, ni pandas, ni torch_geometric au démarrage (import à la
+première utilisation), et leur import doit tenir dans un budget de temps.
+
+Mesure dans un interpréteur neuf via `python -X importtime`. Budget
+ajustable par HIVE_IMPORT_BUDGET_MS (lent en CI par exemple).
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = ("torch", "jax", "pandas", "torch_geometric")
+
+# (module, répertoire du service, budget en ms)
+TARGETS = [
+    ("shared", None, 1500),
+    ("eva_banker.main", "eva-banker", 3000),
+    ("eva_core.main", "eva-core", 3000),
+    ("eva_sentinel.main", "eva-sentinel", 3000),
+    ("eva_compliance.main", "eva-compliance", 3000),
+    ("eva_accountant.main", "eva-accountant", 3000),
+    ("eva_sage.main", "eva-sage", 3000),
+    ("eva_muse.main", "eva-muse", 3000),
+    ("eva_shadow.main", "eva-shadow", 3000),
+]
+
+# Paquets du dépôt : leur absence est un bug, jamais une dépendance optionnelle
+FIRST_PARTY = re.compile(r"^(shared|eva_\w+)$")
+
+PROBE = (
+    "import importlib, sys\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "print(','.join(m for m in sys.argv[2:] if m in sys.modules))\n"
+)
+
+
+def cold_import(module: str, service_dir: str | None) -> tuple[float, list[str], list[tuple[int, str]]]:
+    """Durée d'import (ms), modules lourds chargés et imports les plus coûteux"""
+    paths = [str(SRC / "shared"), str(SRC / "eva-core")]
+    if service_dir:
+        paths.append(str(SRC / service_dir))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(paths)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, module, *HEAVY_MODULES],
+        capture_output=True, text=True, env=env, cwd=SRC, timeout=120,
+    )
+    if result.returncode != 0:
+        # Seule une dépendance tierce absente de l'environnement justifie un skip
+        missing = re.findall(r"ModuleNotFoundError: No module named '([\w.]+)'", result.stderr)
+        if missing and not FIRST_PARTY.match(missing[-1].split(".")[0]):
+            pytest.skip(f"{module} non importable ici: dépendance {missing[-1]!r} absente")
+        pytest.fail(f"import de {module} en échec:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    entries: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        entries.append((int(cumulative), name.strip()))
+        # Imports de premier niveau : leur cumul est la durée totale
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return total_us / 1000, loaded, sorted(entries, reverse=True)[:5]
+
+
+@pytest.mark.parametrize("module,service_dir,budget_ms", TARGETS, ids=[t[0] for t in TARGETS])
+def test_cold_import_stays_lazy_and_within_budget(module, service_dir, budget_ms):
+    budget_ms = float(os.environ.get("HIVE_IMPORT_BUDGET_MS", budget_ms))
+    elapsed_ms, loaded, slowest = cold_import(module, service_dir)
+
+    assert not loaded, f"{module} charge {loaded} à l'import (à importer à la première utilisation)"
+    assert elapsed_ms <= budget_ms, (
+        f"{module}: import à froid {elapsed_ms:.0f} ms > budget {budget_ms:.0f} ms; "
+        f"plus coûteux: {[(name, us // 1000) for us, name in slowest]}"
+    )
@@ -0,0 +1,119 @@
+"""
+Tests du middleware ASGI de métriques HTTP.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from shared.instrumentation import UNMATCHED_ROUTE, MetricsMiddleware
+from shared.telemetry import Telemetry
+
+
+async def routed_app(scope, receive, send):
+    """Application minimale : le « routeur » renseigne scope["route"]"""
+    message = await receive()
+    if scope["path"].startswith("/agents/"):
+        scope["route"] = SimpleNamespace(path="/agents/{agent_id}")
+        status, body = 200, b"ok:" + message.get("body", b"")
+    else:
+        status, body = 404, b"not found"
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def call(app, method, path, body=b""):
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+
+
+@pytest.mark.asyncio
+async def test_records_per_route_latency_status_and_sizes():
+    telemetry = Telemetry("test")
+    app = MetricsMiddleware(routed_app, telemetry)
+
+    await call(app, "POST", "/agents/banker", b"12345")
+    await call(app, "POST", "/agents/core", b"")
+    await call(app, "GET", "/nope/1")
+
+    metrics = telemetry.get_metrics()
+    route = "method=POST,route=/agents/{agent_id}"
+    assert metrics["requests_total"] == 3
+    assert metrics["warnings_total"] == 1
+    assert metrics["operations"][f"hive_http_request_duration_seconds{{{route}}}"]["count"] == 2
+    assert metrics["counters"][f"hive_http_requests_total{{{route},status=200}}"] == 2
+    assert metrics["counters"][
+        f"hive_http_requests_total{{method=GET,route={UNMATCHED_ROUTE},status=404}}"
+    ] == 1
+    assert metrics["counters"][f"hive_http_request_bytes_total{{{route}}}"] == 5
+    assert metrics["counters"][f"hive_http_response_bytes_total{{{route}}}"] == 11
+    assert metrics["gauges"]["hive_http_requests_in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unhandled_exception_counts_as_server_error():
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    telemetry = Telemetry("test")
+    app = MetricsMiddleware(failing_app, telemetry)
+    with pytest.raises(RuntimeError):
+        await call(app, "GET", "/x")
+
+    metrics = telemetry.get_metrics()
+    assert metrics["errors_total"] == 1
+    assert metrics["counters"][
+        f"hive_http_requests_total{{method=GET,route={UNMATCHED_ROUTE},status=500}}"
+    ] == 1
+    assert metrics["gauges"]["hive_http_requests_in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_non_http_scopes_pass_through():
+    seen = []
+
+    async def lifespan_app(scope, receive, send):
+        seen.append(scope["type"])
+
+    telemetry = Telemetry("test")
+    await MetricsMiddleware(lifespan_app, telemetry)({"type": "lifespan"}, None, None)
+    assert seen == ["lifespan"]
+    assert telemetry.requests_total == 0
+
+
+def test_instrument_app_is_idempotent_and_stops_on_shutdown():
+    from contextlib import asynccontextmanager
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from shared.instrumentation import instrument_app, uninstrument_app
+    from shared.system_sampler import get_system_sampler
+
+    @asynccontextmanager
+    async def lifespan(app):
+        instrument_app(app, "idempotent", expose=False)
+        instrument_app(app, "idempotent", expose=False)
+        yield
+        await uninstrument_app(app)
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    # Deux cycles de lifespan : les middlewares ne sont jamais réempilés
+    for _ in range(2):
+        with TestClient(app) as client:
+            assert get_system_sampler()._task is not None
+            client.get("/ping")
+        assert get_system_sampler()._task is None
+
+    counters = app.state.telemetry.get_metrics()["counters"]
+    assert counters["hive_http_requests_total{method=GET,route=/ping,status=200}"] == 2
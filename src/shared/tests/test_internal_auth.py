@@ -28,3 +28,38 @@ def test_invalid_token():
     
     payload = InternalAuth.verify_token(tampered_token)
     assert payload is None
+
+def test_client_reuses_token_until_refresh_margin(monkeypatch):
+    """The signed token is reused, then re-signed shortly before expiry."""
+    from shared import internal_auth
+
+    now = [1_000_000.0]
+    monkeypatch.setattr(internal_auth.time, "time", lambda: now[0])
+    monkeypatch.setattr(InternalAuth, "_issued", {})
+
+    first = InternalAuth.get_token("core")
+    assert InternalAuth.get_token("core") == first
+    assert InternalAuth.get_token("banker") != first
+
+    now[0] += internal_auth.TOKEN_TTL_SECONDS - internal_auth.TOKEN_REFRESH_MARGIN_SECONDS
+    assert InternalAuth.get_token("core") != first
+
+def test_verified_tokens_are_served_from_cache_until_exp(monkeypatch):
+    """A verified token skips the JWT decode until its exp, then is rejected."""
+    from shared import internal_auth
+
+    monkeypatch.setattr(InternalAuth, "verified_cache", internal_auth.VerifiedTokenCache())
+    token = InternalAuth.generate_token("core")
+    assert InternalAuth.verify_token(token)["src"] == "core"
+
+    decode = internal_auth.jwt.decode
+    calls = []
+    monkeypatch.setattr(internal_auth.jwt, "decode", lambda *a, **kw: calls.append(1) or decode(*a, **kw))
+    assert InternalAuth.verify_token(token)["src"] == "core"
+    assert calls == [] and InternalAuth.verified_cache.get_stats()["hits"] == 1
+
+    # Past exp the entry is dropped and the token goes back through a full decode
+    cache = InternalAuth.verified_cache
+    later = time.time() + internal_auth.TOKEN_TTL_SECONDS + 1
+    assert cache.get(cache.key(token), later) is None
+    assert cache.get_stats()["size"] == 0
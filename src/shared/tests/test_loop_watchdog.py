@@ -0,0 +1,51 @@
+"""
+Tests du watchdog de boucle asyncio (retard et capture de pile).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from shared.loop_watchdog import LoopWatchdog
+from shared.telemetry import Telemetry
+
+
+def blocking_hash():
+    """Travail synchrone appelé par erreur depuis une coroutine"""
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_measured_and_its_stack_captured():
+    telemetry = Telemetry("test")
+    watchdog = LoopWatchdog(telemetry, interval=0.01, threshold=0.1)
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_hash()
+        await asyncio.sleep(0.05)
+    finally:
+        watchdog.stop()
+
+    (stall,) = watchdog.stalls
+    assert stall["blocked_ms"] >= 100
+    assert any("blocking_hash" in line for line in stall["stack"])
+    assert stall["task"] is not None
+
+    lag = telemetry.histogram("hive_event_loop_lag_seconds")
+    assert lag.count == watchdog.beats > 5
+    assert lag.max >= 0.25
+    assert telemetry.get_metrics()["counters"]["hive_event_loop_stalls_total"] == 1
+    assert watchdog.get_stats()["max_lag_ms"] >= 250
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_records_no_stall():
+    watchdog = LoopWatchdog(interval=0.01, threshold=0.1)
+    watchdog.start()
+    watchdog.start()  # idempotent
+    await asyncio.sleep(0.1)
+    watchdog.stop()
+    assert not watchdog.running
+    assert watchdog.beats > 0 and list(watchdog.stalls) == []
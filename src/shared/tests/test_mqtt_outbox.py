@@ -0,0 +1,176 @@
+"""
+Tests de l'outbox MQTT (file hors-ligne du Critical Path).
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from shared import mqtt_client
+from shared.mqtt_client import EVAMQTTClient
+from shared.mqtt_outbox import MQTTOutbox
+
+
+def test_outbox_order_expiry_dedupe_and_bound():
+    outbox = MQTTOutbox(max_messages=3)
+    assert not outbox.put("eva/ticks", b"t", qos=0)  # at-most-once : non conservé
+    assert outbox.put("eva/orders", b"1", qos=2, message_id="order-1")
+    assert not outbox.put("eva/orders", b"1", qos=2, message_id="order-1")
+    assert outbox.put("eva/orders", b"2", qos=2, ttl_seconds=30)
+    assert outbox.put("eva/orders", b"3", qos=1)
+    assert outbox.put("eva/orders", b"4", qos=1)  # évince "1"
+
+    outbox._entries[0].expires_at = time.time() - 1  # "2" périmé
+    assert [e.payload for e in outbox.drain()] == [b"3", b"4"]
+
+    stats = outbox.get_stats()
+    assert stats["pending"] == 0
+    assert stats["duplicates"] == 1 and stats["dropped"] == 1 and stats["expired"] == 1
+
+
+def test_outbox_interrupted_drain_keeps_current_message():
+    outbox = MQTTOutbox()
+    for n in range(3):
+        outbox.put("eva/orders", str(n).encode(), qos=1, message_id=f"id-{n}")
+
+    for entry in outbox.drain():
+        if entry.payload == b"1":
+            break  # connexion perdue avant publication
+    assert [e.payload for e in outbox.drain()] == [b"1", b"2"]
+    # Déjà rejoué : un renvoi du même ordre est ignoré
+    assert not outbox.put("eva/orders", b"0", qos=1, message_id="id-0")
+
+
+def test_outbox_survives_restart(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    outbox = MQTTOutbox(path=path)
+    outbox.put("eva/orders", b"1", qos=2, message_id="order-1")
+    outbox.put("eva/orders", b"2", qos=2)
+    outbox.close()
+
+    reloaded = MQTTOutbox(path=path)
+    assert not reloaded.put("eva/orders", b"1", qos=2, message_id="order-1")
+    assert [e.payload for e in reloaded.drain()] == [b"1", b"2"]
+    reloaded.close()
+    assert len(MQTTOutbox(path=path)) == 0
+
+
+@pytest.mark.asyncio
+async def test_persist_writes_sqlite_off_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "outbox.db")
+    outbox = MQTTOutbox(path=path)
+    threads = []
+    to_thread = asyncio.to_thread
+
+    async def spy(func, *args):
+        threads.append(func.__name__)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", spy)
+    outbox.put("eva/orders", b"1", qos=2)
+    outbox.put("eva/orders", b"2", qos=2)
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM outbox").fetchone() == (0,)
+
+    await outbox.persist()
+    assert threads == ["_write"]
+    rows = sqlite3.connect(path).execute("SELECT payload FROM outbox ORDER BY seq").fetchall()
+    assert rows == [(b"1",), (b"2",)]
+
+    assert [e.payload for e in outbox.drain()] == [b"1", b"2"]
+    await outbox.persist()
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM outbox").fetchone() == (0,)
+    outbox.close()
+
+
+class FakeGMQTT:
+    broker_up = True
+
+    def __init__(self, client_id="test"):
+        self.published = []
+        self.subscribed = []
+
+    def set_last_will(self, topic, payload, qos=0, retain=False):
+        pass
+
+    async def connect(self, host, port):
+        if not FakeGMQTT.broker_up:
+            raise ConnectionRefusedError("broker arrêté")
+        self.on_connect(self, 0, 0, {})
+
+    def subscribe(self, topic, qos=0):
+        self.subscribed.append(topic)
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        self.published.append((topic, payload, qos))
+
+    async def disconnect(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_client_buffers_offline_and_replays_in_order(monkeypatch):
+    monkeypatch.setattr(mqtt_client, "MQTTClient", FakeGMQTT)
+    client = EVAMQTTClient("test", outbox=MQTTOutbox())
+
+    for n in range(3):
+        await client.publish("eva/banker/requests/critical", {"n": n}, qos=2)
+    await client.publish("eva/ticks", {"n": 99}, qos=0)
+    assert len(client.outbox) == 3
+
+    client.client = FakeGMQTT()
+    client._on_connect(client.client, 0, 0, {})
+    await client.publish("eva/banker/requests/critical", {"n": 3}, qos=2)
+    await client._drain_task
+
+    sent = [client.codec.decode(payload)["n"] for _, payload, _ in client.client.published]
+    assert sent == [0, 1, 2, 3]
+    assert len(client.outbox) == 0
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_survive_broker_started_later(monkeypatch):
+    """Filtres déclarés sans broker : abonnés à la connexion, puis à chaque reconnexion"""
+    monkeypatch.setattr(mqtt_client, "MQTTClient", FakeGMQTT)
+    monkeypatch.setattr(FakeGMQTT, "broker_up", False)
+    client = EVAMQTTClient("test", outbox=MQTTOutbox())
+
+    async def on_message(topic, data):
+        pass
+
+    assert not await client._open("localhost", 1883)
+    await client.subscribe("eva/status/+", on_message)
+    await client.subscribe("eva/banker/requests/critical", on_message)
+
+    FakeGMQTT.broker_up = True
+    assert await client._open("localhost", 1883)
+    assert client.client.subscribed == ["eva/status/+", "eva/banker/requests/critical"]
+
+    client._on_disconnect(client.client, None, None)
+    client._on_connect(client.client, 0, 0, {})
+    assert client.client.subscribed.count("eva/status/+") == 2
+
+
+@pytest.mark.asyncio
+async def test_disconnect_stops_drain_before_closing_outbox(tmp_path, monkeypatch):
+    monkeypatch.setattr(mqtt_client, "MQTTClient", FakeGMQTT)
+    path = str(tmp_path / "outbox.db")
+    client = EVAMQTTClient("test", outbox=MQTTOutbox(path=path))
+    total = 3 * mqtt_client._DRAIN_YIELD_EVERY
+    for n in range(total):
+        await client.publish("eva/orders", {"n": n}, qos=1)
+
+    client.client = FakeGMQTT()
+    client._on_connect(client.client, 0, 0, {})
+    await asyncio.sleep(0)  # rejeu en cours : premier lot publié
+    await client.disconnect()
+
+    replayed = [t for t, _, _ in client.client.published if t == "eva/orders"]
+    assert client._drain_task is None
+    assert 0 < len(replayed) < total
+    await asyncio.sleep(0.05)
+    assert len(client.client.published) == len(replayed)  # plus rien après la fermeture
+    # Conservés pour le prochain démarrage : messages non rejoués, celui en
+    # cours à l'interruption (at-least-once) et le statut offline
+    assert len(MQTTOutbox(path=path)) == total - len(replayed) + 2
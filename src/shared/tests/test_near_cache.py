@@ -0,0 +1,57 @@
+"""
+Tests du near-cache (LRU local devant cache_get).
+"""
+
+import asyncio
+
+import pytest
+
+from shared.near_cache import NearCache
+from shared.telemetry import collect_sources
+
+
+def test_lru_eviction_and_prefix_ttl():
+    cache = NearCache({"eva.": 60, "eva.banker.": 0}, max_entries=2)
+
+    assert cache.ttl_for("eva.banker.status") == 0
+    assert cache.ttl_for("nemesis:state") is None
+
+    cache.put("eva.a", b"1")
+    cache.put("eva.b", b"2")
+    assert cache.get("eva.a") == b"1"  # eva.a devient la plus récente
+    cache.put("eva.c", b"3")
+    assert cache.get("eva.b") is None
+    assert cache.get("eva.a") == b"1"
+
+    cache.put("eva.banker.status", b"4")  # TTL 0 : expirée dès la lecture
+    assert cache.get("eva.banker.status") is None
+    assert cache.get("eva.c") is None
+
+    generation = cache.generation
+    cache.invalidate("eva.a")
+    cache.put("eva.a", b"stale", generation)  # lecture antérieure à l'invalidation
+    assert cache.get("eva.a") is None
+
+    stats = cache.get_stats()
+    assert stats["evictions"] == 2
+    assert stats["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_remote_write_invalidates_near_cache(make_redis_client):
+    core, banker = make_redis_client(), make_redis_client()
+    await core.enable_near_cache({"eva.": 60})
+
+    await banker.cache_set("eva.banker.status", {"ts": 1}, ttl_seconds=30)
+    await asyncio.sleep(0.05)  # laisse passer la notification de l'écriture
+    assert await core.cache_get("eva.banker.status") == {"ts": 1}
+    assert await core.cache_get("eva.banker.status") == {"ts": 1}
+    assert core._near_cache.hits == 1
+
+    await banker.cache_set("eva.banker.status", {"ts": 2}, ttl_seconds=30)
+    await asyncio.sleep(0.05)
+    assert await core.cache_get("eva.banker.status") == {"ts": 2}
+
+    assert collect_sources()["near_cache"]["misses"] == 2
+    await core.disconnect()
+    assert "near_cache" not in collect_sources()
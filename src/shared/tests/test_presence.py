@@ -0,0 +1,75 @@
+"""
+Tests de la table de présence consolidée.
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+
+pytest.importorskip("lupa")  # scripts Lua (heartbeat, balayage)
+
+from shared.presence import _BEAT_SCRIPT, PresenceTable
+
+
+@pytest.mark.asyncio
+async def test_snapshot_and_transitions(make_redis_client):
+    core = PresenceTable(make_redis_client(), stale_after=0.05, offline_after=0.1)
+    banker = PresenceTable(make_redis_client())
+
+    events = []
+
+    async def on_transition(event):
+        events.append((event["agent"], event["state"]))
+
+    await core.on_transition(on_transition)
+
+    await banker.beat("banker", {"status": "online", "expert": "banker"})
+    await banker.beat("banker", {"status": "online", "expert": "banker"})
+    await banker.beat("keeper", {"status": "online", "expert": "keeper"})
+
+    snapshot = await core.snapshot()
+    assert snapshot["banker"]["status"] == "online"
+    assert snapshot["banker"]["payload"] == {"status": "online", "expert": "banker"}
+
+    await asyncio.sleep(0.15)
+    await banker.beat("keeper", {"status": "online", "expert": "keeper"})
+    assert await core.sweep() == ["banker"]
+    assert await core.sweep() == []
+
+    snapshot = await core.snapshot()
+    assert snapshot["banker"]["status"] == "offline"
+    assert snapshot["keeper"]["status"] == "online"
+
+    await banker.beat("banker", {"status": "online", "expert": "banker"})
+    await asyncio.sleep(0.05)
+    await core.close()
+
+    # Une transition par changement d'état, pas par heartbeat
+    assert events == [
+        ("banker", "online"),
+        ("keeper", "online"),
+        ("banker", "offline"),
+        ("banker", "online"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_beat_joins_existing_batch(make_redis_client):
+    client = make_redis_client()
+    presence = PresenceTable(client)
+
+    async with client.pipeline() as batch:
+        batch.publish("eva.banker.heartbeat", {"status": "online"})
+        await presence.beat("banker", {"status": "online"}, batch=batch)
+
+    assert (await presence.snapshot())["banker"]["status"] == "online"
+    # Script inconnu au premier EVALSHA : chargé une fois, puis réutilisé
+    sha = hashlib.sha1(_BEAT_SCRIPT.encode()).hexdigest()
+    assert await client.commands.script_exists(sha) == [True]
+
+    # Redis redémarré (cache de scripts vidé) : le heartbeat groupé passe encore
+    await client.commands.script_flush()
+    async with client.pipeline() as batch:
+        await presence.beat("keeper", {"status": "online"}, batch=batch)
+    assert (await presence.snapshot())["keeper"]["status"] == "online"
@@ -0,0 +1,116 @@
+"""
+Tests des outils de diagnostic à la demande (profil CPU, tâches, allocations).
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from shared.internal_auth import InternalAuth
+from shared.profiling import (
+    AllocationTracker,
+    ObjectCounter,
+    ProfilerBusyError,
+    SamplingProfiler,
+    dump_tasks,
+)
+
+
+def busy_loop(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+@pytest.mark.asyncio
+async def test_sampling_profile_finds_hot_function_in_both_formats():
+    worker = threading.Thread(target=busy_loop, args=(0.5,), name="worker")
+    worker.start()
+    profiler = await SamplingProfiler(interval=0.005).run(0.2)
+    worker.join()
+
+    collapsed = profiler.to_collapsed()
+    assert "thread:worker;" in collapsed and "busy_loop (test_profiling.py:" in collapsed
+
+    speedscope = profiler.to_speedscope("test")
+    (profile,) = speedscope["profiles"]
+    names = [frame["name"] for frame in speedscope["shared"]["frames"]]
+    assert "busy_loop" in names
+    assert len(profile["samples"]) == len(profile["weights"]) == len(profiler.samples)
+    assert all(i < len(names) for sample in profile["samples"] for i in sample)
+
+
+@pytest.mark.asyncio
+async def test_only_one_profile_at_a_time():
+    first = asyncio.create_task(SamplingProfiler().run(0.2))
+    await asyncio.sleep(0.05)
+    with pytest.raises(ProfilerBusyError):
+        await SamplingProfiler().run(0.1)
+    await first
+
+
+@pytest.mark.asyncio
+async def test_task_dump_shows_waiting_coroutines():
+    async def waiting_for_broker():
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(waiting_for_broker(), name="broker-wait")
+    await asyncio.sleep(0)
+    try:
+        (entry,) = [t for t in dump_tasks() if t["name"] == "broker-wait"]
+        assert entry["coro"].endswith("waiting_for_broker")
+        assert entry["stack"][0].startswith("waiting_for_broker")
+    finally:
+        task.cancel()
+
+
+def test_allocation_snapshots_report_top_and_diff():
+    tracker = AllocationTracker()
+    with pytest.raises(RuntimeError):
+        tracker.snapshot()
+    tracker.start()
+    try:
+        first = tracker.snapshot(limit=5)
+        assert "diff" not in first
+        retained = [bytearray(1024) for _ in range(200)]  # noqa: F841
+        second = tracker.snapshot(limit=5)
+        assert second["top"] and second["diff"][0]["size_diff_kb"] >= 150
+    finally:
+        tracker.stop()
+    assert not tracker.tracing
+
+
+def test_object_counts_diff_between_snapshots():
+    class Leaky:
+        pass
+
+    counter = ObjectCounter()
+    counter.snapshot()
+    leaked = [Leaky() for _ in range(500)]  # noqa: F841
+    diff = dict(counter.snapshot(limit=50)["diff"])
+    assert diff[Leaky.__qualname__] == 500
+
+
+@pytest.mark.asyncio
+async def test_debug_routes_require_internal_token():
+    pytest.importorskip("fastapi")
+    import httpx
+    from fastapi import FastAPI
+
+    from shared.profiling import attach_debug_routes
+
+    app = FastAPI()
+    attach_debug_routes(app, "test")
+    attach_debug_routes(app, "test")  # idempotent
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as client:
+        assert (await client.get("/debug/tasks")).status_code == 401
+        headers = {"X-Hive-Internal-Token": InternalAuth.get_token("core")}
+        response = await client.get("/debug/tasks", headers=headers)
+        assert response.status_code == 200 and response.json()["count"] >= 1
+        response = await client.get("/debug/profile?seconds=0.1&format=collapsed", headers=headers)
+        assert response.status_code == 200
+        response = await client.get("/debug/objects?limit=5", headers=headers)
+        assert response.status_code == 200 and response.json()["total"] > 0
+        assert (await client.get("/debug/tracemalloc", headers=headers)).status_code == 409
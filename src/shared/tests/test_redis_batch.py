@@ -0,0 +1,49 @@
+"""
+Tests du batching Redis (pipeline explicite et AutoBatcher).
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_pipeline_executes_heartbeat_in_one_batch(make_redis_client):
+    """publish + cache_set d'un heartbeat partent dans le même pipeline"""
+    client = make_redis_client()
+    calls = []
+    execute = client._execute_batch
+
+    async def spy(ops):
+        calls.append(len(ops))
+        return await execute(ops)
+
+    client._execute_batch = spy
+
+    payload = {"status": "online", "expert": "banker"}
+    async with client.pipeline() as batch:
+        batch.publish("eva.banker.heartbeat", payload)
+        batch.cache_set("eva.banker.status", payload, ttl_seconds=10)
+
+    assert calls == [2]
+    assert await client.cache_get("eva.banker.status") == payload
+
+
+@pytest.mark.asyncio
+async def test_auto_batcher_coalesces_and_flushes_on_shutdown(make_redis_client):
+    """Les écritures concurrentes sont regroupées, rien n'est perdu à l'arrêt"""
+    client = make_redis_client()
+    client.enable_auto_batching(window_ms=20)
+
+    await asyncio.gather(*(
+        client.cache_set(f"swarm:drone:{i}", {"id": i}, ttl_seconds=60) for i in range(50)
+    ))
+    stats = client._batcher.get_stats()
+    assert stats["ops_sent"] == 50
+    assert stats["batches_sent"] == 1
+
+    pending = asyncio.create_task(client.publish("eva.swarm.events", {"type": "DRONE_HEARTBEAT"}))
+    await asyncio.sleep(0)
+    await client._batcher.close()
+    assert await pending == 0
+    assert await client.cache_get("swarm:drone:7") == {"id": 7}
@@ -0,0 +1,84 @@
+"""
+Tests de la gestion des connexions Redis (reconnexion des écoutes, sonde).
+"""
+
+import asyncio
+
+import pytest
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from shared.telemetry import collect_sources
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_after_connection_error(monkeypatch, make_redis_client):
+    client = make_redis_client()
+    monkeypatch.setattr(client._backoff, "compute", lambda failures: 0)
+    attempts, resubscribed = [], []
+
+    async def flaky_loop():
+        attempts.append(client._listeners["pubsub"])
+        if len(attempts) < 3:
+            raise RedisConnectionError("Redis redémarré")
+
+    async def resubscribe():
+        resubscribed.append(True)
+
+    await client._run_listener("pubsub", flaky_loop, resubscribe)
+
+    assert len(attempts) == 3
+    assert len(resubscribed) == 2
+    assert client.reconnects == 2
+    assert client._listeners["pubsub"] == "stopped"
+
+
+@pytest.mark.asyncio
+async def test_connection_stats_published_to_telemetry(make_redis_client):
+    client = make_redis_client()
+    await client.connect()
+    client._listeners["pubsub"] = "reconnecting"
+    client.reconnects = 1
+
+    stats = collect_sources()["redis_connection"]
+    assert stats == {"status": "degraded", "listeners": {"pubsub": "reconnecting"}, "reconnects": 1}
+
+    client._listeners["pubsub"] = "listening"
+    assert client.get_connection_stats()["status"] == "ok"
+
+    await client.disconnect()
+    assert "redis_connection" not in collect_sources()
+
+
+@pytest.mark.asyncio
+async def test_stream_listener_survives_redis_restart(monkeypatch, make_redis_client, redis_server):
+    """Coupure puis redémarrage à vide : reconnexion, groupe recréé (NOGROUP), livraison"""
+    producer = make_redis_client(["eva.compliance.trades"])
+    consumer = make_redis_client(["eva.compliance.trades"])
+    monkeypatch.setattr(consumer._backoff, "compute", lambda failures: 0.05)
+    consumer._stream_block_ms = 50
+    received = []
+
+    async def handler(channel, data):
+        received.append(data["ticket_id"])
+
+    await consumer.subscribe(["eva.compliance.trades"], handler, group="compliance")
+    task = asyncio.create_task(consumer.listen())
+    await producer.publish("eva.compliance.trades", {"ticket_id": 1})
+    await asyncio.sleep(0.2)
+
+    # Redis tombe, puis revient sans persistance : streams et groupes perdus
+    redis_server.connected = False
+    await asyncio.sleep(0.2)
+    assert consumer.get_connection_stats()["listeners"]["streams"] == "reconnecting"
+    redis_server.connected = True
+    await producer.commands.flushall()
+    await producer.publish("eva.compliance.trades", {"ticket_id": 2})
+    await asyncio.sleep(0.5)
+
+    assert not task.done()
+    task.cancel()
+    assert received == [1, 2]
+    assert consumer.reconnects >= 1
+    await consumer.disconnect()
+    await producer.disconnect()
@@ -0,0 +1,54 @@
+"""
+Tests du request/reply sur le bus Redis.
+"""
+
+import asyncio
+
+import pytest
+
+from shared.redis_client import AgentRequestError
+
+
+@pytest.mark.asyncio
+async def test_request_resolves_on_matching_reply(make_redis_client):
+    core, banker = make_redis_client(), make_redis_client()
+
+    async def trading_status(payload):
+        return {"equity": 10_000, "echo": payload["symbol"]}
+
+    async def failing(payload):
+        raise ValueError("MT5 déconnecté")
+
+    await banker.handle_requests("banker", {"TRADING_STATUS": trading_status, "CLOSE": failing})
+    listener = asyncio.create_task(banker.listen())
+    await asyncio.sleep(0.05)
+
+    result = await core.request("banker", "TRADING_STATUS", {"symbol": "XAUUSD"}, timeout=2)
+    assert result == {"equity": 10_000, "echo": "XAUUSD"}
+
+    with pytest.raises(AgentRequestError):
+        await core.request("banker", "CLOSE", timeout=2)
+
+    with pytest.raises(TimeoutError):
+        await core.request("sage", "PING", timeout=0.1)
+    assert core._pending_replies == {}
+
+    listener.cancel()
+    await core.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_served_actions_are_advertised(make_redis_client):
+    core, banker = make_redis_client(), make_redis_client()
+
+    async def trading_status(payload):
+        return {}
+
+    await banker.handle_requests("banker", {"TRADING_STATUS": trading_status, "CLOSE": trading_status})
+    assert await core.serves("banker", "TRADING_STATUS")
+    assert not await core.serves("banker", "TRADING_ORDER")
+    assert not await core.serves("sage", "PING")
+
+    # Redémarrage avec moins de handlers : l'annonce est remplacée
+    await banker.handle_requests("banker", {"TRADING_STATUS": trading_status})
+    assert not await core.serves("banker", "CLOSE")
@@ -0,0 +1,117 @@
+"""
+Tests du transport Streams (at-least-once) de RedisClient.
+Utilise fakeredis pour simuler un serveur Redis en mémoire.
+"""
+
+import asyncio
+
+import pytest
+
+from shared.redis_client import DEAD_LETTER_STREAM
+
+
+@pytest.fixture
+def make_client(make_redis_client):
+    def make():
+        client = make_redis_client(stream_channels=["eva.compliance.trades"])
+        client._stream_block_ms = 50
+        return client
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_stream_publish_survives_consumer_restart(make_client):
+    """Un message publié pendant l'absence du consumer est rejoué au démarrage"""
+    producer = make_client()
+    consumer = make_client()
+
+    received = []
+
+    async def handler(channel, data):
+        received.append(data)
+
+    # Le groupe existe (abonnement initial), puis le consumer "redémarre"
+    await consumer.subscribe(["eva.compliance.trades"], handler, group="compliance")
+    await producer.publish("eva.compliance.trades", {"ticket_id": 1, "profit": 42})
+
+    restarted = make_client()
+    await restarted.subscribe(["eva.compliance.trades"], handler, group="compliance")
+    task = asyncio.create_task(restarted.listen())
+    await asyncio.sleep(0.2)
+    task.cancel()
+
+    assert received == [{"ticket_id": 1, "profit": 42}]
+    pending = await restarted._client.xpending("eva.compliance.trades", "compliance")
+    assert pending["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_callback_leaves_entry_pending(make_client):
+    """Un callback en échec ne doit pas acquitter le message"""
+    client = make_client()
+
+    async def failing(channel, data):
+        raise RuntimeError("boom")
+
+    await client.subscribe(["eva.compliance.trades"], failing, group="compliance")
+    await client.publish("eva.compliance.trades", {"ticket_id": 2})
+
+    task = asyncio.create_task(client.listen())
+    await asyncio.sleep(0.2)
+    task.cancel()
+
+    pending = await client._client.xpending("eva.compliance.trades", "compliance")
+    assert pending["pending"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_consumer_group_is_recreated(make_client):
+    """Après un FLUSH (ou redémarrage sans persistance), NOGROUP ne tue pas l'écoute"""
+    producer, consumer = make_client(), make_client()
+    received = []
+
+    async def handler(channel, data):
+        received.append(data["ticket_id"])
+
+    await consumer.subscribe(["eva.compliance.trades"], handler, group="compliance")
+    await producer._client.flushall()
+    # Le producteur recrée le stream, sans le groupe
+    await producer.publish("eva.compliance.trades", {"ticket_id": 3})
+
+    task = asyncio.create_task(consumer.listen())
+    await asyncio.sleep(0.2)
+    assert not task.done()
+    task.cancel()
+
+    assert received == [3]
+    pending = await consumer._client.xpending("eva.compliance.trades", "compliance")
+    assert pending["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_poison_entry_goes_to_dead_letter(make_client):
+    """Une entrée en échec à chaque livraison finit en dead-letter, acquittée"""
+    client = make_client()
+    client._stream_reclaim_idle_ms = 0  # reprise à chaque cycle
+    client._stream_max_deliveries = 2
+    attempts = []
+
+    async def failing(channel, data):
+        attempts.append(data["ticket_id"])
+        raise RuntimeError("boom")
+
+    await client.subscribe(["eva.compliance.trades"], failing, group="compliance")
+    await client.publish("eva.compliance.trades", {"ticket_id": 4})
+
+    task = asyncio.create_task(client.listen())
+    await asyncio.sleep(0.5)
+    task.cancel()
+
+    assert len(attempts) == 2
+    pending = await client._client.xpending("eva.compliance.trades", "compliance")
+    assert pending["pending"] == 0
+    (_, fields), = await client._raw_client.xrange(DEAD_LETTER_STREAM)
+    assert fields[b"channel"] == b"eva.compliance.trades"
+    assert fields[b"reason"] == b"max_deliveries"
+    assert client.codec.decode(fields[b"data"])["ticket_id"] == 4
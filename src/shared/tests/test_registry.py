@@ -0,0 +1,77 @@
+"""
+Tests des registres indexés (remplacement de KEYS).
+"""
+
+import pytest
+
+pytest.importorskip("lupa")  # scripts Lua (purge des entrées échues)
+
+from shared.registry import RedisRegistry, get_propfirm_registry
+
+
+@pytest.mark.asyncio
+async def test_list_all_filters_and_sweeps_expired_entries(make_redis_client):
+    """Les entrées échues sont ignorées puis purgées ; les permanentes restent"""
+    client = make_redis_client()
+    registry = RedisRegistry("swarm:drones", client)
+
+    await registry.put("d1", {"id": "d1", "status": "active"}, ttl_seconds=60)
+    await registry.put("d2", {"id": "d2", "status": "active"}, ttl_seconds=-1)
+    await registry.put("d3", {"id": "d3", "status": "completed"})
+
+    drones = await registry.list_all()
+
+    assert sorted(d["id"] for d in drones) == ["d1", "d3"]
+    assert await client.commands.hexists("swarm:drones", "d2") == 0
+    assert await registry.get("d3") == {"id": "d3", "status": "completed"}
+    assert await registry.count() == 2
+
+    assert await registry.remove("d1") is True
+    assert await registry.remove("d1") is False
+    assert await registry.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_put_joins_existing_batch(make_redis_client):
+    """Le heartbeat d'un drone rejoint le pipeline du publish"""
+    client = make_redis_client()
+    registry = RedisRegistry("swarm:drones", client)
+
+    async with client.pipeline() as batch:
+        batch.publish("eva.swarm.events", {"type": "DRONE_HEARTBEAT"})
+        await registry.put("d1", {"id": "d1"}, ttl_seconds=60, batch=batch)
+        assert len(batch) == 3
+
+    assert await registry.list_all() == [{"id": "d1"}]
+
+
+@pytest.mark.asyncio
+async def test_migrate_from_legacy_keys(make_redis_client):
+    """Les anciennes clés unitaires sont importées par SCAN puis supprimées"""
+    client = make_redis_client()
+    for n in range(5):
+        await client.cache_set(f"propfirm:account:{n}", {"n": n}, ttl_seconds=None)
+    await client.cache_set("propfirm:account:tmp", {"n": 99}, ttl_seconds=30)
+
+    registry = get_propfirm_registry(client)
+    migrated = await registry.migrate_from_keys("propfirm:account:", scan_count=2)
+
+    assert migrated == 6
+    assert sorted(r["n"] for r in await registry.list_all()) == [0, 1, 2, 3, 4, 99]
+    assert await client.commands.zscore("propfirm:accounts:expiry", "tmp") is not None
+    assert await client.commands.zscore("propfirm:accounts:expiry", "0") is None
+    assert await client.commands.exists("propfirm:account:0") == 0
+    assert await registry.migrate_from_keys("propfirm:account:") == 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_reloads_script_after_flush(make_redis_client):
+    """EVALSHA retombe sur SCRIPT LOAD si le serveur a oublié le script"""
+    client = make_redis_client()
+    registry = RedisRegistry("swarm:drones", client)
+    await registry.put("d1", {"id": "d1"}, ttl_seconds=-1)
+    assert await registry.sweep() == 1
+
+    await client.commands.script_flush()
+    await registry.put("d2", {"id": "d2"}, ttl_seconds=-1)
+    assert await registry.sweep() == 1
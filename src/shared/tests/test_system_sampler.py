@@ -0,0 +1,147 @@
+"""
+Tests de l'échantillonneur système (débits par différence, historique, cache).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from shared import system_sampler as sampler_module
+from shared.system_sampler import SystemSampler
+
+
+class FakeProcess:
+    pid = 42
+
+    def oneshot(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cpu_percent(self, interval=None):
+        return 3.0
+
+    def memory_info(self):
+        return SimpleNamespace(rss=256 * 1024 * 1024)
+
+    def num_threads(self):
+        return 7
+
+
+class FakePsutil:
+    def __init__(self):
+        self.calls = 0
+        self.net = dict(bytes_recv=0, bytes_sent=0, packets_recv=0, packets_sent=0,
+                        errin=0, errout=0, dropin=0, dropout=0)
+        self.disk = dict(read_bytes=0, write_bytes=0, read_count=0, write_count=0)
+
+    def Process(self):
+        return FakeProcess()
+
+    def cpu_percent(self, interval=None):
+        assert interval is None  # Jamais d'attente bloquante
+        self.calls += 1
+        return 25.0
+
+    def cpu_count(self, logical=True):
+        return 8
+
+    def cpu_freq(self):
+        return SimpleNamespace(current=3200.0)
+
+    def getloadavg(self):
+        return (1.0, 0.5, 0.25)
+
+    def sensors_temperatures(self):
+        return {}
+
+    def virtual_memory(self):
+        return SimpleNamespace(used=4 * 1024 ** 3, total=16 * 1024 ** 3, percent=25.0)
+
+    def swap_memory(self):
+        return SimpleNamespace(percent=0.0)
+
+    def disk_usage(self, path):
+        return SimpleNamespace(used=100 * 1024 ** 3, total=500 * 1024 ** 3, percent=20.0)
+
+    def disk_io_counters(self):
+        return SimpleNamespace(**self.disk)
+
+    def net_io_counters(self):
+        return SimpleNamespace(**self.net)
+
+    def boot_time(self):
+        return 0.0
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakePsutil()
+    monkeypatch.setattr(sampler_module, "psutil", fake, raising=False)
+    monkeypatch.setattr(sampler_module, "PSUTIL_AVAILABLE", True)
+    return fake
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rates_are_computed_from_deltas(fake, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sampler_module.time, "monotonic", clock)
+    sampler = SystemSampler(interval=5.0, history=3)
+
+    first = sampler.sample()
+    assert "rx_bytes_per_s" not in first["network"]
+    assert first["process"]["rss_mb"] == 256.0
+
+    clock.now += 5
+    fake.net.update(bytes_recv=5_000, bytes_sent=1_000, packets_recv=50)
+    fake.disk.update(read_bytes=10_000, write_count=25)
+    second = sampler.sample()
+    assert second["network"]["rx_bytes_per_s"] == 1000.0
+    assert second["network"]["tx_bytes_per_s"] == 200.0
+    assert second["network"]["rx_packets_per_s"] == 10.0
+    assert second["disk"]["read_bytes_per_s"] == 2000.0
+    assert second["disk"]["write_ops_per_s"] == 5.0
+
+    # Compteur remis à zéro : pas de débit négatif
+    clock.now += 5
+    fake.net.update(bytes_recv=0)
+    assert sampler.sample()["network"]["rx_bytes_per_s"] == 0.0
+
+
+def test_latest_serves_cached_snapshot_and_history_is_bounded(fake, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sampler_module.time, "monotonic", clock)
+    sampler = SystemSampler(interval=5.0, history=3)
+
+    # Aucun échantillon : marqueur seul, jamais d'appel psutil à la lecture
+    assert sampler.latest() == {"psutil_available": True, "stale": True}
+    assert fake.calls == 0
+
+    sampler.sample()
+    clock.now += 4
+    snap = sampler.latest()
+    assert fake.calls == 1  # Instantané frais : aucun appel psutil
+    assert "_monotonic" not in snap and snap["stale"] is False
+
+    # Instantané périmé (tâche arrêtée) : servi tel quel, marqué stale
+    clock.now += 20
+    snap = sampler.latest()
+    assert fake.calls == 1
+    assert snap["stale"] is True and snap["cpu"]["percent"] == 25.0
+
+    for _ in range(5):
+        clock.now += 5
+        sampler.sample()
+    assert len(sampler.history()) == 3
+    assert len(sampler.history(seconds=6)) == 2
@@ -0,0 +1,82 @@
+"""
+Tests de la télémétrie (histogrammes en flux, séries labellisées, Prometheus).
+"""
+
+import random
+
+import pytest
+
+from shared.telemetry import LatencyHistogram, Telemetry
+
+
+def test_histogram_quantiles_stay_within_bucket_error():
+    rng = random.Random(42)
+    values = [rng.expovariate(1 / 0.05) for _ in range(50_000)]
+    hist = LatencyHistogram()
+    for v in values:
+        hist.record(v)
+
+    values.sort()
+    for q, estimate in zip((0.5, 0.95, 0.99), hist.quantiles((0.5, 0.95, 0.99)), strict=True):
+        exact = values[int(q * len(values)) - 1]
+        assert estimate == pytest.approx(exact, rel=0.03)
+    assert hist.count == 50_000
+    assert hist.quantiles((1.0,)) == [pytest.approx(max(values), rel=0.03)]
+
+
+def test_histograms_merge_and_snapshots_are_independent():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for _ in range(90):
+        a.record(0.010)
+    for _ in range(10):
+        b.record(1.0)
+
+    snap = a.snapshot()
+    a.merge(b)
+    assert snap.count == 90
+    assert a.count == 100 and a.max == 1.0
+    p50, p99 = a.quantiles((0.5, 0.99))
+    assert p50 == pytest.approx(0.010, rel=0.02)
+    assert p99 == pytest.approx(1.0, rel=0.02)
+    assert a.cumulative((0.005, 0.1, 10.0)) == [0, 90, 100]
+
+
+def test_prometheus_exposition():
+    telemetry = Telemetry("test")
+    telemetry.record_request()
+    telemetry.inc("orders_total", side="buy")
+    telemetry.inc("orders_total", 2, side="buy")
+    telemetry.set_gauge("queue_depth", 7, lane='bulk"x')
+    telemetry.observe("llm.generate", 0.2, model="qwen")
+
+    text = telemetry.render_prometheus(buckets=(0.1, 1.0))
+    lines = text.splitlines()
+    assert "hive_requests_total 1" in lines
+    assert "# TYPE orders_total counter" in lines
+    assert 'orders_total{side="buy"} 3' in lines
+    assert 'queue_depth{lane="bulk\\"x"} 7' in lines
+    assert "# TYPE llm_generate histogram" in lines
+    assert 'llm_generate_bucket{model="qwen",le="0.1"} 0' in lines
+    assert 'llm_generate_bucket{model="qwen",le="1.0"} 1' in lines
+    assert 'llm_generate_bucket{model="qwen",le="+Inf"} 1' in lines
+    assert 'llm_generate_count{model="qwen"} 1' in lines
+
+    metrics = telemetry.get_metrics()
+    assert metrics["counters"]["orders_total{side=buy}"] == 3
+    assert metrics["operations"]["llm.generate{model=qwen}"]["count"] == 1
+
+
+def test_cumulative_system_counters_exported_as_counters(monkeypatch):
+    telemetry = Telemetry("test")
+    monkeypatch.setattr(telemetry, "_get_system_metrics", lambda: {
+        "cpu": {"percent": 12.5},
+        "network": {"rx_bytes": 4096, "tx_bytes": 1024, "rx_bytes_per_s": 10.0},
+    })
+
+    lines = telemetry.render_prometheus().splitlines()
+    assert "# TYPE hive_system_network_rx_bytes_total counter" in lines
+    assert "hive_system_network_rx_bytes_total 4096" in lines
+    assert "hive_system_network_tx_bytes_total 1024" in lines
+    assert "# TYPE hive_system_network_rx_bytes_per_s gauge" in lines
+    assert "# TYPE hive_system_cpu_percent gauge" in lines
+    assert not any(line.startswith("hive_system_network_rx_bytes ") for line in lines)
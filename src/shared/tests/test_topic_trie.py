@@ -0,0 +1,70 @@
+"""
+Tests du routage MQTT (TopicTrie et dispatch EVAMQTTClient).
+"""
+
+import asyncio
+
+import pytest
+
+from shared.mqtt_client import EVAMQTTClient
+from shared.topic_trie import TopicTrie
+
+
+def test_wildcard_matching():
+    trie = TopicTrie()
+    for topic_filter in ("eva/+/status", "eva/banker/#", "#", "eva/banker/status", "+/+"):
+        trie.add(topic_filter, topic_filter)
+
+    assert trie.match("eva/banker/status") == {
+        "eva/+/status", "eva/banker/#", "#", "eva/banker/status"
+    }
+    # `#` couvre aussi le niveau parent
+    assert trie.match("eva/banker") == {"eva/banker/#", "#", "+/+"}
+    assert trie.match("eva/core/status/extra") == {"#"}
+    # Pas de wildcard de premier niveau sur les topics système
+    assert trie.match("$SYS/broker") == set()
+
+
+def test_remove_prunes_and_invalid_filters():
+    trie = TopicTrie()
+    trie.add("eva/+/status", "a")
+    trie.add("eva/+/status", "b")
+    assert trie.remove("eva/+/status", "a")
+    assert not trie.remove("eva/+/status", "a")
+    assert trie.match("eva/core/status") == {"b"}
+    assert trie.remove("eva/+/status", "b")
+    assert len(trie) == 0 and trie.match("eva/core/status") == set()
+
+    for bad in ("", "eva/#/status", "eva/ban+", "eva/ker#"):
+        with pytest.raises(ValueError):
+            trie.add(bad, "x")
+
+
+@pytest.mark.asyncio
+async def test_mqtt_client_dispatches_wildcards_in_topic_order():
+    client = EVAMQTTClient("test")
+    seen: dict[str, list] = {"status": [], "all": []}
+
+    async def on_status(topic, data):
+        await asyncio.sleep(0.001 * (data["seq"] % 3))
+        seen["status"].append((topic, data["seq"]))
+
+    async def on_all(topic, data):
+        seen["all"].append(topic)
+
+    await client.subscribe("eva/status/+", on_status)
+    await client.subscribe("eva/#", on_all)
+
+    for seq in range(10):
+        for agent in ("banker", "core"):
+            payload = client.codec.encode({"seq": seq})
+            await client._on_message(None, f"eva/status/{agent}", payload, 1, {})
+    await client._on_message(None, "other/topic", client.codec.encode({"seq": 0}), 1, {})
+
+    await client._dispatcher.drain()
+    client._dispatcher.close()
+
+    for agent in ("banker", "core"):
+        topic = f"eva/status/{agent}"
+        assert [seq for t, seq in seen["status"] if t == topic] == list(range(10))
+    assert len(seen["all"]) == 20
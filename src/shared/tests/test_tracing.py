@@ -0,0 +1,137 @@
+"""
+Tests du tracing distribué (contexte W3C, spans imbriqués, exporteurs).
+"""
+
+import json
+
+import pytest
+
+from shared.tracing import (
+    JsonlSpanExporter,
+    OTLPHttpSpanExporter,
+    SpanKind,
+    Tracer,
+    TracingMiddleware,
+    current_traceparent,
+    inject,
+    parse_traceparent,
+)
+
+
+class MemoryExporter:
+    def __init__(self):
+        self.spans = []
+
+    async def export(self, spans):
+        self.spans.extend(spans)
+
+    async def close(self):
+        pass
+
+
+def test_traceparent_round_trip_and_validation():
+    header = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    ctx = parse_traceparent(header)
+    assert (ctx.trace_id, ctx.span_id, ctx.sampled) == (
+        "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True
+    )
+    assert ctx.traceparent == header
+    assert parse_traceparent(header[:-2] + "00").sampled is False
+    for invalid in (None, "", "garbage", "00-" + "0" * 32 + "-00f067aa0ba902b7-01"):
+        assert parse_traceparent(invalid) is None
+
+
+def test_disabled_tracer_creates_no_span():
+    tracer = Tracer()
+    with tracer.start_span("noop") as span:
+        assert span is None
+        assert inject({}) == {}
+    assert tracer.started == 0
+
+
+@pytest.mark.asyncio
+async def test_nested_spans_share_trace_and_link_parents():
+    exporter = MemoryExporter()
+    tracer = Tracer("core", exporter=exporter)
+    remote = parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01")
+
+    with tracer.start_span("bus.handle", SpanKind.CONSUMER, parent=remote) as outer:
+        with tracer.start_span("risk.validate") as inner:
+            headers = inject({})
+        with pytest.raises(ValueError):
+            with tracer.start_span("mt5.execute_order"):
+                raise ValueError("marché fermé")
+    assert current_traceparent() is None
+    await tracer.flush()
+
+    assert headers["traceparent"] == inner.context.traceparent
+    assert [s.name for s in exporter.spans] == ["risk.validate", "mt5.execute_order", "bus.handle"]
+    assert {s.context.trace_id for s in exporter.spans} == {remote.trace_id}
+    assert outer.parent_id == remote.span_id
+    assert inner.parent_id == outer.context.span_id
+    assert exporter.spans[1].error == "ValueError: marché fermé"
+
+
+@pytest.mark.asyncio
+async def test_unsampled_traces_propagate_but_are_not_exported():
+    exporter = MemoryExporter()
+    tracer = Tracer(exporter=exporter, sample_ratio=0.0)
+    with tracer.start_span("root") as span:
+        assert current_traceparent().endswith("-00")
+    await tracer.flush()
+    assert span is not None and exporter.spans == []
+
+
+@pytest.mark.asyncio
+async def test_jsonl_exporter_writes_one_line_per_span(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer("banker", exporter=JsonlSpanExporter(str(path)))
+    with tracer.start_span("risk.validate", attributes={"symbol": "XAUUSD"}):
+        pass
+    await tracer.shutdown()
+
+    (line,) = path.read_text().splitlines()
+    record = json.loads(line)
+    assert record["name"] == "risk.validate"
+    assert record["service"] == "banker"
+    assert record["attributes"] == {"symbol": "XAUUSD"}
+
+
+def test_otlp_encoding_groups_spans_by_service():
+    tracer = Tracer("core", exporter=MemoryExporter())
+    with tracer.start_span("llm.generate", SpanKind.CLIENT, attributes={"tokens": 12, "ok": True}):
+        pass
+    span = tracer._queue[0]
+
+    body = OTLPHttpSpanExporter.encode([span])
+    (resource,) = body["resourceSpans"]
+    assert resource["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "core"}}
+    ]
+    (otlp,) = resource["scopeSpans"][0]["spans"]
+    assert otlp["traceId"] == span.context.trace_id and "parentSpanId" not in otlp
+    assert otlp["kind"] == 3 and otlp["status"] == {"code": 1}
+    assert {"key": "tokens", "value": {"intValue": "12"}} in otlp["attributes"]
+    assert {"key": "ok", "value": {"boolValue": True}} in otlp["attributes"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_continues_incoming_trace():
+    exporter = MemoryExporter()
+    tracer = Tracer("core", exporter=exporter)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 503, "headers": []})
+
+    async def send(message):
+        pass
+
+    header = b"00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    scope = {"type": "http", "method": "GET", "path": "/health", "headers": [(b"traceparent", header)]}
+    await TracingMiddleware(app, tracer)(scope, None, send)
+    await tracer.flush()
+
+    (span,) = exporter.spans
+    assert span.kind is SpanKind.SERVER and span.name == "GET /health"
+    assert span.parent_id == "00f067aa0ba902b7"
+    assert span.attributes["http.status_code"] == 503 and span.error == "HTTP 503"